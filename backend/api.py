@@ -1,9 +1,12 @@
 from fastapi import FastAPI, HTTPException, status, WebSocket
+from fastapi.responses import StreamingResponse
+from fastapi.websockets import WebSocketDisconnect
 import asyncio
+import json
 from typing import List, Dict, Optional
 from pydantic import BaseModel
 import logging
-from .workflow_executor import WorkflowExecutor
+from .execution_service import ExecutionService
 
 app = FastAPI(
     title="Workflow API",
@@ -25,10 +28,19 @@ async def root():
         "docs": "Visit /docs for Swagger UI or /redoc for ReDoc documentation",
         "endpoints": {
             "workflows": "/api/workflows",
-            "execute": "/api/workflows/{workflow_id}/execute"
+            "execute": "/api/workflows/{workflow_id}/execute",
+            "events": "/api/workflows/{workflow_id}/events"
         }
     }
-executor = WorkflowExecutor()
+service = ExecutionService()
+
+@app.on_event("startup")
+async def start_workers():
+    service.start()
+
+@app.on_event("shutdown")
+async def stop_workers():
+    await asyncio.to_thread(service.stop)
 
 class ProjectBrief(BaseModel):
     project_brief: str
@@ -102,13 +114,13 @@ async def generate_workflow(project_brief: Dict):
 @app.post("/api/workflows/{workflow_id}/execute",
           status_code=202,
           summary="Execute a workflow",
-          description="Runs the specified workflow with the provided definition",
-          response_description="Workflow execution status",
+          description="Queues the specified workflow for execution by the worker pool",
+          response_description="Queued execution job",
           responses={
-              202: {"description": "Workflow execution started"},
+              202: {"description": "Workflow execution queued"},
               400: {"description": "Invalid workflow definition"},
               404: {"description": "Workflow not found"},
-              500: {"description": "Workflow execution failed"}
+              500: {"description": "Workflow could not be queued"}
           })
 async def execute_workflow(workflow_id: str, workflow_def: Dict):
     """
@@ -116,25 +128,30 @@ async def execute_workflow(workflow_id: str, workflow_def: Dict):
     
     - **workflow_id**: ID of the workflow to execute
     - **workflow_def**: JSON definition of the workflow nodes and edges
-    - Returns: Execution status and result
+    - Returns: Job ID; follow progress at /api/workflows/{workflow_id}/events
     """
     try:
-        result = await executor.execute_workflow(workflow_id, workflow_def)
-        return {
-            "status": "accepted",
-            "workflow_id": workflow_id,
-            "result": result
-        }
+        job_id = await asyncio.to_thread(service.submit, workflow_id, workflow_def)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid workflow definition: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Workflow execution failed: {str(e)}"
+            detail=f"Workflow could not be queued: {str(e)}"
         )
+    return {
+        "status": "accepted",
+        "workflow_id": workflow_id,
+        "job_id": job_id
+    }
 
 @app.get("/api/workflows/{workflow_id}")
 async def get_workflow(workflow_id: str):
     """Get workflow by ID including execution status"""
-    status = executor.get_workflow_status(workflow_id)
+    status = await asyncio.to_thread(service.get_workflow_status, workflow_id)
     return {
         "workflow_id": workflow_id,
         "status": status['status'],
@@ -145,7 +162,7 @@ async def get_workflow(workflow_id: str):
 @app.get("/api/workflows/{workflow_id}/status")
 async def get_workflow_status(workflow_id: str):
     """Get detailed execution status of a workflow"""
-    status = executor.get_workflow_status(workflow_id)
+    status = await asyncio.to_thread(service.get_workflow_status, workflow_id)
     if status['status'] == 'not_found':
         raise HTTPException(
             status_code=404,
@@ -153,29 +170,70 @@ async def get_workflow_status(workflow_id: str):
         )
     return status
 
+@app.get("/api/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """Get status and result of one execution job"""
+    status = await asyncio.to_thread(service.get_job_status, job_id)
+    if status['status'] == 'not_found':
+        raise HTTPException(
+            status_code=404,
+            detail="Job not found"
+        )
+    return status
+
+async def _latest_job_id(workflow_id: str, job_id: Optional[str]) -> Optional[str]:
+    if job_id:
+        return job_id
+    status = await asyncio.to_thread(service.get_workflow_status, workflow_id)
+    return status.get('job_id')
+
 @app.websocket("/api/workflows/{workflow_id}/monitor")
-async def monitor_workflow(websocket: WebSocket, workflow_id: str):
-    """WebSocket endpoint for real-time workflow monitoring"""
+async def monitor_workflow(websocket: WebSocket, workflow_id: str, job_id: Optional[str] = None):
+    """WebSocket endpoint for real-time workflow monitoring
+
+    Sends the per-node progress events of the latest (or given) job, then its final status.
+    """
     await websocket.accept()
-    while True:
-        status = executor.get_workflow_status(workflow_id)
-        await websocket.send_json(status)
-        if status['status'] in ['completed', 'failed']:
-            break
-        await asyncio.sleep(1)
+    job_id = await _latest_job_id(workflow_id, job_id)
+    try:
+        if job_id:
+            async for event in service.stream_events(job_id):
+                await websocket.send_json(event)
+            await websocket.send_json(await asyncio.to_thread(service.get_job_status, job_id))
+        else:
+            await websocket.send_json({'status': 'not_found'})
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+@app.get("/api/workflows/{workflow_id}/events")
+async def stream_workflow_events(workflow_id: str, job_id: Optional[str] = None):
+    """Server-sent events stream of per-node progress for the latest (or given) job"""
+    job_id = await _latest_job_id(workflow_id, job_id)
+    if not job_id:
+        raise HTTPException(
+            status_code=404,
+            detail="Workflow not found"
+        )
+
+    async def events():
+        async for event in service.stream_events(job_id):
+            yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 @app.get("/api/workflows/{workflow_id}/history")
 async def get_workflow_history(workflow_id: str):
     """Get execution history for a workflow"""
     return {
         "workflow_id": workflow_id,
-        "history": executor.get_execution_history(workflow_id)
+        "history": await asyncio.to_thread(service.get_execution_history, workflow_id)
     }
 
 @app.get("/api/agents/status")
 async def get_detailed_agent_status():
     """Get detailed status of all agents"""
-    return executor.get_agent_status()
+    return service.get_agent_status()
 
 # Vector DB Integration
 @app.post("/api/vectordb/connect")
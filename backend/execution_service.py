@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import uuid
+from typing import Any, Dict, List, Optional
+
+from .job_queue import DEFAULT_SQLITE_PATH, JobQueue, create_job_queue
+from .workflow_executor import WorkflowExecutor
+
+WORKERS = int(os.getenv("WORKFLOW_WORKERS", 2))
+LEASE_SECONDS = float(os.getenv("WORKFLOW_LEASE_SECONDS", 300))
+MAX_ATTEMPTS = int(os.getenv("WORKFLOW_MAX_ATTEMPTS", 3))
+POLL_INTERVAL = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+def default_queue_url() -> str:
+    """Queue URL from WORKFLOW_QUEUE_URL, else a SQLite file in the workflow data directory."""
+    return os.getenv("WORKFLOW_QUEUE_URL", DEFAULT_SQLITE_PATH)
+
+
+def _heartbeat(queue: JobQueue, job_id: str, worker_id: str, lease_seconds: float, stop: threading.Event):
+    """Renew a job's lease every third of lease_seconds until stop is set or the lease is lost."""
+    while not stop.wait(lease_seconds / 3):
+        try:
+            if not queue.renew(job_id, worker_id, lease_seconds):
+                logger.warning(f"Worker {worker_id} lost the lease of job {job_id}")
+                return
+        except Exception as e:
+            logger.error(f"Worker {worker_id} could not renew the lease of job {job_id}: {str(e)}")
+
+
+def run_job(queue: JobQueue, job: Dict[str, Any], executor: Optional[WorkflowExecutor] = None,
+            lease_seconds: float = LEASE_SECONDS):
+    """Execute one claimed job, recording its progress events and outcome.
+
+    The job's lease is renewed from a heartbeat thread while the workflow
+    runs, so long-running jobs are not handed to another worker.
+    """
+    executor = executor or WorkflowExecutor()
+    job_id, workflow_id, worker_id = job["id"], job["workflow_id"], job["worker"]
+
+    def on_progress(event: Dict[str, Any]):
+        queue.add_event(job_id, {**event, "workflow_id": workflow_id})
+
+    stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=_heartbeat, args=(queue, job_id, worker_id, lease_seconds, stop), daemon=True
+    )
+    heartbeat.start()
+    try:
+        on_progress({"type": "job_started", "attempt": job["attempts"]})
+        try:
+            result = asyncio.run(executor.execute_workflow(workflow_id, job["payload"], on_progress=on_progress))
+        except Exception as e:
+            on_progress({"type": "job_failed", "error": str(e)})
+            recorded = queue.fail(job_id, str(e), worker_id)
+        else:
+            on_progress({"type": "job_completed"})
+            recorded = queue.complete(job_id, result, worker_id)
+    finally:
+        stop.set()
+        heartbeat.join()
+    if not recorded:
+        logger.warning(f"Worker {worker_id} no longer holds job {job_id}; its outcome was not recorded")
+
+
+def worker_loop(queue_url: str, worker_id: str, stop: Any):
+    """Claim and run jobs until stop is set. Runs in a worker process."""
+    queue = create_job_queue(queue_url)
+    executor = WorkflowExecutor()
+    logger.info(f"Workflow worker {worker_id} started")
+    while not stop.is_set():
+        try:
+            job = queue.claim(worker_id, LEASE_SECONDS, MAX_ATTEMPTS)
+        except Exception as e:
+            logger.error(f"Worker {worker_id} could not claim a job: {str(e)}")
+            job = None
+        if job is None:
+            stop.wait(POLL_INTERVAL)
+            continue
+        logger.info(f"Worker {worker_id} running job {job['id']} for workflow {job['workflow_id']}")
+        run_job(queue, job, executor)
+
+
+class ExecutionService:
+    """Queues workflow executions and runs them in a pool of worker processes.
+
+    Jobs, results and progress events are kept in the job queue (SQLite by
+    default, Redis for a queue URL starting with redis://), so they survive
+    restarts and can be served by any API process. With workers=0 no
+    processes are started and jobs wait for workers started elsewhere
+    (python -m backend.execution_service).
+    """
+
+    def __init__(self, queue_url: Optional[str] = None, workers: int = WORKERS):
+        self.queue_url = queue_url or default_queue_url()
+        self.queue = create_job_queue(self.queue_url)
+        self.workers = workers
+        self._processes: List[multiprocessing.Process] = []
+        self._stop = None
+
+    def start(self):
+        """Start the worker processes."""
+        if self._processes or self.workers <= 0:
+            return
+        context = multiprocessing.get_context("spawn")
+        self._stop = context.Event()
+        host = socket.gethostname()
+        for index in range(self.workers):
+            worker_id = f"{host}-{os.getpid()}-{index}-{uuid.uuid4().hex[:6]}"
+            process = context.Process(
+                target=worker_loop, args=(self.queue_url, worker_id, self._stop), daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+    def stop(self, timeout: float = 10):
+        """Stop the worker processes after their current job."""
+        if self._stop is not None:
+            self._stop.set()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+    def submit(self, workflow_id: str, workflow_def: Dict[str, Any]) -> str:
+        """Validate and queue a workflow execution, returning the job ID."""
+        WorkflowExecutor.validate_workflow(workflow_def)
+        job_id = self.queue.enqueue(workflow_id, workflow_def)
+        self.queue.add_event(job_id, {"type": "job_queued", "workflow_id": workflow_id})
+        return job_id
+
+    def _status(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "workflow_id": job["workflow_id"],
+            "job_id": job["id"],
+            "status": job["status"],
+            "result": job["result"],
+            "error": job["error"],
+            "attempts": job["attempts"],
+            "created_at": job["created_at"],
+            "started_at": job["started_at"],
+            "finished_at": job["finished_at"],
+        }
+
+    def get_workflow_status(self, workflow_id: str) -> Dict[str, Any]:
+        """Status of the latest execution of a workflow"""
+        job = self.queue.latest(workflow_id)
+        return self._status(job) if job else {"status": "not_found"}
+
+    def get_job_status(self, job_id: str) -> Dict[str, Any]:
+        job = self.queue.get(job_id)
+        return self._status(job) if job else {"status": "not_found"}
+
+    def get_execution_history(self, workflow_id: str) -> List[Dict[str, Any]]:
+        return [self._status(job) for job in self.queue.history(workflow_id)]
+
+    def get_agent_status(self) -> Dict[str, str]:
+        """Liveness of the worker processes started by this service"""
+        return {
+            f"worker-{index}": "running" if process.is_alive() else "stopped"
+            for index, process in enumerate(self._processes)
+        }
+
+    async def stream_events(self, job_id: str, poll_interval: float = POLL_INTERVAL):
+        """Yield a job's progress events as they are recorded, until it finishes."""
+        after = 0
+        while True:
+            job = await asyncio.to_thread(self.queue.get, job_id)
+            events = await asyncio.to_thread(self.queue.events, job_id, after)
+            for event in events:
+                after = event["seq"]
+                yield event
+            if job is None or job["status"] in ("completed", "failed"):
+                # Events written before the final status update were read above
+                return
+            await asyncio.sleep(poll_interval)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run workflow execution workers")
+    parser.add_argument("--queue", default=None,
+                        help="SQLite path or redis:// URL of the job queue (default: $WORKFLOW_QUEUE_URL or the data directory)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Number of worker processes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    service = ExecutionService(args.queue, args.workers)
+    service.start()
+    try:
+        for process in service._processes:
+            process.join()
+    except KeyboardInterrupt:
+        service.stop()
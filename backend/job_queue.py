@@ -0,0 +1,381 @@
+import importlib.util
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+DATA_DIR = os.getenv("WORKFLOW_DATA_DIR", os.path.join(os.path.expanduser("~"), ".praison", "workflows"))
+DEFAULT_SQLITE_PATH = os.path.join(DATA_DIR, "workflow_jobs.db")
+
+class JobQueue(ABC):
+    """Durable queue of workflow execution jobs and their progress events.
+
+    A job moves from queued to running to completed or failed. A running job
+    holds a lease that its worker renews while it runs; jobs whose lease has
+    expired (for example after a worker crash or a restart) are handed out
+    again by claim(), unless they have already been claimed max_attempts
+    times: those are marked failed instead, so a job that keeps crashing
+    its worker is not retried forever. Only the worker holding the lease
+    can renew, complete or fail a job.
+    """
+
+    @abstractmethod
+    def enqueue(self, workflow_id: str, payload: Dict[str, Any]) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float,
+              max_attempts: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Take the oldest queued (or expired) job, returning it or None.
+
+        Expired jobs already claimed max_attempts times are failed rather than
+        handed out; None retries them without limit.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def renew(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend the lease of a running job; False when worker_id no longer holds it."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete(self, job_id: str, result: Any, worker_id: str) -> bool:
+        """Record a job's result; False (and no change) when worker_id no longer holds its lease."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def fail(self, job_id: str, error: str, worker_id: str) -> bool:
+        """Record a job's failure; False (and no change) when worker_id no longer holds its lease."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_event(self, job_id: str, event: Dict[str, Any]):
+        """Record a progress event."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def events(self, job_id: str, after: int = 0) -> List[Dict[str, Any]]:
+        """Progress events of a job with a sequence number greater than after."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def latest(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def history(self, workflow_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+def _attempts_error(attempts: int) -> str:
+    return f"Lease expired after {attempts} attempts"
+
+
+class SQLiteJobQueue(JobQueue):
+    """Job queue in a local SQLite file, shared by all worker processes on the host."""
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    workflow_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    worker TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    lease_until REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+                CREATE INDEX IF NOT EXISTS idx_jobs_workflow_created ON jobs (workflow_id, created_at);
+                CREATE TABLE IF NOT EXISTS job_events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    event TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_job_events_job_seq ON job_events (job_id, seq);
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; sqlite3 connections are not thread-safe
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _job(self, row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def enqueue(self, workflow_id: str, payload: Dict[str, Any]) -> str:
+        job_id = str(uuid.uuid4())
+        self._connect().execute(
+            "INSERT INTO jobs (id, workflow_id, status, payload, created_at) VALUES (?, ?, 'queued', ?, ?)",
+            (job_id, workflow_id, _dumps(payload), time.time())
+        )
+        return job_id
+
+    def claim(self, worker_id: str, lease_seconds: float,
+              max_attempts: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        now = time.time()
+        # BEGIN IMMEDIATE takes the write lock, so two processes never claim the same job
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if max_attempts is not None:
+                exhausted = conn.execute(
+                    "SELECT id, attempts FROM jobs WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                    (now, max_attempts)
+                ).fetchall()
+                for job in exhausted:
+                    error = _attempts_error(job["attempts"])
+                    conn.execute(
+                        """UPDATE jobs SET status = 'failed', error = ?, finished_at = ?, lease_until = NULL
+                           WHERE id = ?""",
+                        (error, now, job["id"])
+                    )
+                    conn.execute(
+                        "INSERT INTO job_events (job_id, event, created_at) VALUES (?, ?, ?)",
+                        (job["id"], _dumps({"type": "job_failed", "error": error}), now)
+                    )
+            row = conn.execute(
+                """SELECT id FROM jobs
+                   WHERE status = 'queued' OR (status = 'running' AND lease_until < ?)
+                   ORDER BY created_at LIMIT 1""",
+                (now,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                """UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1,
+                   started_at = ?, lease_until = ? WHERE id = ?""",
+                (worker_id, now, now + lease_seconds, row["id"])
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row["id"])
+
+    def renew(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        cursor = self._connect().execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time() + lease_seconds, job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def _finish(self, job_id: str, worker_id: str, status: str, result: Any = None,
+                error: Optional[str] = None) -> bool:
+        cursor = self._connect().execute(
+            """UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_until = NULL
+               WHERE id = ? AND worker = ? AND status = 'running'""",
+            (status, None if result is None else _dumps(result), error, time.time(), job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, result: Any, worker_id: str) -> bool:
+        return self._finish(job_id, worker_id, "completed", result=result)
+
+    def fail(self, job_id: str, error: str, worker_id: str) -> bool:
+        return self._finish(job_id, worker_id, "failed", error=error)
+
+    def add_event(self, job_id: str, event: Dict[str, Any]):
+        self._connect().execute(
+            "INSERT INTO job_events (job_id, event, created_at) VALUES (?, ?, ?)",
+            (job_id, _dumps(event), time.time())
+        )
+
+    def events(self, job_id: str, after: int = 0) -> List[Dict[str, Any]]:
+        rows = self._connect().execute(
+            "SELECT seq, event FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+            (job_id, after)
+        ).fetchall()
+        return [{**json.loads(row["event"]), "seq": row["seq"]} for row in rows]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._job(self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def latest(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        return self._job(self._connect().execute(
+            "SELECT * FROM jobs WHERE workflow_id = ? ORDER BY created_at DESC LIMIT 1",
+            (workflow_id,)
+        ).fetchone())
+
+    def history(self, workflow_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        rows = self._connect().execute(
+            "SELECT * FROM jobs WHERE workflow_id = ? ORDER BY created_at DESC LIMIT ?",
+            (workflow_id, limit)
+        ).fetchall()
+        return [self._job(row) for row in rows]
+
+
+class RedisJobQueue(JobQueue):
+    """Job queue in Redis (or a Redis-compatible server), for workers on several hosts."""
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "workflow_jobs"):
+        if importlib.util.find_spec("redis") is None:
+            raise ImportError("Redis job queue requires the redis package. Install with: pip install redis")
+        import redis
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self._watch_error = redis.WatchError
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix,) + parts)
+
+    def _job(self, data: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        if not data:
+            return None
+        job: Dict[str, Any] = dict(data)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job.get("result") else None
+        job["error"] = job.get("error") or None
+        for field in ("created_at", "started_at", "finished_at", "lease_until"):
+            job[field] = float(job[field]) if job.get(field) else None
+        job["attempts"] = int(job.get("attempts", 0))
+        return job
+
+    def enqueue(self, workflow_id: str, payload: Dict[str, Any]) -> str:
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        pipe = self.redis.pipeline()
+        pipe.hset(self._key("job", job_id), mapping={
+            "id": job_id, "workflow_id": workflow_id, "status": "queued",
+            "payload": _dumps(payload), "attempts": 0, "created_at": now
+        })
+        pipe.zadd(self._key("workflow", workflow_id), {job_id: now})
+        pipe.lpush(self._key("queued"), job_id)
+        pipe.execute()
+        return job_id
+
+    def claim(self, worker_id: str, lease_seconds: float,
+              max_attempts: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        # Jobs whose lease expired go back to the queue first, or fail once out of attempts
+        for job_id in self.redis.zrangebyscore(self._key("leases"), 0, now):
+            if not self.redis.zrem(self._key("leases"), job_id):
+                continue
+            attempts = int(self.redis.hget(self._key("job", job_id), "attempts") or 0)
+            if max_attempts is not None and attempts >= max_attempts:
+                error = _attempts_error(attempts)
+                pipe = self.redis.pipeline()
+                pipe.hset(self._key("job", job_id), mapping={
+                    "status": "failed", "error": error, "finished_at": now, "lease_until": ""
+                })
+                pipe.rpush(self._key("events", job_id), _dumps({"type": "job_failed", "error": error}))
+                pipe.execute()
+            else:
+                self.redis.rpush(self._key("queued"), job_id)
+        job_id = self.redis.rpop(self._key("queued"))
+        if job_id is None:
+            return None
+        pipe = self.redis.pipeline()
+        pipe.hset(self._key("job", job_id), mapping={
+            "status": "running", "worker": worker_id, "started_at": now, "lease_until": now + lease_seconds
+        })
+        pipe.hincrby(self._key("job", job_id), "attempts", 1)
+        pipe.zadd(self._key("leases"), {job_id: now + lease_seconds})
+        pipe.execute()
+        return self.get(job_id)
+
+    def _update_if_holder(self, job_id: str, worker_id: str, update: Callable[[Any], None]) -> bool:
+        """Apply update to a transaction pipeline if worker_id holds the job's lease."""
+        key = self._key("job", job_id)
+        with self.redis.pipeline() as pipe:
+            while True:
+                try:
+                    # WATCH makes the transaction fail if another worker claims the job meanwhile
+                    pipe.watch(key)
+                    if pipe.hget(key, "status") != "running" or pipe.hget(key, "worker") != worker_id:
+                        pipe.unwatch()
+                        return False
+                    pipe.multi()
+                    update(pipe)
+                    pipe.execute()
+                    return True
+                except self._watch_error:
+                    continue
+
+    def renew(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        until = time.time() + lease_seconds
+
+        def update(pipe):
+            pipe.hset(self._key("job", job_id), "lease_until", until)
+            pipe.zadd(self._key("leases"), {job_id: until})
+        return self._update_if_holder(job_id, worker_id, update)
+
+    def _finish(self, job_id: str, worker_id: str, status: str, result: Any = None,
+                error: Optional[str] = None) -> bool:
+        def update(pipe):
+            pipe.hset(self._key("job", job_id), mapping={
+                "status": status, "result": "" if result is None else _dumps(result),
+                "error": error or "", "finished_at": time.time(), "lease_until": ""
+            })
+            pipe.zrem(self._key("leases"), job_id)
+            # An expired lease may already have put the job back in the queue
+            pipe.lrem(self._key("queued"), 0, job_id)
+        return self._update_if_holder(job_id, worker_id, update)
+
+    def complete(self, job_id: str, result: Any, worker_id: str) -> bool:
+        return self._finish(job_id, worker_id, "completed", result=result)
+
+    def fail(self, job_id: str, error: str, worker_id: str) -> bool:
+        return self._finish(job_id, worker_id, "failed", error=error)
+
+    def add_event(self, job_id: str, event: Dict[str, Any]):
+        self.redis.rpush(self._key("events", job_id), _dumps(event))
+
+    def events(self, job_id: str, after: int = 0) -> List[Dict[str, Any]]:
+        items = self.redis.lrange(self._key("events", job_id), after, -1)
+        return [{**json.loads(item), "seq": after + i + 1} for i, item in enumerate(items)]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._job(self.redis.hgetall(self._key("job", job_id)))
+
+    def latest(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        job_ids = self.redis.zrevrange(self._key("workflow", workflow_id), 0, 0)
+        return self.get(job_ids[0]) if job_ids else None
+
+    def history(self, workflow_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        job_ids = self.redis.zrevrange(self._key("workflow", workflow_id), 0, limit - 1)
+        return [job for job in (self.get(job_id) for job_id in job_ids) if job]
+
+
+def create_job_queue(url: str) -> JobQueue:
+    """Job queue for a URL: redis://... (or rediss://) for Redis, else a SQLite file path."""
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisJobQueue(url)
+    if url.startswith("sqlite:///"):
+        url = url[len("sqlite:///"):]
+    return SQLiteJobQueue(url)
@@ -1,20 +1,55 @@
 from langgraph.graph import Graph
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 import logging
 
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
 class WorkflowExecutor:
     def __init__(self):
         self.active_workflows = {}
         self.logger = logging.getLogger(__name__)
 
-    async def execute_workflow(self, workflow_id: str, workflow_def: Dict[str, Any]):
-        """Execute a workflow using LangGraph"""
+    @staticmethod
+    def validate_workflow(workflow_def: Dict[str, Any]):
+        """Raise ValueError if a workflow definition is malformed"""
+        if not workflow_def.get('nodes'):
+            raise ValueError("Workflow must contain at least one node")
+        if not workflow_def.get('entry_point'):
+            raise ValueError("Workflow must specify an entry point")
+        for node in workflow_def['nodes']:
+            if not node.get('id'):
+                raise ValueError("All nodes must have an id")
+
+    @staticmethod
+    def _node_runner(node_id: str, func: Callable, on_progress: Optional[ProgressCallback]):
+        """State handler for one node, reporting node progress"""
+        def run(state):
+            if on_progress:
+                on_progress({'type': 'node_started', 'node': node_id})
+            try:
+                value = func(state['value'] if isinstance(state, dict) and 'value' in state else state)
+            except Exception as e:
+                if on_progress:
+                    on_progress({'type': 'node_failed', 'node': node_id, 'error': str(e)})
+                raise
+            if on_progress:
+                on_progress({'type': 'node_completed', 'node': node_id, 'value': value})
+            return {
+                'value': value,
+                '_prev': state  # Keep previous state for reference
+            }
+        return run
+
+    async def execute_workflow(self, workflow_id: str, workflow_def: Dict[str, Any],
+                               on_progress: Optional[ProgressCallback] = None):
+        """Execute a workflow using LangGraph
+
+        on_progress, when given, is called with node_started, node_completed
+        and node_failed events as the nodes run.
+        """
         try:
             # Validate workflow definition
-            if not workflow_def.get('nodes'):
-                raise ValueError("Workflow must contain at least one node")
-            if not workflow_def.get('entry_point'):
-                raise ValueError("Workflow must specify an entry point")
+            self.validate_workflow(workflow_def)
 
             # Create LangGraph workflow
             workflow = Graph()
@@ -34,16 +69,13 @@ class WorkflowExecutor:
                         raise ValueError(f"Invalid function definition: {str(e)}")
                 else:
                     # Wrap raw functions to handle dict input
-                    func = lambda x: node['function'](x)
+                    func = lambda x, f=node['function']: f(x)
                 
                 if not callable(func):
                     raise ValueError(f"Node {node['id']} function must be callable")
                 
                 # Add node with proper state handling
-                workflow.add_node(node['id'], lambda state: {
-                    'value': func(state['value'] if isinstance(state, dict) and 'value' in state else state),
-                    '_prev': state  # Keep previous state for reference
-                })
+                workflow.add_node(node['id'], self._node_runner(node['id'], func, on_progress))
             
             # Add edges from workflow definition  
             for edge in workflow_def.get('edges', []):
@@ -51,6 +83,12 @@ class WorkflowExecutor:
             
             # Set entry point
             workflow.set_entry_point(workflow_def['entry_point'])
+
+            # Nodes without outgoing edges end the run, so their state is returned as the result
+            sources = {edge['source'] for edge in workflow_def.get('edges', [])}
+            for node in workflow_def['nodes']:
+                if node['id'] not in sources:
+                    workflow.set_finish_point(node['id'])
             
             # Execute workflow
             self.active_workflows[workflow_id] = {
@@ -67,7 +105,7 @@ class WorkflowExecutor:
             
         except Exception as e:
             self.logger.error(f"Workflow execution failed: {str(e)}")
-            self.active_workflows[workflow_id]['status'] = 'failed'
+            self.active_workflows.setdefault(workflow_id, {})['status'] = 'failed'
             raise
 
     def get_workflow_status(self, workflow_id: str):
@@ -1,5 +1,6 @@
 from typing import Dict, List, Optional, Any, Callable
-from concurrent.futures import ThreadPoolExecutor, Future
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from collections import deque
 import os
 import json
 import datetime
@@ -8,6 +9,7 @@ import importlib
 import logging
 import yaml
 import time
+import threading
 from pathlib import Path
 
 # Настройка логирования
@@ -15,18 +17,63 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(level
 logger = logging.getLogger("LangGraphExecutor")
 
 class LangGraphExecutor:
-    def __init__(self, workflow: Dict, workflow_id: Optional[str] = None):
+    def __init__(self, workflow: Dict, workflow_id: Optional[str] = None,
+                 max_workers: Optional[int] = None, node_timeout: Optional[float] = None):
+        """
+        Args:
+            workflow: Workflow with 'nodes' and 'edges'
+            workflow_id: Identifier used for saved results
+            max_workers: Maximum number of tasks run at the same time
+            node_timeout: Default per-task timeout in seconds (a node's data.timeout overrides it)
+        """
         self.workflow = workflow
         self.workflow_id = workflow_id or str(uuid.uuid4())
-        self.executor = ThreadPoolExecutor()
+        self.max_workers = max_workers
+        self.node_timeout = node_timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self.results = []
         self.context = {}  # Контекст выполнения для хранения результатов задач
         self.agent_cache = {}  # Кэш для хранения экземпляров агентов
         self.task_results = {}  # Результаты выполнения задач
+        self._lock = threading.Lock()
+        self._abandoned = set()  # Задачи, результат которых больше не ожидается (таймаут)
+        self._nodes: Dict[str, Dict] = {}
+        self._successors: Dict[str, List[str]] = {}
+        self._predecessors: Dict[str, List[str]] = {}
+        self._edges_from: Dict[str, List[Dict]] = {}
+
+    def _build_graph(self):
+        """
+        Precompute node lookup and adjacency maps from the workflow.
+        """
+        self._nodes = {}
+        for node in self.workflow.get('nodes', []):
+            if node.get('id'):
+                self._nodes[node['id']] = node
+        self._successors = {node_id: [] for node_id in self._nodes}
+        self._predecessors = {node_id: [] for node_id in self._nodes}
+        self._edges_from = {node_id: [] for node_id in self._nodes}
+        for edge in self.workflow.get('edges', []):
+            source = edge.get('source')
+            target = edge.get('target')
+            if not source or not target or target not in self._nodes:
+                continue
+            self._predecessors[target].append(source)
+            if source in self._nodes:
+                self._successors[source].append(target)
+                self._edges_from[source].append(edge)
 
     def execute_workflow(self):
         """
         Execute the workflow plan.
+
+        Nodes are dispatched to the thread pool as soon as all of their
+        dependencies have succeeded, so independent branches run in parallel.
+        When a node fails or times out, its downstream nodes are cancelled.
+        A node not chosen by a decision point is skipped, and so is a node
+        all of whose upstream nodes were skipped; a node where skipped and
+        taken branches merge still runs. A failing 'critical' task stops the
+        whole workflow.
         """
         # Создаем запись о начале выполнения рабочего процесса
         execution_id = str(uuid.uuid4())
@@ -35,33 +82,18 @@ class LangGraphExecutor:
         try:
             logger.info(f"Starting workflow execution: {self.workflow_id}")
             
-            # Создаем топологическую сортировку узлов для правильного порядка выполнения
-            execution_order = self._create_execution_order()
+            # Строим карты смежности и проверяем граф на циклы
+            self._build_graph()
+            self._create_execution_order()
             
-            # Выполняем узлы в правильном порядке
-            for node_id in execution_order:
-                node = self._find_node_by_id(node_id)
-                if not node:
-                    continue
-                    
-                # Проверяем, выполнены ли все зависимости
-                dependencies_met = self._check_dependencies(node)
-                if not dependencies_met:
-                    logger.warning(f"Skipping node {node_id} due to unmet dependencies")
-                    continue
-                
-                # Выполняем узел в зависимости от его типа
-                if node.get('type') == 'parallel':
-                    self.execute_parallel_block(node)
-                elif node.get('type') == 'decision':
-                    self.execute_decision_point(node)
-                else:
-                    self.execute_task(node)
+            # Выполняем узлы по мере готовности их зависимостей
+            self._run_ready_queue()
             
             # Записываем успешное завершение
+            tasks_completed = sum(1 for r in self.task_results.values() if r.get('status') == 'success')
             self._save_result(execution_id, start_time, 'completed', {
                 'message': 'Workflow executed successfully',
-                'tasks_completed': len(execution_order),
+                'tasks_completed': tasks_completed,
                 'results': self.task_results
             })
             
@@ -83,77 +115,161 @@ class LangGraphExecutor:
             
             raise e
 
+    def _run_ready_queue(self):
+        """
+        Dispatch every node whose dependencies are satisfied and wait for the
+        running tasks, releasing their successors as they finish.
+        """
+        remaining = {node_id: len(preds) for node_id, preds in self._predecessors.items()}
+        skipped = {node_id: 0 for node_id in self._predecessors}
+        ready = deque(node_id for node_id, count in remaining.items() if count == 0)
+        running: Dict[Future, tuple] = {}
+
+        def release(target: str, skip_reason: Optional[str] = None):
+            # Пропущенный предшественник считается выполненным: узел пропускается,
+            # только если пропущены все его предшественники (слияние ветвей if/else)
+            stack = [(target, skip_reason)]
+            while stack:
+                current, reason = stack.pop()
+                remaining[current] -= 1
+                if reason is not None:
+                    skipped[current] += 1
+                if remaining[current] > 0 or current in self.task_results:
+                    continue
+                if skipped[current] == len(self._predecessors[current]):
+                    reason = reason if skipped[current] == 1 else "All upstream paths were skipped"
+                    logger.info(f"Node {current} skipped: {reason}")
+                    self.task_results[current] = {'status': 'skipped', 'reason': reason}
+                    stack.extend((successor, f"Upstream node {current} was skipped")
+                                 for successor in self._successors[current])
+                else:
+                    ready.append(current)
+
+        def finish(node_id: str, success: bool, released: Optional[List[str]] = None):
+            # Освобождаем последователей успешного узла, остальных отменяем
+            for target in self._successors[node_id]:
+                if not success:
+                    self._cancel_downstream(target, 'cancelled', f"Upstream node {node_id} did not succeed")
+                elif released is not None and target not in released:
+                    release(target, f"Path not taken at decision {node_id}")
+                else:
+                    release(target)
+
+        while ready or running:
+            while ready:
+                node_id = ready.popleft()
+                node = self._nodes[node_id]
+                if node.get('type') == 'parallel':
+                    self._record_parallel_block(node)
+                    finish(node_id, True)
+                elif node.get('type') == 'decision':
+                    finish(node_id, True, self._run_decision_point(node))
+                else:
+                    timeout = node.get('data', {}).get('timeout', self.node_timeout)
+                    deadline = time.monotonic() + timeout if timeout else None
+                    running[self.executor.submit(self.execute_task, node)] = (node_id, deadline)
+
+            if not running:
+                break
+
+            deadlines = [deadline for _, deadline in running.values() if deadline is not None]
+            wait_timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, _ = wait(list(running), timeout=wait_timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                node_id, _ = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    # Критическая задача завершилась с ошибкой - останавливаем весь процесс
+                    for pending in running:
+                        pending.cancel()
+                    for pending_id, _ in running.values():
+                        self._abandon(pending_id, 'cancelled', f"Workflow stopped after critical task {node_id} failed")
+                    raise error
+                finish(node_id, self.task_results.get(node_id, {}).get('status') == 'success')
+
+            now = time.monotonic()
+            for future, (node_id, deadline) in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    del running[future]
+                    future.cancel()
+                    logger.error(f"Task {node_id} timed out")
+                    self._abandon(node_id, 'error', 'Task timed out')
+                    finish(node_id, False)
+                    if self._nodes[node_id].get('data', {}).get('critical', False):
+                        for pending in running:
+                            pending.cancel()
+                        raise TimeoutError(f"Critical task {node_id} timed out")
+
+        for node_id in self._nodes:
+            if node_id not in self.task_results:
+                logger.warning(f"Skipping node {node_id} due to unmet dependencies")
+
+    def _abandon(self, node_id: str, status: str, error: str):
+        """
+        Record a result for a task that is still running; its own result is discarded.
+        """
+        with self._lock:
+            self._abandoned.add(node_id)
+            self.task_results[node_id] = {'status': status, 'error': error}
+
+    def _cancel_downstream(self, node_id: str, status: str, reason: str):
+        """
+        Mark a node and everything downstream of it as not run.
+        """
+        stack = [node_id]
+        while stack:
+            current = stack.pop()
+            if current in self.task_results:
+                continue
+            logger.info(f"Node {current} {status}: {reason}")
+            self.task_results[current] = {'status': status, 'reason': reason}
+            stack.extend(self._successors.get(current, []))
+
     def _find_node_by_id(self, node_id: str) -> Optional[Dict]:
         """
         Find a node in the workflow by its ID.
         """
-        for node in self.workflow.get('nodes', []):
-            if node.get('id') == node_id:
-                return node
-        return None
+        if not self._nodes:
+            self._build_graph()
+        return self._nodes.get(node_id)
 
     def _create_execution_order(self) -> List[str]:
         """
         Create a topological sort of the nodes based on dependencies.
         """
-        # Создаем граф зависимостей
-        graph = {}
-        for node in self.workflow.get('nodes', []):
-            node_id = node.get('id')
-            if not node_id:
-                continue
-                
-            graph[node_id] = []
-            
-        # Заполняем граф зависимостями
-        for edge in self.workflow.get('edges', []):
-            source = edge.get('source')
-            target = edge.get('target')
-            if source and target:
-                if target in graph:
-                    graph[target].append(source)
-        
-        # Выполняем топологическую сортировку
-        visited = set()
-        temp = set()
+        if not self._nodes:
+            self._build_graph()
+
+        # Алгоритм Кана по предвычисленным картам смежности
+        in_degree = {
+            node_id: sum(1 for source in preds if source in self._nodes)
+            for node_id, preds in self._predecessors.items()
+        }
+        queue = deque(node_id for node_id, degree in in_degree.items() if degree == 0)
         order = []
-        
-        def visit(node_id):
-            if node_id in temp:
-                raise ValueError(f"Cycle detected in workflow graph at node {node_id}")
-            if node_id in visited:
-                return
-                
-            temp.add(node_id)
-            
-            # Посещаем все зависимости
-            for dependency in graph.get(node_id, []):
-                visit(dependency)
-                
-            temp.remove(node_id)
-            visited.add(node_id)
+        while queue:
+            node_id = queue.popleft()
             order.append(node_id)
-        
-        # Посещаем все узлы
-        for node_id in graph:
-            if node_id not in visited:
-                visit(node_id)
-                
-        # Возвращаем обратный порядок для правильной последовательности выполнения
-        return list(reversed(order))
+            for target in self._successors[node_id]:
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    queue.append(target)
+
+        if len(order) < len(self._nodes):
+            cycle_node = next(node_id for node_id, degree in in_degree.items() if degree > 0)
+            raise ValueError(f"Cycle detected in workflow graph at node {cycle_node}")
+        return order
 
     def _check_dependencies(self, node: Dict) -> bool:
         """
         Check if all dependencies of a node are met.
         """
-        # Получаем зависимости из ребер
-        dependencies = []
-        for edge in self.workflow.get('edges', []):
-            if edge.get('target') == node.get('id'):
-                dependencies.append(edge.get('source'))
-        
+        if not self._nodes:
+            self._build_graph()
+
         # Проверяем, выполнены ли все зависимости
-        for dependency in dependencies:
+        for dependency in self._predecessors.get(node.get('id'), []):
             if dependency not in self.task_results:
                 return False
                 
@@ -180,10 +296,13 @@ class LangGraphExecutor:
             # Получаем или создаем экземпляр агента
             agent = self._get_agent(agent_type)
             
-            # Подготавливаем входные данные для агента
+            # Подготавливаем входные данные для агента; контекст копируется под
+            # блокировкой, так как параллельные задачи обновляют его
+            with self._lock:
+                context = dict(self.context)
             input_data = {
                 'task': task_data,
-                'context': self.context,
+                'context': context,
                 'workflow_id': self.workflow_id
             }
             
@@ -192,16 +311,21 @@ class LangGraphExecutor:
             result = self._run_agent(agent, input_data)
             execution_time = time.time() - start_time
             
-            # Обновляем контекст выполнения
-            if isinstance(result, dict):
-                self.context.update(result)
-            
-            # Сохраняем результат выполнения задачи
-            self.task_results[task_id] = {
-                'status': 'success',
-                'result': result,
-                'execution_time': execution_time
-            }
+            with self._lock:
+                if task_id in self._abandoned:
+                    logger.warning(f"Discarding result of task {task_id}, it finished after its timeout")
+                    return
+                
+                # Обновляем контекст выполнения
+                if isinstance(result, dict):
+                    self.context.update(result)
+                
+                # Сохраняем результат выполнения задачи
+                self.task_results[task_id] = {
+                    'status': 'success',
+                    'result': result,
+                    'execution_time': execution_time
+                }
             
             logger.info(f"Task {task_id} completed successfully in {execution_time:.2f}s")
             
@@ -209,10 +333,12 @@ class LangGraphExecutor:
             logger.error(f"Error executing task {task_id}: {str(e)}", exc_info=True)
             
             # Сохраняем информацию об ошибке
-            self.task_results[task_id] = {
-                'status': 'error',
-                'error': str(e)
-            }
+            with self._lock:
+                if task_id not in self._abandoned:
+                    self.task_results[task_id] = {
+                        'status': 'error',
+                        'error': str(e)
+                    }
             
             # В зависимости от настроек, можем либо продолжить выполнение, либо прервать его
             if task_data.get('critical', False):
@@ -351,17 +477,16 @@ class LangGraphExecutor:
     def execute_parallel_block(self, parallel_block: Dict):
         """
         Execute a parallel block of tasks.
+
+        Within execute_workflow the block only releases its tasks to the ready
+        queue; calling it directly runs them in the thread pool and waits.
         """
         block_id = parallel_block.get('id')
-        logger.info(f"Executing parallel block: {block_id} ({parallel_block.get('data', {}).get('label', 'Unnamed Block')})")
+        if not self._nodes:
+            self._build_graph()
         
         # Находим все задачи, которые зависят от этого параллельного блока
-        dependent_tasks = []
-        for edge in self.workflow.get('edges', []):
-            if edge.get('source') == block_id:
-                target_node = self._find_node_by_id(edge.get('target'))
-                if target_node:
-                    dependent_tasks.append(target_node)
+        dependent_tasks = [self._find_node_by_id(target) for target in self._successors.get(block_id, [])]
         
         # Запускаем задачи параллельно
         futures: List[Future] = []
@@ -375,17 +500,29 @@ class LangGraphExecutor:
             except Exception as e:
                 logger.error(f"Error in parallel task: {str(e)}", exc_info=True)
                 
-        logger.info(f"Parallel block {block_id} completed")
+        self._record_parallel_block(parallel_block)
+
+    def _record_parallel_block(self, parallel_block: Dict):
+        block_id = parallel_block.get('id')
+        logger.info(f"Executing parallel block: {block_id} ({parallel_block.get('data', {}).get('label', 'Unnamed Block')})")
+        task_count = len(self._successors.get(block_id, []))
         
         # Сохраняем результат выполнения блока
         self.task_results[block_id] = {
             'status': 'success',
-            'message': f"Parallel block executed with {len(dependent_tasks)} tasks"
+            'message': f"Parallel block executed with {task_count} tasks"
         }
 
     def execute_decision_point(self, decision_point: Dict):
         """
-        Execute a decision point in the workflow.
+        Execute a decision point in the workflow and run the chosen task.
+        """
+        for target in self._run_decision_point(decision_point):
+            self.execute_task(self._find_node_by_id(target))
+
+    def _run_decision_point(self, decision_point: Dict) -> List[str]:
+        """
+        Evaluate a decision point and return the IDs of the nodes on the chosen path.
         """
         decision_id = decision_point.get('id')
         logger.info(f"Executing decision point: {decision_id} ({decision_point.get('data', {}).get('label', 'Unnamed Decision')})")
@@ -397,25 +534,25 @@ class LangGraphExecutor:
         result = self.evaluate_decision(decision_point, condition)
         
         # Находим все возможные пути после точки принятия решения
+        if not self._nodes:
+            self._build_graph()
         paths = {}
-        for edge in self.workflow.get('edges', []):
-            if edge.get('source') == decision_id:
-                target_node = self._find_node_by_id(edge.get('target'))
-                if target_node:
-                    # Проверяем, есть ли у ребра условие
-                    edge_condition = edge.get('data', {}).get('condition')
-                    paths[edge_condition or 'default'] = target_node
+        for edge in self._edges_from.get(decision_id, []):
+            # Проверяем, есть ли у ребра условие
+            edge_condition = edge.get('data', {}).get('condition')
+            paths[edge_condition or 'default'] = edge.get('target')
         
         # Выбираем путь на основе результата оценки условия
+        chosen = []
         if result and 'true' in paths:
             logger.info(f"Decision {decision_id} evaluated to TRUE, taking 'true' path")
-            self.execute_task(paths['true'])
+            chosen.append(paths['true'])
         elif not result and 'false' in paths:
             logger.info(f"Decision {decision_id} evaluated to FALSE, taking 'false' path")
-            self.execute_task(paths['false'])
+            chosen.append(paths['false'])
         elif 'default' in paths:
             logger.info(f"Decision {decision_id} taking default path")
-            self.execute_task(paths['default'])
+            chosen.append(paths['default'])
         else:
             logger.warning(f"Decision {decision_id} has no valid paths for result: {result}")
         
@@ -425,6 +562,7 @@ class LangGraphExecutor:
             'result': result,
             'condition': condition
         }
+        return chosen
 
     def evaluate_decision(self, decision_point: Dict, condition: str) -> bool:
         """
@@ -437,7 +575,8 @@ class LangGraphExecutor:
             
         try:
             # Создаем локальный контекст для оценки условия
-            local_context = {**self.context}
+            with self._lock:
+                local_context = {**self.context}
             
             # Безопасная оценка условия
             result = eval(condition, {"__builtins__": {}}, local_context)
@@ -1,10 +1,12 @@
 import os
 import json
+import time
 import base64
 import asyncio
+import itertools
 import websockets
 from fastapi import FastAPI, WebSocket, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.websockets import WebSocketDisconnect
 from twilio.twiml.voice_response import VoiceResponse, Connect
 from dotenv import load_dotenv
@@ -22,6 +24,11 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')  # requires OpenAI Realtime API Acc
 PORT = int(os.getenv('PORT', 8090))
 NGROK_AUTH_TOKEN = os.getenv('NGROK_AUTH_TOKEN')
 PUBLIC = os.getenv('PUBLIC', 'false').lower() == 'true'
+OPENAI_REALTIME_URL = os.getenv(
+    'OPENAI_REALTIME_URL', 'wss://api.openai.com/v1/realtime?model=gpt-4o-realtime-preview-2024-10-01'
+)
+# Inbound Twilio frames (20ms each) arriving within this window are sent to OpenAI as one append
+JITTER_WINDOW_MS = int(os.getenv('CALL_JITTER_MS', 40))
 SYSTEM_MESSAGE = (
     "You are a helpful and bubbly AI assistant who loves to chat about "
     "anything the user is interested in and is prepared to offer them facts. "
@@ -39,6 +46,161 @@ LOG_EVENT_TYPES = [
 
 app = FastAPI()
 
+# Fast JSON codec: orjson when installed, else the standard library
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+
+    def json_loads(data):
+        return orjson.loads(data)
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+else:
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':'))
+
+# Pre-serialized message templates. Base64 payloads are copied between them
+# as-is, so audio frames are never decoded, re-encoded or fully parsed.
+OPENAI_AUDIO_DELTA = '"type":"response.audio.delta"'
+TWILIO_MEDIA_EVENT = '"event":"media"'
+OPENAI_APPEND_PREFIX = '{"type":"input_audio_buffer.append","audio":"'
+TEMPLATE_SUFFIX = '"}'
+TWILIO_MEDIA_SUFFIX = '"}}'
+
+def twilio_media_prefix(stream_sid):
+    """Start of a Twilio media message, up to the payload."""
+    return '{"event":"media","streamSid":' + json_dumps(stream_sid) + ',"media":{"payload":"'
+
+def extract_string(message, key):
+    """Return the string value of the first "key" in a compact JSON message, without parsing it.
+
+    Only used for base64 payloads, which contain no quotes or escapes.
+    """
+    marker = '"' + key + '":"'
+    start = message.find(marker)
+    if start < 0:
+        return None
+    start += len(marker)
+    end = message.find('"', start)
+    return message[start:end] if end >= 0 else None
+
+def join_base64(payloads):
+    """Join base64 payloads into one; only padded payloads need a decode."""
+    if len(payloads) == 1:
+        return payloads[0]
+    if all(len(p) % 4 == 0 and not p.endswith('=') for p in payloads[:-1]):
+        return ''.join(payloads)
+    return base64.b64encode(b''.join(base64.b64decode(p) for p in payloads)).decode('ascii')
+
+class CallMetrics:
+    """Per-call relay statistics, served by the /metrics endpoint."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self):
+        self.call_id = next(self._ids)
+        self.stream_sid = None
+        self.started = time.monotonic()
+        self.frames_in = 0          # media frames from Twilio
+        self.messages_to_openai = 0  # appends after batching
+        self.frames_out = 0         # audio deltas relayed to Twilio
+        self.queue_depth = 0        # inbound frames waiting in the jitter window
+        self.max_queue_depth = 0
+        self.relay_latency_ms = 0.0  # average time to forward an audio delta
+        self.response_latency_ms = None  # end of user speech to first response audio
+        self._speech_stopped_at = None
+
+    def speech_stopped(self):
+        self._speech_stopped_at = time.monotonic()
+
+    def audio_relayed(self, received_at):
+        self.frames_out += 1
+        elapsed = (time.monotonic() - received_at) * 1000
+        self.relay_latency_ms += (elapsed - self.relay_latency_ms) / self.frames_out
+        if self._speech_stopped_at is not None:
+            self.response_latency_ms = (received_at - self._speech_stopped_at) * 1000
+            self._speech_stopped_at = None
+
+    def snapshot(self):
+        duration = max(time.monotonic() - self.started, 1e-9)
+        return {
+            "call_id": self.call_id,
+            "stream_sid": self.stream_sid,
+            "duration_s": round(duration, 3),
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+            "messages_to_openai": self.messages_to_openai,
+            "frames_in_per_s": round(self.frames_in / duration, 2),
+            "frames_out_per_s": round(self.frames_out / duration, 2),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "relay_latency_ms": round(self.relay_latency_ms, 3),
+            "response_latency_ms": None if self.response_latency_ms is None else round(self.response_latency_ms, 1),
+        }
+
+active_calls = {}
+
+class FrameBatcher:
+    """Collects inbound audio payloads for up to window seconds and sends them as one frame."""
+
+    def __init__(self, send, window, metrics):
+        self.send = send
+        self.window = window
+        self.metrics = metrics
+        self.frames = []
+        self._task = None
+
+    async def add(self, payload):
+        if self.window <= 0:
+            await self._send([payload])
+            return
+        self.frames.append(payload)
+        self.metrics.queue_depth = len(self.frames)
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, len(self.frames))
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"Error sending audio to OpenAI: {e}")
+
+    async def flush(self):
+        frames, self.frames = self.frames, []
+        self.metrics.queue_depth = 0
+        if frames:
+            await self._send(frames)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    async def _send(self, frames):
+        await self.send(OPENAI_APPEND_PREFIX + join_base64(frames) + TEMPLATE_SUFFIX)
+        self.metrics.messages_to_openai += 1
+
+def is_open(ws):
+    """Whether a websockets client connection is open (legacy and new APIs)."""
+    if hasattr(ws, 'open'):
+        return ws.open
+    return ws.state == websockets.protocol.State.OPEN
+
+def connect_openai():
+    headers = {
+        "Authorization": f"Bearer {OPENAI_API_KEY}",
+        "OpenAI-Beta": "realtime=v1"
+    }
+    if int(websockets.__version__.split('.')[0]) >= 14:
+        return websockets.connect(OPENAI_REALTIME_URL, additional_headers=headers, compression=None)
+    return websockets.connect(OPENAI_REALTIME_URL, extra_headers=headers, compression=None)
+
 if not OPENAI_API_KEY:
     raise ValueError('Missing the OpenAI API key. Please set it in the .env file.')
 
@@ -95,6 +257,14 @@ async def index_page():
     </html>
     """
 
+@app.get("/metrics")
+async def metrics():
+    """Relay metrics for the calls in progress."""
+    return JSONResponse({
+        "active_calls": len(active_calls),
+        "calls": [call.snapshot() for call in active_calls.values()]
+    })
+
 @app.api_route("/", methods=["GET", "POST"])
 async def handle_incoming_call(request: Request):
     """Handle incoming call and return TwiML response to connect to Media Stream."""
@@ -114,68 +284,81 @@ async def handle_media_stream(websocket: WebSocket):
     print("Client connected")
     await websocket.accept()
 
-    async with websockets.connect(
-        'wss://api.openai.com/v1/realtime?model=gpt-4o-realtime-preview-2024-10-01',
-        extra_headers={
-            "Authorization": f"Bearer {OPENAI_API_KEY}",
-            "OpenAI-Beta": "realtime=v1"
-        }
-    ) as openai_ws:
+    async with connect_openai() as openai_ws:
         await send_session_update(openai_ws)
-        stream_sid = None
+        call = CallMetrics()
+        active_calls[call.call_id] = call
+        media_prefix = twilio_media_prefix(None)
+        batcher = FrameBatcher(openai_ws.send, JITTER_WINDOW_MS / 1000, call)
 
         async def receive_from_twilio():
             """Receive audio data from Twilio and send it to the OpenAI Realtime API."""
-            nonlocal stream_sid
+            nonlocal media_prefix
             try:
                 async for message in websocket.iter_text():
-                    data = json.loads(message)
-                    if data['event'] == 'media' and openai_ws.open:
-                        audio_append = {
-                            "type": "input_audio_buffer.append",
-                            "audio": data['media']['payload']
-                        }
-                        await openai_ws.send(json.dumps(audio_append))
+                    if TWILIO_MEDIA_EVENT in message:
+                        payload = extract_string(message, 'payload')
+                        if payload is not None:
+                            call.frames_in += 1
+                            if is_open(openai_ws):
+                                await batcher.add(payload)
+                            continue
+                    data = json_loads(message)
+                    if data['event'] == 'media' and is_open(openai_ws):
+                        call.frames_in += 1
+                        await batcher.add(data['media']['payload'])
                     elif data['event'] == 'start':
-                        stream_sid = data['start']['streamSid']
-                        print(f"Incoming stream has started {stream_sid}")
+                        call.stream_sid = data['start']['streamSid']
+                        media_prefix = twilio_media_prefix(call.stream_sid)
+                        print(f"Incoming stream has started {call.stream_sid}")
+                    elif data['event'] == 'stop':
+                        await batcher.flush()
             except WebSocketDisconnect:
-                print("Client disconnected.")
-                if openai_ws.open:
-                    await openai_ws.close()
+                pass
+            print("Client disconnected.")
+            # End the OpenAI side too, so send_to_twilio returns and the call is released
+            if is_open(openai_ws):
+                await batcher.close()
+                await openai_ws.close()
 
         async def send_to_twilio():
             """Receive events from the OpenAI Realtime API, send audio back to Twilio."""
-            nonlocal stream_sid
             try:
                 async for openai_message in openai_ws:
-                    response = json.loads(openai_message)
-                    if response['type'] in LOG_EVENT_TYPES:
-                        print(f"Received event: {response['type']}", response)
-                    if response['type'] == 'session.updated':
-                        print("Session updated successfully:", response)
-                    
-                    if response['type'] == 'response.done':
-                        await handle_response_done(response, openai_ws)
-                    
-                    if response['type'] == 'response.audio.delta' and response.get('delta'):
-                        # Audio from OpenAI
+                    received_at = time.monotonic()
+                    if isinstance(openai_message, bytes):
+                        openai_message = openai_message.decode('utf-8')
+                    # Audio deltas are recognised and sliced without parsing the JSON
+                    delta = extract_string(openai_message, 'delta') if OPENAI_AUDIO_DELTA in openai_message else None
+                    if delta is None:
+                        response = json_loads(openai_message)
+                        if response['type'] in LOG_EVENT_TYPES:
+                            print(f"Received event: {response['type']}", response)
+                        if response['type'] == 'session.updated':
+                            print("Session updated successfully:", response)
+                        if response['type'] == 'input_audio_buffer.speech_stopped':
+                            call.speech_stopped()
+
+                        if response['type'] == 'response.done':
+                            await handle_response_done(response, openai_ws)
+
+                        if response['type'] == 'response.audio.delta':
+                            delta = response.get('delta')
+
+                    if delta:
+                        # Audio from OpenAI: relay the base64 payload unchanged
                         try:
-                            audio_payload = base64.b64encode(base64.b64decode(response['delta'])).decode('utf-8')
-                            audio_delta = {
-                                "event": "media",
-                                "streamSid": stream_sid,
-                                "media": {
-                                    "payload": audio_payload
-                                }
-                            }
-                            await websocket.send_json(audio_delta)
+                            await websocket.send_text(media_prefix + delta + TWILIO_MEDIA_SUFFIX)
+                            call.audio_relayed(received_at)
                         except Exception as e:
                             print(f"Error processing audio data: {e}")
             except Exception as e:
                 print(f"Error in Sending to Phone: {e}")
 
-        await asyncio.gather(receive_from_twilio(), send_to_twilio())
+        try:
+            await asyncio.gather(receive_from_twilio(), send_to_twilio())
+        finally:
+            active_calls.pop(call.call_id, None)
 
 async def handle_response_done(response, openai_ws):
     """Handle the response.done event and process any function calls."""
@@ -82,33 +82,12 @@ async def init_database_with_retry():
 db_manager = asyncio.run(init_database_with_retry())
 cl_data._data_layer = db_manager
 
-async def save_setting_with_retry(key: str, value: str):
-    for attempt in range(MAX_RETRIES):
-        try:
-            await db_manager.save_setting(key, value)
-            return
-        except sqlite3.OperationalError as e:
-            if "database is locked" in str(e) and attempt < MAX_RETRIES - 1:
-                await asyncio.sleep(RETRY_DELAY)
-                continue
-            raise
-
-async def load_setting_with_retry(key: str) -> str:
-    for attempt in range(MAX_RETRIES):
-        try:
-            return await db_manager.load_setting(key)
-        except sqlite3.OperationalError as e:
-            if "database is locked" in str(e) and attempt < MAX_RETRIES - 1:
-                await asyncio.sleep(RETRY_DELAY)
-                continue
-            raise
-    return ""
+async def save_setting(key: str, value: str):
+    await db_manager.save_setting(key, value)
 
-def save_setting(key: str, value: str):
-    asyncio.run(save_setting_with_retry(key, value))
-
-def load_setting(key: str) -> str:
-    return asyncio.run(load_setting_with_retry(key))
+async def load_setting(key: str) -> str:
+    # Served from the shared in-memory settings cache after the first read
+    return await db_manager.load_setting(key)
 
 async def update_thread_metadata(thread_id: str, metadata: dict):
     for attempt in range(MAX_RETRIES):
@@ -639,7 +618,7 @@ async def set_profiles(current_user: cl.User):
 @cl.on_chat_start
 async def start_chat():
     try:
-        model_name = load_setting("model_name") or os.getenv("MODEL_NAME", "gpt-4o-mini")
+        model_name = await load_setting("model_name") or os.getenv("MODEL_NAME", "gpt-4o-mini")
         cl.user_session.set("model_name", model_name)
         logger.debug(f"Model name: {model_name}")
 
@@ -719,6 +698,11 @@ async def start_chat():
         logger.error(f"Error in start_chat: {str(e)}")
         await cl.Message(content=f"An error occurred while starting the chat: {str(e)}").send()
 
+@cl.on_chat_end
+async def on_chat_end():
+    # Write any steps still queued by the data layer's write-behind buffer
+    await db_manager.flush()
+
 @cl.on_chat_resume
 async def on_chat_resume(thread: ThreadDict):
     try:
@@ -763,9 +747,9 @@ async def on_settings_update(settings):
         
         for attempt in range(MAX_RETRIES):
             try:
-                await save_setting_with_retry("model_name", config_list[0]['model'])
-                await save_setting_with_retry("base_url", config_list[0]['base_url'])
-                await save_setting_with_retry("api_key", config_list[0]['api_key'])
+                await save_setting("model_name", config_list[0]['model'])
+                await save_setting("base_url", config_list[0]['base_url'])
+                await save_setting("api_key", config_list[0]['api_key'])
                 break
             except sqlite3.OperationalError as e:
                 if "database is locked" in str(e) and attempt < MAX_RETRIES - 1:
@@ -22,6 +22,7 @@ import chainlit.data as cl_data
 from litellm import acompletion
 from literalai.helper import utc_now
 from db import DatabaseManager
+from settings_store import subscribe_session
 
 # Load environment variables
 load_dotenv()
@@ -49,16 +50,46 @@ create_step_counter = 0
 db_manager = DatabaseManager()
 db_manager.initialize()
 
-def save_setting(key: str, value: str):
+async def save_setting(key: str, value: str):
     """Save a setting to the database"""
-    asyncio.run(db_manager.save_setting(key, value))
+    await db_manager.save_setting(key, value)
 
-def load_setting(key: str) -> str:
-    """Load a setting from the database"""
-    return asyncio.run(db_manager.load_setting(key))
+async def load_setting(key: str) -> str:
+    """Load a setting (cached in memory after the first read)"""
+    return await db_manager.load_setting(key)
 
 cl_data._data_layer = db_manager
 
+def model_settings(model_name: str) -> cl.ChatSettings:
+    """The settings panel, showing model_name"""
+    return cl.ChatSettings(
+        [
+            TextInput(
+                id="model_name",
+                label="Enter the Model Name",
+                placeholder="e.g., gpt-4o-mini",
+                initial=model_name
+            )
+        ]
+    )
+
+async def on_shared_setting_changed(key: str, value: str):
+    """Show a model chosen in another chat session in this one"""
+    if key != "model_name" or not value:
+        return
+    cl.user_session.set("model_name", value)
+    settings = model_settings(value)
+    cl.user_session.set("settings", settings)
+    await settings.send()
+
+def follow_shared_settings():
+    """Keep this session's settings panel in step with changes made elsewhere"""
+    previous = cl.user_session.get("unsubscribe_settings")
+    if previous:
+        previous()
+    unsubscribe = subscribe_session(db_manager.settings, on_shared_setting_changed)
+    cl.user_session.set("unsubscribe_settings", unsubscribe)
+
 tavily_api_key = os.getenv("TAVILY_API_KEY")
 tavily_client = TavilyClient(api_key=tavily_api_key) if tavily_api_key else None
 
@@ -145,21 +176,13 @@ async def send_count():
 
 @cl.on_chat_start
 async def start():
-    model_name = load_setting("model_name") or os.getenv("MODEL_NAME", "gpt-4o-mini")
+    model_name = await load_setting("model_name") or os.getenv("MODEL_NAME", "gpt-4o-mini")
     cl.user_session.set("model_name", model_name)
     logger.debug(f"Model name: {model_name}")
-    settings = cl.ChatSettings(
-        [
-            TextInput(
-                id="model_name",
-                label="Enter the Model Name",
-                placeholder="e.g., gpt-4o-mini",
-                initial=model_name
-            )
-        ]
-    )
+    settings = model_settings(model_name)
     cl.user_session.set("settings", settings)
     await settings.send()
+    follow_shared_settings()
 
 @cl.on_settings_update
 async def setup_agent(settings):
@@ -168,7 +191,7 @@ async def setup_agent(settings):
     model_name = settings["model_name"]
     cl.user_session.set("model_name", model_name)
 
-    save_setting("model_name", model_name)
+    await save_setting("model_name", model_name)
 
     thread_id = cl.user_session.get("thread_id")
     if thread_id:
@@ -186,7 +209,7 @@ async def setup_agent(settings):
 
 @cl.on_message
 async def main(message: cl.Message):
-    model_name = load_setting("model_name") or os.getenv("MODEL_NAME", "gpt-4o-mini")
+    model_name = await load_setting("model_name") or os.getenv("MODEL_NAME", "gpt-4o-mini")
     message_history = cl.user_session.get("message_history", [])
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
@@ -336,22 +359,22 @@ User Question: {message.content}
         msg.content = full_response
         await msg.update()
 
+@cl.on_chat_end
+async def on_chat_end():
+    unsubscribe = cl.user_session.get("unsubscribe_settings")
+    if unsubscribe:
+        unsubscribe()
+    # Write any steps still queued by the data layer's write-behind buffer
+    await db_manager.flush()
+
 @cl.on_chat_resume
 async def on_chat_resume(thread: ThreadDict):
     logger.info(f"Resuming chat: {thread['id']}")
-    model_name = load_setting("model_name") or os.getenv("MODEL_NAME", "gpt-4o-mini")
+    model_name = await load_setting("model_name") or os.getenv("MODEL_NAME", "gpt-4o-mini")
     logger.debug(f"Model name: {model_name}")
-    settings = cl.ChatSettings(
-        [
-            TextInput(
-                id="model_name",
-                label="Enter the Model Name",
-                placeholder="e.g., gpt-4o-mini",
-                initial=model_name
-            )
-        ]
-    )
+    settings = model_settings(model_name)
     await settings.send()
+    follow_shared_settings()
     thread_id = thread["id"]
     cl.user_session.set("thread_id", thread_id)
 
@@ -21,6 +21,7 @@ from chainlit.types import ThreadDict
 import chainlit.data as cl_data
 from litellm import acompletion
 from db import DatabaseManager
+from settings_store import subscribe_session
 
 # Load environment variables
 load_dotenv()
@@ -55,17 +56,17 @@ db_manager.initialize()
 
 deleted_thread_ids = []  # type: List[str]
 
-def save_setting(key: str, value: str):
+async def save_setting(key: str, value: str):
     """Saves a setting to the database.
     
     Args:
         key: The setting key.
         value: The setting value.
     """
-    asyncio.run(db_manager.save_setting(key, value))
+    await db_manager.save_setting(key, value)
 
-def load_setting(key: str) -> str:
-    """Loads a setting from the database.
+async def load_setting(key: str) -> str:
+    """Loads a setting (cached in memory after the first read).
     
     Args:
         key: The setting key.
@@ -73,13 +74,43 @@ def load_setting(key: str) -> str:
     Returns:
         The setting value, or None if the key is not found.
     """
-    return asyncio.run(db_manager.load_setting(key))
+    return await db_manager.load_setting(key)
 
 cl_data._data_layer = db_manager
 
+def model_settings(model_name: str) -> cl.ChatSettings:
+    """The settings panel, showing model_name"""
+    return cl.ChatSettings(
+        [
+            TextInput(
+                id="model_name",
+                label="Enter the Model Name",
+                placeholder="e.g., gpt-4o-mini",
+                initial=model_name
+            )
+        ]
+    )
+
+async def on_shared_setting_changed(key: str, value: str):
+    """Show a model chosen in another chat session in this one"""
+    if key != "model_name" or not value:
+        return
+    cl.user_session.set("model_name", value)
+    settings = model_settings(value)
+    cl.user_session.set("settings", settings)
+    await settings.send()
+
+def follow_shared_settings():
+    """Keep this session's settings panel in step with changes made elsewhere"""
+    previous = cl.user_session.get("unsubscribe_settings")
+    if previous:
+        previous()
+    unsubscribe = subscribe_session(db_manager.settings, on_shared_setting_changed)
+    cl.user_session.set("unsubscribe_settings", unsubscribe)
+
 @cl.on_chat_start
 async def start():
-    model_name = load_setting("model_name") 
+    model_name = await load_setting("model_name") 
 
     if (model_name):
         cl.user_session.set("model_name", model_name)
@@ -88,20 +119,12 @@ async def start():
         model_name = os.getenv("MODEL_NAME", "gpt-4o-mini")
         cl.user_session.set("model_name", model_name)
     logger.debug(f"Model name: {model_name}")
-    settings = cl.ChatSettings(
-        [
-            TextInput(
-                id="model_name",
-                label="Enter the Model Name",
-                placeholder="e.g., gpt-4o-mini",
-                initial=model_name
-            )
-        ]
-    )
+    settings = model_settings(model_name)
     cl.user_session.set("settings", settings)
     await settings.send()
+    follow_shared_settings()
     gatherer = ContextGatherer()
-    context, token_count, context_tree = gatherer.run()
+    context, token_count, context_tree = await asyncio.to_thread(gatherer.run)
     msg = cl.Message(content="""Token Count: {token_count},
                                  Files include: \n```bash\n{context_tree}\n"""
                                  .format(token_count=token_count, context_tree=context_tree))
@@ -115,7 +138,7 @@ async def setup_agent(settings):
     cl.user_session.set("model_name", model_name)
     
     # Save in settings table
-    save_setting("model_name", model_name)
+    await save_setting("model_name", model_name)
     
     # Save in thread metadata
     thread_id = cl.user_session.get("thread_id")
@@ -198,10 +221,10 @@ tools = [{
 
 @cl.on_message
 async def main(message: cl.Message):
-    model_name = load_setting("model_name") or os.getenv("MODEL_NAME") or "gpt-4o-mini"
+    model_name = await load_setting("model_name") or os.getenv("MODEL_NAME") or "gpt-4o-mini"
     message_history = cl.user_session.get("message_history", [])
     gatherer = ContextGatherer()
-    context, token_count, context_tree = gatherer.run()
+    context, token_count, context_tree = await asyncio.to_thread(gatherer.run)
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     # Check if an image was uploaded with this message
@@ -383,22 +406,22 @@ async def send_count():
         f"Create step counter: {create_step_counter}", disable_feedback=True
     ).send()
 
+@cl.on_chat_end
+async def on_chat_end():
+    unsubscribe = cl.user_session.get("unsubscribe_settings")
+    if unsubscribe:
+        unsubscribe()
+    # Write any steps still queued by the data layer's write-behind buffer
+    await db_manager.flush()
+
 @cl.on_chat_resume
 async def on_chat_resume(thread: ThreadDict):
     logger.info(f"Resuming chat: {thread['id']}")
-    model_name = load_setting("model_name") or os.getenv("MODEL_NAME") or "gpt-4o-mini"
+    model_name = await load_setting("model_name") or os.getenv("MODEL_NAME") or "gpt-4o-mini"
     logger.debug(f"Model name: {model_name}")
-    settings = cl.ChatSettings(
-        [
-            TextInput(
-                id="model_name",
-                label="Enter the Model Name",
-                placeholder="e.g., gpt-4o-mini",
-                initial=model_name
-            )
-        ]
-    )
+    settings = model_settings(model_name)
     await settings.send()
+    follow_shared_settings()
     cl.user_session.set("thread_id", thread["id"])
     
     # Ensure metadata is a dictionary
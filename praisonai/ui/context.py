@@ -1,6 +1,11 @@
 import os
+import re
 import fnmatch
+import threading
 import yaml
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from importlib import util
 from pathlib import Path
 import logging
 
@@ -19,9 +24,96 @@ logger.addHandler(console_handler)
 # Set the logging level for the logger
 logger.setLevel(log_level)
 
+_encoding = None
+
+
+def count_tokens(text):
+    """Count tokens with tiktoken when available, else estimate 4 characters per token."""
+    global _encoding
+    if _encoding is None:
+        _encoding = False
+        if util.find_spec("tiktoken") is not None:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.debug(f"tiktoken unavailable, estimating tokens: {e}")
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def truncate_to_tokens(text, max_tokens):
+    """Cut text to at most max_tokens tokens, keeping its formatting."""
+    if _encoding is None:
+        count_tokens("")
+    if _encoding:
+        tokens = _encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else _encoding.decode(tokens[:max_tokens])
+    return text[:max_tokens * 4]
+
+
+class _FileCache:
+    """LRU cache of file contents keyed by absolute path, bounded by total size.
+
+    Entries are (mtime_ns, size) -> (content, tokens), so a repeat run only
+    re-reads files whose modification time or size changed.
+    """
+
+    def __init__(self, max_chars):
+        self.max_chars = max_chars
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, version, result):
+        with self._lock:
+            self._discard(key)
+            if len(result[0]) > self.max_chars:
+                return
+            self._entries[key] = (version, result)
+            self.size += len(result[0])
+            while self.size > self.max_chars:
+                self._discard(next(iter(self._entries)))
+
+    def prune(self, root, seen):
+        """Drop entries under root that are not in seen (deleted or no longer gathered)."""
+        prefix = os.path.join(root, '')
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix) and k not in seen]:
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1][0])
+
+
+# Files read by any ContextGatherer in this process (the chainlit server keeps
+# one process across sessions), bounded to PRAISONAI_CONTEXT_CACHE_CHARS characters
+_file_cache = _FileCache(int(os.getenv("PRAISONAI_CONTEXT_CACHE_CHARS", 64_000_000)))
+
+
 class ContextGatherer:
     def __init__(self, directory='.', output_file='context.txt',
-                 relevant_extensions=None, max_file_size=1_000_000, max_tokens=900000):
+                 relevant_extensions=None, max_file_size=1_000_000, max_tokens=900000,
+                 max_workers=8):
         self.directory = directory
         self.output_file = output_file
         self.relevant_extensions = relevant_extensions or [
@@ -32,9 +124,16 @@ class ContextGatherer:
         ]
         self.max_file_size = max_file_size
         self.max_tokens = int(os.getenv("PRAISONAI_MAX_TOKENS", max_tokens))
+        self.max_workers = max_workers
         self.ignore_patterns = self.get_ignore_patterns()
+        # All patterns compiled into one regex instead of an fnmatch call per pattern
+        self._ignore_regex = re.compile(
+            "|".join(fnmatch.translate(os.path.normcase(p)) for p in self.ignore_patterns) or "(?!)"
+        )
         self.include_paths = self.get_include_paths()
         self.included_files = []
+        self._included_set = set()
+        self.token_count = 0
 
     def get_ignore_patterns(self):
         """
@@ -136,11 +235,9 @@ class ContextGatherer:
         relative_path = os.path.relpath(file_path, self.directory)
         if relative_path.startswith('.'):
             return True
-        for pattern in self.ignore_patterns:
-            if fnmatch.fnmatch(relative_path, pattern) or \
-               fnmatch.fnmatch(os.path.basename(file_path), pattern):
-                return True
-        return False
+        match = self._ignore_regex.match
+        return bool(match(os.path.normcase(relative_path)) or
+                    match(os.path.normcase(os.path.basename(file_path))))
 
     def is_relevant_file(self, file_path):
         """Determine if a file is relevant for the context."""
@@ -152,32 +249,21 @@ class ContextGatherer:
         """
         Gather context from relevant files, respecting ignore patterns
         and include options from .praisoninclude and .praisoncontext.
+
+        Files are read in parallel (unchanged files come from the cache) and,
+        when they exceed max_tokens, the highest priority files that fit the
+        budget are kept: files named in .praisoncontext/.praisoninclude first,
+        then shallower paths, then the most recently modified.
         """
-        context = []
-        total_files = 0
-        processed_files = 0
         self.include_paths, include_all = self.get_include_paths()
+        candidates = {}  # path -> explicitly included
+        walked = []  # directories whose cache entries are pruned to what was found
 
-        def add_file_content(file_path):
-            """Helper function to add file content to context."""
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    context.append(
-                        f"File: {file_path}\n\n{content}\n\n{'=' * 50}\n"
-                    )
-                    self.included_files.append(
-                        Path(file_path).relative_to(self.directory)
-                    )
-            except Exception as e:
-                logger.error(f"Error reading {file_path}: {e}")
-
-        def process_path(path):
-            """Helper function to process a single path (file or directory)."""
-            nonlocal total_files, processed_files
+        def process_path(path, explicit):
+            """Helper function to collect the relevant files under a path."""
             if os.path.isdir(path):
+                walked.append(os.path.abspath(path))
                 for root, dirs, files in os.walk(path):
-                    total_files += len(files)
                     dirs[:] = [
                         d
                         for d in dirs
@@ -186,53 +272,98 @@ class ContextGatherer:
                     for file in files:
                         file_path = os.path.join(root, file)
                         if not self.should_ignore(file_path) and self.is_relevant_file(file_path):
-                            add_file_content(file_path)
-                        processed_files += 1
-                        print(
-                            f"\rProcessed {processed_files}/{total_files} files",
-                            end="",
-                            flush=True,
-                        )
+                            candidates[file_path] = candidates.get(file_path, False) or explicit
             elif os.path.isfile(path) and self.is_relevant_file(path):
-                add_file_content(path)
-                processed_files += 1
-                print(
-                    f"\rProcessed {processed_files}/1 files",
-                    end="",
-                    flush=True,
-                )
+                candidates[path] = candidates.get(path, False) or explicit
 
         if include_all:
             # Include ALL relevant files from the entire directory
-            process_path(self.directory)
-            
+            process_path(self.directory, False)
+
             # Include files from .praisoninclude specifically
             for include_path in self.include_paths:
-                full_path = os.path.join(self.directory, include_path)
-                process_path(full_path)
+                process_path(os.path.join(self.directory, include_path), True)
         elif self.include_paths:
             # Include only files specified in .praisoncontext
             for include_path in self.include_paths:
-                full_path = os.path.join(self.directory, include_path)
-                process_path(full_path)
+                process_path(os.path.join(self.directory, include_path), True)
         else:
             # No include options, process the entire directory
-            process_path(self.directory)
+            process_path(self.directory, False)
 
+        paths = list(candidates)
+        seen = {os.path.abspath(file_path) for file_path in paths}
+        for root in walked:
+            _file_cache.prune(root, seen)
+        files = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for processed_files, (file_path, result) in enumerate(
+                zip(paths, executor.map(self.read_file, paths)), start=1
+            ):
+                if result is not None:
+                    files[file_path] = result
+                print(f"\rProcessed {processed_files}/{len(paths)} files", end="", flush=True)
         print()  # New line after progress indicator
+
+        selected = self.select_files(files, candidates)
+        self.token_count = sum(files[file_path][1] for file_path in selected)
+        context = []
+        for file_path in paths:
+            if file_path in selected:
+                context.append(f"File: {file_path}\n\n{files[file_path][0]}\n\n{'=' * 50}\n")
+                rel_path = Path(file_path).relative_to(self.directory)
+                self.included_files.append(rel_path)
+                self._included_set.add(rel_path)
         return "\n".join(context)
 
+    def read_file(self, file_path):
+        """Return (content, tokens) for a file, from the cache when it is unchanged."""
+        try:
+            stat = os.stat(file_path)
+            key = os.path.abspath(file_path)
+            version = (stat.st_mtime_ns, stat.st_size)
+            cached = _file_cache.get(key, version)
+            if cached is not None:
+                return cached
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            # Token count of the whole block added to the context for this file
+            result = (content, count_tokens(f"File: {file_path}\n\n{content}\n\n{'=' * 50}\n\n"))
+            _file_cache.put(key, version, result)
+            return result
+        except Exception as e:
+            logger.error(f"Error reading {file_path}: {e}")
+            return None
+
+    def select_files(self, files, candidates):
+        """Pick the files to include within max_tokens, by priority."""
+        if sum(tokens for _, tokens in files.values()) <= self.max_tokens:
+            return set(files)
+
+        def priority(file_path):
+            depth = Path(file_path).relative_to(self.directory).parts
+            return (not candidates[file_path], len(depth), -os.path.getmtime(file_path))
+
+        selected, budget = set(), self.max_tokens
+        for file_path in sorted(files, key=priority):
+            tokens = files[file_path][1]
+            if tokens <= budget:
+                selected.add(file_path)
+                budget -= tokens
+        logger.warning(
+            f"Context limited to {len(selected)} of {len(files)} files due to token limit."
+        )
+        return selected
+
     def count_tokens(self, text):
-        """Count tokens using a simple whitespace-based tokenizer."""
-        return len(text.split())
+        """Count tokens with the model tokenizer (tiktoken) when available."""
+        return count_tokens(text)
 
     def truncate_context(self, context):
         """Truncate context to stay within the token limit."""
-        tokens = context.split()
-        if len(tokens) > self.max_tokens:
-            truncated_context = ' '.join(tokens[:self.max_tokens])
+        if self.count_tokens(context) > self.max_tokens:
             logger.warning("Context truncated due to token limit.")
-            return truncated_context
+            return truncate_to_tokens(context, self.max_tokens)
         return context
 
     def save_context(self, context):
@@ -242,30 +373,30 @@ class ContextGatherer:
 
     def get_context_tree(self):
         """Generate a formatted tree structure of included files and folders."""
+        children = {}
+        for rel_path in self._included_set:
+            parts = rel_path.parts
+            for i in range(len(parts)):
+                children.setdefault(Path(*parts[:i]), set()).add(Path(*parts[:i + 1]))
         tree = []
-        start_dir = Path(self.directory)
 
         def add_to_tree(path, prefix=''):
-            contents = sorted(path.iterdir())
-            pointers = [('└── ' if i == len(contents) - 1 else '├── ') for i in range(len(contents))]
-            for pointer, item in zip(pointers, contents):
-                rel_path = item.relative_to(start_dir)
-                if rel_path in self.included_files:
-                    tree.append(f"{prefix}{pointer}{rel_path}")
-
-                if item.is_dir():
-                    add_to_tree(item, prefix + ('    ' if pointer == '└── ' else '│   '))
+            contents = sorted(children.get(path, ()))
+            for i, item in enumerate(contents):
+                last = i == len(contents) - 1
+                tree.append(f"{prefix}{'└── ' if last else '├── '}{item}")
+                add_to_tree(item, prefix + ('    ' if last else '│   '))
 
-        add_to_tree(start_dir)
+        add_to_tree(Path())
         return '\n'.join(tree)
 
     def run(self):
         """Execute the context gathering, truncation, and reporting."""
         context = self.gather_context()
-        context = self.truncate_context(context)
-        token_count = self.count_tokens(context)
+        # Files were already selected to fit max_tokens and counted when read
+        token_count = self.token_count
         print(f"Context gathered successfully.")
-        print(f"Total number of tokens (estimated): {token_count}")
+        print(f"Total number of tokens: {token_count}")
         # self.save_context(context)
         context_tree = self.get_context_tree()
         logger.debug(f"Context tree:\n{context_tree}")
@@ -7,6 +7,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sql_alchemy import SQLAlchemyDataLayer
+from settings_store import SettingsStore
 import chainlit.data as cl_data
 from chainlit.types import ThreadDict
 
@@ -55,6 +56,14 @@ def ensure_directories():
 # Create directories at module import time
 ensure_directories()
 
+# Indexes used by thread listing and by loading an opened thread
+INDEXES = [
+    """CREATE INDEX IF NOT EXISTS idx_threads_userId_createdAt ON threads ("userId", (COALESCE("createdAt", '')), "id")""",
+    'CREATE INDEX IF NOT EXISTS idx_steps_threadId ON steps ("threadId")',
+    'CREATE INDEX IF NOT EXISTS idx_feedbacks_forId ON feedbacks ("forId")',
+    'CREATE INDEX IF NOT EXISTS idx_elements_threadId ON elements ("threadId")',
+]
+
 class DatabaseManager(SQLAlchemyDataLayer):
     def __init__(self):
         self.database_url = os.getenv("DATABASE_URL")
@@ -71,6 +80,8 @@ class DatabaseManager(SQLAlchemyDataLayer):
         
         # Initialize SQLAlchemyDataLayer with the connection info
         super().__init__(conninfo=self.conninfo)
+        # Settings are cached and shared by all sessions, using the data layer's engine
+        self.settings = SettingsStore(self.engine)
 
     async def create_schema_async(self):
         """Create the database schema for PostgreSQL"""
@@ -157,6 +168,13 @@ class DatabaseManager(SQLAlchemyDataLayer):
                     "value" TEXT
                 );
             '''))
+            for index in INDEXES:
+                await conn.execute(text(index))
+            # Full-text index for thread search (see SQLAlchemyDataLayer.list_threads)
+            await conn.execute(text('''
+                CREATE INDEX IF NOT EXISTS idx_steps_output_fts
+                ON steps USING GIN (to_tsvector('simple', COALESCE("output", '')));
+            '''))
         await engine.dispose()
 
     def create_schema_sqlite(self):
@@ -244,9 +262,44 @@ class DatabaseManager(SQLAlchemyDataLayer):
                 value TEXT
             );
         ''')
+        for index in INDEXES:
+            cursor.execute(index)
+        self.create_search_index_sqlite(cursor)
         conn.commit()
         conn.close()
 
+    def create_search_index_sqlite(self, cursor):
+        """Create the FTS5 index on step outputs used for thread search"""
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'steps_fts'")
+        exists = cursor.fetchone() is not None
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS steps_fts
+                USING fts5(output, content='steps', content_rowid='rowid');
+            ''')
+        except sqlite3.OperationalError as e:
+            logging.info(f"SQLite FTS5 is not available, thread search will scan step outputs: {e}")
+            return
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS steps_fts_insert AFTER INSERT ON steps BEGIN
+                INSERT INTO steps_fts(rowid, output) VALUES (new.rowid, new.output);
+            END;
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS steps_fts_delete AFTER DELETE ON steps BEGIN
+                INSERT INTO steps_fts(steps_fts, rowid, output) VALUES ('delete', old.rowid, old.output);
+            END;
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS steps_fts_update AFTER UPDATE OF output ON steps BEGIN
+                INSERT INTO steps_fts(steps_fts, rowid, output) VALUES ('delete', old.rowid, old.output);
+                INSERT INTO steps_fts(rowid, output) VALUES (new.rowid, new.output);
+            END;
+        ''')
+        if not exists:
+            # Index the steps saved before the search index existed
+            cursor.execute("INSERT INTO steps_fts(steps_fts) VALUES ('rebuild')")
+
     def initialize(self):
         """Initialize the database with schema based on the configuration"""
         if self.database_url:
@@ -256,36 +309,8 @@ class DatabaseManager(SQLAlchemyDataLayer):
 
     async def save_setting(self, key: str, value: str):
         """Save a setting to the database"""
-        if self.database_url:
-            async with self.engine.begin() as conn:
-                await conn.execute(text("""
-                    INSERT INTO settings ("key", "value") VALUES (:key, :value)
-                    ON CONFLICT ("key") DO UPDATE SET "value" = EXCLUDED."value"
-                """), {"key": key, "value": value})
-        else:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO settings (id, key, value)
-                VALUES ((SELECT id FROM settings WHERE key = ?), ?, ?)
-                """,
-                (key, key, value),
-            )
-            conn.commit()
-            conn.close()
+        await self.settings.set(key, value)
 
     async def load_setting(self, key: str) -> str:
         """Load a setting from the database"""
-        if self.database_url:
-            async with self.engine.connect() as conn:
-                result = await conn.execute(text('SELECT "value" FROM settings WHERE "key" = :key'), {"key": key})
-                row = result.fetchone()
-                return row[0] if row else None
-        else:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT value FROM settings WHERE key = ?', (key,))
-            result = cursor.fetchone()
-            conn.close()
-            return result[0] if result else None
+        return await self.settings.get(key)
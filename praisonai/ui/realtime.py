@@ -12,6 +12,7 @@ from chainlit.types import ThreadDict
 from realtimeclient import RealtimeClient
 from realtimeclient.tools import tools
 from sql_alchemy import SQLAlchemyDataLayer
+from settings_store import SettingsStore
 import chainlit.data as cl_data
 from literalai.helper import utc_now
 import json
@@ -131,35 +132,23 @@ def initialize_db():
     conn.commit()
     conn.close()
 
-def save_setting(key: str, value: str):
-    """Saves a setting to the database."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT OR REPLACE INTO settings (id, key, value)
-        VALUES ((SELECT id FROM settings WHERE key = ?), ?, ?)
-    """,
-        (key, key, value),
-    )
-    conn.commit()
-    conn.close()
-
-def load_setting(key: str) -> str:
-    """Loads a setting from the database."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute('SELECT value FROM settings WHERE key = ?', (key,))
-    result = cursor.fetchone()
-    conn.close()
-    return result[0] if result else None
-
 # Initialize the database
 initialize_db()
 
 # Set up SQLAlchemy data layer
 cl_data._data_layer = SQLAlchemyDataLayer(conninfo=f"sqlite+aiosqlite:///{DB_PATH}")
 
+# Settings are cached in memory and shared by all sessions
+settings_store = SettingsStore(cl_data._data_layer.engine)
+
+async def save_setting(key: str, value: str):
+    """Saves a setting to the database."""
+    await settings_store.set(key, value)
+
+async def load_setting(key: str) -> str:
+    """Loads a setting (cached in memory after the first read)."""
+    return await settings_store.get(key)
+
 client = AsyncOpenAI()
 
 # Try to import tools from the root directory
@@ -229,7 +218,7 @@ except Exception as e:
 @cl.on_chat_start
 async def start():
     initialize_db()
-    model_name = load_setting("model_name") or os.getenv("MODEL_NAME", "gpt-4o-mini-realtime-preview")
+    model_name = await load_setting("model_name") or os.getenv("MODEL_NAME", "gpt-4o-mini-realtime-preview")
     cl.user_session.set("model_name", model_name)
     cl.user_session.set("message_history", [])  # Initialize message history
     logger.debug(f"Model name: {model_name}")
@@ -351,7 +340,7 @@ async def setup_agent(settings):
     cl.user_session.set("model_name", model_name)
     
     # Save in settings table
-    save_setting("model_name", model_name)
+    await save_setting("model_name", model_name)
     
     # Save in thread metadata
     thread_id = cl.user_session.get("thread_id")
@@ -407,6 +396,8 @@ async def on_end():
     openai_realtime: RealtimeClient = cl.user_session.get("openai_realtime")
     if openai_realtime and openai_realtime.is_connected():
         await openai_realtime.disconnect()
+    # Write any steps still queued by the data layer's write-behind buffer
+    await cl_data._data_layer.flush()
 
 @cl.password_auth_callback
 def auth_callback(username: str, password: str):
@@ -423,7 +414,7 @@ def auth_callback(username: str, password: str):
 @cl.on_chat_resume
 async def on_chat_resume(thread: ThreadDict):
     logger.info(f"Resuming chat: {thread['id']}")
-    model_name = load_setting("model_name") or os.getenv("MODEL_NAME") or "gpt-4o-mini-realtime-preview"
+    model_name = await load_setting("model_name") or os.getenv("MODEL_NAME") or "gpt-4o-mini-realtime-preview"
     logger.debug(f"Model name: {model_name}")
     settings = cl.ChatSettings(
         [
@@ -13,15 +13,11 @@ import base64
 from chainlit.logger import logger
 from chainlit.config import config
 
+from .audio import Int16Arena, Int16RingBuffer, as_int16, float_to_16bit_pcm
+
+# Seconds of microphone audio kept for slicing out server VAD speech segments
+INPUT_AUDIO_WINDOW_SECONDS = 120
 
-def float_to_16bit_pcm(float32_array):
-    """
-    Converts a numpy array of float32 amplitude data to a numpy array in int16 format.
-    :param float32_array: numpy array of float32
-    :return: numpy array of int16
-    """
-    int16_array = np.clip(float32_array, -1, 1) * 32767
-    return int16_array.astype(np.int16)
 
 def base64_to_array_buffer(base64_string):
     """
@@ -38,13 +34,11 @@ def array_buffer_to_base64(array_buffer):
     :param array_buffer: numpy array
     :return: base64 encoded string
     """
-    if array_buffer.dtype == np.float32:
+    if isinstance(array_buffer, Int16Arena):
+        array_buffer = array_buffer.view()
+    elif isinstance(array_buffer, np.ndarray) and array_buffer.dtype.kind == 'f':
         array_buffer = float_to_16bit_pcm(array_buffer)
-    elif array_buffer.dtype == np.int16:
-        array_buffer = array_buffer.tobytes()
-    else:
-        array_buffer = array_buffer.tobytes()
-    
+    # bytes, memoryviews and contiguous arrays are encoded without an extra copy
     return base64.b64encode(array_buffer).decode('utf-8')
 
 def merge_int16_arrays(left, right):
@@ -200,7 +194,7 @@ class RealtimeConversation:
             self.item_lookup[new_item['id']] = new_item
             self.items.append(new_item)
         new_item['formatted'] = {
-            'audio': [],
+            'audio': Int16Arena(),
             'text': '',
             'transcript': ''
         }
@@ -243,7 +237,7 @@ class RealtimeConversation:
             raise Exception(f'item.truncated: Item "{item_id}" not found')
         end_index = (audio_end_ms * self.default_frequency) // 1000
         item['formatted']['transcript'] = ''
-        item['formatted']['audio'] = item['formatted']['audio'][:end_index]
+        item['formatted']['audio'].truncate(end_index)
         return item, None
 
     def _process_item_deleted(self, event):
@@ -279,10 +273,10 @@ class RealtimeConversation:
         audio_end_ms = event['audio_end_ms']
         speech = self.queued_speech_items[item_id]
         speech['audio_end_ms'] = audio_end_ms
-        if input_audio_buffer:
+        if input_audio_buffer is not None:
             start_index = (speech['audio_start_ms'] * self.default_frequency) // 1000
             end_index = (speech['audio_end_ms'] * self.default_frequency) // 1000
-            speech['audio'] = input_audio_buffer[start_index:end_index]
+            speech['audio'] = input_audio_buffer.slice(start_index, end_index)
         return None, None
 
     def _process_response_created(self, event):
@@ -339,10 +333,9 @@ class RealtimeConversation:
         if not item:
             logger.debug(f'response.audio.delta: Item "{item_id}" not found')
             return None, None
-        array_buffer = base64_to_array_buffer(delta)
-        append_values = array_buffer.tobytes()
-        # TODO: make it work
-        # item['formatted']['audio'] = merge_int16_arrays(item['formatted']['audio'], append_values)
+        # Decoded once; the arena copies the samples and the bytes go to the player as-is
+        append_values = base64.b64decode(delta)
+        item['formatted']['audio'].append(append_values)
         return item, {'audio': append_values}
 
     def _process_text_delta(self, event):
@@ -400,7 +393,10 @@ class RealtimeClient(RealtimeEventHandler):
         self.session_created = False
         self.tools = {}
         self.session_config = self.default_session_config.copy()
-        self.input_audio_buffer = bytearray()
+        sample_rate = RealtimeConversation.default_frequency
+        self.input_audio_buffer = Int16RingBuffer(INPUT_AUDIO_WINDOW_SECONDS * sample_rate)
+        # Absolute index of the first input sample not yet committed (manual turn detection)
+        self.input_audio_committed = 0
         return True
 
     def _add_api_event_handlers(self):
@@ -566,7 +562,7 @@ class RealtimeClient(RealtimeEventHandler):
         if content:
             for c in content:
                 if c["type"] == "input_audio":
-                    if isinstance(c["audio"], (bytes, bytearray)):
+                    if not isinstance(c["audio"], str):
                         c["audio"] = array_buffer_to_base64(c["audio"])
             await self.realtime.send("conversation.item.create", {
                 "item": {
@@ -581,16 +577,16 @@ class RealtimeClient(RealtimeEventHandler):
     async def append_input_audio(self, array_buffer):
         if len(array_buffer) > 0:
             await self.realtime.send("input_audio_buffer.append", {
-                "audio": array_buffer_to_base64(np.array(array_buffer)),
+                "audio": array_buffer_to_base64(array_buffer),
             })
-            self.input_audio_buffer.extend(array_buffer)
+            self.input_audio_buffer.write(array_buffer)
         return True
 
     async def create_response(self):
-        if self.get_turn_detection_type() is None and len(self.input_audio_buffer) > 0:
+        if self.get_turn_detection_type() is None and self.input_audio_buffer.total > self.input_audio_committed:
             await self.realtime.send("input_audio_buffer.commit")
-            self.conversation.queue_input_audio(self.input_audio_buffer)
-            self.input_audio_buffer = bytearray()
+            self.conversation.queue_input_audio(self.input_audio_buffer.slice(self.input_audio_committed))
+            self.input_audio_committed = self.input_audio_buffer.total
         await self.realtime.send("response.create")
         return True
 
@@ -610,6 +606,8 @@ class RealtimeClient(RealtimeEventHandler):
             audio_index = next((i for i, c in enumerate(item["content"]) if c["type"] == "audio"), -1)
             if audio_index == -1:
                 raise Exception("Could not find audio on item to cancel")
+            # Drop the unplayed audio locally right away (no copy); the server confirms with item.truncated
+            item["formatted"]["audio"].truncate(sample_count)
             await self.realtime.send("conversation.item.truncate", {
                 "item_id": id,
                 "content_index": audio_index,
@@ -647,7 +645,7 @@ class RealtimeClient(RealtimeEventHandler):
                 logger.warning(f"Unhandled role: {item['role']}")
         else:
             # Handle items without a 'role' or 'type'
-            logger.debug(f"Unhandled item type:\n{json.dumps(item, indent=2)}")
+            logger.debug(f"Unhandled item type:\n{json.dumps(item, indent=2, default=str)}")
         
         # Additional debug logging
         logger.debug(f"Processed Chainlit message for item: {item.get('id', 'unknown')}")
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""Preallocated int16 audio buffers for the realtime client.
+
+Audio arrives in many small chunks over a long session. Growing a numpy
+array with np.concatenate per chunk copies the whole recording each time,
+so these buffers write chunks into preallocated storage instead:
+
+- Int16Arena: growable buffer for one item's audio (capacity doubles when
+  full), truncated in place and read through zero-copy views.
+- Int16RingBuffer: fixed-size window over the microphone stream, addressed
+  by absolute sample index so server VAD offsets (audio_start_ms /
+  audio_end_ms) can be sliced out without keeping the whole session.
+"""
+
+from typing import Optional, Union
+
+import numpy as np
+
+AudioData = Union[bytes, bytearray, memoryview, np.ndarray]
+
+
+def as_int16(data: AudioData) -> np.ndarray:
+    """View PCM16 bytes as int16 samples without copying; float audio is converted."""
+    if isinstance(data, np.ndarray):
+        if data.dtype == np.int16:
+            return data.reshape(-1)
+        if data.dtype.kind == "f":
+            return float_to_16bit_pcm(data)
+        data = data.tobytes()
+    usable = len(data) - len(data) % 2
+    return np.frombuffer(data, dtype=np.int16, count=usable // 2)
+
+
+def float_to_16bit_pcm(float32_array: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Convert float samples in [-1, 1] to int16, writing into out when given."""
+    scaled = np.clip(float32_array, -1, 1)
+    np.multiply(scaled, 32767, out=scaled)
+    if out is None:
+        return scaled.astype(np.int16)
+    np.copyto(out, scaled, casting="unsafe")
+    return out
+
+
+class Int16Arena:
+    """Growable int16 sample buffer with amortized O(1) appends."""
+
+    def __init__(self, capacity: int = 24000):
+        self._data = np.empty(max(1, capacity), dtype=np.int16)
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"Int16Arena(samples={self._length})"
+
+    def append(self, data: AudioData) -> None:
+        samples = data if isinstance(data, np.ndarray) and data.dtype.kind == "f" else as_int16(data)
+        end = self._length + len(samples)
+        if end > len(self._data):
+            grown = np.empty(max(end, 2 * len(self._data)), dtype=np.int16)
+            grown[:self._length] = self._data[:self._length]
+            self._data = grown
+        if samples.dtype.kind == "f":
+            float_to_16bit_pcm(samples, out=self._data[self._length:end])
+        else:
+            self._data[self._length:end] = samples
+        self._length = end
+
+    def truncate(self, length: int) -> None:
+        """Drop samples after length (no copy)."""
+        self._length = max(0, min(self._length, length))
+
+    def clear(self) -> None:
+        self._length = 0
+
+    def samples(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Zero-copy int16 view of a sample range; valid until the next append."""
+        return self._data[start:self._length if end is None else min(end, self._length)]
+
+    def view(self) -> memoryview:
+        """Zero-copy bytes view of the audio; valid until the next append."""
+        return memoryview(self._data[:self._length]).cast("B")
+
+    def tobytes(self) -> bytes:
+        return self._data[:self._length].tobytes()
+
+
+class Int16RingBuffer:
+    """Fixed-capacity window over a sample stream, addressed by absolute sample index."""
+
+    def __init__(self, capacity: int):
+        self._data = np.zeros(max(1, capacity), dtype=np.int16)
+        self.total = 0  # samples written since the start (or last clear)
+
+    def __len__(self) -> int:
+        return min(self.total, len(self._data))
+
+    def __repr__(self) -> str:
+        return f"Int16RingBuffer(total={self.total}, capacity={len(self._data)})"
+
+    @property
+    def start(self) -> int:
+        """Absolute index of the oldest sample still held."""
+        return self.total - len(self)
+
+    def write(self, data: AudioData) -> None:
+        samples = as_int16(data)
+        capacity = len(self._data)
+        if len(samples) >= capacity:
+            self.total += len(samples) - capacity
+            samples = samples[-capacity:]
+        pos = self.total % capacity
+        first = min(len(samples), capacity - pos)
+        self._data[pos:pos + first] = samples[:first]
+        self._data[:len(samples) - first] = samples[first:]
+        self.total += len(samples)
+
+    def slice(self, start: int, end: Optional[int] = None) -> Int16Arena:
+        """Copy absolute samples [start, end) into an Int16Arena.
+
+        Samples older than the ring's window are no longer available, so the
+        result starts at the oldest retained sample in that case.
+        """
+        end = self.total if end is None else min(end, self.total)
+        start = max(start, self.start)
+        arena = Int16Arena(max(0, end - start))
+        if end <= start:
+            return arena
+        capacity = len(self._data)
+        first, last = start % capacity, (end - 1) % capacity + 1
+        if first < last:
+            arena.append(self._data[first:last])
+        else:
+            arena.append(self._data[first:])
+            arena.append(self._data[:last])
+        return arena
+
+    def clear(self) -> None:
+        self.total = 0
@@ -0,0 +1,133 @@
+"""Replay a realtime event stream and time the audio buffering.
+
+Usage:
+    python -m praisonai.ui.realtimeclient.benchmark [events.jsonl] [--record out.jsonl]
+
+Each line of events.jsonl is one server event as received by RealtimeAPI
+(for example dumped from a "server.*" handler), or an
+{"type": "client.input_audio", "audio": "<base64>"} entry for a microphone
+chunk passed to append_input_audio. Without a file a synthetic
+conversation is generated; --record saves it for later runs.
+
+The events are replayed through RealtimeConversation with the preallocated
+buffers, and through the previous approach (np.concatenate per chunk, a
+bytearray for the microphone) for comparison.
+"""
+
+import argparse
+import base64
+import json
+import time
+
+import numpy as np
+
+from . import INPUT_AUDIO_WINDOW_SECONDS, RealtimeConversation
+from .audio import Int16RingBuffer
+
+
+def synthetic_events(turns=20, seconds_per_turn=8, chunk_ms=50, sample_rate=24000):
+    """A conversation of alternating user speech and assistant audio responses."""
+    rng = np.random.default_rng(0)
+    chunk = sample_rate * chunk_ms // 1000
+    events = []
+    elapsed_ms = 0
+    for turn in range(turns):
+        user_id, assistant_id = f"item_user_{turn}", f"item_assistant_{turn}"
+        events.append({"type": "input_audio_buffer.speech_started", "item_id": user_id, "audio_start_ms": elapsed_ms})
+        for _ in range(seconds_per_turn * 1000 // chunk_ms):
+            audio = rng.integers(-3000, 3000, chunk, dtype=np.int16).tobytes()
+            events.append({"type": "client.input_audio", "audio": base64.b64encode(audio).decode()})
+            elapsed_ms += chunk_ms
+        events.append({"type": "input_audio_buffer.speech_stopped", "item_id": user_id, "audio_end_ms": elapsed_ms})
+        events.append({"type": "conversation.item.created", "item": {
+            "id": user_id, "type": "message", "role": "user", "content": [{"type": "input_audio"}]
+        }})
+        events.append({"type": "conversation.item.created", "item": {
+            "id": assistant_id, "type": "message", "role": "assistant", "content": []
+        }})
+        for _ in range(seconds_per_turn * 1000 // chunk_ms):
+            audio = rng.integers(-3000, 3000, chunk, dtype=np.int16).tobytes()
+            events.append({
+                "type": "response.audio.delta", "item_id": assistant_id,
+                "content_index": 0, "delta": base64.b64encode(audio).decode()
+            })
+        # The user interrupts every other response halfway through
+        if turn % 2:
+            events.append({
+                "type": "conversation.item.truncated", "item_id": assistant_id,
+                "audio_end_ms": seconds_per_turn * 500
+            })
+    return events
+
+
+def replay(events):
+    """Replay events through RealtimeConversation, as RealtimeClient does."""
+    conversation = RealtimeConversation()
+    input_audio = Int16RingBuffer(INPUT_AUDIO_WINDOW_SECONDS * conversation.default_frequency)
+    for event in events:
+        if event["type"] == "client.input_audio":
+            input_audio.write(base64.b64decode(event["audio"]))
+        elif event["type"] == "input_audio_buffer.speech_stopped":
+            conversation.process_event(event, input_audio)
+        else:
+            conversation.process_event(event)
+    return sum(len(item["formatted"]["audio"]) for item in conversation.items)
+
+
+def replay_concatenate(events, sample_rate):
+    """The previous buffering: np.concatenate per delta, one growing bytearray of input."""
+    items, speech = {}, {}
+    input_audio = bytearray()
+    for event in events:
+        kind = event["type"]
+        if kind == "client.input_audio":
+            input_audio.extend(np.frombuffer(base64.b64decode(event["audio"]), dtype=np.uint8).tobytes())
+        elif kind == "input_audio_buffer.speech_started":
+            speech[event["item_id"]] = event["audio_start_ms"]
+        elif kind == "input_audio_buffer.speech_stopped":
+            start = speech[event["item_id"]] * sample_rate // 1000
+            end = event["audio_end_ms"] * sample_rate // 1000
+            speech[event["item_id"]] = np.frombuffer(bytes(input_audio), dtype=np.int16)[start:end]
+        elif kind == "conversation.item.created":
+            item_id = event["item"]["id"]
+            items[item_id] = speech.pop(item_id, np.array([], dtype=np.int16))
+        elif kind == "response.audio.delta":
+            delta = np.frombuffer(base64.b64decode(event["delta"]), dtype=np.int16)
+            items[event["item_id"]] = np.concatenate((items[event["item_id"]], delta))
+        elif kind == "conversation.item.truncated":
+            end = event["audio_end_ms"] * sample_rate // 1000
+            items[event["item_id"]] = items[event["item_id"]][:end]
+    return sum(len(audio) for audio in items.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a realtime event stream and time audio buffering")
+    parser.add_argument("events", nargs="?", help="JSONL file of recorded events")
+    parser.add_argument("--record", help="Save the synthetic event stream to this file")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.events:
+        with open(args.events, "r", encoding="utf-8") as f:
+            events = [json.loads(line) for line in f if line.strip()]
+    else:
+        events = synthetic_events(sample_rate=RealtimeConversation.default_frequency)
+        if args.record:
+            with open(args.record, "w", encoding="utf-8") as f:
+                for event in events:
+                    f.write(json.dumps(event) + "\n")
+
+    sample_rate = RealtimeConversation.default_frequency
+    for name, run in (("preallocated", lambda: replay(events)),
+                      ("concatenate", lambda: replay_concatenate(events, sample_rate))):
+        best, samples = None, 0
+        for _ in range(args.repeat):
+            began = time.perf_counter()
+            samples = run()
+            elapsed = time.perf_counter() - began
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"{name:>12}: {best * 1000:8.1f} ms for {len(events)} events ({samples} samples kept)")
+
+
+if __name__ == "__main__":
+    main()
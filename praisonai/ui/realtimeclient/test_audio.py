@@ -0,0 +1,103 @@
+"""Unit tests for the realtime audio buffers.
+
+Run with: python -m pytest praisonai/ui/realtimeclient/test_audio.py
+"""
+
+import json
+import unittest
+
+import numpy as np
+
+from .audio import Int16Arena, Int16RingBuffer, as_int16, float_to_16bit_pcm
+
+
+def pcm(*samples):
+    return np.array(samples, dtype=np.int16).tobytes()
+
+
+class TestConversions(unittest.TestCase):
+    def test_as_int16_views_bytes(self):
+        data = bytearray(pcm(1, -2, 3))
+        samples = as_int16(data)
+        self.assertEqual(samples.tolist(), [1, -2, 3])
+        data[0] = 5
+        self.assertEqual(samples[0], 5)
+
+    def test_as_int16_drops_odd_trailing_byte(self):
+        self.assertEqual(as_int16(pcm(7, 8) + b"\x01").tolist(), [7, 8])
+
+    def test_float_to_pcm_clips(self):
+        out = float_to_16bit_pcm(np.array([0.0, 0.5, 2.0, -2.0], dtype=np.float32))
+        self.assertEqual(out.tolist(), [0, 16383, 32767, -32767])
+
+
+class TestInt16Arena(unittest.TestCase):
+    def test_append_grows_past_capacity(self):
+        arena = Int16Arena(capacity=2)
+        for i in range(5):
+            arena.append(pcm(i, -i))
+        self.assertEqual(len(arena), 10)
+        self.assertEqual(arena.samples().tolist(), [0, 0, 1, -1, 2, -2, 3, -3, 4, -4])
+        self.assertEqual(arena.tobytes(), bytes(arena.view()))
+
+    def test_append_float_audio(self):
+        arena = Int16Arena()
+        arena.append(np.array([1.0, -1.0], dtype=np.float32))
+        self.assertEqual(arena.samples().tolist(), [32767, -32767])
+
+    def test_truncate_and_clear(self):
+        arena = Int16Arena()
+        arena.append(pcm(1, 2, 3, 4))
+        arena.truncate(2)
+        self.assertEqual(arena.samples().tolist(), [1, 2])
+        arena.truncate(10)
+        self.assertEqual(len(arena), 2)
+        arena.append(pcm(9))
+        self.assertEqual(arena.samples(1).tolist(), [2, 9])
+        arena.clear()
+        self.assertEqual(arena.tobytes(), b"")
+
+    def test_json_dumps_with_default_str(self):
+        arena = Int16Arena()
+        arena.append(pcm(1, 2))
+        item = {"formatted": {"audio": arena}}
+        with self.assertRaises(TypeError):
+            json.dumps(item)
+        self.assertIn("Int16Arena(samples=2)", json.dumps(item, default=str))
+
+
+class TestInt16RingBuffer(unittest.TestCase):
+    def test_slice_within_window(self):
+        ring = Int16RingBuffer(8)
+        ring.write(pcm(0, 1, 2, 3, 4))
+        self.assertEqual(ring.slice(1, 4).samples().tolist(), [1, 2, 3])
+        self.assertEqual(ring.slice(3).samples().tolist(), [3, 4])
+
+    def test_wraps_and_keeps_absolute_indices(self):
+        ring = Int16RingBuffer(4)
+        ring.write(pcm(0, 1, 2))
+        ring.write(pcm(3, 4, 5))
+        self.assertEqual(ring.total, 6)
+        self.assertEqual(len(ring), 4)
+        self.assertEqual(ring.start, 2)
+        self.assertEqual(ring.slice(3, 6).samples().tolist(), [3, 4, 5])
+        # Samples before the window are gone; the slice starts at the oldest one held
+        self.assertEqual(ring.slice(0, 4).samples().tolist(), [2, 3])
+
+    def test_write_larger_than_capacity(self):
+        ring = Int16RingBuffer(3)
+        ring.write(pcm(0, 1, 2, 3, 4))
+        self.assertEqual(ring.total, 5)
+        self.assertEqual(ring.slice(0).samples().tolist(), [2, 3, 4])
+
+    def test_empty_slice_and_clear(self):
+        ring = Int16RingBuffer(4)
+        ring.write(pcm(1, 2))
+        self.assertEqual(len(ring.slice(2, 2)), 0)
+        ring.clear()
+        self.assertEqual(ring.total, 0)
+        self.assertEqual(len(ring.slice(0)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import asyncio
+import inspect
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+from chainlit.context import context_var
+from chainlit.logger import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+SettingsCallback = Callable[[str, Optional[str]], Union[None, Awaitable[None]]]
+
+
+class SettingsStore:
+    """Cached access to the settings table, shared by all chat sessions.
+
+    All settings are read with one query on first use and served from memory
+    afterwards, so reading a setting on every message costs no database
+    round trip. Writes go through the data layer's async engine and update
+    the cache immediately. Callbacks registered with subscribe() are told
+    about every change, whichever session made it.
+
+    max_age bounds how stale the cache can get when another process (for
+    example a second UI server on the same database) changes a setting.
+    """
+
+    def __init__(self, engine: AsyncEngine, max_age: Optional[float] = 60.0):
+        self.engine = engine
+        self.max_age = max_age
+        self._cache: Dict[str, Optional[str]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._subscribers: List[SettingsCallback] = []
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        return self.max_age is None or time.monotonic() - self._loaded_at < self.max_age
+
+    async def refresh(self):
+        """Reload all settings from the database."""
+        async with self.engine.connect() as conn:
+            result = await conn.execute(text('SELECT "key", "value" FROM settings'))
+            rows = result.fetchall()
+        self._cache = {row[0]: row[1] for row in rows}
+        self._loaded_at = time.monotonic()
+
+    async def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        if not self._is_fresh():
+            async with self._get_lock():
+                if not self._is_fresh():
+                    await self.refresh()
+        value = self._cache.get(key)
+        return default if value is None else value
+
+    async def set(self, key: str, value: Optional[str]):
+        # Always written: the cached value may be stale if another process changed it
+        async with self.engine.begin() as conn:
+            await conn.execute(text("""
+                INSERT INTO settings ("key", "value") VALUES (:key, :value)
+                ON CONFLICT ("key") DO UPDATE SET "value" = EXCLUDED."value"
+            """), {"key": key, "value": value})
+        self._cache[key] = value
+        await self._notify(key, value)
+
+    def subscribe(self, callback: SettingsCallback) -> Callable[[], None]:
+        """Call callback(key, value) on every change; returns a function that unsubscribes."""
+        self._subscribers.append(callback)
+
+        def unsubscribe():
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    async def _notify(self, key: str, value: Optional[str]):
+        for callback in list(self._subscribers):
+            try:
+                result = callback(key, value)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warn(f"Settings subscriber failed for {key}: {e}")
+
+
+def subscribe_session(store: SettingsStore, callback: SettingsCallback) -> Callable[[], None]:
+    """Subscribe callback on behalf of the current chat session.
+
+    The callback runs in the subscribing session's chainlit context, so
+    cl.user_session and anything it sends reach that session rather than
+    the one that changed the setting. Changes made by the session itself are
+    not reported back to it. Returns a function that unsubscribes.
+    """
+    session_context = context_var.get()
+
+    async def notify_session(key: str, value: Optional[str]):
+        current = context_var.get(None)
+        if current is not None and current.session.id == session_context.session.id:
+            return
+        token = context_var.set(session_context)
+        try:
+            result = callback(key, value)
+            if inspect.isawaitable(result):
+                await result
+        finally:
+            context_var.reset(token)
+
+    return store.subscribe(notify_session)
@@ -1,9 +1,11 @@
+import asyncio
 import json
+import re
 import ssl
 import uuid
 from dataclasses import asdict
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
 import os
 
 import aiofiles
@@ -25,7 +27,7 @@ from chainlit.types import (
     ThreadFilter,
 )
 from chainlit.user import PersistedUser, User
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
@@ -48,10 +50,19 @@ class SQLAlchemyDataLayer(BaseDataLayer):
         storage_provider: Optional[BaseStorageClient] = None,
         user_thread_limit: Optional[int] = 1000,
         show_logger: Optional[bool] = False,
+        write_behind: bool = True,
+        flush_interval: float = 0.5,
     ):
         self._conninfo = conninfo
         self.user_thread_limit = user_thread_limit
         self.show_logger = show_logger
+        # Write-behind step persistence: step upserts are coalesced per step id
+        # and written in one transaction every flush_interval seconds
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self._pending_steps: Dict[str, Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
         ssl_args = {}
         if ssl_require:
             ssl_context = ssl.create_default_context()
@@ -61,6 +72,7 @@ class SQLAlchemyDataLayer(BaseDataLayer):
         self.engine: AsyncEngine = create_async_engine(
             self._conninfo, connect_args=ssl_args
         )
+        self._search_mode: Optional[str] = None
         self.async_session = sessionmaker(
             bind=self.engine, expire_on_commit=False, class_=AsyncSession
         )
@@ -79,9 +91,17 @@ class SQLAlchemyDataLayer(BaseDataLayer):
 
     ###### SQL Helpers ######
     async def execute_sql(
-        self, query: str, parameters: dict
+        self, query: str, parameters: dict, expanding: Sequence[str] = ()
     ) -> Union[List[Dict[str, Any]], int, None]:
+        """Run one statement in its own transaction.
+
+        Parameters named in expanding are lists bound to an IN (:name) clause.
+        """
         parameterized_query = text(query)
+        if expanding:
+            parameterized_query = parameterized_query.bindparams(
+                *(bindparam(name, expanding=True) for name in expanding)
+            )
         async with self.async_session() as session:
             try:
                 await session.begin()
@@ -105,6 +125,24 @@ class SQLAlchemyDataLayer(BaseDataLayer):
                 logger.warn(f"An unexpected error occurred: {e}")
                 return None
 
+    async def execute_many(self, statements: List[Tuple[str, dict]]) -> bool:
+        """Run several statements in a single transaction."""
+        async with self.async_session() as session:
+            try:
+                await session.begin()
+                for query, parameters in statements:
+                    await session.execute(text(query), parameters)
+                await session.commit()
+                return True
+            except SQLAlchemyError as e:
+                await session.rollback()
+                logger.warn(f"An error occurred: {e}")
+                return False
+            except Exception as e:
+                await session.rollback()
+                logger.warn(f"An unexpected error occurred: {e}")
+                return False
+
     async def get_current_timestamp(self) -> str:
         return datetime.now().isoformat() + "Z"
 
@@ -193,6 +231,7 @@ class SQLAlchemyDataLayer(BaseDataLayer):
     async def get_thread(self, thread_id: str) -> Optional[ThreadDict]:
         if self.show_logger:
             logger.info(f"SQLAlchemy: get_thread, thread_id={thread_id}")
+        await self.flush()
         user_threads: Optional[List[ThreadDict]] = await self.get_all_user_threads(
             thread_id=thread_id
         )
@@ -253,10 +292,16 @@ class SQLAlchemyDataLayer(BaseDataLayer):
         steps_query = 'DELETE FROM steps WHERE "threadId" = :id'
         thread_query = 'DELETE FROM threads WHERE "id" = :id'
         parameters = {"id": thread_id}
-        await self.execute_sql(query=feedbacks_query, parameters=parameters)
-        await self.execute_sql(query=elements_query, parameters=parameters)
-        await self.execute_sql(query=steps_query, parameters=parameters)
-        await self.execute_sql(query=thread_query, parameters=parameters)
+        # Under the flush lock, so a flush already writing this thread's steps
+        # finishes first instead of writing them back after the delete
+        async with self._get_flush_lock():
+            for step_id, step in list(self._pending_steps.items()):
+                if step.get("threadId") == thread_id:
+                    self._pending_steps.pop(step_id, None)
+            await self.execute_sql(query=feedbacks_query, parameters=parameters)
+            await self.execute_sql(query=elements_query, parameters=parameters)
+            await self.execute_sql(query=steps_query, parameters=parameters)
+            await self.execute_sql(query=thread_query, parameters=parameters)
 
     async def list_threads(
         self, pagination: Pagination, filters: ThreadFilter
@@ -267,44 +312,59 @@ class SQLAlchemyDataLayer(BaseDataLayer):
             )
         if not filters.userId:
             raise ValueError("userId is required")
-        all_user_threads: Optional[List[ThreadDict]] = (
-            await self.get_all_user_threads(user_id=filters.userId) or []
-        )
-
-        search_keyword = filters.search.lower() if filters.search else None
-        feedback_value = int(filters.feedback) if filters.feedback else None
-
-        filtered_threads = []
-        for thread in all_user_threads:
-            keyword_match = True
-            feedback_match = True
-            if search_keyword or feedback_value is not None:
-                if search_keyword:
-                    keyword_match = any(
-                        search_keyword in step["output"].lower()
-                        for step in thread["steps"]
-                        if "output" in step and isinstance(step["output"], str)
-                    )
-                if feedback_value is not None:
-                    feedback_match = False
-                    for step in thread["steps"]:
-                        feedback = step.get("feedback")
-                        if feedback and feedback.get("value") == feedback_value:
-                            feedback_match = True
-                            break
-            if keyword_match and feedback_match:
-                filtered_threads.append(thread)
-
-        start = 0
+        if filters.search or filters.feedback is not None:
+            # Search and feedback filters look at steps, so include unsaved ones
+            await self.flush()
+
+        # Only thread rows are loaded here; steps and elements are loaded
+        # by get_thread when a thread is opened.
+        conditions = ['t."userId" = :user_id']
+        parameters: Dict[str, Any] = {
+            "user_id": filters.userId,
+            "limit": pagination.first + 1,
+        }
+        if filters.search:
+            conditions.append(await self._search_condition(filters.search, parameters))
+        if filters.feedback is not None:
+            conditions.append(
+                """EXISTS (
+                    SELECT 1 FROM feedbacks f JOIN steps s ON s."id" = f."forId"
+                    WHERE s."threadId" = t."id" AND f."value" = :feedback
+                )"""
+            )
+            parameters["feedback"] = int(filters.feedback)
         if pagination.cursor:
-            for i, thr in enumerate(filtered_threads):
-                if thr["id"] == pagination.cursor:
-                    start = i + 1
-                    break
-        end = start + pagination.first
-        paginated_threads = filtered_threads[start:end] or []
-
-        has_next_page = len(filtered_threads) > end
+            # Keyset pagination: continue after the cursor thread in (createdAt, id) order
+            conditions.append(
+                """(
+                    COALESCE(t."createdAt", '') < (SELECT COALESCE(c."createdAt", '') FROM threads c WHERE c."id" = :cursor)
+                    OR (
+                        COALESCE(t."createdAt", '') = (SELECT COALESCE(c."createdAt", '') FROM threads c WHERE c."id" = :cursor)
+                        AND t."id" < :cursor
+                    )
+                )"""
+            )
+            parameters["cursor"] = pagination.cursor
+
+        query = f"""
+            SELECT
+                t."id" AS thread_id,
+                t."createdAt" AS thread_createdat,
+                t."name" AS thread_name,
+                t."userId" AS user_id,
+                t."userIdentifier" AS user_identifier,
+                t."tags" AS thread_tags,
+                t."meta" AS thread_meta
+            FROM threads t
+            WHERE {" AND ".join(conditions)}
+            ORDER BY COALESCE(t."createdAt", '') DESC, t."id" DESC
+            LIMIT :limit
+        """
+        rows = await self.execute_sql(query=query, parameters=parameters)
+        rows = rows if isinstance(rows, list) else []
+
+        has_next_page = len(rows) > pagination.first
+        paginated_threads = [self._thread_dict(row) for row in rows[: pagination.first]]
         start_cursor = paginated_threads[0]["id"] if paginated_threads else None
         end_cursor = paginated_threads[-1]["id"] if paginated_threads else None
 
@@ -317,6 +377,47 @@ class SQLAlchemyDataLayer(BaseDataLayer):
             data=paginated_threads,
         )
 
+    async def _search_condition(self, search: str, parameters: Dict[str, Any]) -> str:
+        """SQL condition matching threads with a step output containing the search terms.
+
+        Uses the SQLite FTS5 table or the Postgres tsvector index created by
+        DatabaseManager, and falls back to a LIKE scan on other databases.
+        Each term matches as a word prefix.
+        """
+        terms = re.findall(r"\w+", search.lower())
+        mode = await self._get_search_mode() if terms else "like"
+        if mode == "fts5":
+            parameters["search"] = " ".join(f'"{term}"*' for term in terms)
+            return """t."id" IN (
+                SELECT s."threadId" FROM steps s
+                WHERE s.rowid IN (SELECT rowid FROM steps_fts WHERE steps_fts MATCH :search)
+            )"""
+        if mode == "tsvector":
+            parameters["search"] = " & ".join(f"{term}:*" for term in terms)
+            return """t."id" IN (
+                SELECT s."threadId" FROM steps s
+                WHERE to_tsvector('simple', COALESCE(s."output", '')) @@ to_tsquery('simple', :search)
+            )"""
+        parameters["search"] = f"%{search.lower()}%"
+        return """t."id" IN (
+            SELECT s."threadId" FROM steps s WHERE LOWER(s."output") LIKE :search
+        )"""
+
+    async def _get_search_mode(self) -> str:
+        if self._search_mode is None:
+            dialect = self.engine.dialect.name
+            if dialect == "postgresql":
+                self._search_mode = "tsvector"
+            elif dialect == "sqlite":
+                result = await self.execute_sql(
+                    query="SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'steps_fts'",
+                    parameters={},
+                )
+                self._search_mode = "fts5" if result else "like"
+            else:
+                self._search_mode = "like"
+        return self._search_mode
+
     ###### Steps ######
     @queue_until_user_message()
     async def create_step(self, step_dict: "StepDict"):
@@ -357,18 +458,60 @@ class SQLAlchemyDataLayer(BaseDataLayer):
             "indent": step_dict.get("indent"),
         }
         parameters = {k: v for k, v in parameters.items() if v is not None}
+        if not self.write_behind:
+            await self.execute_sql(query=self._step_upsert_query(parameters), parameters=parameters)
+            return
+        # Coalesce with any unsaved update of the same step (later values win)
+        self._pending_steps[parameters["id"]] = {
+            **self._pending_steps.get(parameters["id"], {}),
+            **parameters,
+        }
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    @staticmethod
+    def _step_upsert_query(parameters: Dict[str, Any]) -> str:
         columns = ", ".join(f'"{key}"' for key in parameters.keys())
         values = ", ".join(f':{key}' for key in parameters.keys())
         updates = ", ".join(
             f'"{key}" = :{key}' for key in parameters.keys() if key != "id"
         )
-        query = f"""
+        return f"""
             INSERT INTO steps ({columns})
             VALUES ({values})
             ON CONFLICT ("id") DO UPDATE
             SET {updates};
         """
-        await self.execute_sql(query=query, parameters=parameters)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    def _get_flush_lock(self) -> asyncio.Lock:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    async def flush(self):
+        """Write all pending step upserts in one transaction."""
+        async with self._get_flush_lock():
+            if not self._pending_steps:
+                return
+            pending, self._pending_steps = self._pending_steps, {}
+            if self.show_logger:
+                logger.info(f"SQLAlchemy: flush, steps={len(pending)}")
+            statements = [
+                (self._step_upsert_query(parameters), parameters)
+                for parameters in pending.values()
+            ]
+            if not await self.execute_many(statements):
+                # Save what can be saved rather than losing the whole batch
+                for query, parameters in statements:
+                    await self.execute_sql(query=query, parameters=parameters)
+
+    async def close(self):
+        await self.flush()
+        await self.engine.dispose()
 
     @queue_until_user_message()
     async def update_step(self, step_dict: "StepDict"):
@@ -384,9 +527,12 @@ class SQLAlchemyDataLayer(BaseDataLayer):
         elements_query = 'DELETE FROM elements WHERE "forId" = :id'
         steps_query = 'DELETE FROM steps WHERE "id" = :id'
         parameters = {"id": step_id}
-        await self.execute_sql(query=feedbacks_query, parameters=parameters)
-        await self.execute_sql(query=elements_query, parameters=parameters)
-        await self.execute_sql(query=steps_query, parameters=parameters)
+        # See delete_thread: an in-flight flush must not resurrect the step
+        async with self._get_flush_lock():
+            self._pending_steps.pop(step_id, None)
+            await self.execute_sql(query=feedbacks_query, parameters=parameters)
+            await self.execute_sql(query=elements_query, parameters=parameters)
+            await self.execute_sql(query=steps_query, parameters=parameters)
 
     ###### Feedback ######
     async def upsert_feedback(self, feedback: Feedback) -> str:
@@ -512,6 +658,31 @@ class SQLAlchemyDataLayer(BaseDataLayer):
         parameters = {"id": element_id}
         await self.execute_sql(query=query, parameters=parameters)
 
+    def _thread_dict(self, thread: Dict[str, Any]) -> ThreadDict:
+        meta = thread["thread_meta"]
+        if isinstance(meta, str):
+            try:
+                meta = json.loads(meta)
+            except:
+                meta = {}
+        tags = thread["thread_tags"]
+        if isinstance(tags, str):
+            try:
+                tags = json.loads(tags)
+            except:
+                tags = []
+        return ThreadDict(
+            id=thread["thread_id"],
+            createdAt=thread["thread_createdat"],
+            name=thread["thread_name"],
+            userId=thread["user_id"],
+            userIdentifier=thread["user_identifier"],
+            tags=tags,
+            metadata=meta,
+            steps=[],
+            elements=[],
+        )
+
     async def get_all_user_threads(
         self, user_id: Optional[str] = None, thread_id: Optional[str] = None
     ) -> Optional[List[ThreadDict]]:
@@ -545,12 +716,9 @@ class SQLAlchemyDataLayer(BaseDataLayer):
             return None
         if not user_threads:
             return []
-        else:
-            thread_ids = (
-                "('" + "','".join([t["thread_id"] for t in user_threads]) + "')"
-            )
+        thread_ids = [t["thread_id"] for t in user_threads]
 
-        steps_feedbacks_query = f"""
+        steps_feedbacks_query = """
             SELECT
                 s."id" AS step_id,
                 s."name" AS step_name,
@@ -575,14 +743,16 @@ class SQLAlchemyDataLayer(BaseDataLayer):
                 f."comment" AS feedback_comment,
                 f."id" AS feedback_id
             FROM steps s LEFT JOIN feedbacks f ON s."id" = f."forId"
-            WHERE s."threadId" IN {thread_ids}
+            WHERE s."threadId" IN :thread_ids
             ORDER BY s."createdAt" ASC
         """
         steps_feedbacks = await self.execute_sql(
-            query=steps_feedbacks_query, parameters={}
+            query=steps_feedbacks_query,
+            parameters={"thread_ids": thread_ids},
+            expanding=("thread_ids",),
         )
 
-        elements_query = f"""
+        elements_query = """
             SELECT
                 e."id" AS element_id,
                 e."threadId" as element_threadid,
@@ -598,36 +768,17 @@ class SQLAlchemyDataLayer(BaseDataLayer):
                 e."forId" AS element_forid,
                 e."mime" AS element_mime
             FROM elements e
-            WHERE e."threadId" IN {thread_ids}
+            WHERE e."threadId" IN :thread_ids
         """
-        elements = await self.execute_sql(query=elements_query, parameters={})
+        elements = await self.execute_sql(
+            query=elements_query,
+            parameters={"thread_ids": thread_ids},
+            expanding=("thread_ids",),
+        )
 
         thread_dicts = {}
         for thread in user_threads:
-            t_id = thread["thread_id"]
-            meta = thread["thread_meta"]
-            if isinstance(meta, str):
-                try:
-                    meta = json.loads(meta)
-                except:
-                    meta = {}
-            tags = thread["thread_tags"]
-            if isinstance(tags, str):
-                try:
-                    tags = json.loads(tags)
-                except:
-                    tags = []
-            thread_dicts[t_id] = ThreadDict(
-                id=t_id,
-                createdAt=thread["thread_createdat"],
-                name=thread["thread_name"],
-                userId=thread["user_id"],
-                userIdentifier=thread["user_identifier"],
-                tags=tags,
-                metadata=meta,
-                steps=[],
-                elements=[],
-            )
+            thread_dicts[thread["thread_id"]] = self._thread_dict(thread)
 
         if isinstance(steps_feedbacks, list):
             for step_feedback in steps_feedbacks:
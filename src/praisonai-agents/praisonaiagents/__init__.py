@@ -13,6 +13,7 @@ from .knowledge.chunking import Chunking
 from .mcp.mcp import MCP
 from .main import (
     TaskOutput,
+    StreamEvent,
     ReflectionOutput,
     display_interaction,
     display_self_reflection,
@@ -38,6 +39,7 @@ __all__ = [
     'Tools',
     'Task',
     'TaskOutput',
+    'StreamEvent',
     'ReflectionOutput',
     'AutoAgents',
     'display_interaction',
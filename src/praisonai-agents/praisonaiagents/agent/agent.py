@@ -3,10 +3,13 @@ import time
 import json
 import logging
 import asyncio
-from typing import List, Optional, Any, Dict, Union, Literal, TYPE_CHECKING
+import contextlib
+import contextvars
+import threading
+from typing import List, Optional, Any, Dict, Union, Literal, AsyncIterator, TYPE_CHECKING
 from rich.console import Console
 from rich.live import Live
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, OpenAI
 from ..main import (
     display_error,
     display_tool_call,
@@ -14,7 +17,7 @@ from ..main import (
     display_interaction,
     display_generating,
     display_self_reflection,
-    ReflectionOutput,
+    StreamEvent,
     client,
     adisplay_instruction
 )
@@ -25,6 +28,10 @@ from dataclasses import dataclass
 if TYPE_CHECKING:
     from ..task.task import Task
 
+# ids of the agents whose router cascade is running in this context; their
+# chat()/achat() calls made by the cascade go straight to the chosen model
+_routing_agents: contextvars.ContextVar = contextvars.ContextVar("praison_routing_agents", default=())
+
 @dataclass
 class ChatCompletionMessage:
     content: str
@@ -359,8 +366,11 @@ class Agent:
         max_reflect: int = 3,
         min_reflect: int = 1,
         reflect_llm: Optional[str] = None,
+        reflect_confidence: float = 0.8,
         user_id: Optional[str] = None,
-        reasoning_steps: bool = False
+        reasoning_steps: bool = False,
+        tool_output_config: Optional[Dict[str, Any]] = None,
+        hedging: Optional[Union[bool, Dict[str, Any]]] = None
     ):
         # Add check at start if memory is requested
         if memory is not None:
@@ -403,6 +413,17 @@ class Agent:
         # Check for model name in environment variable if not provided
         self._using_custom_llm = False
 
+        # A Router picks the model per request; its first model sets up the agent
+        self.router = None
+        self._route_lock = threading.Lock()
+        self._active_routes = 0
+        self._routed_from = None
+        if llm is not None and not isinstance(llm, (str, dict)):
+            from ..llm.router import Router
+            if isinstance(llm, Router):
+                self.router = llm
+                llm = llm.models[0]
+
         # If the user passes a dictionary (for advanced configuration)
         if isinstance(llm, dict) and "model" in llm:
             try:
@@ -439,6 +460,15 @@ class Agent:
         self.allow_delegation = allow_delegation
         self.step_callback = step_callback
         self.cache = cache
+        # Result cache for tools marked with @cached_tool (None: off; True: process-wide cache)
+        self.tool_cache = None
+        # Token budget for tool results added to the conversation (off without a config)
+        from ..tools.tool_output import ToolOutputCompactor, read_tool_output
+        self.tool_output = ToolOutputCompactor(tool_output_config)
+        if isinstance(self.tools, list) and self.tools and self.tool_output.uses_artifacts() \
+                and read_tool_output not in self.tools:
+            # Lets the agent page through results that were spilled to disk
+            self.tools = self.tools + [read_tool_output]
         self.system_template = system_template
         self.prompt_template = prompt_template
         self.response_template = response_template
@@ -453,8 +483,22 @@ class Agent:
         self.markdown = markdown
         self.max_reflect = max_reflect
         self.min_reflect = min_reflect
-        # Use the same model selection logic for reflect_llm
-        self.reflect_llm = reflect_llm or os.getenv('OPENAI_MODEL_NAME', 'gpt-4o')
+        # Reflection uses a small critic model unless one is configured
+        self.reflect_llm = reflect_llm or os.getenv('PRAISON_REFLECT_LLM') or os.getenv('OPENAI_MODEL_NAME', 'gpt-4o-mini')
+        self.reflect_confidence = reflect_confidence
+        self.last_reflection = None
+        if self._using_custom_llm:
+            if reflect_llm:
+                self.llm_instance.reflect_llm = reflect_llm
+            self.llm_instance.reflect_confidence = reflect_confidence
+        # Duplicate requests whose first token is late (see llm/hedging.py)
+        self.hedger = None
+        self._hedge_clients = {}
+        if hedging:
+            from ..llm.hedging import Hedger
+            self.hedger = Hedger(hedging)
+            if self._using_custom_llm and self.llm_instance.hedger is None:
+                self.llm_instance.hedger = self.hedger
         self.console = Console()  # Create a single console instance for the agent
         
         # Initialize system prompt
@@ -554,7 +598,7 @@ Your Goal: {self.goal}
 
                 # Otherwise treat as regular function
                 elif callable(func):
-                    return func(**arguments)
+                    return self._call_tool(func, arguments)
             except Exception as e:
                 error_msg = str(e)
                 logging.error(f"Error executing tool {function_name}: {error_msg}")
@@ -564,23 +608,151 @@ Your Goal: {self.goal}
         logging.error(error_msg)
         return {"error": error_msg}
 
+    def format_tool_result(self, function_name: str, result: Any) -> str:
+        """Serialize a tool result for the conversation within the tool output budget."""
+        return self.tool_output.format(function_name, result)
+
+    def _call_tool(self, func, arguments):
+        """Call a tool with this agent's tool cache active (disabled when cache=False)."""
+        from ..tools.cache import use_tool_cache
+        with use_tool_cache(self.tool_cache if self.cache else False):
+            return func(**arguments)
+
+    async def _acall_tool(self, func, arguments):
+        """Async version of _call_tool"""
+        from ..tools.cache import use_tool_cache
+        with use_tool_cache(self.tool_cache if self.cache else False):
+            return await func(**arguments)
+
+    @staticmethod
+    def _get_structured_output(output_model):
+        """Compiled (cached) schema for output_json/output_pydantic, or None."""
+        if not output_model:
+            return None
+        from ..llm.structured import get_structured_output
+        return get_structured_output(output_model)
+
+    def _structured_params(self, structured) -> Dict[str, Any]:
+        """response_format for native json_schema output, when the model supports it."""
+        if structured is None:
+            return {}
+        from ..llm.structured import supports_native_schema
+        return {"response_format": structured.response_format} if supports_native_schema(self.llm) else {}
+
+    def _ensure_structured_output(self, structured, messages, response_text, temperature) -> str:
+        """Validate structured output, asking the model once to repair an invalid reply."""
+        from ..llm.structured import ensure_valid
+
+        def complete(repair_messages):
+            response = client.chat.completions.create(
+                model=self.llm,
+                messages=repair_messages,
+                temperature=temperature,
+                **self._structured_params(structured)
+            )
+            return response.choices[0].message.content
+
+        return ensure_valid(structured, messages, response_text, complete)
+
+    async def _aensure_structured_output(self, structured, messages, response_text, temperature) -> str:
+        """Async version of _ensure_structured_output"""
+        from ..llm.structured import aensure_valid
+
+        async def complete(repair_messages):
+            response = await AsyncOpenAI().chat.completions.create(
+                model=self.llm,
+                messages=repair_messages,
+                temperature=temperature,
+                **self._structured_params(structured)
+            )
+            return response.choices[0].message.content
+
+        return await aensure_valid(structured, messages, response_text, complete)
+
+    def _hedge_target(self, is_async: bool = False):
+        """(model, latency key, client) for hedged requests: the fallback, or self.llm again."""
+        from ..llm.hedging import latency_key
+        fallback = self.hedger.fallback or {}
+        model = fallback.get("model", self.llm)
+        base_url, api_key = fallback.get("base_url"), fallback.get("api_key")
+        if not (base_url or api_key) and not is_async:
+            return model, latency_key(model), client
+        key = (base_url, api_key, is_async)
+        if key not in self._hedge_clients:
+            if base_url or api_key:
+                client_class = AsyncOpenAI if is_async else OpenAI
+                self._hedge_clients[key] = client_class(base_url=base_url, api_key=api_key or client.api_key)
+            else:
+                self._hedge_clients[key] = AsyncOpenAI()
+        return model, latency_key(model, base_url), self._hedge_clients[key]
+
+    def _create_completion(self, **params):
+        """client.chat.completions.create for self.llm, hedged when hedging is enabled."""
+        def start():
+            return client.chat.completions.create(model=self.llm, **params)
+
+        if self.hedger is None:
+            return start()
+        model, hedge_key, hedge_client = self._hedge_target()
+
+        def hedge_start():
+            return hedge_client.chat.completions.create(model=model, **params)
+
+        if params.get("stream"):
+            return self.hedger.stream(self.llm, start, hedge_key, hedge_start)
+        return self.hedger.call(self.llm, start, hedge_key, hedge_start)
+
+    async def _astream_completion(self, async_client, params):
+        """Stream a chat completion from async_client, hedged when hedging is enabled."""
+        if self.hedger is None:
+            async for chunk in await async_client.chat.completions.create(**params):
+                yield chunk
+            return
+        model, hedge_key, hedge_client = self._hedge_target(is_async=True)
+        hedged = self.hedger.astream(
+            params["model"],
+            lambda: async_client.chat.completions.create(**params),
+            hedge_key,
+            lambda: hedge_client.chat.completions.create(**{**params, "model": model})
+        )
+        async for chunk in hedged:
+            yield chunk
+
+    def _format_tools(self, tools) -> List[Dict]:
+        """Convert tool names, dicts and callables into OpenAI tool definitions."""
+        formatted_tools = []
+        for tool in tools or []:
+            if isinstance(tool, str):
+                tool_def = self._generate_tool_definition(tool)
+                if tool_def:
+                    formatted_tools.append(tool_def)
+            elif isinstance(tool, dict):
+                formatted_tools.append(tool)
+            elif hasattr(tool, "to_openai_tool"):
+                formatted_tools.append(tool.to_openai_tool())
+            elif callable(tool):
+                formatted_tools.append(self._generate_tool_definition(tool.__name__))
+        return formatted_tools
+
     def clear_history(self):
         self.chat_history = []
 
     def __str__(self):
         return f"Agent(name='{self.name}', role='{self.role}', goal='{self.goal}')"
 
-    def _process_stream_response(self, messages, temperature, start_time, formatted_tools=None, reasoning_steps=False):
+    def _process_stream_response(self, messages, temperature, start_time, formatted_tools=None, reasoning_steps=False, structured=None):
         """Process streaming response and return final response"""
         try:
             # Create the response stream
-            response_stream = client.chat.completions.create(
-                model=self.llm,
+            response_stream = self._create_completion(
                 messages=messages,
                 temperature=temperature,
                 tools=formatted_tools if formatted_tools else None,
-                stream=True
+                stream=True,
+                **self._structured_params(structured)
             )
+            # Stop reading early once structured output cannot be valid
+            validator = structured.validator() if structured else None
             
             full_response_text = ""
             reasoning_content = ""
@@ -600,6 +772,8 @@ Your Goal: {self.goal}
                     if chunk.choices[0].delta.content:
                         full_response_text += chunk.choices[0].delta.content
                         live.update(display_generating(full_response_text, start_time))
+                        if validator and not validator.feed(chunk.choices[0].delta.content):
+                            break
                     
                     # Update live display with reasoning content if enabled
                     if reasoning_steps and hasattr(chunk.choices[0].delta, "reasoning_content"):
@@ -617,7 +791,7 @@ Your Goal: {self.goal}
             display_error(f"Error in stream processing: {e}")
             return None
 
-    def _chat_completion(self, messages, temperature=0.2, tools=None, stream=True, reasoning_steps=False):
+    def _chat_completion(self, messages, temperature=0.2, tools=None, stream=True, reasoning_steps=False, structured=None):
         start_time = time.time()
         logging.debug(f"{self.name} sending messages to LLM: {messages}")
 
@@ -650,16 +824,17 @@ Your Goal: {self.goal}
                     temperature, 
                     start_time, 
                     formatted_tools=formatted_tools if formatted_tools else None,
-                    reasoning_steps=reasoning_steps
+                    reasoning_steps=reasoning_steps,
+                    structured=structured
                 )
             else:
                 # Process as regular non-streaming response
-                final_response = client.chat.completions.create(
-                    model=self.llm,
+                final_response = self._create_completion(
                     messages=messages,
                     temperature=temperature,
                     tools=formatted_tools if formatted_tools else None,
-                    stream=False
+                    stream=False,
+                    **self._structured_params(structured)
                 )
 
             tool_calls = getattr(final_response.choices[0].message, 'tool_calls', None)
@@ -679,7 +854,7 @@ Your Goal: {self.goal}
                         display_tool_call(f"Agent {self.name} is calling function '{function_name}' with arguments: {arguments}")
 
                     tool_result = self.execute_tool(function_name, arguments)
-                    results_str = json.dumps(tool_result) if tool_result else "Function returned an empty output"
+                    results_str = self.format_tool_result(function_name, tool_result) if tool_result else "Function returned an empty output"
 
                     if self.verbose:
                         display_tool_call(f"Function '{function_name}' returned: {results_str}")
@@ -697,14 +872,15 @@ Your Goal: {self.goal}
                         temperature, 
                         start_time,
                         formatted_tools=formatted_tools if formatted_tools else None,
-                        reasoning_steps=reasoning_steps
+                        reasoning_steps=reasoning_steps,
+                        structured=structured
                     )
                 else:
-                    final_response = client.chat.completions.create(
-                        model=self.llm,
+                    final_response = self._create_completion(
                         messages=messages,
                         temperature=temperature,
-                        stream=False
+                        stream=False,
+                        **self._structured_params(structured)
                     )
 
             return final_response
@@ -714,6 +890,8 @@ Your Goal: {self.goal}
             return None
 
     def chat(self, prompt, temperature=0.2, tools=None, output_json=None, output_pydantic=None, reasoning_steps=False):
+        if self.router is not None and id(self) not in _routing_agents.get():
+            return self._routed_chat(prompt, temperature, tools, output_json, output_pydantic, reasoning_steps)
         # Log all parameter values when in debug mode
         if logging.getLogger().getEffectiveLevel() == logging.DEBUG:
             param_info = {
@@ -767,6 +945,7 @@ Your Goal: {self.goal}
                     agent_role=self.role,
                     agent_tools=[t.__name__ if hasattr(t, '__name__') else str(t) for t in (tools if tools is not None else self.tools)],
                     execute_tool_fn=self.execute_tool,  # Pass tool execution function
+                    format_tool_result_fn=self.format_tool_result,
                     reasoning_steps=reasoning_steps
                 )
 
@@ -783,15 +962,15 @@ Your Goal: {self.goal}
                 display_error(f"Error in LLM chat: {e}")
                 return None
         else:
+            structured = self._get_structured_output(output_json or output_pydantic)
+            native_schema = bool(self._structured_params(structured))
             if self.use_system_prompt:
                 system_prompt = f"""{self.backstory}\n
 Your Role: {self.role}\n
 Your Goal: {self.goal}
                 """
-                if output_json:
-                    system_prompt += f"\nReturn ONLY a JSON object that matches this Pydantic model: {json.dumps(output_json.model_json_schema())}"
-                elif output_pydantic:
-                    system_prompt += f"\nReturn ONLY a JSON object that matches this Pydantic model: {json.dumps(output_pydantic.model_json_schema())}"
+                if structured and not native_schema:
+                    system_prompt += structured.instruction
             else:
                 system_prompt = None
 
@@ -802,7 +981,7 @@ Your Goal: {self.goal}
 
             # Modify prompt if output_json or output_pydantic is specified
             original_prompt = prompt
-            if output_json or output_pydantic:
+            if structured and not native_schema:
                 if isinstance(prompt, str):
                     prompt += "\nReturn ONLY a valid JSON object. No other text or explanation."
                 elif isinstance(prompt, list):
@@ -819,7 +998,6 @@ Your Goal: {self.goal}
                 messages.append({"role": "user", "content": prompt})
 
             final_response_text = None
-            reflection_count = 0
             start_time = time.time()
 
             while True:
@@ -842,7 +1020,7 @@ Your Goal: {self.goal}
                                 agent_tools=agent_tools
                             )
 
-                    response = self._chat_completion(messages, temperature=temperature, tools=tools if tools else None, reasoning_steps=reasoning_steps)
+                    response = self._chat_completion(messages, temperature=temperature, tools=tools if tools else None, reasoning_steps=reasoning_steps, structured=structured)
                     if not response:
                         return None
 
@@ -870,7 +1048,7 @@ Your Goal: {self.goal}
                                 messages.append({
                                     "role": "tool",
                                     "tool_call_id": tool_call.id,
-                                    "content": json.dumps(tool_result)
+                                    "content": self.format_tool_result(function_name, tool_result)
                                 })
                             else:
                                 messages.append({
@@ -879,13 +1057,14 @@ Your Goal: {self.goal}
                                     "content": "Function returned an empty output"
                                 })
                             
-                        response = self._chat_completion(messages, temperature=temperature)
+                        response = self._chat_completion(messages, temperature=temperature, structured=structured)
                         if not response:
                             return None
                         response_text = response.choices[0].message.content.strip()
 
                     # Handle output_json or output_pydantic if specified
                     if output_json or output_pydantic:
+                        response_text = self._ensure_structured_output(structured, messages, response_text, temperature)
                         # Add to chat history and return raw response
                         self.chat_history.append({"role": "user", "content": original_prompt})
                         self.chat_history.append({"role": "assistant", "content": response_text})
@@ -905,61 +1084,11 @@ Your Goal: {self.goal}
                             return response.choices[0].message.reasoning_content
                         return response_text
 
-                    reflection_prompt = f"""
-Reflect on your previous response: '{response_text}'.
-Identify any flaws, improvements, or actions.
-Provide a "satisfactory" status ('yes' or 'no').
-Output MUST be JSON with 'reflection' and 'satisfactory'.
-                    """
-                    logging.debug(f"{self.name} reflection attempt {reflection_count+1}, sending prompt: {reflection_prompt}")
-                    messages.append({"role": "user", "content": reflection_prompt})
-
-                    try:
-                        reflection_response = client.beta.chat.completions.parse(
-                            model=self.reflect_llm if self.reflect_llm else self.llm,
-                            messages=messages,
-                            temperature=temperature,
-                            response_format=ReflectionOutput
-                        )
-
-                        reflection_output = reflection_response.choices[0].message.parsed
-
-                        if self.verbose:
-                            display_self_reflection(f"Agent {self.name} self reflection (using {self.reflect_llm if self.reflect_llm else self.llm}): reflection='{reflection_output.reflection}' satisfactory='{reflection_output.satisfactory}'", console=self.console)
-
-                        messages.append({"role": "assistant", "content": f"Self Reflection: {reflection_output.reflection} Satisfactory?: {reflection_output.satisfactory}"})
-
-                        # Only consider satisfactory after minimum reflections
-                        if reflection_output.satisfactory == "yes" and reflection_count >= self.min_reflect - 1:
-                            if self.verbose:
-                                display_self_reflection("Agent marked the response as satisfactory after meeting minimum reflections", console=self.console)
-                            self.chat_history.append({"role": "user", "content": prompt})
-                            self.chat_history.append({"role": "assistant", "content": response_text})
-                            display_interaction(prompt, response_text, markdown=self.markdown, generation_time=time.time() - start_time, console=self.console)
-                            return response_text
-
-                        # Check if we've hit max reflections
-                        if reflection_count >= self.max_reflect - 1:
-                            if self.verbose:
-                                display_self_reflection("Maximum reflection count reached, returning current response", console=self.console)
-                            self.chat_history.append({"role": "user", "content": prompt})
-                            self.chat_history.append({"role": "assistant", "content": response_text})
-                            display_interaction(prompt, response_text, markdown=self.markdown, generation_time=time.time() - start_time, console=self.console)
-                            return response_text
-
-                        logging.debug(f"{self.name} reflection count {reflection_count + 1}, continuing reflection process")
-                        messages.append({"role": "user", "content": "Now regenerate your response using the reflection you made"})
-                        response = self._chat_completion(messages, temperature=temperature, tools=None, stream=True)
-                        response_text = response.choices[0].message.content.strip()
-                        reflection_count += 1
-                        continue  # Continue the loop for more reflections
-
-                    except Exception as e:
-                        display_error(f"Error in parsing self-reflection json {e}. Retrying", console=self.console)
-                        logging.error("Reflection parsing failed.", exc_info=True)
-                        messages.append({"role": "assistant", "content": f"Self Reflection failed."})
-                        reflection_count += 1
-                        continue  # Continue even after error to try again
+                    response_text = self._reflect(original_prompt, response_text, temperature)
+                    self.chat_history.append({"role": "user", "content": original_prompt})
+                    self.chat_history.append({"role": "assistant", "content": response_text})
+                    display_interaction(original_prompt, response_text, markdown=self.markdown, generation_time=time.time() - start_time, console=self.console)
+                    return response_text
                     
                 except Exception as e:
                     display_error(f"Error in chat: {e}", console=self.console)
@@ -972,6 +1101,139 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             
         return response_text
 
+    def _reflect(self, prompt, response_text: str, temperature: float) -> str:
+        """Critique and revise a response with a compact critic prompt (see llm/reflection.py)."""
+        from ..llm.reflection import ReflectionEngine, usage_from_response
+        engine = ReflectionEngine(
+            critic_model=self.reflect_llm or self.llm,
+            revise_model=self.llm,
+            max_reflect=self.max_reflect,
+            min_reflect=self.min_reflect,
+            confidence_threshold=self.reflect_confidence
+        )
+
+        def complete(messages, model, response_format):
+            params = {"response_format": response_format} if response_format else {}
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                **params
+            )
+            return response.choices[0].message.content or "", usage_from_response(response)
+
+        def on_step(step):
+            logging.debug(f"{self.name} reflection {step.iteration + 1}: confidence={step.confidence} tokens={step.prompt_tokens + step.completion_tokens} cost={step.cost}")
+            if self.verbose:
+                display_self_reflection(
+                    f"Agent {self.name} self reflection (using {step.critic_model}): reflection='{step.reflection}' "
+                    f"satisfactory='{'yes' if step.satisfactory else 'no'}' confidence={step.confidence:.2f}",
+                    console=self.console
+                )
+
+        try:
+            self.last_reflection = engine.run(prompt, response_text, complete, on_step=on_step)
+            return self.last_reflection.response
+        except Exception as e:
+            display_error(f"Error in self-reflection: {e}", console=self.console)
+            logging.error("Self-reflection failed.", exc_info=True)
+            return response_text
+
+    def _use_model(self, entry):
+        """Point the agent at one of its router's models."""
+        if self.router.is_litellm(entry):
+            self.llm_instance = self.router.llm_for(entry)
+            self.llm_instance.reflect_llm = self.llm_instance.reflect_llm or self.reflect_llm
+            self.llm_instance.reflect_confidence = self.reflect_confidence
+            if self.llm_instance.hedger is None:
+                self.llm_instance.hedger = self.hedger
+            self._using_custom_llm = True
+        else:
+            self.llm = entry
+            self._using_custom_llm = False
+
+    def _route_attempts(self, prompt, output_json, output_pydantic):
+        """Yield (model, prompt, structured, asked_confidence) for each step of the cascade."""
+        from ..llm.router import current_task_type
+        structured = self._get_structured_output(output_json or output_pydantic)
+        models = self.router.candidates(current_task_type() or self.role)
+        for i, entry in enumerate(models):
+            # Confidence is not requested from the last model (nothing to escalate to)
+            # or for structured output (it would break the JSON)
+            asked_confidence = bool(self.router.min_confidence) and structured is None and i < len(models) - 1
+            yield entry, self.router.confidence_prompt(prompt) if asked_confidence else prompt, structured, asked_confidence, i == len(models) - 1
+
+    def _route_result(self, entry, prompt, response, structured, asked_confidence, is_last, history_len, started):
+        """Record an attempt; returns (done, response)."""
+        from ..llm.router import current_task_type
+        task_type = current_task_type() or self.role
+        accepted, cleaned, reason = self.router.evaluate(response, structured, asked_confidence)
+        self.router.record(task_type, entry, accepted, time.time() - started)
+        # Keep the caller's prompt and the cleaned answer in history, not the routing scaffolding
+        del self.chat_history[history_len:]
+        if accepted or is_last:
+            if cleaned:
+                self.chat_history.append({"role": "user", "content": prompt})
+                self.chat_history.append({"role": "assistant", "content": cleaned})
+            return True, cleaned
+        logging.info(f"Agent {self.name}: escalating from {self.router.model_name(entry)} ({reason})")
+        return False, None
+
+    @contextlib.contextmanager
+    def _routing_scope(self):
+        """Mark this agent as routing in the current context and restore its model afterwards.
+
+        Overlapping routed calls share the agent, so the model it had before
+        the first of them is restored when the last one finishes.
+        """
+        token = _routing_agents.set(_routing_agents.get() + (id(self),))
+        with self._route_lock:
+            if self._active_routes == 0:
+                self._routed_from = {
+                    key: self.__dict__[key]
+                    for key in ("llm", "llm_instance", "_using_custom_llm")
+                    if key in self.__dict__
+                }
+            self._active_routes += 1
+        try:
+            yield
+        finally:
+            with self._route_lock:
+                self._active_routes -= 1
+                if self._active_routes == 0:
+                    for key in ("llm", "llm_instance"):
+                        if key not in self._routed_from:
+                            self.__dict__.pop(key, None)
+                    self.__dict__.update(self._routed_from)
+                    self._routed_from = None
+            _routing_agents.reset(token)
+
+    def _routed_chat(self, prompt, temperature, tools, output_json, output_pydantic, reasoning_steps):
+        """chat() through the router's model cascade."""
+        response = None
+        with self._routing_scope():
+            for entry, attempt_prompt, structured, asked_confidence, is_last in self._route_attempts(prompt, output_json, output_pydantic):
+                self._use_model(entry)
+                history_len, started = len(self.chat_history), time.time()
+                response = self.chat(attempt_prompt, temperature, tools, output_json, output_pydantic, reasoning_steps)
+                done, response = self._route_result(entry, prompt, response, structured, asked_confidence, is_last, history_len, started)
+                if done:
+                    break
+        return response
+
+    async def _arouted_chat(self, prompt, temperature, tools, output_json, output_pydantic, reasoning_steps):
+        """Async version of _routed_chat"""
+        response = None
+        with self._routing_scope():
+            for entry, attempt_prompt, structured, asked_confidence, is_last in self._route_attempts(prompt, output_json, output_pydantic):
+                self._use_model(entry)
+                history_len, started = len(self.chat_history), time.time()
+                response = await self.achat(attempt_prompt, temperature, tools, output_json, output_pydantic, reasoning_steps)
+                done, response = self._route_result(entry, prompt, response, structured, asked_confidence, is_last, history_len, started)
+                if done:
+                    break
+        return response
+
     def clean_json_output(self, output: str) -> str:
         """Clean and extract JSON from response text."""
         cleaned = output.strip()
@@ -986,6 +1248,8 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
 
     async def achat(self, prompt: str, temperature=0.2, tools=None, output_json=None, output_pydantic=None, reasoning_steps=False):
         """Async version of chat method. TODO: Requires Syncing with chat method.""" 
+        if self.router is not None and id(self) not in _routing_agents.get():
+            return await self._arouted_chat(prompt, temperature, tools, output_json, output_pydantic, reasoning_steps)
         # Log all parameter values when in debug mode
         if logging.getLogger().getEffectiveLevel() == logging.DEBUG:
             param_info = {
@@ -1034,6 +1298,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                         agent_role=self.role,
                         agent_tools=[t.__name__ if hasattr(t, '__name__') else str(t) for t in self.tools],
                         execute_tool_fn=self.execute_tool_async,
+                        format_tool_result_fn=self.format_tool_result,
                         reasoning_steps=reasoning_steps
                     )
 
@@ -1052,15 +1317,15 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                     return None
 
             # For OpenAI client
+            structured = self._get_structured_output(output_json or output_pydantic)
+            native_schema = bool(self._structured_params(structured))
             if self.use_system_prompt:
                 system_prompt = f"""{self.backstory}\n
 Your Role: {self.role}\n
 Your Goal: {self.goal}
                 """
-                if output_json:
-                    system_prompt += f"\nReturn ONLY a JSON object that matches this Pydantic model: {json.dumps(output_json.model_json_schema())}"
-                elif output_pydantic:
-                    system_prompt += f"\nReturn ONLY a JSON object that matches this Pydantic model: {json.dumps(output_pydantic.model_json_schema())}"
+                if structured and not native_schema:
+                    system_prompt += structured.instruction
             else:
                 system_prompt = None
 
@@ -1071,7 +1336,7 @@ Your Goal: {self.goal}
 
             # Modify prompt if output_json or output_pydantic is specified
             original_prompt = prompt
-            if output_json or output_pydantic:
+            if structured and not native_schema:
                 if isinstance(prompt, str):
                     prompt += "\nReturn ONLY a valid JSON object. No other text or explanation."
                 elif isinstance(prompt, list):
@@ -1106,19 +1371,7 @@ Your Goal: {self.goal}
                             )
 
                     # Format tools if provided
-                    formatted_tools = []
-                    if tools:
-                        for tool in tools:
-                            if isinstance(tool, str):
-                                tool_def = self._generate_tool_definition(tool)
-                                if tool_def:
-                                    formatted_tools.append(tool_def)
-                            elif isinstance(tool, dict):
-                                formatted_tools.append(tool)
-                            elif hasattr(tool, "to_openai_tool"):
-                                formatted_tools.append(tool.to_openai_tool())
-                            elif callable(tool):
-                                formatted_tools.append(self._generate_tool_definition(tool.__name__))
+                    formatted_tools = self._format_tools(tools)
 
                     # Create async OpenAI client
                     async_client = AsyncOpenAI()
@@ -1141,13 +1394,15 @@ Your Goal: {self.goal}
                             model=self.llm,
                             messages=messages,
                             temperature=temperature,
-                            response_format={"type": "json_object"}
+                            response_format=structured.response_format if native_schema else {"type": "json_object"}
+                        )
+                        response_text = await self._aensure_structured_output(
+                            structured, messages, response.choices[0].message.content or "", temperature
                         )
-                        # Return the raw response
                         if logging.getLogger().getEffectiveLevel() == logging.DEBUG:
                             total_time = time.time() - start_time
                             logging.debug(f"Agent.achat completed in {total_time:.2f} seconds")
-                        return response.choices[0].message.content
+                        return response_text
                     else:
                         response = await async_client.chat.completions.create(
                             model=self.llm,
@@ -1172,40 +1427,47 @@ Your Goal: {self.goal}
             return None
 
     async def _achat_completion(self, response, tools, reasoning_steps=False):
-        """Async version of _chat_completion method"""
+        """Async version of _chat_completion method.
+
+        The tool calls of one response run concurrently here. The sync
+        chat() path still runs them one at a time.
+        """
         try:
             message = response.choices[0].message
             if not hasattr(message, 'tool_calls') or not message.tool_calls:
                 return message.content
 
-            results = []
-            for tool_call in message.tool_calls:
+            async def run_tool_call(tool_call):
+                function_name = tool_call.function.name
                 try:
-                    function_name = tool_call.function.name
                     arguments = json.loads(tool_call.function.arguments)
                     
                     # Find the matching tool
                     tool = next((t for t in tools if t.__name__ == function_name), None)
                     if not tool:
                         display_error(f"Tool {function_name} not found")
-                        continue
+                        return None
                     
                     # Check if the tool is async
                     if asyncio.iscoroutinefunction(tool):
-                        result = await tool(**arguments)
-                    else:
-                        # Run sync function in executor to avoid blocking
-                        loop = asyncio.get_event_loop()
-                        result = await loop.run_in_executor(None, lambda: tool(**arguments))
-                    
-                    results.append(result)
+                        return await self._acall_tool(tool, arguments)
+                    # Run sync function in executor to avoid blocking
+                    loop = asyncio.get_event_loop()
+                    return await loop.run_in_executor(None, lambda: self._call_tool(tool, arguments))
                 except Exception as e:
                     display_error(f"Error executing tool {function_name}: {e}")
-                    results.append(None)
+                    return None
+
+            # Independent tool calls (e.g. several shell commands) run concurrently;
+            # only async callers (achat/astart) get this, chat() stays sequential
+            results = await asyncio.gather(*(run_tool_call(tc) for tc in message.tool_calls))
 
             # If we have results, format them into a response
             if results:
-                formatted_results = "\n".join([str(r) for r in results if r is not None])
+                formatted_results = "\n".join([
+                    self.format_tool_result(tc.function.name, r)
+                    for tc, r in zip(message.tool_calls, results) if r is not None
+                ])
                 if formatted_results:
                     messages = [
                         {"role": "system", "content": self.system_prompt},
@@ -1262,6 +1524,134 @@ Your Goal: {self.goal}
             display_error(f"Error in _achat_completion: {e}")
             return None
 
+    async def astream(self, prompt, temperature=0.2, tools=None) -> AsyncIterator[StreamEvent]:
+        """Stream the response as events while it is generated.
+
+        Yields "token" events for each piece of generated text, a
+        "tool_call_start" and "tool_result" event around every tool call,
+        and a final "done" event with the full response. Tool-calling turns
+        are followed up to max_iter times. The model stream is only read as
+        the caller iterates, so slow consumers apply backpressure.
+
+        Example:
+            async for event in agent.astream("Summarise today's news"):
+                if event.type == "token":
+                    print(event.content, end="")
+        """
+        tools = self.tools if tools is None else tools
+        formatted_tools = self._format_tools(tools)
+
+        if self.knowledge:
+            search_results = self.knowledge.search(prompt, agent_id=self.agent_id)
+            if search_results:
+                if isinstance(search_results, dict) and 'results' in search_results:
+                    knowledge_content = "\n".join([result['memory'] for result in search_results['results']])
+                else:
+                    knowledge_content = "\n".join(search_results)
+                prompt = f"{prompt}\n\nKnowledge: {knowledge_content}"
+
+        messages = []
+        if self.use_system_prompt:
+            messages.append({"role": "system", "content": self.system_prompt})
+        messages.extend(self.chat_history)
+        messages.append({"role": "user", "content": prompt})
+
+        if self._using_custom_llm:
+            def open_stream():
+                return self.llm_instance.astream_chunks(messages, temperature=temperature, tools=formatted_tools)
+        else:
+            async_client = AsyncOpenAI()
+
+            async def open_stream():
+                params = {"model": self.llm, "messages": messages, "temperature": temperature, "stream": True}
+                if formatted_tools:
+                    params["tools"] = formatted_tools
+                async for chunk in self._astream_completion(async_client, params):
+                    yield chunk
+
+        full_response_text = ""
+        for _ in range(max(1, self.max_iter)):
+            turn_text = ""
+            tool_calls: Dict[int, Dict[str, str]] = {}
+            async for chunk in open_stream():
+                if not chunk or not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if getattr(delta, "content", None):
+                    turn_text += delta.content
+                    yield StreamEvent(type="token", agent_name=self.name, content=delta.content)
+                # Tool call names and arguments arrive in fragments keyed by index
+                for tc in getattr(delta, "tool_calls", None) or []:
+                    call = tool_calls.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+                    if tc.id:
+                        call["id"] = tc.id
+                    if tc.function and tc.function.name:
+                        call["name"] += tc.function.name
+                    if tc.function and tc.function.arguments:
+                        call["arguments"] += tc.function.arguments
+            full_response_text += turn_text
+
+            if not tool_calls:
+                break
+
+            calls = [tool_calls[i] for i in sorted(tool_calls)]
+            messages.append({
+                "role": "assistant",
+                "content": turn_text or None,
+                "tool_calls": [
+                    {
+                        "id": call["id"],
+                        "type": "function",
+                        "function": {"name": call["name"], "arguments": call["arguments"]}
+                    }
+                    for call in calls
+                ]
+            })
+            for call in calls:
+                try:
+                    arguments = json.loads(call["arguments"]) if call["arguments"] else {}
+                except json.JSONDecodeError as e:
+                    arguments = {}
+                    result = {"error": f"Invalid arguments for {call['name']}: {e}"}
+                else:
+                    result = None
+                yield StreamEvent(
+                    type="tool_call_start", agent_name=self.name,
+                    tool_name=call["name"], tool_call_id=call["id"], arguments=arguments
+                )
+                if result is None:
+                    result = await self._astream_tool(tools, call["name"], arguments)
+                yield StreamEvent(
+                    type="tool_result", agent_name=self.name,
+                    tool_name=call["name"], tool_call_id=call["id"], result=result
+                )
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": call["id"],
+                    "content": self.format_tool_result(call["name"], result)
+                })
+        else:
+            logging.warning(f"Agent {self.name} stopped streaming after {self.max_iter} tool-calling turns")
+
+        self.chat_history.append({"role": "user", "content": prompt})
+        self.chat_history.append({"role": "assistant", "content": full_response_text})
+        yield StreamEvent(type="done", agent_name=self.name, content=full_response_text)
+
+    async def _astream_tool(self, tools, function_name: str, arguments: Dict[str, Any]) -> Any:
+        """Run a tool requested during astream, preferring the tools passed to that call."""
+        func = next((t for t in tools if callable(t) and getattr(t, "__name__", "") == function_name), None)
+        if func is None:
+            return await self.execute_tool_async(function_name, arguments)
+        try:
+            if inspect.iscoroutinefunction(func):
+                return await self._acall_tool(func, arguments)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, lambda: self._call_tool(func, arguments))
+        except Exception as e:
+            error_msg = f"Error executing tool {function_name}: {str(e)}"
+            logging.error(error_msg)
+            return {"error": error_msg}
+
     async def astart(self, prompt: str, **kwargs):
         """Async version of start method"""
         return await self.achat(prompt, **kwargs)
@@ -1292,11 +1682,11 @@ Your Goal: {self.goal}
             try:
                 if inspect.iscoroutinefunction(func):
                     logging.debug(f"Executing async function: {function_name}")
-                    result = await func(**arguments)
+                    result = await self._acall_tool(func, arguments)
                 else:
                     logging.debug(f"Executing sync function in executor: {function_name}")
                     loop = asyncio.get_event_loop()
-                    result = await loop.run_in_executor(None, lambda: func(**arguments))
+                    result = await loop.run_in_executor(None, lambda: self._call_tool(func, arguments))
                 
                 # Ensure result is JSON serializable
                 logging.debug(f"Raw result from tool: {result}")
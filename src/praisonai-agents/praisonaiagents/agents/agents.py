@@ -7,11 +7,13 @@ from pydantic import BaseModel
 from rich.text import Text
 from rich.panel import Panel
 from rich.console import Console
-from ..main import display_error, TaskOutput, error_logs, client
+from ..main import display_error, TaskOutput, StreamEvent, error_logs, client
 from ..agent.agent import Agent
 from ..task.task import Task
 from ..process.process import Process, LoopItems
+from .checkpoint import RunCheckpoint
 import asyncio
+import contextlib
 import uuid
 
 # Set up logger
@@ -44,8 +46,41 @@ def process_video(video_path: str, seconds_per_frame=2):
     video.release()
     return base64_frames
 
+def get_multimodal_message(text_prompt, images):
+    """Build a chat message content list from a prompt and image/video paths or URLs."""
+    content = [{"type": "text", "text": text_prompt}]
+
+    for img in images:
+        # If local file path for a valid image
+        if os.path.exists(img):
+            ext = os.path.splitext(img)[1].lower()
+            # If it's a .mp4, convert to frames
+            if ext == ".mp4":
+                frames = process_video(img, seconds_per_frame=1)
+                content.append({"type": "text", "text": "These are frames from the video."})
+                for f in frames:
+                    content.append({
+                        "type": "image_url",
+                        "image_url": {"url": f"data:image/jpg;base64,{f}"}
+                    })
+            else:
+                encoded = encode_file_to_base64(img)
+                content.append({
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:image/{ext.lstrip('.')};base64,{encoded}"
+                    }
+                })
+        else:
+            # Treat as a remote URL
+            content.append({
+                "type": "image_url",
+                "image_url": {"url": img}
+            })
+    return content
+
 class PraisonAIAgents:
-    def __init__(self, agents, tasks=None, verbose=0, completion_checker=None, max_retries=5, process="sequential", manager_llm=None, memory=False, memory_config=None, embedder=None, user_id=None, max_iter=10):
+    def __init__(self, agents, tasks=None, verbose=0, completion_checker=None, max_retries=5, process="sequential", manager_llm=None, memory=False, memory_config=None, embedder=None, user_id=None, max_iter=10, tool_cache=None, checkpoint=False, checkpoint_dir=None):
         # Add check at the start if memory is requested
         if memory:
             try:
@@ -61,6 +96,9 @@ class PraisonAIAgents:
             raise ValueError("At least one agent must be provided")
         
         self.run_id = str(uuid.uuid4())  # Auto-generate run_id
+        # Save task outputs, state and chat histories after each task so the run can be resumed
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint = RunCheckpoint(self.run_id, checkpoint_dir) if checkpoint else None
         self.user_id = user_id or "praison"  # Optional user_id
         self.max_iter = max_iter  # Add max_iter parameter
 
@@ -68,6 +106,13 @@ class PraisonAIAgents:
         for agent in agents:
             agent.user_id = self.user_id
 
+        # Share one tool result cache across all agents of the run
+        # (True: the process-wide cache; None leaves tool caching off)
+        self.tool_cache = tool_cache
+        if tool_cache is not None:
+            for agent in agents:
+                agent.tool_cache = tool_cache
+
         self.agents = agents
         self.tasks = {}
         if max_retries < 3:
@@ -183,6 +228,43 @@ class PraisonAIAgents:
                     task.memory = self.shared_memory
                     logger.info(f"Assigned shared memory to task {task.id}")
 
+    def _task_key(self, task_id) -> str:
+        """Checkpoint key of a task: its name, or its position when unnamed."""
+        task = self.tasks[task_id]
+        return task.name or f"task_{list(self.tasks).index(task_id)}"
+
+    def _resume(self, run_id: str) -> None:
+        """Load a run's checkpoint, restoring state and chat histories."""
+        checkpoint = RunCheckpoint(run_id, self.checkpoint_dir)
+        if not checkpoint.load():
+            raise ValueError(f"No checkpoint found for run {run_id} at {checkpoint.path}")
+        self.run_id = run_id
+        self.checkpoint = checkpoint
+        self._state.update(checkpoint.state)
+        for agent, saved in zip(self.agents, checkpoint.agents):
+            if agent.name == saved.get("name"):
+                agent.chat_history = saved.get("chat_history", [])
+            else:
+                logger.warning(f"Checkpoint: agent '{agent.name}' does not match saved agent '{saved.get('name')}', chat history not restored")
+        logger.info(f"Resuming run {run_id}: {sum(len(o) for o in checkpoint.tasks.values())} completed task runs saved")
+
+    def _restore_task(self, task_id) -> bool:
+        """Complete a task from the checkpoint when it already ran in the resumed run."""
+        if not self.checkpoint:
+            return False
+        task = self.tasks[task_id]
+        task_output = self.checkpoint.next_output(self._task_key(task_id), task.output_pydantic)
+        if task_output is None:
+            return False
+        task.result = task_output
+        task.status = "completed"
+        logger.info(f"Task {task_id} restored from checkpoint of run {self.run_id}")
+        return True
+
+    def _save_checkpoint(self, task_id, task_output) -> None:
+        if self.checkpoint:
+            self.checkpoint.record(self._task_key(task_id), task_output, self._state, self.agents)
+
     def add_task(self, task):
         task_id = self.task_id_counter
         task.id = task_id
@@ -207,35 +289,8 @@ class PraisonAIAgents:
             return True
         return len(agent_output.strip()) > 0
 
-    async def aexecute_task(self, task_id):
-        """Async version of execute_task method"""
-        if task_id not in self.tasks:
-            display_error(f"Error: Task with ID {task_id} does not exist")
-            return
-        task = self.tasks[task_id]
-        
-        # Only import multimodal dependencies if task has images
-        if task.images and task.status == "not started":
-            try:
-                import cv2
-                import base64
-                from moviepy import VideoFileClip
-            except ImportError as e:
-                display_error(f"Error: Missing required dependencies for image/video processing: {e}")
-                display_error("Please install with: pip install opencv-python moviepy")
-                task.status = "failed"
-                return None
-
-        if task.status == "not started":
-            task.status = "in progress"
-
-        executor_agent = task.agent
-
-        # Ensure tools are available from both task and agent
-        tools = task.tools or []
-        if executor_agent and executor_agent.tools:
-            tools.extend(executor_agent.tools)
-
+    def _build_task_prompt(self, task) -> str:
+        """Build the prompt for a task, including the results of its context."""
         task_prompt = f"""
 You need to do the following task: {task.description}.
 Expected Output: {task.expected_output}.
@@ -283,46 +338,95 @@ Context:
 {'  '.join(unique_contexts)}
 """
         task_prompt += "Please provide only the final result of your work. Do not add any conversation or extra explanation."
+        return task_prompt
+
+    def _build_task_output(self, task_id, task, executor_agent, agent_output: str) -> TaskOutput:
+        """Wrap an agent's output for a task, parsing JSON/Pydantic output when requested."""
+        task_output = TaskOutput(
+            description=task.description,
+            summary=task.description[:10],
+            raw=agent_output,
+            agent=executor_agent.name,
+            output_format="RAW"
+        )
+
+        if task.output_json:
+            cleaned = self.clean_json_output(agent_output)
+            try:
+                parsed = json.loads(cleaned)
+                task_output.json_dict = parsed
+                task_output.output_format = "JSON"
+            except:
+                logger.warning(f"Warning: Could not parse output of task {task_id} as JSON")
+                logger.debug(f"Output that failed JSON parsing: {agent_output}")
+
+        if task.output_pydantic:
+            cleaned = self.clean_json_output(agent_output)
+            try:
+                parsed = json.loads(cleaned)
+                pyd_obj = task.output_pydantic(**parsed)
+                task_output.pydantic = pyd_obj
+                task_output.output_format = "Pydantic"
+            except:
+                logger.warning(f"Warning: Could not parse output of task {task_id} as Pydantic Model")
+                logger.debug(f"Output that failed Pydantic parsing: {agent_output}")
+        return task_output
+
+    @staticmethod
+    def _route_task_type(task) -> str:
+        return task.name or task.description[:80]
+
+    def _routing_context(self, task):
+        """Tag LLM requests with the task so a Router agent can learn per task type."""
+        if getattr(task.agent, "router", None) is None:
+            return contextlib.nullcontext()
+        from ..llm.router import routing_task
+        return routing_task(self._route_task_type(task))
+
+    def _reject_routed_output(self, task) -> None:
+        """Tell a Router agent that completion_checker rejected its output, so the retry escalates."""
+        router = getattr(task.agent, "router", None)
+        if router is not None:
+            router.reject(self._route_task_type(task))
+
+    async def aexecute_task(self, task_id):
+        """Async version of execute_task method"""
+        if task_id not in self.tasks:
+            display_error(f"Error: Task with ID {task_id} does not exist")
+            return
+        task = self.tasks[task_id]
+        
+        # Only import multimodal dependencies if task has images
+        if task.images and task.status == "not started":
+            try:
+                import cv2
+                import base64
+                from moviepy import VideoFileClip
+            except ImportError as e:
+                display_error(f"Error: Missing required dependencies for image/video processing: {e}")
+                display_error("Please install with: pip install opencv-python moviepy")
+                task.status = "failed"
+                return None
+
+        if task.status == "not started":
+            task.status = "in progress"
+
+        executor_agent = task.agent
+
+        # Ensure tools are available from both task and agent
+        tools = task.tools or []
+        if executor_agent and executor_agent.tools:
+            tools.extend(executor_agent.tools)
+
+        task_prompt = self._build_task_prompt(task)
 
         if self.verbose >= 2:
             logger.info(f"Executing task {task_id}: {task.description} using {executor_agent.name}")
         logger.debug(f"Starting execution of task {task_id} with prompt:\n{task_prompt}")
 
         if task.images:
-            def _get_multimodal_message(text_prompt, images):
-                content = [{"type": "text", "text": text_prompt}]
-
-                for img in images:
-                    # If local file path for a valid image
-                    if os.path.exists(img):
-                        ext = os.path.splitext(img)[1].lower()
-                        # If it's a .mp4, convert to frames
-                        if ext == ".mp4":
-                            frames = process_video(img, seconds_per_frame=1)
-                            content.append({"type": "text", "text": "These are frames from the video."})
-                            for f in frames:
-                                content.append({
-                                    "type": "image_url",
-                                    "image_url": {"url": f"data:image/jpg;base64,{f}"}
-                                })
-                        else:
-                            encoded = encode_file_to_base64(img)
-                            content.append({
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/{ext.lstrip('.')};base64,{encoded}"
-                                }
-                            })
-                    else:
-                        # Treat as a remote URL
-                        content.append({
-                            "type": "image_url",
-                            "image_url": {"url": img}
-                        })
-                return content
-
             agent_output = await executor_agent.achat(
-                _get_multimodal_message(task_prompt, task.images),
+                get_multimodal_message(task_prompt, task.images),
                 tools=tools,
                 output_json=task.output_json,
                 output_pydantic=task.output_pydantic
@@ -336,35 +440,7 @@ Context:
             )
 
         if agent_output:
-            task_output = TaskOutput(
-                description=task.description,
-                summary=task.description[:10],
-                raw=agent_output,
-                agent=executor_agent.name,
-                output_format="RAW"
-            )
-
-            if task.output_json:
-                cleaned = self.clean_json_output(agent_output)
-                try:
-                    parsed = json.loads(cleaned)
-                    task_output.json_dict = parsed
-                    task_output.output_format = "JSON"
-                except:
-                    logger.warning(f"Warning: Could not parse output of task {task_id} as JSON")
-                    logger.debug(f"Output that failed JSON parsing: {agent_output}")
-
-            if task.output_pydantic:
-                cleaned = self.clean_json_output(agent_output)
-                try:
-                    parsed = json.loads(cleaned)
-                    pyd_obj = task.output_pydantic(**parsed)
-                    task_output.pydantic = pyd_obj
-                    task_output.output_format = "Pydantic"
-                except:
-                    logger.warning(f"Warning: Could not parse output of task {task_id} as Pydantic Model")
-                    logger.debug(f"Output that failed Pydantic parsing: {agent_output}")
-
+            task_output = self._build_task_output(task_id, task, executor_agent, agent_output)
             task.result = task_output
             return task_output
         else:
@@ -380,12 +456,15 @@ Context:
         if task.status == "completed":
             logger.info(f"Task with ID {task_id} is already completed")
             return
+        if self._restore_task(task_id):
+            return
 
         retries = 0
         while task.status != "completed" and retries < self.max_retries:
             logger.debug(f"Attempt {retries+1} for task {task_id}")
             if task.status in ["not started", "in progress"]:
-                task_output = await self.aexecute_task(task_id)
+                with self._routing_context(task):
+                    task_output = await self.aexecute_task(task_id)
                 if task_output and self.completion_checker(task, task_output.raw):
                     task.status = "completed"
                     # Run execute_callback for memory operations
@@ -413,10 +492,13 @@ Context:
                             logger.exception(e)
                             
                     self.save_output_to_file(task, task_output)
+                    self._save_checkpoint(task_id, task_output)
                     if self.verbose >= 1:
                         logger.info(f"Task {task_id} completed successfully.")
                 else:
                     task.status = "in progress"
+                    if task_output:
+                        self._reject_routed_output(task)
                     if self.verbose >= 1:
                         logger.info(f"Task {task_id} not completed, retrying")
                     await asyncio.sleep(1)
@@ -477,14 +559,17 @@ Context:
                 else:
                     self.run_task(task_id)
 
-    async def astart(self, content=None, return_dict=False, **kwargs):
+    async def astart(self, content=None, return_dict=False, resume_run_id=None, **kwargs):
         """Async version of start method
         
         Args:
             content: Optional content to add to all tasks' context
             return_dict: If True, returns the full results dictionary instead of only the final response
+            resume_run_id: Resume a checkpointed run, skipping the tasks it completed
             **kwargs: Additional arguments
         """
+        if resume_run_id:
+            self._resume(resume_run_id)
         if content:
             # Add content to context of all tasks
             for task in self.tasks.values():
@@ -494,6 +579,7 @@ Context:
                     task.context.append(content)
 
         await self.arun_all_tasks()
+        await asyncio.to_thread(self.flush_quality_checks)
         
         # Get results
         results = {
@@ -514,6 +600,125 @@ Context:
         # Return full results dict if return_dict is True or if no final result was found
         return results
 
+    async def astream(self, content=None):
+        """Run the tasks and stream their progress as StreamEvent objects.
+
+        Each task yields a "task_started" event, the executing agent's
+        "token", "tool_call_start" and "tool_result" events, and a
+        "task_completed" event whose result is the TaskOutput. A final
+        "done" event carries the last task's output. Tasks run one at a
+        time in the order chosen by the process, including tasks marked
+        async_execution, so that events from different tasks do not interleave.
+
+        Args:
+            content: Optional content to add to all tasks' context
+
+        Example:
+            async for event in agents.astream():
+                if event.type == "token":
+                    await websocket.send_text(event.content)
+        """
+        if content:
+            for task in self.tasks.values():
+                if isinstance(content, (str, list)):
+                    if not task.context:
+                        task.context = []
+                    task.context.append(content)
+
+        process = Process(
+            tasks=self.tasks,
+            agents=self.agents,
+            manager_llm=self.manager_llm,
+            verbose=self.verbose,
+            max_iter=self.max_iter
+        )
+        if self.process == "workflow":
+            task_ids = process.aworkflow()
+        elif self.process == "hierarchical":
+            task_ids = process.ahierarchical()
+        else:
+            task_ids = process.asequential()
+
+        last_output = None
+        async for task_id in task_ids:
+            if isinstance(task_id, Task):
+                task_id = self.add_task(task_id)
+            async for event in self._astream_task(task_id):
+                if event.type == "task_completed":
+                    last_output = event.content
+                yield event
+
+        await asyncio.to_thread(self.flush_quality_checks)
+        yield StreamEvent(type="done", content=last_output)
+
+    async def _astream_task(self, task_id):
+        """Stream one task's execution, retrying like arun_task."""
+        task = self.tasks[task_id]
+        if task.status == "completed":
+            return
+        if self._restore_task(task_id):
+            task_name = task.name or task.description
+            yield StreamEvent(
+                type="task_completed", task_id=task_id, task_name=task_name,
+                agent_name=task.agent.name if task.agent else None, content=task.result.raw, result=task.result
+            )
+            return
+        executor_agent = task.agent
+        tools = list(task.tools or [])
+        tools.extend(t for t in executor_agent.tools if t not in tools)
+        task_name = task.name or task.description
+
+        retries = 0
+        while task.status != "completed" and retries < self.max_retries:
+            task.status = "in progress"
+            yield StreamEvent(type="task_started", task_id=task_id, task_name=task_name, agent_name=executor_agent.name)
+
+            task_prompt = self._build_task_prompt(task)
+            structured = executor_agent._get_structured_output(task.output_json or task.output_pydantic)
+            if structured:
+                task_prompt += structured.instruction
+            prompt = get_multimodal_message(task_prompt, task.images) if task.images else task_prompt
+
+            agent_output = None
+            async for event in executor_agent.astream(prompt, tools=tools):
+                if event.type == "done":
+                    agent_output = event.content
+                    continue
+                event.task_id = task_id
+                event.task_name = task_name
+                yield event
+
+            if agent_output and self.completion_checker(task, agent_output):
+                task_output = self._build_task_output(task_id, task, executor_agent, agent_output)
+                task.result = task_output
+                task.status = "completed"
+                try:
+                    task.execute_callback_sync(task_output)
+                except Exception as e:
+                    logger.error(f"Error executing memory callback for task {task_id}: {e}")
+                if task.callback:
+                    try:
+                        if asyncio.iscoroutinefunction(task.callback):
+                            await task.callback(task_output)
+                        else:
+                            task.callback(task_output)
+                    except Exception as e:
+                        logger.error(f"Error executing task callback for task {task_id}: {e}")
+                self.save_output_to_file(task, task_output)
+                self._save_checkpoint(task_id, task_output)
+                yield StreamEvent(
+                    type="task_completed", task_id=task_id, task_name=task_name,
+                    agent_name=executor_agent.name, content=agent_output, result=task_output
+                )
+            else:
+                retries += 1
+                if self.verbose >= 1:
+                    logger.info(f"Task {task_id} not completed, retrying")
+
+        if task.status != "completed":
+            task.status = "failed"
+            logger.info(f"Task {task_id} failed after {self.max_retries} retries.")
+
     def save_output_to_file(self, task, task_output):
         if task.output_file:
             try:
@@ -622,40 +827,8 @@ Context:
         logger.debug(f"Starting execution of task {task_id} with prompt:\n{task_prompt}")
 
         if task.images:
-            def _get_multimodal_message(text_prompt, images):
-                content = [{"type": "text", "text": text_prompt}]
-
-                for img in images:
-                    # If local file path for a valid image
-                    if os.path.exists(img):
-                        ext = os.path.splitext(img)[1].lower()
-                        # If it's a .mp4, convert to frames
-                        if ext == ".mp4":
-                            frames = process_video(img, seconds_per_frame=1)
-                            content.append({"type": "text", "text": "These are frames from the video."})
-                            for f in frames:
-                                content.append({
-                                    "type": "image_url",
-                                    "image_url": {"url": f"data:image/jpg;base64,{f}"}
-                                })
-                        else:
-                            encoded = encode_file_to_base64(img)
-                            content.append({
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/{ext.lstrip('.')};base64,{encoded}"
-                                }
-                            })
-                    else:
-                        # Treat as a remote URL
-                        content.append({
-                            "type": "image_url",
-                            "image_url": {"url": img}
-                        })
-                return content
-
             agent_output = executor_agent.chat(
-                _get_multimodal_message(task_prompt, task.images),
+                get_multimodal_message(task_prompt, task.images),
                 tools=task.tools,
                 output_json=task.output_json,
                 output_pydantic=task.output_pydantic
@@ -724,12 +897,15 @@ Context:
         if task.status == "completed":
             logger.info(f"Task with ID {task_id} is already completed")
             return
+        if self._restore_task(task_id):
+            return
 
         retries = 0
         while task.status != "completed" and retries < self.max_retries:
             logger.debug(f"Attempt {retries+1} for task {task_id}")
             if task.status in ["not started", "in progress"]:
-                task_output = self.execute_task(task_id)
+                with self._routing_context(task):
+                    task_output = self.execute_task(task_id)
                 if task_output and self.completion_checker(task, task_output.raw):
                     task.status = "completed"
                     # Run execute_callback for memory operations
@@ -757,10 +933,13 @@ Context:
                             logger.exception(e)
                             
                     self.save_output_to_file(task, task_output)
+                    self._save_checkpoint(task_id, task_output)
                     if self.verbose >= 1:
                         logger.info(f"Task {task_id} completed successfully.")
                 else:
                     task.status = "in progress"
+                    if task_output:
+                        self._reject_routed_output(task)
                     if self.verbose >= 1:
                         logger.info(f"Task {task_id} not completed, retrying")
                     time.sleep(1)
@@ -798,6 +977,15 @@ Context:
                     task_id = self.add_task(task_id)
                 self.run_task(task_id)
 
+    def flush_quality_checks(self):
+        """Wait for background quality scoring of task outputs to finish"""
+        memories = {id(t.memory): t.memory for t in self.tasks.values() if t.memory}
+        for memory in memories.values():
+            try:
+                memory.flush_quality_checks()
+            except Exception as e:
+                logger.error(f"Error flushing quality checks: {e}")
+
     def get_task_status(self, task_id):
         if task_id in self.tasks:
             return self.tasks[task_id].status
@@ -816,20 +1004,29 @@ Context:
             return str(self.tasks[task_id])
         return None
 
+    def tool_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics of the tool result cache used by this run's agents"""
+        from ..tools.cache import ToolCache, get_tool_cache
+        cache = self.tool_cache if isinstance(self.tool_cache, ToolCache) else get_tool_cache()
+        return cache.stats()
+
     def get_agent_details(self, agent_name):
         agent = [task.agent for task in self.tasks.values() if task.agent and task.agent.name == agent_name]
         if agent:
             return str(agent[0])
         return None
 
-    def start(self, content=None, return_dict=False, **kwargs):
+    def start(self, content=None, return_dict=False, resume_run_id=None, **kwargs):
         """Start agent execution with optional content and config
         
         Args:
             content: Optional content to add to all tasks' context
             return_dict: If True, returns the full results dictionary instead of only the final response
+            resume_run_id: Resume a checkpointed run, skipping the tasks it completed
             **kwargs: Additional arguments
         """
+        if resume_run_id:
+            self._resume(resume_run_id)
         if content:
             # Add content to context of all tasks
             for task in self.tasks.values():
@@ -842,6 +1039,7 @@ Context:
                 
         # Run tasks as before
         self.run_all_tasks()
+        self.flush_quality_checks()
         
         # Get results
         results = {
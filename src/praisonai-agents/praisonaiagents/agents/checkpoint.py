@@ -0,0 +1,126 @@
+"""Run checkpoints for PraisonAIAgents.
+
+Usage:
+from praisonaiagents import PraisonAIAgents
+
+agents = PraisonAIAgents(agents=[...], tasks=[...], checkpoint=True)
+agents.start()  # saves .praison/runs/<agents.run_id>.json after every task
+
+# After a crash, with the same agents and tasks:
+agents = PraisonAIAgents(agents=[...], tasks=[...], checkpoint=True)
+agents.start(resume_run_id="<run_id of the crashed run>")
+
+A checkpoint holds the output of every completed task, the run state
+(set_state / get_state) and the agents' chat histories. On resume the state
+and histories are restored and completed tasks are not run again: their
+saved output is used instead.
+
+Tasks are matched by name (by position when unnamed), so tasks created at
+run time, such as the per-row tasks of a loop task's CSV file, are matched
+too. A task that ran several times (in a workflow loop) is restored once
+per saved run, in order.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ..main import TaskOutput
+
+DEFAULT_CHECKPOINT_DIR = ".praison/runs"
+
+
+def _jsonable(state: Dict[str, Any]) -> Dict[str, Any]:
+    """State values that can be saved; others are skipped with a warning."""
+    result = {}
+    for key, value in state.items():
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            logging.warning(f"Checkpoint: state '{key}' is not JSON serializable and will not be restored")
+            continue
+        result[key] = value
+    return result
+
+
+class RunCheckpoint:
+    """Local JSON store of one run's progress."""
+
+    def __init__(self, run_id: str, directory: Optional[str] = None):
+        self.run_id = run_id
+        self.directory = directory or DEFAULT_CHECKPOINT_DIR
+        self.tasks: Dict[str, List[Dict[str, Any]]] = {}
+        self.state: Dict[str, Any] = {}
+        self.agents: List[Dict[str, Any]] = []
+        self._consumed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f"{self.run_id}.json")
+
+    def load(self) -> bool:
+        """Read the checkpoint file; returns False when there is none."""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        with self._lock:
+            self.tasks = data.get("tasks", {})
+            self.state = data.get("state", {})
+            self.agents = data.get("agents", [])
+            self._consumed = {}
+        return True
+
+    def next_output(self, key: str, output_pydantic: Any = None) -> Optional[TaskOutput]:
+        """Saved output for the next run of a task, or None when it has not completed before."""
+        with self._lock:
+            outputs = self.tasks.get(key, [])
+            index = self._consumed.get(key, 0)
+            if index >= len(outputs):
+                return None
+            self._consumed[key] = index + 1
+            data = dict(outputs[index])
+        pydantic_data = data.pop("pydantic", None)
+        output = TaskOutput(**data)
+        if pydantic_data is not None and output_pydantic is not None:
+            try:
+                output.pydantic = output_pydantic.model_validate(pydantic_data)
+            except Exception as e:
+                logging.warning(f"Checkpoint: could not restore {output_pydantic.__name__} output of '{key}': {e}")
+        return output
+
+    def record(self, key: str, output: TaskOutput, state: Dict[str, Any], agents: List[Any]) -> None:
+        """Add a completed task's output, snapshot state and chat histories, and save."""
+        data = output.model_dump(exclude={"pydantic"})
+        data["pydantic"] = output.pydantic.model_dump() if output.pydantic is not None else None
+        with self._lock:
+            self.tasks.setdefault(key, []).append(data)
+            # Restored outputs of this task are already saved, so they are not consumed again
+            self._consumed[key] = self._consumed.get(key, 0) + 1
+            self.state = _jsonable(state)
+            self.agents = [
+                {"name": agent.name, "chat_history": list(getattr(agent, "chat_history", []))}
+                for agent in agents
+            ]
+            payload = json.dumps({
+                "run_id": self.run_id,
+                "updated_at": time.time(),
+                "tasks": self.tasks,
+                "state": self.state,
+                "agents": self.agents
+            }, default=str)
+            self._write(payload)
+
+    def _write(self, payload: str) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning(f"Could not save run checkpoint to {self.path}: {e}")
@@ -0,0 +1,343 @@
+"""Hedged LLM requests to cut tail latency.
+
+Usage:
+from praisonaiagents import Agent
+
+agent = Agent(
+    instructions="...",
+    hedging={"percentile": 95, "fallback": {"model": "gpt-4o-mini"}}
+)
+
+When no first token has arrived after the hedge delay, a duplicate request
+is sent (to the same model, or to the fallback model / base_url). Whichever
+request streams first is used and the other one is cancelled.
+
+The hedge delay is a percentile of the model's observed time to first token,
+kept in a per-model latency histogram, so only the slowest requests are
+duplicated (about 5% of them with the default 95th percentile). Non-streaming
+requests are timed to the full response and keep a separate histogram (key
+suffix ":full"), so they neither distort nor are hedged by the streaming
+time to first token; they are only hedged once that histogram has
+min_samples.
+
+Config (Agent(hedging=...) or LLM(..., hedging=...)), True uses the defaults:
+{
+  "percentile": 95,        # hedge requests slower than this percentile
+  "min_samples": 20,       # samples needed before the percentile is trusted
+  "initial_delay": 2.0,    # hedge delay (seconds) until then
+  "min_delay": 0.1,
+  "max_delay": 10.0,
+  "fallback": None         # {"model": ..., "base_url": ..., "api_key": ...}
+}
+"""
+
+import asyncio
+import bisect
+import inspect
+import logging
+import queue
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+DEFAULT_HEDGING = {
+    "percentile": 95,
+    "min_samples": 20,
+    "initial_delay": 2.0,
+    "min_delay": 0.1,
+    "max_delay": 10.0,
+    "fallback": None
+}
+
+# Log-spaced bucket upper bounds from 10ms to ~3 minutes
+_BUCKETS = [0.01 * 1.25 ** i for i in range(45)]
+
+_EMPTY = object()
+
+
+class LatencyHistogram:
+    """Time-to-first-token histogram for one model.
+
+    Counts are halved once max_samples is reached, so the percentiles follow
+    the model's recent latency rather than its whole history.
+    """
+
+    def __init__(self, max_samples: int = 1000):
+        self.max_samples = max_samples
+        self.counts = [0] * (len(_BUCKETS) + 1)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(_BUCKETS, seconds)] += 1
+            self.count += 1
+            if self.count >= self.max_samples:
+                self.counts = [c // 2 for c in self.counts]
+                self.count = sum(self.counts)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bound of the bucket holding the p-th percentile (None when empty)."""
+        with self._lock:
+            if not self.count:
+                return None
+            target = self.count * p / 100
+            seen = 0
+            for i, c in enumerate(self.counts):
+                seen += c
+                if seen >= target and c:
+                    return _BUCKETS[i] if i < len(_BUCKETS) else _BUCKETS[-1]
+        return _BUCKETS[-1]
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def latency_key(model: str, base_url: Optional[str] = None) -> str:
+    return f"{model}@{base_url}" if base_url else model
+
+
+def full_response_key(key: str) -> str:
+    """Histogram key for non-streaming requests, timed to the whole response."""
+    return f"{key}:full"
+
+
+def get_latency_histogram(key: str) -> LatencyHistogram:
+    """Process-wide histogram for a model (and base_url), shared by all agents."""
+    with _histograms_lock:
+        if key not in _histograms:
+            _histograms[key] = LatencyHistogram()
+        return _histograms[key]
+
+
+def _close(stream: Any) -> None:
+    """Best-effort close of an abandoned stream so its connection is released."""
+    for target in (stream, getattr(stream, "response", None)):
+        close = getattr(target, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logging.debug(f"Error closing hedged stream: {e}")
+            return
+
+
+async def _aclose(stream: Any) -> None:
+    for target in (stream, getattr(stream, "response", None)):
+        close = getattr(target, "aclose", None) or getattr(target, "close", None)
+        if callable(close):
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logging.debug(f"Error closing hedged stream: {e}")
+            return
+
+
+class Hedger:
+    """Sends a duplicate request when the first token is late and keeps the faster stream."""
+
+    def __init__(self, config: Union[bool, Dict[str, Any], None] = True):
+        config = {**DEFAULT_HEDGING, **(config if isinstance(config, dict) else {})}
+        self.percentile = config["percentile"]
+        self.min_samples = config["min_samples"]
+        self.initial_delay = config["initial_delay"]
+        self.min_delay = config["min_delay"]
+        self.max_delay = config["max_delay"]
+        self.fallback: Optional[Dict[str, Any]] = config["fallback"]
+        if self.fallback is not None and not isinstance(self.fallback, dict):
+            self.fallback = {"model": self.fallback}
+        # Number of requests that were hedged, and how many the hedge won
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def delay(self, key: str) -> float:
+        """Seconds to wait for the first token before hedging a request to this model."""
+        histogram = get_latency_histogram(key)
+        value = histogram.percentile(self.percentile) if histogram.count >= self.min_samples else None
+        if value is None:
+            value = self.initial_delay
+        return min(self.max_delay, max(self.min_delay, value))
+
+    def stream(
+        self,
+        key: str,
+        start: Callable[[], Iterable],
+        hedge_key: Optional[str] = None,
+        hedge_start: Optional[Callable[[], Iterable]] = None
+    ) -> Iterator:
+        """Yield chunks from start(), hedged with hedge_start() (default: start again).
+
+        Threads cannot be interrupted mid-request, so a losing request is
+        closed as soon as it returns its first chunk.
+        """
+        attempts = [(key, start), (hedge_key or key, hedge_start or start)]
+        results: "queue.Queue" = queue.Queue()
+        lock = threading.Lock()
+        state = {"decided": False}
+
+        def attempt(index: int) -> None:
+            attempt_key, starter = attempts[index]
+            began = time.monotonic()
+            stream = None
+            try:
+                stream = starter()
+                iterator = iter(stream)
+                chunk = next(iterator, _EMPTY)
+                get_latency_histogram(attempt_key).record(time.monotonic() - began)
+                result = (index, stream, iterator, chunk, None)
+            except Exception as e:
+                result = (index, stream, None, None, e)
+            with lock:
+                if not state["decided"]:
+                    results.put(result)
+                    return
+            if stream is not None:
+                _close(stream)
+
+        def launch(index: int) -> None:
+            threading.Thread(target=attempt, args=(index,), daemon=True).start()
+
+        launch(0)
+        launched, finished, errors = 1, 0, []
+        winner = None
+        timeout = self.delay(key)
+        while winner is None:
+            try:
+                index, stream, iterator, chunk, error = results.get(timeout=timeout)
+            except queue.Empty:
+                index = error = None
+            else:
+                finished += 1
+            if index is not None and error is None:
+                winner = (index, stream, iterator, chunk)
+                break
+            if error is not None:
+                errors.append(error)
+            if launched < len(attempts):
+                # Late first token, or the first request failed
+                logging.debug(f"Hedging request to {key} after {timeout:.2f}s")
+                self.hedged += 1
+                launch(launched)
+                launched += 1
+                timeout = None
+            elif finished >= launched:
+                raise errors[0]
+
+        with lock:
+            state["decided"] = True
+            leftovers = []
+            while not results.empty():
+                leftovers.append(results.get_nowait())
+        for _, stream, _, _, _ in leftovers:
+            if stream is not None:
+                _close(stream)
+
+        index, stream, iterator, chunk = winner
+        if index > 0:
+            self.hedge_wins += 1
+        try:
+            if chunk is not _EMPTY:
+                yield chunk
+            yield from iterator
+        finally:
+            _close(stream)
+
+    def call(
+        self,
+        key: str,
+        start: Callable[[], Any],
+        hedge_key: Optional[str] = None,
+        hedge_start: Optional[Callable[[], Any]] = None
+    ) -> Any:
+        """Hedge a non-streaming request; the whole response counts as the first token.
+
+        Latency is recorded under full_response_key(key), apart from the
+        streaming time to first token of the same model. Until that histogram
+        has min_samples, requests are timed but not hedged: the initial delay
+        is meant for a first token, not a whole response.
+        """
+        histogram = get_latency_histogram(full_response_key(key))
+        if histogram.count < self.min_samples:
+            began = time.monotonic()
+            result = start()
+            histogram.record(time.monotonic() - began)
+            return result
+        return next(self.stream(
+            full_response_key(key),
+            lambda: [start()],
+            full_response_key(hedge_key) if hedge_key else None,
+            (lambda: [hedge_start()]) if hedge_start else None
+        ))
+
+    async def astream(
+        self,
+        key: str,
+        start: Callable[[], Awaitable[Any]],
+        hedge_key: Optional[str] = None,
+        hedge_start: Optional[Callable[[], Awaitable[Any]]] = None
+    ) -> AsyncIterator:
+        """Async version of stream; the losing request is cancelled."""
+        attempts = [(key, start), (hedge_key or key, hedge_start or start)]
+
+        async def attempt(index: int):
+            attempt_key, starter = attempts[index]
+            began = time.monotonic()
+            stream = await starter()
+            try:
+                iterator = stream.__aiter__()
+                try:
+                    chunk = await iterator.__anext__()
+                except StopAsyncIteration:
+                    chunk = _EMPTY
+            except BaseException:
+                await _aclose(stream)
+                raise
+            get_latency_histogram(attempt_key).record(time.monotonic() - began)
+            return stream, iterator, chunk
+
+        tasks: List[asyncio.Task] = [asyncio.create_task(attempt(0))]
+        pending = set(tasks)
+        errors: List[BaseException] = []
+        winner = None
+        timeout = self.delay(key)
+        try:
+            while winner is None:
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                    elif winner is None:
+                        winner = task
+                if winner is not None:
+                    break
+                if len(tasks) < len(attempts):
+                    logging.debug(f"Hedging request to {key} after {timeout:.2f}s")
+                    self.hedged += 1
+                    task = asyncio.create_task(attempt(len(tasks)))
+                    tasks.append(task)
+                    pending.add(task)
+                    timeout = None
+                elif not pending:
+                    raise errors[0]
+        finally:
+            for task in tasks:
+                if task is winner:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None:
+                    await _aclose(task.result()[0])
+
+        stream, iterator, chunk = winner.result()
+        if winner is not tasks[0]:
+            self.hedge_wins += 1
+        try:
+            if chunk is not _EMPTY:
+                yield chunk
+            async for chunk in iterator:
+                yield chunk
+        finally:
+            await _aclose(stream)
@@ -12,8 +12,8 @@ from ..main import (
     display_interaction,
     display_generating,
     display_self_reflection,
-    ReflectionOutput,
 )
+from .structured import get_structured_output, supports_native_schema, ensure_valid, aensure_valid
 from rich.console import Console
 from rich.live import Live
 
@@ -168,6 +168,13 @@ class LLM:
         self.max_reflect = extra_settings.get('max_reflect', 3)
         self.min_reflect = extra_settings.get('min_reflect', 1)
         self.reasoning_steps = extra_settings.get('reasoning_steps', False)
+        self.reflect_llm = extra_settings.get('reflect_llm')
+        self.reflect_confidence = extra_settings.get('reflect_confidence', 0.8)
+        self.last_reflection = None
+        self.hedger = None
+        if extra_settings.get('hedging'):
+            from .hedging import Hedger
+            self.hedger = Hedger(extra_settings['hedging'])
         
         # Enable error dropping for cleaner output
         litellm.drop_params = True
@@ -205,6 +212,15 @@ class LLM:
             }
             logging.debug(f"LLM instance initialized with: {json.dumps(debug_info, indent=2, default=str)}")
 
+    @staticmethod
+    def _format_tool_result(function_name: str, tool_result: Any, format_tool_result_fn: Optional[Callable] = None) -> str:
+        """Serialize a tool result for the conversation, through the agent's formatter if given."""
+        if not tool_result:
+            return "Function returned an empty output"
+        if format_tool_result_fn:
+            return format_tool_result_fn(function_name, tool_result)
+        return json.dumps(tool_result)
+
     def get_response(
         self,
         prompt: Union[str, List[Dict]],
@@ -224,6 +240,7 @@ class LLM:
         agent_role: Optional[str] = None,
         agent_tools: Optional[List[str]] = None,
         execute_tool_fn: Optional[Callable] = None,
+        format_tool_result_fn: Optional[Callable] = None,
         **kwargs
     ) -> str:
         """Enhanced get_response with all OpenAI-like features"""
@@ -301,13 +318,18 @@ class LLM:
                 if not formatted_tools:
                     formatted_tools = None
             
+            # The schema is compiled once per output model; models with native
+            # json_schema support get it as response_format instead of in the prompt
+            structured = get_structured_output(output_json or output_pydantic) if (output_json or output_pydantic) else None
+            native_schema = structured is not None and supports_native_schema(self.model)
+            if native_schema:
+                kwargs["response_format"] = structured.response_format
+
             # Build messages list
             messages = []
             if system_prompt:
-                if output_json:
-                    system_prompt += f"\nReturn ONLY a JSON object that matches this Pydantic model: {json.dumps(output_json.model_json_schema())}"
-                elif output_pydantic:
-                    system_prompt += f"\nReturn ONLY a JSON object that matches this Pydantic model: {json.dumps(output_pydantic.model_json_schema())}"
+                if structured and not native_schema:
+                    system_prompt += structured.instruction
                 messages.append({"role": "system", "content": system_prompt})
             
             if chat_history:
@@ -315,7 +337,7 @@ class LLM:
 
             # Handle prompt modifications for JSON output
             original_prompt = prompt
-            if output_json or output_pydantic:
+            if structured and not native_schema:
                 if isinstance(prompt, str):
                     prompt += "\nReturn ONLY a valid JSON object. No other text or explanation."
                 elif isinstance(prompt, list):
@@ -331,7 +353,6 @@ class LLM:
                 messages.append({"role": "user", "content": prompt})
 
             start_time = time.time()
-            reflection_count = 0
 
             while True:
                 try:
@@ -385,6 +406,8 @@ class LLM:
                     
                     # Otherwise do the existing streaming approach
                     else:
+                        # Stop reading early once structured output cannot be valid
+                        validator = structured.validator() if structured else None
                         if verbose:
                             with Live(display_generating("", start_time), console=console, refresh_per_second=4) as live:
                                 response_text = ""
@@ -400,6 +423,8 @@ class LLM:
                                         content = chunk.choices[0].delta.content
                                         response_text += content
                                         live.update(display_generating(response_text, start_time))
+                                        if validator and not validator.feed(content):
+                                            break
                         else:
                             # Non-verbose mode, just collect the response
                             response_text = ""
@@ -413,6 +438,8 @@ class LLM:
                             ):
                                 if chunk and chunk.choices and chunk.choices[0].delta.content:
                                     response_text += chunk.choices[0].delta.content
+                                    if validator and not validator.feed(chunk.choices[0].delta.content):
+                                        break
 
                         response_text = response_text.strip()
 
@@ -455,19 +482,14 @@ class LLM:
                                 
                                 logging.debug(f"[TOOL_EXEC_DEBUG] About to display tool call with message: {display_message}")
                                 display_tool_call(display_message, console=console)
-                                
-                                messages.append({
-                                    "role": "tool",
-                                    "tool_call_id": tool_call["id"],
-                                    "content": json.dumps(tool_result)
-                                })
                             else:
                                 logging.debug("[TOOL_EXEC_DEBUG] Verbose mode off, not displaying tool call")
-                                messages.append({
-                                    "role": "tool",
-                                    "tool_call_id": tool_call["id"],
-                                    "content": "Function returned an empty output"
-                                })
+
+                            messages.append({
+                                "role": "tool",
+                                "tool_call_id": tool_call["id"],
+                                "content": self._format_tool_result(function_name, tool_result, format_tool_result_fn)
+                            })
 
                         # If reasoning_steps is True, do a single non-streaming call
                         if reasoning_steps:
@@ -530,6 +552,7 @@ class LLM:
 
                     # Handle output formatting
                     if output_json or output_pydantic:
+                        response_text = self._ensure_structured(structured, messages, response_text, temperature, kwargs)
                         self.chat_history.append({"role": "user", "content": original_prompt})
                         self.chat_history.append({"role": "assistant", "content": response_text})
                         if verbose:
@@ -547,115 +570,14 @@ class LLM:
                         return response_text
 
                     # Handle self-reflection
-                    reflection_prompt = f"""
-Reflect on your previous response: '{response_text}'.
-Identify any flaws, improvements, or actions.
-Provide a "satisfactory" status ('yes' or 'no').
-Output MUST be JSON with 'reflection' and 'satisfactory'.
-                    """
-                    
-                    reflection_messages = messages + [
-                        {"role": "assistant", "content": response_text},
-                        {"role": "user", "content": reflection_prompt}
-                    ]
-
-                    # If reasoning_steps is True, do a single non-streaming call to capture reasoning
-                    if reasoning_steps:
-                        reflection_resp = litellm.completion(
-                            model=self.model,
-                            messages=reflection_messages,
-                            temperature=temperature,
-                            stream=False,  # Force non-streaming
-                            response_format={"type": "json_object"},
-                            **{k:v for k,v in kwargs.items() if k != 'reasoning_steps'}
-                        )
-                        # Grab reflection text and optional reasoning
-                        reasoning_content = reflection_resp["choices"][0]["message"].get("provider_specific_fields", {}).get("reasoning_content")
-                        reflection_text = reflection_resp["choices"][0]["message"]["content"]
-
-                        # Optionally display reasoning if present
-                        if verbose and reasoning_content:
-                            display_interaction(
-                                "Reflection reasoning:",
-                                f"{reasoning_content}\n\nReflection result:\n{reflection_text}",
-                                markdown=markdown,
-                                generation_time=time.time() - start_time,
-                                console=console
-                            )
-                        elif verbose:
-                            display_interaction(
-                                "Self-reflection (non-streaming):",
-                                reflection_text,
-                                markdown=markdown,
-                                generation_time=time.time() - start_time,
-                                console=console
-                            )
-                    else:
-                        # Existing streaming approach
-                        if verbose:
-                            with Live(display_generating("", start_time), console=console, refresh_per_second=4) as live:
-                                reflection_text = ""
-                                for chunk in litellm.completion(
-                                    model=self.model,
-                                    messages=reflection_messages,
-                                    temperature=temperature,
-                                    stream=True,
-                                    response_format={"type": "json_object"},
-                                    **{k:v for k,v in kwargs.items() if k != 'reasoning_steps'}
-                                ):
-                                    if chunk and chunk.choices and chunk.choices[0].delta.content:
-                                        content = chunk.choices[0].delta.content
-                                        reflection_text += content
-                                        live.update(display_generating(reflection_text, start_time))
-                        else:
-                            reflection_text = ""
-                            for chunk in litellm.completion(
-                                model=self.model,
-                                messages=reflection_messages,
-                                temperature=temperature,
-                                stream=True,
-                                response_format={"type": "json_object"},
-                                **{k:v for k,v in kwargs.items() if k != 'reasoning_steps'}
-                            ):
-                                if chunk and chunk.choices and chunk.choices[0].delta.content:
-                                    reflection_text += chunk.choices[0].delta.content
-
-                    try:
-                        reflection_data = json.loads(reflection_text)
-                        satisfactory = reflection_data.get("satisfactory", "no").lower() == "yes"
-
-                        if verbose:
-                            display_self_reflection(
-                                f"Agent {agent_name} self reflection: reflection='{reflection_data['reflection']}' satisfactory='{reflection_data['satisfactory']}'",
-                                console=console
-                            )
-
-                        if satisfactory and reflection_count >= min_reflect - 1:
-                            if verbose:
-                                display_interaction(prompt, response_text, markdown=markdown,
-                                                 generation_time=time.time() - start_time, console=console)
-                            return response_text
-
-                        if reflection_count >= max_reflect - 1:
-                            if verbose:
-                                display_interaction(prompt, response_text, markdown=markdown,
-                                                 generation_time=time.time() - start_time, console=console)
-                            return response_text
-
-                        reflection_count += 1
-                        messages.extend([
-                            {"role": "assistant", "content": response_text},
-                            {"role": "user", "content": reflection_prompt},
-                            {"role": "assistant", "content": reflection_text},
-                            {"role": "user", "content": "Now regenerate your response using the reflection you made"}
-                        ])
-                        continue
-
-                    except json.JSONDecodeError:
-                        reflection_count += 1
-                        if reflection_count >= max_reflect:
-                            return response_text
-                        continue
+                    response_text = self._reflect(
+                        original_prompt, response_text, temperature, kwargs,
+                        max_reflect, min_reflect, verbose, console, agent_name
+                    )
+                    if verbose:
+                        display_interaction(original_prompt, response_text, markdown=markdown,
+                                         generation_time=time.time() - start_time, console=console)
+                    return response_text
 
                 except Exception as e:
                     display_error(f"Error in LLM response: {str(e)}")
@@ -689,6 +611,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
         agent_role: Optional[str] = None,
         agent_tools: Optional[List[str]] = None,
         execute_tool_fn: Optional[Callable] = None,
+        format_tool_result_fn: Optional[Callable] = None,
         **kwargs
     ) -> str:
         """Async version of get_response with identical functionality."""
@@ -747,13 +670,18 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             reasoning_steps = kwargs.pop('reasoning_steps', self.reasoning_steps)
             litellm.set_verbose = False
 
+            # The schema is compiled once per output model; models with native
+            # json_schema support get it as response_format instead of in the prompt
+            structured = get_structured_output(output_json or output_pydantic) if (output_json or output_pydantic) else None
+            native_schema = structured is not None and supports_native_schema(self.model)
+            if native_schema:
+                kwargs["response_format"] = structured.response_format
+
             # Build messages list
             messages = []
             if system_prompt:
-                if output_json:
-                    system_prompt += f"\nReturn ONLY a JSON object that matches this Pydantic model: {json.dumps(output_json.model_json_schema())}"
-                elif output_pydantic:
-                    system_prompt += f"\nReturn ONLY a JSON object that matches this Pydantic model: {json.dumps(output_pydantic.model_json_schema())}"
+                if structured and not native_schema:
+                    system_prompt += structured.instruction
                 messages.append({"role": "system", "content": system_prompt})
             
             if chat_history:
@@ -761,7 +689,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
 
             # Handle prompt modifications for JSON output
             original_prompt = prompt
-            if output_json or output_pydantic:
+            if structured and not native_schema:
                 if isinstance(prompt, str):
                     prompt += "\nReturn ONLY a valid JSON object. No other text or explanation."
                 elif isinstance(prompt, list):
@@ -777,7 +705,6 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                 messages.append({"role": "user", "content": prompt})
 
             start_time = time.time()
-            reflection_count = 0
 
             # Format tools for LiteLLM
             formatted_tools = None
@@ -878,11 +805,13 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                         console=console
                     )
             else:
+                # Stop reading early once structured output cannot be valid
+                validator = structured.validator() if structured else None
                 if verbose:
                     # ----------------------------------------------------
                     # 1) Make the streaming call WITHOUT tools
                     # ----------------------------------------------------
-                    async for chunk in await litellm.acompletion(
+                    async for chunk in self._acompletion_stream(
                         model=self.model,
                         messages=messages,
                         temperature=temperature,
@@ -893,9 +822,11 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                             response_text += chunk.choices[0].delta.content
                             print("\033[K", end="\r")  
                             print(f"Generating... {time.time() - start_time:.1f}s", end="\r")
+                            if validator and not validator.feed(chunk.choices[0].delta.content):
+                                break
                 else:
                     # Non-verbose streaming call, still no tools
-                    async for chunk in await litellm.acompletion(
+                    async for chunk in self._acompletion_stream(
                         model=self.model,
                         messages=messages,
                         temperature=temperature,
@@ -904,6 +835,8 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                     ):
                         if chunk and chunk.choices and chunk.choices[0].delta.content:
                             response_text += chunk.choices[0].delta.content
+                            if validator and not validator.feed(chunk.choices[0].delta.content):
+                                break
 
             response_text = response_text.strip()
 
@@ -943,17 +876,11 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                             else:
                                 display_message += "Function returned no output"
                             display_tool_call(display_message, console=console)
-                            messages.append({
-                                "role": "tool",
-                                "tool_call_id": tool_call.id,
-                                "content": json.dumps(tool_result)
-                            })
-                        else:
-                            messages.append({
-                                "role": "tool",
-                                "tool_call_id": tool_call.id,
-                                "content": "Function returned an empty output"
-                            })
+                        messages.append({
+                            "role": "tool",
+                            "tool_call_id": tool_call.id,
+                            "content": self._format_tool_result(function_name, tool_result, format_tool_result_fn)
+                        })
 
                     # Get response after tool calls
                     response_text = ""
@@ -989,7 +916,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                     else:
                         # Get response after tool calls with streaming
                         if verbose:
-                            async for chunk in await litellm.acompletion(
+                            async for chunk in self._acompletion_stream(
                                 model=self.model,
                                 messages=messages,
                                 temperature=temperature,
@@ -1004,7 +931,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                                     print(f"Reflecting... {time.time() - start_time:.1f}s", end="\r")
                         else:
                             response_text = ""
-                            for chunk in litellm.completion(
+                            async for chunk in self._acompletion_stream(
                                 model=self.model,
                                 messages=messages,
                                 temperature=temperature,
@@ -1018,6 +945,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
 
             # Handle output formatting
             if output_json or output_pydantic:
+                response_text = await self._aensure_structured(structured, messages, response_text, temperature, kwargs)
                 self.chat_history.append({"role": "user", "content": original_prompt})
                 self.chat_history.append({"role": "assistant", "content": response_text})
                 if verbose:
@@ -1035,116 +963,14 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                 return response_text
 
             # Handle self-reflection
-            reflection_prompt = f"""
-Reflect on your previous response: '{response_text}'.
-Identify any flaws, improvements, or actions.
-Provide a "satisfactory" status ('yes' or 'no').
-Output MUST be JSON with 'reflection' and 'satisfactory'.
-            """
-            
-            reflection_messages = messages + [
-                {"role": "assistant", "content": response_text},
-                {"role": "user", "content": reflection_prompt}
-            ]
-
-            # If reasoning_steps is True, do a single non-streaming call to capture reasoning
-            if reasoning_steps:
-                reflection_resp = litellm.completion(
-                    model=self.model,
-                    messages=reflection_messages,
-                    temperature=temperature,
-                    stream=False,  # Force non-streaming
-                    response_format={"type": "json_object"},
-                    **{k:v for k,v in kwargs.items() if k != 'reasoning_steps'}
-                )
-                # Grab reflection text and optional reasoning
-                reasoning_content = reflection_resp["choices"][0]["message"].get("provider_specific_fields", {}).get("reasoning_content")
-                reflection_text = reflection_resp["choices"][0]["message"]["content"]
-
-                # Optionally display reasoning if present
-                if verbose and reasoning_content:
-                    display_interaction(
-                        "Reflection reasoning:",
-                        f"{reasoning_content}\n\nReflection result:\n{reflection_text}",
-                        markdown=markdown,
-                        generation_time=time.time() - start_time,
-                        console=console
-                    )
-                elif verbose:
-                    display_interaction(
-                        "Self-reflection (non-streaming):",
-                        reflection_text,
-                        markdown=markdown,
-                        generation_time=time.time() - start_time,
-                        console=console
-                    )
-            else:
-                # Existing streaming approach
-                if verbose:
-                    with Live(display_generating("", start_time), console=console, refresh_per_second=4) as live:
-                        reflection_text = ""
-                        for chunk in litellm.completion(
-                            model=self.model,
-                            messages=reflection_messages,
-                            temperature=temperature,
-                            stream=True,
-                            response_format={"type": "json_object"},
-                            **{k:v for k,v in kwargs.items() if k != 'reasoning_steps'}
-                        ):
-                            if chunk and chunk.choices and chunk.choices[0].delta.content:
-                                content = chunk.choices[0].delta.content
-                                reflection_text += content
-                                live.update(display_generating(reflection_text, start_time))
-                else:
-                    reflection_text = ""
-                    for chunk in litellm.completion(
-                        model=self.model,
-                        messages=reflection_messages,
-                        temperature=temperature,
-                        stream=True,
-                        response_format={"type": "json_object"},
-                        **{k:v for k,v in kwargs.items() if k != 'reasoning_steps'}
-                    ):
-                        if chunk and chunk.choices and chunk.choices[0].delta.content:
-                            reflection_text += chunk.choices[0].delta.content
-
-            while True:  # Add loop for reflection handling
-                try:
-                    reflection_data = json.loads(reflection_text)
-                    satisfactory = reflection_data.get("satisfactory", "no").lower() == "yes"
-
-                    if verbose:
-                        display_self_reflection(
-                            f"Agent {agent_name} self reflection: reflection='{reflection_data['reflection']}' satisfactory='{reflection_data['satisfactory']}'",
-                            console=console
-                        )
-
-                    if satisfactory and reflection_count >= min_reflect - 1:
-                        if verbose:
-                            display_interaction(prompt, response_text, markdown=markdown,
-                                             generation_time=time.time() - start_time, console=console)
-                        return response_text
-
-                    if reflection_count >= max_reflect - 1:
-                        if verbose:
-                            display_interaction(prompt, response_text, markdown=markdown,
-                                             generation_time=time.time() - start_time, console=console)
-                        return response_text
-
-                    reflection_count += 1
-                    messages.extend([
-                        {"role": "assistant", "content": response_text},
-                        {"role": "user", "content": reflection_prompt},
-                        {"role": "assistant", "content": reflection_text},
-                        {"role": "user", "content": "Now regenerate your response using the reflection you made"}
-                    ])
-                    continue  # Now properly in a loop
-
-                except json.JSONDecodeError:
-                    reflection_count += 1
-                    if reflection_count >= max_reflect:
-                        return response_text
-                    continue  # Now properly in a loop
+            response_text = await self._areflect(
+                original_prompt, response_text, temperature, kwargs,
+                max_reflect, min_reflect, verbose, console, agent_name
+            )
+            if verbose:
+                display_interaction(original_prompt, response_text, markdown=markdown,
+                                 generation_time=time.time() - start_time, console=console)
+            return response_text
             
         except Exception as error:
             if LLMContextLengthExceededException(str(error))._is_context_limit_error(str(error)):
@@ -1157,6 +983,115 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             total_time = time.time() - start_time
             logging.debug(f"get_response_async completed in {total_time:.2f} seconds")
 
+    def _reflection_engine(self, max_reflect: int, min_reflect: int):
+        from .reflection import ReflectionEngine
+        return ReflectionEngine(
+            critic_model=self.reflect_llm or self.model,
+            revise_model=self.model,
+            max_reflect=max_reflect,
+            min_reflect=min_reflect,
+            confidence_threshold=self.reflect_confidence
+        )
+
+    def _reflection_step_callback(self, verbose, console, agent_name):
+        def on_step(step):
+            logging.debug(f"Reflection {step.iteration + 1}: confidence={step.confidence} tokens={step.prompt_tokens + step.completion_tokens} cost={step.cost}")
+            if verbose:
+                display_self_reflection(
+                    f"Agent {agent_name} self reflection: reflection='{step.reflection}' "
+                    f"satisfactory='{'yes' if step.satisfactory else 'no'}' confidence={step.confidence:.2f}",
+                    console=console
+                )
+        return on_step
+
+    def _reflect(self, prompt, response_text, temperature, kwargs, max_reflect, min_reflect, verbose, console, agent_name) -> str:
+        """Critique and revise a response with a compact critic prompt (see reflection.py)."""
+        import litellm
+        from .reflection import usage_from_response
+        call_kwargs = {k: v for k, v in kwargs.items() if k != 'response_format'}
+
+        def complete(messages, model, response_format):
+            params = {"response_format": response_format} if response_format else {}
+            resp = litellm.completion(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                stream=False,
+                **params,
+                **call_kwargs
+            )
+            return resp.choices[0].message.content or "", usage_from_response(resp)
+
+        try:
+            self.last_reflection = self._reflection_engine(max_reflect, min_reflect).run(
+                prompt, response_text, complete, on_step=self._reflection_step_callback(verbose, console, agent_name),
+                response_format=kwargs.get('response_format')
+            )
+            return self.last_reflection.response
+        except Exception as e:
+            display_error(f"Error in self-reflection: {e}")
+            return response_text
+
+    async def _areflect(self, prompt, response_text, temperature, kwargs, max_reflect, min_reflect, verbose, console, agent_name) -> str:
+        """Async version of _reflect"""
+        import litellm
+        from .reflection import usage_from_response
+        call_kwargs = {k: v for k, v in kwargs.items() if k != 'response_format'}
+
+        async def complete(messages, model, response_format):
+            params = {"response_format": response_format} if response_format else {}
+            resp = await litellm.acompletion(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                stream=False,
+                **params,
+                **call_kwargs
+            )
+            return resp.choices[0].message.content or "", usage_from_response(resp)
+
+        try:
+            self.last_reflection = await self._reflection_engine(max_reflect, min_reflect).arun(
+                prompt, response_text, complete, on_step=self._reflection_step_callback(verbose, console, agent_name),
+                response_format=kwargs.get('response_format')
+            )
+            return self.last_reflection.response
+        except Exception as e:
+            display_error(f"Error in self-reflection: {e}")
+            return response_text
+
+    def _ensure_structured(self, structured, messages, response_text, temperature, kwargs) -> str:
+        """Validate structured output, asking the model once to repair an invalid reply."""
+        import litellm
+
+        def complete(repair_messages):
+            resp = litellm.completion(
+                model=self.model,
+                messages=repair_messages,
+                temperature=temperature,
+                stream=False,
+                **kwargs
+            )
+            return resp.choices[0].message.content
+
+        return ensure_valid(structured, messages, response_text, complete)
+
+    async def _aensure_structured(self, structured, messages, response_text, temperature, kwargs) -> str:
+        """Async version of _ensure_structured"""
+        import litellm
+
+        async def complete(repair_messages):
+            resp = await litellm.acompletion(
+                model=self.model,
+                messages=repair_messages,
+                temperature=temperature,
+                stream=False,
+                **kwargs
+            )
+            return resp.choices[0].message.content
+
+        return await aensure_valid(structured, messages, response_text, complete)
+
     def can_use_tools(self) -> bool:
         """Check if this model can use tool functions"""
         try:
@@ -1375,7 +1310,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                 response_text = ""
                 if verbose:
                     with Live(display_generating("", start_time), console=console or self.console, refresh_per_second=4) as live:
-                        async for chunk in await litellm.acompletion(
+                        async for chunk in self._acompletion_stream(
                             model=self.model,
                             messages=messages,
                             temperature=temperature,
@@ -1387,7 +1322,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                                 response_text += content
                                 live.update(display_generating(response_text, start_time))
                 else:
-                    async for chunk in await litellm.acompletion(
+                    async for chunk in self._acompletion_stream(
                         model=self.model,
                         messages=messages,
                         temperature=temperature,
@@ -1421,6 +1356,59 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             display_error(f"Error in response_async: {str(error)}")
             raise
 
+    async def astream_chunks(
+        self,
+        messages: List[Dict],
+        temperature: float = 0.2,
+        tools: Optional[List[Dict]] = None,
+        **kwargs
+    ):
+        """Yield raw streaming chunks for a prepared message list.
+
+        Unlike get_response_async, nothing is accumulated or displayed, so
+        callers (Agent.astream) can forward tokens as soon as they arrive.
+        Tools must already be in OpenAI tool-definition format.
+        """
+        import litellm
+        litellm.set_verbose = False
+
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True,
+            **kwargs
+        }
+        if tools:
+            params["tools"] = tools
+        if self.api_key:
+            params["api_key"] = self.api_key
+        if self.base_url:
+            params["base_url"] = self.base_url
+        if self.max_tokens:
+            params["max_tokens"] = self.max_tokens
+        async for chunk in self._acompletion_stream(**params):
+            yield chunk
+
+    async def _acompletion_stream(self, **params):
+        """Stream litellm.acompletion chunks, hedged when hedging is enabled."""
+        import litellm
+        if self.hedger is None:
+            async for chunk in await litellm.acompletion(**params):
+                yield chunk
+            return
+        from .hedging import latency_key
+        # The hedge goes to the fallback model / base_url when one is configured
+        hedge_params = {**params, **{k: v for k, v in (self.hedger.fallback or {}).items() if v is not None}}
+        hedged = self.hedger.astream(
+            latency_key(params["model"], params.get("base_url")),
+            lambda: litellm.acompletion(**params),
+            latency_key(hedge_params["model"], hedge_params.get("base_url")),
+            lambda: litellm.acompletion(**hedge_params)
+        )
+        async for chunk in hedged:
+            yield chunk
+
     def _generate_tool_definition(self, function_name: str) -> Optional[Dict]:
         """Generate a tool definition from a function name."""
         logging.debug(f"Attempting to generate tool definition for: {function_name}")
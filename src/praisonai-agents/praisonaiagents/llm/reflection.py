@@ -0,0 +1,284 @@
+"""Self-reflection with a compact critic prompt and targeted revisions.
+
+Each round sends the critic only the task, the current response and a short
+rubric (not the conversation history). The critic returns a verdict, a
+confidence score and concrete edit instructions; if more work is needed the
+edits are applied by a separate revision call that again sees only the task,
+the response and the edits. Reflection stops as soon as the critic is
+satisfied with enough confidence, so the prompt never grows between rounds.
+
+Token usage and (when litellm can price the model) cost are recorded for
+every round in ReflectionResult.steps.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, ValidationError
+
+from .structured import extract_json, get_structured_output, supports_native_schema
+
+RUBRIC = (
+    "You are a strict reviewer. Judge whether the response fully and correctly completes the task.\n"
+    "Check: correctness, completeness against the task, following the requested format, and concision.\n"
+    "Return JSON with:\n"
+    '- "reflection": one or two sentences on the main problems (or why it is good)\n'
+    '- "satisfactory": "yes" or "no"\n'
+    '- "confidence": a number from 0 to 1 for how sure you are of that verdict\n'
+    '- "edits": a list of specific, self-contained edit instructions; empty when satisfactory'
+)
+
+REVISER = (
+    "Revise the response by applying the edit instructions. Change only what the edits require "
+    "and keep everything else as it is. Return only the full revised response."
+)
+
+# (messages, model, response_format) -> (text, usage)
+CompleteFn = Callable[[List[Dict], str, Optional[Dict]], Tuple[str, Dict[str, int]]]
+AsyncCompleteFn = Callable[[List[Dict], str, Optional[Dict]], Awaitable[Tuple[str, Dict[str, int]]]]
+
+
+class CritiqueOutput(BaseModel):
+    reflection: str
+    satisfactory: Literal["yes", "no"]
+    confidence: float
+    edits: List[str]
+
+
+@dataclass
+class ReflectionStep:
+    """One critique (and the revision that followed it, if any)."""
+    iteration: int
+    critic_model: str
+    satisfactory: bool
+    confidence: float
+    reflection: str
+    edits: List[str]
+    revised: bool = False
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: Optional[float] = None
+    duration: float = 0.0
+
+
+@dataclass
+class ReflectionResult:
+    response: str
+    steps: List[ReflectionStep] = field(default_factory=list)
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(s.prompt_tokens + s.completion_tokens for s in self.steps)
+
+    @property
+    def total_cost(self) -> Optional[float]:
+        costs = [s.cost for s in self.steps]
+        return sum(costs) if costs and None not in costs else None
+
+
+def usage_from_response(response: Any) -> Dict[str, int]:
+    """Prompt/completion token counts from an OpenAI or litellm response."""
+    usage = getattr(response, "usage", None)
+    if usage is None and isinstance(response, dict):
+        usage = response.get("usage")
+    if usage is None:
+        return {}
+    get = usage.get if isinstance(usage, dict) else lambda k, d=0: getattr(usage, k, d)
+    return {
+        "prompt_tokens": get("prompt_tokens", 0) or 0,
+        "completion_tokens": get("completion_tokens", 0) or 0
+    }
+
+
+def estimate_cost(model: str, usage: Dict[str, int]) -> Optional[float]:
+    """USD cost of a call when litellm knows the model's prices, else None."""
+    if not usage:
+        return None
+    try:
+        import litellm
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=model,
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0)
+        )
+        return prompt_cost + completion_cost
+    except Exception:
+        return None
+
+
+def prompt_text(prompt: Any) -> str:
+    """Text of a prompt that may be a multimodal content list."""
+    if isinstance(prompt, list):
+        return "\n".join(item.get("text", "") for item in prompt if isinstance(item, dict) and item.get("type") == "text")
+    return str(prompt)
+
+
+class ReflectionEngine:
+    """Critique-and-revise loop with early exit on a confident verdict."""
+
+    def __init__(
+        self,
+        critic_model: str,
+        revise_model: str,
+        max_reflect: int = 3,
+        min_reflect: int = 1,
+        confidence_threshold: float = 0.8,
+        max_chars: int = 12000
+    ):
+        self.critic_model = critic_model
+        self.revise_model = revise_model
+        self.max_reflect = max(1, max_reflect)
+        self.min_reflect = min_reflect
+        self.confidence_threshold = confidence_threshold
+        self.max_chars = max_chars
+
+    def _clip(self, text: str) -> str:
+        if len(text) <= self.max_chars:
+            return text
+        half = self.max_chars // 2
+        return f"{text[:half]}\n...[{len(text) - self.max_chars} characters omitted]...\n{text[-half:]}"
+
+    def critic_messages(self, task: str, response: str) -> List[Dict]:
+        return [
+            {"role": "system", "content": RUBRIC},
+            {"role": "user", "content": f"Task:\n{self._clip(task)}\n\nResponse:\n{self._clip(response)}"}
+        ]
+
+    def revision_messages(self, task: str, response: str, critique: CritiqueOutput) -> List[Dict]:
+        edits = "\n".join(f"- {edit}" for edit in critique.edits)
+        return [
+            {"role": "system", "content": REVISER},
+            {"role": "user", "content": f"Task:\n{self._clip(task)}\n\nResponse:\n{response}\n\nEdits:\n{edits}"}
+        ]
+
+    def critique_format(self) -> Dict:
+        """json_schema response_format when the critic supports it, else JSON mode."""
+        if supports_native_schema(self.critic_model):
+            return get_structured_output(CritiqueOutput).response_format
+        return {"type": "json_object"}
+
+    @staticmethod
+    def parse_critique(text: str) -> CritiqueOutput:
+        try:
+            data = json.loads(extract_json(text or ""))
+        except ValueError:
+            logging.debug(f"Unparseable critique, treating as unsatisfactory: {text!r}")
+            return CritiqueOutput(reflection=text or "", satisfactory="no", confidence=0.0, edits=[])
+        if not isinstance(data, dict):
+            data = {}
+        satisfactory = str(data.get("satisfactory", "no")).strip().lower()
+        edits = data.get("edits") or []
+        try:
+            confidence = min(1.0, max(0.0, float(data.get("confidence", 0.0))))
+        except (TypeError, ValueError):
+            confidence = 0.0
+        try:
+            return CritiqueOutput(
+                reflection=str(data.get("reflection", "")),
+                satisfactory="yes" if satisfactory == "yes" else "no",
+                confidence=confidence,
+                edits=[str(e) for e in edits] if isinstance(edits, list) else [str(edits)]
+            )
+        except ValidationError:
+            return CritiqueOutput(reflection=str(data), satisfactory="no", confidence=0.0, edits=[])
+
+    def _done(self, critique: CritiqueOutput, iteration: int) -> bool:
+        """Whether the critique ends reflection without a revision.
+
+        The max_reflect limit is not checked here: the last round's edits are
+        still applied, and the loop ends after them.
+        """
+        if iteration < self.min_reflect - 1:
+            return False
+        if critique.satisfactory == "yes" and critique.confidence >= self.confidence_threshold:
+            return True
+        # Nothing concrete to change: another round would produce the same verdict
+        return not critique.edits
+
+    def _record(self, step: ReflectionStep, model: str, usage: Dict[str, int]) -> None:
+        step.prompt_tokens += usage.get("prompt_tokens", 0)
+        step.completion_tokens += usage.get("completion_tokens", 0)
+        cost = estimate_cost(model, usage)
+        if cost is not None:
+            step.cost = (step.cost or 0.0) + cost
+
+    def _new_step(self, iteration: int, critique: CritiqueOutput) -> ReflectionStep:
+        return ReflectionStep(
+            iteration=iteration,
+            critic_model=self.critic_model,
+            satisfactory=critique.satisfactory == "yes",
+            confidence=critique.confidence,
+            reflection=critique.reflection,
+            edits=critique.edits
+        )
+
+    def run(
+        self,
+        task: Any,
+        response: str,
+        complete: CompleteFn,
+        on_step: Optional[Callable[[ReflectionStep], None]] = None,
+        response_format: Optional[Dict] = None
+    ) -> ReflectionResult:
+        """Reflect on a response, revising it until the critic is confident.
+
+        response_format, when given, is used for the revision calls so the
+        revised response keeps the format of the original one.
+        """
+        task = prompt_text(task)
+        result = ReflectionResult(response=response)
+        for iteration in range(self.max_reflect):
+            start = time.time()
+            text, usage = complete(self.critic_messages(task, result.response), self.critic_model, self.critique_format())
+            critique = self.parse_critique(text)
+            step = self._new_step(iteration, critique)
+            self._record(step, self.critic_model, usage)
+            done = self._done(critique, iteration)
+            if not done and critique.edits:
+                revised, usage = complete(self.revision_messages(task, result.response, critique), self.revise_model, response_format)
+                self._record(step, self.revise_model, usage)
+                if revised and revised.strip():
+                    result.response = revised.strip()
+                    step.revised = True
+            step.duration = time.time() - start
+            result.steps.append(step)
+            if on_step:
+                on_step(step)
+            if done:
+                break
+        return result
+
+    async def arun(
+        self,
+        task: Any,
+        response: str,
+        complete: AsyncCompleteFn,
+        on_step: Optional[Callable[[ReflectionStep], None]] = None,
+        response_format: Optional[Dict] = None
+    ) -> ReflectionResult:
+        """Async version of run"""
+        task = prompt_text(task)
+        result = ReflectionResult(response=response)
+        for iteration in range(self.max_reflect):
+            start = time.time()
+            text, usage = await complete(self.critic_messages(task, result.response), self.critic_model, self.critique_format())
+            critique = self.parse_critique(text)
+            step = self._new_step(iteration, critique)
+            self._record(step, self.critic_model, usage)
+            done = self._done(critique, iteration)
+            if not done and critique.edits:
+                revised, usage = await complete(self.revision_messages(task, result.response, critique), self.revise_model, response_format)
+                self._record(step, self.revise_model, usage)
+                if revised and revised.strip():
+                    result.response = revised.strip()
+                    step.revised = True
+            step.duration = time.time() - start
+            result.steps.append(step)
+            if on_step:
+                on_step(step)
+            if done:
+                break
+        return result
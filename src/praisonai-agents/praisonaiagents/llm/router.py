@@ -0,0 +1,230 @@
+"""Model cascade routing.
+
+Usage:
+from praisonaiagents import Agent
+from praisonaiagents.llm.router import Router
+
+agent = Agent(
+    instructions="...",
+    llm=Router(["gpt-4o-mini", "gpt-4o"])
+)
+
+Models are listed from cheapest to most capable. Each request goes to the
+cheapest suitable model first and escalates to the next one when:
+
+- structured output (output_json / output_pydantic) fails validation
+- the model reports a confidence below min_confidence
+- the request errors
+- the workflow's completion_checker rejects the task output (the retry
+  starts from the next model)
+
+Outcomes are recorded per task type (the task name inside PraisonAIAgents,
+else the agent's role) in a local JSON file. A model that has failed a task
+type too often is skipped for that task type on later runs. Statistics are
+kept in ~/.praison/router_stats.json by default.
+
+Entries can be model names (OpenAI, or "provider/model" for LiteLLM) or
+LLM config dicts, as accepted by Agent(llm=...).
+"""
+
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+DEFAULT_STATS_PATH = os.path.join(os.path.expanduser("~"), ".praison", "router_stats.json")
+
+CONFIDENCE_REQUEST = (
+    "\n\nAfter your answer, add a final line of the form 'CONFIDENCE: <number between 0 and 1>' "
+    "stating how confident you are that the answer is correct and complete."
+)
+_CONFIDENCE_LINE = re.compile(r"\n?\s*\**CONFIDENCE\**\s*:\s*\**\s*([01](?:\.\d+)?)\**\s*$", re.IGNORECASE)
+
+_task_type: contextvars.ContextVar = contextvars.ContextVar("praison_router_task_type", default=None)
+
+
+@contextlib.contextmanager
+def routing_task(task_type: Optional[str]):
+    """Route requests made in this context under the given task type."""
+    token = _task_type.set(task_type)
+    try:
+        yield
+    finally:
+        _task_type.reset(token)
+
+
+def current_task_type() -> Optional[str]:
+    return _task_type.get()
+
+
+class Router:
+    """Cascade of models tried from cheapest to most capable."""
+
+    def __init__(
+        self,
+        models: List[Union[str, Dict[str, Any]]],
+        min_confidence: Optional[float] = 0.6,
+        stats_path: Optional[str] = DEFAULT_STATS_PATH,
+        min_samples: int = 5,
+        min_success_rate: float = 0.7
+    ):
+        """
+        Args:
+            models: Model names or LLM config dicts, cheapest first
+            min_confidence: Escalate when a model reports lower confidence
+                (None to not ask models for a confidence score)
+            stats_path: JSON file for routing statistics (None keeps them in memory)
+            min_samples: Attempts needed before a model may be skipped for a task type
+            min_success_rate: Skip a model for a task type below this success rate
+        """
+        if not models:
+            raise ValueError("Router needs at least one model")
+        self.models = list(models)
+        self.min_confidence = min_confidence
+        self.stats_path = stats_path
+        self.min_samples = min_samples
+        self.min_success_rate = min_success_rate
+        self._lock = threading.Lock()
+        self._llms: Dict[str, Any] = {}
+        self._last_model: Dict[str, str] = {}
+        self._floor: Dict[str, int] = {}
+        self._stats: Dict[str, Dict[str, Dict[str, float]]] = self._load()
+
+    @staticmethod
+    def model_name(entry: Union[str, Dict[str, Any]]) -> str:
+        return entry["model"] if isinstance(entry, dict) else entry
+
+    @staticmethod
+    def is_litellm(entry: Union[str, Dict[str, Any]]) -> bool:
+        """Whether an entry is served through LLM (LiteLLM) rather than the OpenAI client."""
+        return isinstance(entry, dict) or "/" in entry
+
+    def llm_for(self, entry: Union[str, Dict[str, Any]]):
+        """Shared LLM instance for a LiteLLM entry."""
+        key = json.dumps(entry, sort_keys=True, default=str)
+        with self._lock:
+            if key not in self._llms:
+                from .llm import LLM
+                self._llms[key] = LLM(**entry) if isinstance(entry, dict) else LLM(model=entry)
+            return self._llms[key]
+
+    def candidates(self, task_type: str) -> List[Union[str, Dict[str, Any]]]:
+        """Models to try for a task type, in order.
+
+        Models with a poor record for this task type are skipped, and after a
+        completion_checker rejection the cascade resumes above the rejected model.
+        """
+        with self._lock:
+            floor = self._floor.pop(task_type, 0)
+            stats = self._stats.get(task_type, {})
+        last = len(self.models) - 1
+        start = min(floor, last)
+        while start < last:
+            record = stats.get(self.model_name(self.models[start]))
+            if not record or record["attempts"] < self.min_samples:
+                break
+            if 1 - record["failures"] / record["attempts"] >= self.min_success_rate:
+                break
+            start += 1
+        return self.models[start:]
+
+    def confidence_prompt(self, prompt: Any) -> Any:
+        """Ask the model to report its confidence at the end of its answer."""
+        if isinstance(prompt, str):
+            return prompt + CONFIDENCE_REQUEST
+        if isinstance(prompt, list):
+            prompt = [dict(item) for item in prompt]
+            for item in prompt:
+                if item.get("type") == "text":
+                    item["text"] += CONFIDENCE_REQUEST
+                    break
+        return prompt
+
+    @staticmethod
+    def split_confidence(response: str) -> Tuple[str, Optional[float]]:
+        """Remove the confidence line from a response, returning (text, confidence)."""
+        match = _CONFIDENCE_LINE.search(response.rstrip())
+        if not match:
+            return response, None
+        return response.rstrip()[:match.start()].rstrip(), float(match.group(1))
+
+    def evaluate(self, response: Optional[str], structured=None, asked_confidence: bool = False) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Check a response, returning (accepted, cleaned response, rejection reason)."""
+        if not response:
+            return False, response, "no response"
+        if structured is not None:
+            _, error = structured.validate(response)
+            if error:
+                return False, response, f"invalid structured output: {error.splitlines()[0]}"
+        if asked_confidence:
+            response, confidence = self.split_confidence(response)
+            if confidence is not None and confidence < self.min_confidence:
+                return False, response, f"low confidence ({confidence})"
+        return True, response, None
+
+    def record(self, task_type: str, entry: Union[str, Dict[str, Any]], success: bool, latency: float = 0.0) -> None:
+        model = self.model_name(entry)
+        with self._lock:
+            record = self._stats.setdefault(task_type, {}).setdefault(
+                model, {"attempts": 0, "failures": 0, "avg_latency": 0.0}
+            )
+            record["attempts"] += 1
+            if not success:
+                record["failures"] += 1
+            record["avg_latency"] += (latency - record["avg_latency"]) / record["attempts"]
+            self._last_model[task_type] = model
+        self._save()
+
+    def reject(self, task_type: str) -> None:
+        """Record that the last accepted output for a task type was rejected and escalate the retry."""
+        with self._lock:
+            model = self._last_model.get(task_type)
+            if model is None:
+                return
+            record = self._stats.get(task_type, {}).get(model)
+            if record:
+                record["failures"] = min(record["attempts"], record["failures"] + 1)
+            names = [self.model_name(m) for m in self.models]
+            if model in names:
+                self._floor[task_type] = names.index(model) + 1
+        logging.info(f"Router: {model} output rejected for '{task_type}', escalating on retry")
+        self._save()
+
+    def stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Per task type and model: attempts, failures, success_rate and avg_latency."""
+        with self._lock:
+            result = json.loads(json.dumps(self._stats))
+        for models in result.values():
+            for record in models.values():
+                record["success_rate"] = 1 - record["failures"] / record["attempts"] if record["attempts"] else 0.0
+        return result
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        if not self.stats_path or not os.path.exists(self.stats_path):
+            return {}
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable router stats {self.stats_path}: {e}")
+            return {}
+
+    def _save(self) -> None:
+        if not self.stats_path:
+            return
+        with self._lock:
+            data = json.dumps(self._stats, indent=2)
+        try:
+            directory = os.path.dirname(self.stats_path)
+            if directory:
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+            tmp_path = f"{self.stats_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.stats_path)
+        except OSError as e:
+            logging.warning(f"Could not save router stats to {self.stats_path}: {e}")
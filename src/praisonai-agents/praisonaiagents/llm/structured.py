@@ -0,0 +1,276 @@
+"""Structured output (output_json / output_pydantic) support.
+
+Each output model's JSON schema is compiled once and cached, together with
+the prompt instruction and the provider-native response_format built from
+it. Models that support `response_format={"type": "json_schema"}` are sent
+the schema natively; other models get the instruction in the system prompt.
+
+Streamed output is checked as it arrives with JSONStreamValidator, so a
+reply that is clearly not the expected JSON object can be abandoned early
+and repaired with a single follow-up request instead of a full task retry.
+"""
+
+import copy
+import functools
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+# OpenAI models with json_schema support, used when litellm is not installed
+NATIVE_SCHEMA_MODEL_PREFIXES = ("gpt-4o", "gpt-4.1", "gpt-4.5", "gpt-5", "o1", "o3", "o4")
+
+
+class StructuredOutput:
+    """Compiled JSON schema and parsing helpers for one output model."""
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.name = model.__name__
+        self.schema = model.model_json_schema()
+        self.schema_json = json.dumps(self.schema, separators=(",", ":"))
+        self.properties = set(self.schema.get("properties", {}))
+        self.forbid_extra = model.model_config.get("extra") == "forbid"
+        self.instruction = f"\nReturn ONLY a JSON object that matches this Pydantic model: {self.schema_json}"
+
+        strict_schema = copy.deepcopy(self.schema)
+        strict = _make_strict(strict_schema)
+        self.response_format = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": self.name[:64],
+                "schema": strict_schema if strict else self.schema,
+                "strict": strict
+            }
+        }
+
+    def validator(self) -> "JSONStreamValidator":
+        return JSONStreamValidator(self)
+
+    def validate(self, text: str) -> Tuple[Optional[BaseModel], Optional[str]]:
+        """Parse and validate a reply, returning (instance, None) or (None, error)."""
+        cleaned = extract_json(text)
+        try:
+            return self.model.model_validate_json(cleaned), None
+        except ValidationError as e:
+            return None, str(e)
+        except ValueError as e:
+            return None, f"Invalid JSON: {e}"
+
+    def repair_messages(self, messages: List[Dict], response_text: str, error: str) -> List[Dict]:
+        """Messages asking the model to correct a reply that failed validation."""
+        return messages + [
+            {"role": "assistant", "content": response_text},
+            {"role": "user", "content": (
+                f"Your reply did not match the required {self.name} JSON schema: {error}\n"
+                "Return ONLY the corrected JSON object. No other text or explanation."
+            )}
+        ]
+
+
+@functools.lru_cache(maxsize=None)
+def get_structured_output(model: Type[BaseModel]) -> StructuredOutput:
+    """Return the compiled StructuredOutput for a model, compiling it on first use."""
+    return StructuredOutput(model)
+
+
+@functools.lru_cache(maxsize=256)
+def supports_native_schema(model_name: str) -> bool:
+    """Whether a model accepts response_format={"type": "json_schema"}."""
+    try:
+        import litellm
+    except ImportError:
+        return str(model_name).startswith(NATIVE_SCHEMA_MODEL_PREFIXES)
+    try:
+        if hasattr(litellm, "supports_response_schema"):
+            return bool(litellm.supports_response_schema(model=model_name))
+        params = litellm.get_supported_openai_params(model=model_name) or []
+        return "response_format" in params
+    except Exception as e:
+        logging.debug(f"Could not determine json_schema support for {model_name}: {e}")
+        return False
+
+
+def extract_json(text: str) -> str:
+    """Strip markdown fences and any text around the outermost JSON object."""
+    cleaned = text.strip()
+    if cleaned.startswith("```json"):
+        cleaned = cleaned[len("```json"):].strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned[len("```"):].strip()
+    if cleaned.endswith("```"):
+        cleaned = cleaned[:-3].strip()
+    if not cleaned.startswith("{"):
+        start, end = cleaned.find("{"), cleaned.rfind("}")
+        if start != -1 and end > start:
+            cleaned = cleaned[start:end + 1]
+    return cleaned
+
+
+def ensure_valid(
+    structured: StructuredOutput,
+    messages: List[Dict],
+    response_text: str,
+    complete: Callable[[List[Dict]], Optional[str]]
+) -> str:
+    """Return a reply as clean JSON, asking the model once to repair it if invalid.
+
+    complete is called with the repair messages and returns the new reply.
+    The original text is returned when the repair fails too, leaving the
+    caller's own fallback handling in place.
+    """
+    _, error = structured.validate(response_text)
+    if error is None:
+        return extract_json(response_text)
+    logging.debug(f"Structured output failed validation, requesting a repair: {error}")
+    try:
+        repaired = complete(structured.repair_messages(messages, response_text, error)) or ""
+    except Exception as e:
+        logging.warning(f"Structured output repair failed: {e}")
+        return response_text
+    return _pick_repaired(structured, response_text, repaired)
+
+
+async def aensure_valid(
+    structured: StructuredOutput,
+    messages: List[Dict],
+    response_text: str,
+    complete: Callable[[List[Dict]], Awaitable[Optional[str]]]
+) -> str:
+    """Async version of ensure_valid"""
+    _, error = structured.validate(response_text)
+    if error is None:
+        return extract_json(response_text)
+    logging.debug(f"Structured output failed validation, requesting a repair: {error}")
+    try:
+        repaired = await complete(structured.repair_messages(messages, response_text, error)) or ""
+    except Exception as e:
+        logging.warning(f"Structured output repair failed: {e}")
+        return response_text
+    return _pick_repaired(structured, response_text, repaired)
+
+
+def _pick_repaired(structured: StructuredOutput, response_text: str, repaired: str) -> str:
+    _, error = structured.validate(repaired)
+    if error is not None:
+        logging.warning(f"Structured output is still invalid for {structured.name} after repair: {error}")
+        return response_text
+    return extract_json(repaired)
+
+
+def _make_strict(schema: Any) -> bool:
+    """Adapt a schema in place for OpenAI strict mode; False if it cannot be strict.
+
+    Strict mode requires every object to list all of its properties as
+    required and to forbid additional properties, so models with optional
+    fields fall back to non-strict json_schema.
+    """
+    if isinstance(schema, dict):
+        if schema.get("type") == "object" or "properties" in schema:
+            properties = schema.get("properties", {})
+            if set(schema.get("required", [])) != set(properties):
+                return False
+            schema["additionalProperties"] = False
+        if "default" in schema:
+            return False
+        return all(_make_strict(value) for value in schema.values())
+    if isinstance(schema, list):
+        return all(_make_strict(item) for item in schema)
+    return True
+
+
+class JSONStreamValidator:
+    """Incrementally checks streamed text against the expected JSON object.
+
+    feed() returns False as soon as the text can no longer become a valid
+    object for the schema: it starts with prose instead of "{", brackets are
+    mismatched, or (for models with extra="forbid") an unknown top-level key
+    appears. A leading markdown fence is tolerated.
+    """
+
+    _MAX_PREAMBLE = 16
+
+    def __init__(self, structured: StructuredOutput):
+        self.structured = structured
+        self.error: Optional[str] = None
+        self.complete = False
+        self._preamble = ""
+        self._started = False
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key: Optional[List[str]] = None
+
+    def feed(self, text: str) -> bool:
+        if self.error or self.complete:
+            return self.error is None
+        for ch in text:
+            if not self._started:
+                self._feed_preamble(ch)
+            else:
+                self._feed_json(ch)
+            if self.error:
+                return False
+            if self.complete:
+                break
+        return True
+
+    def _feed_preamble(self, ch: str) -> None:
+        if ch == "{":
+            fence = self._preamble.strip()
+            if fence and fence not in ("```", "```json"):
+                self._fail(f"Response does not start with a JSON object: {self._preamble!r}")
+                return
+            self._started = True
+            self._stack.append("{")
+            self._expect_key = True
+            return
+        self._preamble += ch
+        fence = self._preamble.strip()
+        if fence and not "```json".startswith(fence):
+            self._fail(f"Response does not start with a JSON object: {self._preamble!r}")
+        elif len(self._preamble) > self._MAX_PREAMBLE:
+            self._fail("Response does not start with a JSON object")
+
+    def _feed_json(self, ch: str) -> None:
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if self._key is not None:
+                    self._check_key("".join(self._key))
+                    self._key = None
+                return
+            if self._key is not None:
+                self._key.append(ch)
+            return
+
+        if ch == '"':
+            self._in_string = True
+            if self._expect_key and len(self._stack) == 1:
+                self._key = []
+                self._expect_key = False
+        elif ch in "{[":
+            self._stack.append(ch)
+        elif ch in "}]":
+            opener = self._stack.pop() if self._stack else None
+            if (opener, ch) not in (("{", "}"), ("[", "]")):
+                self._fail(f"Unbalanced '{ch}' in JSON response")
+            elif not self._stack:
+                self.complete = True
+        elif ch == "," and len(self._stack) == 1:
+            self._expect_key = True
+
+    def _check_key(self, key: str) -> None:
+        structured = self.structured
+        if structured.forbid_extra and structured.properties and key not in structured.properties:
+            self._fail(f"Unexpected field '{key}' for {structured.name}")
+
+    def _fail(self, message: str) -> None:
+        self.error = message
+        logging.debug(f"Structured output stream rejected early: {message}")
@@ -392,4 +392,20 @@ class TaskOutput(BaseModel):
         elif self.json_dict:
             return json.dumps(self.json_dict)
         else:
-            return self.raw 
\ No newline at end of file
+            return self.raw
+
+class StreamEvent(BaseModel):
+    """Event yielded by Agent.astream and PraisonAIAgents.astream.
+
+    type is one of "token", "tool_call_start", "tool_result",
+    "task_started", "task_completed" or "done".
+    """
+    type: Literal["token", "tool_call_start", "tool_result", "task_started", "task_completed", "done"]
+    agent_name: Optional[str] = None
+    content: Optional[str] = None
+    tool_name: Optional[str] = None
+    tool_call_id: Optional[str] = None
+    arguments: Optional[Dict[str, Any]] = None
+    result: Optional[Any] = None
+    task_id: Optional[Any] = None
+    task_name: Optional[str] = None
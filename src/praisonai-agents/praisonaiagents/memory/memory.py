@@ -1,10 +1,13 @@
 import os
+import atexit
 import sqlite3
 import json
 import time
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Union, Literal
 import logging
+import weakref
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -30,6 +33,13 @@ except ImportError:
     OPENAI_AVAILABLE = False
 
 
+def _close_at_exit(memory_ref):
+    memory = memory_ref()
+    if memory is not None:
+        try:
+            memory.close()
+        except Exception as e:
+            logger.error(f"Error closing memory at exit: {e}")
 
 
 class Memory:
@@ -49,6 +59,7 @@ class Memory:
       "short_db": "short_term.db",
       "long_db": "long_term.db",
       "rag_db_path": "rag_db",   # optional path for local embedding store
+      "quality_llm": "gpt-4o-mini",  # judge model for background quality scoring
       "config": {
         "api_key": "...",       # if mem0 usage
         "org_id": "...",
@@ -58,6 +69,13 @@ class Memory:
     }
     """
 
+    # Metadata keys that get an expression index in SQLite so that
+    # entity/user lookups can be filtered in SQL instead of in Python.
+    INDEXED_META_KEYS = ("category", "user_id")
+    # Mem0 searches with metadata filters fetch this many times the limit,
+    # since the filters are applied after the search
+    MEM0_FILTER_OVERFETCH = 4
+
     def __init__(self, config: Dict[str, Any], verbose: int = 0):
         self.cfg = config or {}
         self.verbose = verbose
@@ -117,6 +135,7 @@ class Memory:
             created_at REAL
         )
         """)
+        self._create_meta_indexes(c, "short_mem")
         conn.commit()
         conn.close()
 
@@ -133,9 +152,18 @@ class Memory:
             created_at REAL
         )
         """)
+        self._create_meta_indexes(c, "long_mem")
         conn.commit()
         conn.close()
 
+    def _create_meta_indexes(self, cursor, table: str):
+        """Creates expression indexes on the filterable JSON metadata keys."""
+        for key in self.INDEXED_META_KEYS:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_{key} "
+                f"ON {table}(json_extract(meta, '$.{key}'))"
+            )
+
     def _init_mem0(self):
         """Initialize Mem0 client for agent or user memory."""
         from mem0 import MemoryClient
@@ -180,6 +208,45 @@ class Memory:
             self._log_verbose(f"Failed to initialize ChromaDB: {e}", logging.ERROR)
             self.use_rag = False
 
+    # -------------------------------------------------------------------------
+    #                      Embeddings & Metadata Filters
+    # -------------------------------------------------------------------------
+    def _get_embedding(self, text: str) -> List[float]:
+        """Embed text with a lazily created, reused OpenAI client."""
+        if not hasattr(self, "_embedding_client"):
+            from openai import OpenAI
+            self._embedding_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        response = self._embedding_client.embeddings.create(
+            input=text,
+            model="text-embedding-3-small"
+        )
+        return response.data[0].embedding
+
+    def _chroma_where(self, filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Translate equality filters into a ChromaDB ``where`` clause."""
+        if not filters:
+            return None
+        clauses = [{key: value} for key, value in filters.items()]
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    def _sql_meta_filter(self, filters: Optional[Dict[str, Any]]):
+        """Translate equality filters into a SQL fragment on the JSON meta column."""
+        if not filters:
+            return "", []
+        clauses = []
+        for key in filters:
+            if not key.isidentifier():
+                raise ValueError(f"Invalid metadata filter key: {key}")
+            clauses.append(f" AND json_extract(meta, '$.{key}') = ?")
+        return "".join(clauses), list(filters.values())
+
+    def _matches_filters(self, hit: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> bool:
+        """Check a search hit against equality filters (for providers without pushdown)."""
+        if not filters:
+            return True
+        meta = hit.get("metadata") or {}
+        return all(meta.get(key) == value for key, value in filters.items())
+
     # -------------------------------------------------------------------------
     #                      Basic Quality Score Computation
     # -------------------------------------------------------------------------
@@ -262,9 +329,14 @@ class Memory:
         query: str, 
         limit: int = 5,
         min_quality: float = 0.0,
-        relevance_cutoff: float = 0.0
+        relevance_cutoff: float = 0.0,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
-        """Search short-term memory with optional quality filter"""
+        """Search short-term memory with optional quality filter.
+
+        ``query_embedding`` may be passed in to reuse an embedding that was
+        already computed for the same query.
+        """
         self._log_verbose(f"Searching short memory for: {query}")
         
         if self.use_mem0 and hasattr(self, "mem0_client"):
@@ -274,15 +346,9 @@ class Memory:
             
         elif self.use_rag and hasattr(self, "chroma_col"):
             try:
-                from openai import OpenAI
-                client = OpenAI()
-                
-                response = client.embeddings.create(
-                    input=query,
-                    model="text-embedding-3-small"
-                )
-                query_embedding = response.data[0].embedding
-                
+                if query_embedding is None:
+                    query_embedding = self._get_embedding(query)
+
                 resp = self.chroma_col.query(
                     query_embeddings=[query_embedding],
                     n_results=limit
@@ -398,17 +464,10 @@ class Memory:
         # Store in vector database if enabled
         if self.use_rag and hasattr(self, "chroma_col"):
             try:
-                from openai import OpenAI
-                client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))  # Ensure API key is correctly set
-                
                 logger.info("Getting embeddings from OpenAI...")
                 logger.debug(f"Embedding input text: {text}")  # Log the input text
-                
-                response = client.embeddings.create(
-                    input=text,
-                    model="text-embedding-3-small"
-                )
-                embedding = response.data[0].embedding
+
+                embedding = self._get_embedding(text)
                 logger.info("Successfully got embeddings")
                 logger.debug(f"Received embedding of length: {len(embedding)}")  # Log embedding details
                 
@@ -439,37 +498,46 @@ class Memory:
         query: str, 
         limit: int = 5, 
         relevance_cutoff: float = 0.0,
-        min_quality: float = 0.0
+        min_quality: float = 0.0,
+        filters: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
-        """Search long-term memory with optional quality filter"""
+        """Search long-term memory with optional quality and metadata filters.
+
+        ``filters`` is a dict of metadata equality constraints (e.g.
+        ``{"category": "entity"}``). They are pushed down into the ChromaDB
+        ``where`` clause and into the SQLite query, so only matching records
+        are fetched. Mem0 results are filtered after an over-fetched search. ``query_embedding`` may be passed in to reuse an
+        embedding that was already computed for the same query.
+        """
         self._log_verbose(f"Searching long memory for: {query}")
         self._log_verbose(f"Min quality: {min_quality}")
 
         found = []
 
         if self.use_mem0 and hasattr(self, "mem0_client"):
-            results = self.mem0_client.search(query=query, limit=limit)
-            # Filter by quality
-            filtered = [r for r in results if r.get("metadata", {}).get("quality", 0.0) >= min_quality]
+            # Metadata filters are applied here, so over-fetch to still fill the limit
+            fetch_limit = max(limit * self.MEM0_FILTER_OVERFETCH, 20) if filters else limit
+            results = self.mem0_client.search(query=query, limit=fetch_limit)
+            # Filter by quality and metadata
+            filtered = [
+                r for r in results
+                if (r.get("metadata") or {}).get("quality", 0.0) >= min_quality
+                and self._matches_filters(r, filters)
+            ]
             logger.info(f"Found {len(filtered)} results in Mem0")
-            return filtered
+            return filtered[:limit]
 
         elif self.use_rag and hasattr(self, "chroma_col"):
             try:
-                from openai import OpenAI
-                client = OpenAI()
-                
-                # Get query embedding
-                response = client.embeddings.create(
-                    input=query,
-                    model="text-embedding-3-small"  # Using consistent model
-                )
-                query_embedding = response.data[0].embedding
-                
-                # Search ChromaDB with embedding
+                if query_embedding is None:
+                    query_embedding = self._get_embedding(query)
+
+                # Search ChromaDB with embedding, filtering on metadata server-side
                 resp = self.chroma_col.query(
                     query_embeddings=[query_embedding],
                     n_results=limit,
+                    where=self._chroma_where(filters),
                     include=["documents", "metadatas", "distances"]
                 )
                 
@@ -492,11 +560,13 @@ class Memory:
                 self._log_verbose(f"Error searching ChromaDB: {e}", logging.ERROR)
 
         # Always try SQLite as fallback or additional source
+        filter_sql, filter_params = self._sql_meta_filter(filters)
         conn = sqlite3.connect(self.long_db)
         c = conn.cursor()
         rows = c.execute(
-            "SELECT id, content, meta, created_at FROM long_mem WHERE content LIKE ? LIMIT ?",
-            (f"%{query}%", limit)
+            "SELECT id, content, meta, created_at FROM long_mem WHERE content LIKE ?"
+            + filter_sql + " LIMIT ?",
+            (f"%{query}%", *filter_params, limit)
         ).fetchall()
         conn.close()
 
@@ -559,17 +629,21 @@ class Memory:
         data = f"Entity {name}({type_}): {desc} | relationships: {relations}"
         self.store_long_term(data, metadata={"category": "entity"})
 
-    def search_entity(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    def search_entity(
+        self,
+        query: str,
+        limit: int = 5,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Filter to items that have metadata 'category=entity'.
+        Search only items that have metadata 'category=entity'.
         """
-        all_hits = self.search_long_term(query, limit=20)  # gather more
-        ents = []
-        for h in all_hits:
-            meta = h.get("metadata") or {}
-            if meta.get("category") == "entity":
-                ents.append(h)
-        return ents[:limit]
+        return self.search_long_term(
+            query,
+            limit=limit,
+            filters={"category": "entity"},
+            query_embedding=query_embedding
+        )
 
     def reset_entity_only(self):
         """
@@ -595,20 +669,25 @@ class Memory:
         else:
             self.store_long_term(text, metadata=meta)
 
-    def search_user_memory(self, user_id: str, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    def search_user_memory(
+        self,
+        user_id: str,
+        query: str,
+        limit: int = 5,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Dict[str, Any]]:
         """
-        If mem0 is used, pass user_id in. Otherwise fallback to local filter on user in metadata.
+        If mem0 is used, pass user_id in. Otherwise filter LTM on user_id in metadata.
         """
         if self.use_mem0 and hasattr(self, "mem0_client"):
             return self.mem0_client.search(query=query, limit=limit, user_id=user_id)
         else:
-            hits = self.search_long_term(query, limit=20)
-            filtered = []
-            for h in hits:
-                meta = h.get("metadata", {})
-                if meta.get("user_id") == user_id:
-                    filtered.append(h)
-            return filtered[:limit]
+            return self.search_long_term(
+                query,
+                limit=limit,
+                filters={"user_id": user_id},
+                query_embedding=query_embedding
+            )
 
     def reset_user_memory(self):
         """
@@ -627,9 +706,14 @@ class Memory:
         quality_score: float,
         threshold: float = 0.7,
         metrics: Dict[str, Any] = None,
-        task_id: str = None
+        task_id: str = None,
+        store_short: bool = True
     ):
-        """Store task output in memory with appropriate metadata"""
+        """Store task output in memory with appropriate metadata.
+
+        ``store_short=False`` skips the short-term write, for outputs that
+        were already stored there before being scored.
+        """
         logger.info(f"Finalizing task output: {content[:100]}...")
         logger.info(f"Agent: {agent_name}, Quality: {quality_score}, Threshold: {threshold}")
         
@@ -643,16 +727,16 @@ class Memory:
         }
         logger.info(f"Prepared metadata: {metadata}")
         
-        # Always store in short-term memory
-        try:
-            logger.info("Storing in short-term memory...")
-            self.store_short_term(
-                text=content,
-                metadata=metadata
-            )
-            logger.info("Successfully stored in short-term memory")
-        except Exception as e:
-            logger.error(f"Failed to store in short-term memory: {e}")
+        if store_short:
+            try:
+                logger.info("Storing in short-term memory...")
+                self.store_short_term(
+                    text=content,
+                    metadata=metadata
+                )
+                logger.info("Successfully stored in short-term memory")
+            except Exception as e:
+                logger.error(f"Failed to store in short-term memory: {e}")
         
         # Store in long-term memory if quality meets threshold
         if quality_score >= threshold:
@@ -750,12 +834,33 @@ class Memory:
                 for content in formatted_hits:
                     lines.append(f" • {content}")
 
-        # Add each section
-        # First get all results
-        short_term = self.search_short_term(q, limit=max_items)
-        long_term = self.search_long_term(q, limit=max_items)
-        entities = self.search_entity(q, limit=max_items)
-        user_mem = self.search_user_memory(user_id, q, limit=max_items) if user_id else []
+        # Embed the query once and share it across all sub-searches
+        query_embedding = None
+        if self.use_rag and hasattr(self, "chroma_col"):
+            try:
+                query_embedding = self._get_embedding(q)
+            except Exception as e:
+                self._log_verbose(f"Error embedding context query: {e}", logging.ERROR)
+
+        # Run the independent searches concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            short_future = executor.submit(
+                self.search_short_term, q, limit=max_items, query_embedding=query_embedding
+            )
+            long_future = executor.submit(
+                self.search_long_term, q, limit=max_items, query_embedding=query_embedding
+            )
+            entity_future = executor.submit(
+                self.search_entity, q, limit=max_items, query_embedding=query_embedding
+            )
+            user_future = executor.submit(
+                self.search_user_memory, user_id, q, limit=max_items, query_embedding=query_embedding
+            ) if user_id else None
+
+            short_term = short_future.result()
+            long_term = long_future.result()
+            entities = entity_future.result()
+            user_mem = user_future.result() if user_future else []
 
         # Add sections in order of priority
         add_section("Short-term Memory Context", short_term)
@@ -903,6 +1008,54 @@ class Memory:
         except Exception as e:
             logger.error(f"Failed to store in memory: {e}")
 
+    def queue_quality_check(
+        self,
+        content: str,
+        expected_output: str,
+        agent_name: str,
+        task_id: Optional[str] = None,
+        threshold: float = 0.7
+    ) -> None:
+        """
+        Store a task output in short-term memory and queue it for background,
+        batched quality scoring. Once scored, the output goes to long-term
+        memory if its score meets ``threshold``.
+        """
+        self.store_short_term(
+            text=content,
+            metadata={
+                "task_id": task_id,
+                "agent": agent_name,
+                "task_type": "output",
+                "stored_at": time.time()
+            }
+        )
+        if not hasattr(self, "_quality_evaluator"):
+            from .quality import QualityEvaluator
+            self._quality_evaluator = QualityEvaluator(
+                memory=self,
+                llm=self.cfg.get("quality_llm", "gpt-4o-mini"),
+                batch_size=self.cfg.get("quality_batch_size", 5),
+                flush_interval=self.cfg.get("quality_flush_interval", 0.5)
+            )
+            atexit.register(_close_at_exit, weakref.ref(self))
+        self._quality_evaluator.submit(
+            content=content,
+            expected_output=expected_output,
+            agent_name=agent_name,
+            task_id=task_id,
+            threshold=threshold
+        )
+
+    def flush_quality_checks(self) -> None:
+        """Wait until all queued quality checks are scored and stored."""
+        if hasattr(self, "_quality_evaluator"):
+            self._quality_evaluator.flush()
+
+    def close(self) -> None:
+        """Finish pending background work. Called at interpreter exit."""
+        self.flush_quality_checks()
+
     def search_with_quality(
         self,
         query: str,
@@ -0,0 +1,158 @@
+import json
+import queue
+import threading
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+QUALITY_METRICS = ["completeness", "relevance", "clarity", "accuracy"]
+
+
+class QualityEvaluator:
+    """
+    Background scorer for task outputs.
+
+    Outputs are queued with ``submit`` and graded off the caller's thread by
+    a single worker. The worker collects up to ``batch_size`` outputs (or
+    whatever arrives within ``flush_interval`` seconds) and scores them all in
+    one judge request, then passes each score to
+    ``Memory.finalize_task_output``, which stores outputs that meet their
+    threshold in long-term memory. Short-term storage happens when the output
+    is queued, so it does not wait for the judge.
+
+    Config (read from the Memory config):
+    {
+      "quality_llm": "gpt-4o-mini",     # judge model
+      "quality_batch_size": 5,          # outputs per judge request
+      "quality_flush_interval": 0.5     # seconds to wait for a fuller batch
+    }
+    """
+
+    def __init__(
+        self,
+        memory,
+        llm: str = "gpt-4o-mini",
+        batch_size: int = 5,
+        flush_interval: float = 0.5
+    ):
+        self.memory = memory
+        self.llm = llm
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="quality-evaluator", daemon=True)
+        self._worker.start()
+
+    def submit(
+        self,
+        content: str,
+        expected_output: str,
+        agent_name: str,
+        task_id: Optional[str] = None,
+        threshold: float = 0.7
+    ) -> None:
+        """Queue an output for scoring; returns immediately."""
+        self._queue.put({
+            "content": content,
+            "expected_output": expected_output,
+            "agent_name": agent_name,
+            "task_id": task_id,
+            "threshold": threshold
+        })
+
+    def flush(self) -> None:
+        """Block until every queued output has been scored and stored."""
+        self._queue.join()
+
+    # -------------------------------------------------------------------------
+    #                              Worker
+    # -------------------------------------------------------------------------
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._process(batch)
+            except Exception as e:
+                logger.error(f"Error processing quality batch: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _process(self, batch: List[Dict[str, Any]]):
+        metrics_list = self.score_batch(batch)
+        for item, metrics in zip(batch, metrics_list):
+            quality_score = metrics.get("accuracy", 0.0)
+            try:
+                self.memory.finalize_task_output(
+                    content=item["content"],
+                    agent_name=item["agent_name"],
+                    quality_score=quality_score,
+                    threshold=item["threshold"],
+                    metrics=metrics,
+                    task_id=item["task_id"],
+                    store_short=False
+                )
+            except Exception as e:
+                logger.error(f"Failed to store scored output for task {item['task_id']}: {e}")
+
+    def score_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, float]]:
+        """Score several outputs with a single judge request."""
+        empty = {k: 0.0 for k in QUALITY_METRICS}
+        entries = "\n\n".join(
+            f"### Output {i}\nExpected: {item['expected_output']}\nActual: {item['content']}"
+            for i, item in enumerate(batch)
+        )
+        prompt = f"""
+        Evaluate each of the following outputs against its expected output.
+        Score each metric from 0.0 to 1.0:
+        - Completeness: Does it address all requirements?
+        - Relevance: Does it match expected output?
+        - Clarity: Is it clear and well-structured?
+        - Accuracy: Is it factually correct?
+
+        {entries}
+
+        Return ONLY a JSON object with a "results" list holding one entry per output,
+        each with these keys: id, completeness, relevance, clarity, accuracy
+        Example: {{"results": [{{"id": 0, "completeness": 0.95, "relevance": 0.8, "clarity": 0.9, "accuracy": 0.85}}]}}
+        """
+
+        try:
+            from ..main import client
+
+            response = client.chat.completions.create(
+                model=self.llm,
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
+                temperature=0.3
+            )
+            results = json.loads(response.choices[0].message.content).get("results", [])
+        except Exception as e:
+            logger.error(f"Error calculating batch metrics: {e}")
+            return [dict(empty) for _ in batch]
+
+        by_id = {}
+        for entry in results:
+            if isinstance(entry, dict) and all(k in entry for k in QUALITY_METRICS):
+                by_id[entry.get("id")] = {k: float(entry[k]) for k in QUALITY_METRICS}
+
+        scored = []
+        for i in range(len(batch)):
+            metrics = by_id.get(i)
+            if metrics is None:
+                logger.warning(f"Judge returned no metrics for output {i} in batch")
+                metrics = dict(empty)
+            scored.append(metrics)
+        logger.info(f"Calculated batch metrics: {scored}")
+        return scored
@@ -190,76 +190,28 @@ class Task:
             self.memory = self.initialize_memory()
 
         logger.info(f"Memory object exists: {self.memory is not None}")
-        if self.memory:
-            logger.info(f"Memory config: {self.memory.cfg}")
-            # Store task output in memory
-            try:
-                logger.info(f"Task {self.id}: Storing task output in memory...")
-                self.store_in_memory(
-                    content=task_output.raw,
-                    agent_name=self.agent.name if self.agent else "Agent",
-                    task_id=self.id
-                )
-                logger.info(f"Task {self.id}: Task output stored in memory")
-            except Exception as e:
-                logger.error(f"Task {self.id}: Failed to store task output in memory: {e}")
-                logger.exception(e)
-
         logger.info(f"Task output: {task_output.raw[:100]}...")
 
-        if self.quality_check and self.memory:
+        if self.memory:
+            logger.info(f"Memory config: {self.memory.cfg}")
             try:
-                logger.info(f"Task {self.id}: Starting memory operations")
-                logger.info(f"Task {self.id}: Calculating quality metrics for output: {task_output.raw[:100]}...")
-
-                # Get quality metrics from LLM
-                metrics = self.memory.calculate_quality_metrics(
-                    task_output.raw,
-                    self.expected_output
-                )
-                logger.info(f"Task {self.id}: Quality metrics calculated: {metrics}")
-
-                quality_score = metrics.get("accuracy", 0.0)
-                logger.info(f"Task {self.id}: Quality score: {quality_score}")
-
-                # Store in both short and long-term memory with higher threshold
-                logger.info(f"Task {self.id}: Finalizing task output in memory...")
-                self.memory.finalize_task_output(
-                    content=task_output.raw,
-                    agent_name=self.agent.name if self.agent else "Agent",
-                    quality_score=quality_score,
-                    threshold=0.7,  # Only high quality outputs in long-term memory
-                    metrics=metrics,
-                    task_id=self.id
-                )
-                logger.info(f"Task {self.id}: Finalized task output in memory")
-
-                # Store quality metrics separately
-                logger.info(f"Task {self.id}: Storing quality metrics...")
-                self.memory.store_quality(
-                    text=task_output.raw,
-                    quality_score=quality_score,
-                    task_id=self.id,
-                    metrics=metrics
-                )
-
-                # Store in both short and long-term memory with higher threshold
-                self.memory.finalize_task_output(
-                    content=task_output.raw,
-                    agent_name=self.agent.name if self.agent else "Agent",
-                    quality_score=quality_score,
-                    threshold=0.7  # Only high quality outputs in long-term memory
-                )
-
-                # Build context for next tasks
-                if self.next_tasks:
-                    logger.info(f"Task {self.id}: Building context for next tasks...")
-                    context = self.memory.build_context_for_task(
-                        task_descr=task_output.raw,
-                        max_items=5
+                if self.quality_check:
+                    # Stored in short-term memory now; scored and promoted to long-term in the background
+                    logger.info(f"Task {self.id}: Queueing output for quality scoring...")
+                    self.memory.queue_quality_check(
+                        content=task_output.raw,
+                        expected_output=self.expected_output,
+                        agent_name=self.agent.name if self.agent else "Agent",
+                        task_id=self.id,
+                        threshold=0.7  # Only high quality outputs in long-term memory
+                    )
+                else:
+                    logger.info(f"Task {self.id}: Storing task output in memory...")
+                    self.store_in_memory(
+                        content=task_output.raw,
+                        agent_name=self.agent.name if self.agent else "Agent",
+                        task_id=self.id
                     )
-                    logger.info(f"Task {self.id}: Built context for next tasks: {len(context)} items")
-
                 logger.info(f"Task {self.id}: Memory operations complete")
             except Exception as e:
                 logger.error(f"Task {self.id}: Failed to process memory operations: {e}")
@@ -6,10 +6,12 @@ from typing import Any
 TOOL_MAPPINGS = {
     # Direct functions
     'internet_search': ('.duckduckgo_tools', None),
+    'internet_search_many': ('.duckduckgo_tools', None),
     'duckduckgo': ('.duckduckgo_tools', None),
     
     # arXiv Tools
     'search_arxiv': ('.arxiv_tools', None),
+    'search_arxiv_many': ('.arxiv_tools', None),
     'get_arxiv_paper': ('.arxiv_tools', None),
     'get_papers_by_author': ('.arxiv_tools', None),
     'get_papers_by_category': ('.arxiv_tools', None),
@@ -18,6 +20,7 @@ TOOL_MAPPINGS = {
     # Wikipedia Tools
     'wiki_search': ('.wikipedia_tools', None),
     'wiki_summary': ('.wikipedia_tools', None),
+    'wiki_summaries': ('.wikipedia_tools', None),
     'wiki_page': ('.wikipedia_tools', None),
     'wiki_random': ('.wikipedia_tools', None),
     'wiki_language': ('.wikipedia_tools', None),
@@ -42,12 +45,22 @@ TOOL_MAPPINGS = {
     'create_table': ('.duckdb_tools', None),
     'load_data': ('.duckdb_tools', None),
     'export_data': ('.duckdb_tools', None),
+    'export_parquet': ('.duckdb_tools', None),
     'get_table_info': ('.duckdb_tools', None),
     'analyze_data': ('.duckdb_tools', None),
+    'open_query': ('.duckdb_tools', None),
+    'fetch_rows': ('.duckdb_tools', None),
+    'export_result': ('.duckdb_tools', None),
+    'close_result': ('.duckdb_tools', None),
     'duckdb_tools': ('.duckdb_tools', None),
     
+    # Tool output artifacts
+    'read_tool_output': ('.tool_output', None),
+
     # Shell Tools
     'execute_command': ('.shell_tools', None),
+    'aexecute_command': ('.shell_tools', None),
+    'aexecute_commands': ('.shell_tools', None),
     'list_processes': ('.shell_tools', None),
     'kill_process': ('.shell_tools', None),
     'get_system_info': ('.shell_tools', None),
@@ -63,6 +76,7 @@ TOOL_MAPPINGS = {
 
     # Class methods from YFinance
     'get_stock_price': ('.yfinance_tools', 'YFinanceTools'),
+    'get_stock_prices': ('.yfinance_tools', 'YFinanceTools'),
     'get_stock_info': ('.yfinance_tools', 'YFinanceTools'),
     'get_historical_data': ('.yfinance_tools', 'YFinanceTools'),
     'yfinance': ('.yfinance_tools', 'YFinanceTools'),
@@ -83,6 +97,8 @@ TOOL_MAPPINGS = {
     'merge_csv': ('.csv_tools', 'CSVTools'),
     'analyze_csv': ('.csv_tools', 'CSVTools'),
     'split_csv': ('.csv_tools', 'CSVTools'),
+    'summarize_csv': ('.csv_tools', 'CSVTools'),
+    'read_csv_page': ('.csv_tools', 'CSVTools'),
     'csv_tools': ('.csv_tools', 'CSVTools'),
 
     # JSON Tools
@@ -92,6 +108,8 @@ TOOL_MAPPINGS = {
     'validate_json': ('.json_tools', 'JSONTools'),
     'analyze_json': ('.json_tools', 'JSONTools'),
     'transform_json': ('.json_tools', 'JSONTools'),
+    'extract_json': ('.json_tools', 'JSONTools'),
+    'infer_json_schema': ('.json_tools', 'JSONTools'),
     'json_tools': ('.json_tools', 'JSONTools'),
 
     # Excel Tools
@@ -100,6 +118,7 @@ TOOL_MAPPINGS = {
     'merge_excel': ('.excel_tools', 'ExcelTools'),
     'create_chart': ('.excel_tools', 'ExcelTools'),
     'add_chart_to_sheet': ('.excel_tools', 'ExcelTools'),
+    'summarize_excel': ('.excel_tools', 'ExcelTools'),
     'excel_tools': ('.excel_tools', 'ExcelTools'),
 
     # XML Tools
@@ -110,6 +129,8 @@ TOOL_MAPPINGS = {
     'xml_to_dict': ('.xml_tools', 'XMLTools'),
     'dict_to_xml': ('.xml_tools', 'XMLTools'),
     'xpath_query': ('.xml_tools', 'XMLTools'),
+    'extract_xml': ('.xml_tools', 'XMLTools'),
+    'infer_xml_schema': ('.xml_tools', 'XMLTools'),
     'xml_tools': ('.xml_tools', 'XMLTools'),
 
     # YAML Tools
@@ -119,6 +140,7 @@ TOOL_MAPPINGS = {
     'validate_yaml': ('.yaml_tools', 'YAMLTools'),
     'analyze_yaml': ('.yaml_tools', 'YAMLTools'),
     'transform_yaml': ('.yaml_tools', 'YAMLTools'),
+    'extract_yaml': ('.yaml_tools', 'YAMLTools'),
     'yaml_tools': ('.yaml_tools', 'YAMLTools'),
 
     # Python Tools
@@ -171,13 +193,14 @@ def __getattr__(name: str) -> Any:
         # Direct function import
         module = import_module(module_path, __package__)
         if name in [
-            'duckduckgo', 'internet_search',
-            'search_arxiv', 'get_arxiv_paper', 'get_papers_by_author', 'get_papers_by_category',
-            'wiki_search', 'wiki_summary', 'wiki_page', 'wiki_random', 'wiki_language',
+            'duckduckgo', 'internet_search', 'internet_search_many',
+            'search_arxiv', 'search_arxiv_many', 'get_arxiv_paper', 'get_papers_by_author', 'get_papers_by_category',
+            'wiki_search', 'wiki_summary', 'wiki_summaries', 'wiki_page', 'wiki_random', 'wiki_language',
             'get_article', 'get_news_sources', 'get_articles_from_source', 'get_trending_topics',
             'scrape_page', 'extract_links', 'crawl', 'extract_text',
-            'query', 'create_table', 'load_data', 'export_data', 'get_table_info', 'analyze_data',
-            'execute_command', 'list_processes', 'kill_process', 'get_system_info',
+            'query', 'create_table', 'load_data', 'export_data', 'export_parquet', 'get_table_info', 'analyze_data',
+            'open_query', 'fetch_rows', 'export_result', 'close_result',
+            'execute_command', 'aexecute_command', 'aexecute_commands', 'list_processes', 'kill_process', 'get_system_info',
             'evaluate', 'solve_equation', 'convert_units', 'calculate_statistics', 'calculate_financial'
         ]:
             return getattr(module, name)
@@ -8,12 +8,15 @@ paper = arxiv_tools.get_paper("2401.00123")
 or
 from praisonaiagents.tools import search_arxiv, get_arxiv_paper
 papers = search_arxiv("quantum computing")
+papers = search_arxiv_many(["quantum error correction", "topological qubits"])
 """
 
 import logging
 from typing import List, Dict, Union, Optional, Any
 from importlib import util
+import threading
 import json
+from .cache import cached_tool, map_concurrent
 
 # Map sort criteria to arxiv.SortCriterion
 SORT_CRITERIA = {
@@ -34,6 +37,8 @@ class ArxivTools:
     def __init__(self):
         """Initialize ArxivTools and check for arxiv package."""
         self._check_arxiv()
+        self._client = None
+        self._client_lock = threading.Lock()
         
     def _check_arxiv(self):
         """Check if arxiv package is installed."""
@@ -42,6 +47,14 @@ class ArxivTools:
         global arxiv
         import arxiv
 
+    def _get_client(self):
+        """Return the shared arxiv client (keeps one HTTP session and rate limiter)."""
+        with self._client_lock:
+            if self._client is None:
+                import arxiv
+                self._client = arxiv.Client()
+            return self._client
+
     def search(
         self,
         query: str,
@@ -69,7 +82,7 @@ class ArxivTools:
             import arxiv
             
             # Configure search client
-            client = arxiv.Client()
+            client = self._get_client()
             
             # Map sort criteria
             sort_by_enum = getattr(arxiv.SortCriterion, SORT_CRITERIA[sort_by.lower()])
@@ -96,6 +109,55 @@ class ArxivTools:
             logging.error(error_msg)
             return {"error": error_msg}
 
+    def search_many(
+        self,
+        queries: List[str],
+        max_results: int = 10,
+        sort_by: str = "relevance",
+        sort_order: str = "descending",
+        include_fields: Optional[List[str]] = None,
+        max_workers: int = 3
+    ) -> Union[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Run several arXiv searches concurrently and merge the results.
+        
+        Args:
+            queries: Search queries
+            max_results: Maximum number of results per query
+            sort_by: Sort results by ("relevance", "lastUpdatedDate", "submittedDate")
+            sort_order: Sort order ("ascending" or "descending")
+            include_fields: List of fields to include in results. If None, includes all.
+            max_workers: Maximum number of queries in flight
+            
+        Returns:
+            List[Dict] or Dict: Papers deduplicated by arXiv ID, each with the
+            queries that matched it, or error dict if every query failed
+        """
+        queries = list(dict.fromkeys(q for q in queries if q))
+        if not queries:
+            return []
+        batches = map_concurrent(
+            lambda q: self.search(q, max_results, sort_by, sort_order, include_fields),
+            queries,
+            max_workers
+        )
+        
+        papers: Dict[str, Dict[str, Any]] = {}
+        errors = []
+        for query, batch in zip(queries, batches):
+            if isinstance(batch, dict):
+                errors.append(f"{query}: {batch.get('error')}")
+                continue
+            for paper in batch:
+                if paper["arxiv_id"] in papers:
+                    papers[paper["arxiv_id"]]["queries"].append(query)
+                else:
+                    papers[paper["arxiv_id"]] = {**paper, "queries": [query]}
+        if errors and not papers:
+            return {"error": "; ".join(errors)}
+        return list(papers.values())
+
+    @cached_tool(ttl=604800)
     def get_paper(
         self,
         paper_id: str,
@@ -229,6 +291,7 @@ class ArxivTools:
 # Create instance for direct function access
 _arxiv_tools = ArxivTools()
 search_arxiv = _arxiv_tools.search
+search_arxiv_many = _arxiv_tools.search_many
 get_arxiv_paper = _arxiv_tools.get_paper
 get_papers_by_author = _arxiv_tools.get_papers_by_author
 get_papers_by_category = _arxiv_tools.get_papers_by_category
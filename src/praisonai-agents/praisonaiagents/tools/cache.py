@@ -0,0 +1,324 @@
+"""Result caching for read-only tools.
+
+Usage:
+from praisonaiagents.tools.cache import cached_tool
+
+@cached_tool(ttl=3600)
+def lookup(query: str) -> dict:
+    ...
+
+Caching is off unless it is enabled for the calling context, either with
+`use_tool_cache` or through an agent's `tool_cache` (for example
+`PraisonAIAgents(tool_cache=True)`):
+
+with use_tool_cache(True):
+    lookup("x")
+
+Calls with the same arguments within `ttl` seconds are then answered from
+a shared on-disk cache (SQLite, `~/.praison/tool_cache.db` by default)
+instead of running the tool again. Results are shared across agents and
+across runs. Results are stored as JSON, so only JSON-serializable results
+are cached (tuples come back as lists). Error results (`{"error": ...}`)
+and None are never cached. Expired entries are purged when the cache is
+opened.
+
+`use_tool_cache(True)` uses the process-wide cache, which can be replaced
+with `set_tool_cache`. Any object implementing the ToolCache interface can
+be passed instead.
+"""
+
+import contextlib
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".praison", "tool_cache.db")
+
+
+class ToolCache:
+    """Interface for tool result caches, with hit/miss accounting."""
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value) for a key."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float], tool: str = "") -> None:
+        """Store a value; ttl of None means it never expires."""
+        raise NotImplementedError
+
+    def clear(self, tool: Optional[str] = None) -> None:
+        """Remove all entries, or only those of one tool."""
+        raise NotImplementedError
+
+    def record(self, tool: str, hit: bool) -> None:
+        with self._stats_lock:
+            counts = self._stats.setdefault(tool, {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counts and hit rate, overall and per tool."""
+        with self._stats_lock:
+            per_tool = {name: dict(counts) for name, counts in self._stats.items()}
+        hits = sum(c["hits"] for c in per_tool.values())
+        misses = sum(c["misses"] for c in per_tool.values())
+        for counts in per_tool.values():
+            total = counts["hits"] + counts["misses"]
+            counts["hit_rate"] = counts["hits"] / total if total else 0.0
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "tools": per_tool
+        }
+
+
+class SQLiteToolCache(ToolCache):
+    """Tool cache persisted in a SQLite file, safe to share between threads."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        super().__init__()
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS tool_cache (
+                    key TEXT PRIMARY KEY,
+                    tool TEXT,
+                    value TEXT,
+                    created_at REAL,
+                    expires_at REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tool_cache_expires ON tool_cache(expires_at)")
+            self._conn.commit()
+        # Entries are otherwise only dropped when their key is requested again
+        self.purge_expired()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM tool_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            if row[1] is not None and row[1] < time.time():
+                self._conn.execute("DELETE FROM tool_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return False, None
+        try:
+            return True, json.loads(row[0])
+        except Exception as e:
+            logging.warning(f"Discarding unreadable tool cache entry: {e}")
+            return False, None
+
+    def set(self, key: str, value: Any, ttl: Optional[float], tool: str = "") -> None:
+        try:
+            data = json.dumps(value)
+        except (TypeError, ValueError) as e:
+            logging.debug(f"Result of {tool} is not cacheable: {e}")
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_cache (key, tool, value, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, tool, data, now, now + ttl if ttl is not None else None)
+            )
+            self._conn.commit()
+
+    def clear(self, tool: Optional[str] = None) -> None:
+        with self._lock:
+            if tool:
+                self._conn.execute("DELETE FROM tool_cache WHERE tool = ?", (tool,))
+            else:
+                self._conn.execute("DELETE FROM tool_cache")
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired entries, returning how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM tool_cache WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+
+_default_cache: Optional[ToolCache] = None
+_default_lock = threading.Lock()
+# None/False: caching disabled; True: the process-wide cache; otherwise a ToolCache
+_active_cache: contextvars.ContextVar = contextvars.ContextVar("praison_tool_cache", default=None)
+
+
+def get_tool_cache() -> ToolCache:
+    """Return the process-wide tool cache, creating it on first use."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SQLiteToolCache(os.getenv("PRAISON_TOOL_CACHE_PATH", DEFAULT_CACHE_PATH))
+        return _default_cache
+
+
+def set_tool_cache(cache: Optional[ToolCache]) -> None:
+    """Replace the process-wide tool cache (None restores the default)."""
+    global _default_cache
+    with _default_lock:
+        _default_cache = cache
+
+
+@contextlib.contextmanager
+def use_tool_cache(cache: Union[ToolCache, bool, None]):
+    """Use `cache` for cached tools called in this context.
+
+    True uses the process-wide cache; None or False disables caching.
+    """
+    token = _active_cache.set(cache)
+    try:
+        yield
+    finally:
+        _active_cache.reset(token)
+
+
+# Shared by all batch tools, so their worker threads (and any per-thread
+# clients such as the DuckDuckGo session) live across calls
+MAX_POOL_WORKERS = 16
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+_pool_thread = threading.local()
+
+
+def _mark_pool_thread():
+    _pool_thread.active = True
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=MAX_POOL_WORKERS,
+                thread_name_prefix="praison-tools",
+                initializer=_mark_pool_thread
+            )
+        return _pool
+
+
+def map_concurrent(func: Callable[[Any], Any], items: Iterable[Any], max_workers: int = 4) -> List[Any]:
+    """Apply func to items on the shared tool thread pool, keeping the caller's tool cache in the workers.
+
+    At most max_workers items of this call run at once. A call made from a
+    pool thread runs its items in that thread instead of waiting on the pool.
+    """
+    items = list(items)
+    if not items:
+        return []
+    if getattr(_pool_thread, "active", False):
+        return [func(item) for item in items]
+    pool = _get_pool()
+    slots = threading.BoundedSemaphore(max(1, max_workers))
+
+    def run(context, item):
+        try:
+            return context.run(func, item)
+        finally:
+            slots.release()
+
+    futures = []
+    for item in items:
+        slots.acquire()
+        futures.append(pool.submit(run, contextvars.copy_context(), item))
+    return [future.result() for future in futures]
+
+
+def _current_cache() -> Optional[ToolCache]:
+    cache = _active_cache.get()
+    if cache is None or cache is False:
+        return None
+    return get_tool_cache() if cache is True else cache
+
+
+def _is_error(result: Any) -> bool:
+    if result is None:
+        return True
+    if isinstance(result, dict) and "error" in result:
+        return True
+    if isinstance(result, list) and result and isinstance(result[0], dict) and "error" in result[0]:
+        return True
+    return False
+
+
+def cached_tool(
+    ttl: Optional[float] = 3600,
+    key: Optional[Callable[[Dict[str, Any]], str]] = None
+):
+    """Mark a read-only tool as cacheable.
+
+    Args:
+        ttl: Seconds a result stays valid (None for no expiry)
+        key: Optional function mapping the call's arguments (a dict, with
+            defaults applied) to a cache key; by default all arguments are used
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        name = func.__qualname__
+
+        def cache_key(args, kwargs) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {k: v for k, v in bound.arguments.items() if k not in ("self", "cls")}
+            raw = key(arguments) if key else json.dumps(arguments, sort_keys=True, default=str)
+            return f"{name}:{hashlib.sha256(str(raw).encode('utf-8')).hexdigest()}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                cache = _current_cache()
+                if cache is None:
+                    return await func(*args, **kwargs)
+                cache_id = cache_key(args, kwargs)
+                found, value = cache.get(cache_id)
+                cache.record(name, found)
+                if found:
+                    return value
+                result = await func(*args, **kwargs)
+                if not _is_error(result):
+                    cache.set(cache_id, result, ttl, name)
+                return result
+            wrapper = async_wrapper
+        else:
+            @functools.wraps(func)
+            def sync_wrapper(*args, **kwargs):
+                cache = _current_cache()
+                if cache is None:
+                    return func(*args, **kwargs)
+                cache_id = cache_key(args, kwargs)
+                found, value = cache.get(cache_id)
+                cache.record(name, found)
+                if found:
+                    return value
+                result = func(*args, **kwargs)
+                if not _is_error(result):
+                    cache.set(cache_id, result, ttl, name)
+                return result
+            wrapper = sync_wrapper
+
+        return wrapper
+    return decorator
+
@@ -7,10 +7,14 @@ df = csv_tools.read_csv("data.csv")
 or
 from praisonaiagents.tools import read_csv, write_csv, merge_csv
 df = read_csv("data.csv")
+
+Large files can be inspected without loading them:
+summary = csv_tools.summarize_csv("big.csv", filters=[["age", ">", 30]])
+page = csv_tools.read_csv_page("big.csv", offset=0, limit=100, usecols=["name", "age"])
 """
 
 import logging
-from typing import List, Dict, Union, Optional, Any, TYPE_CHECKING
+from typing import List, Dict, Union, Optional, Any, Iterable, Iterator, TYPE_CHECKING
 from importlib import util
 import json
 import csv
@@ -19,6 +23,130 @@ from pathlib import Path
 if TYPE_CHECKING:
     import pandas as pd
 
+# Row filters are given as [column, op, value] triples and ANDed together,
+# e.g. [["age", ">", 30], ["city", "in", ["Paris", "Tokyo"]]]
+FILTER_OPS = ('==', '!=', '>', '>=', '<', '<=', 'in', 'not in')
+
+
+def _apply_filters(df: 'pd.DataFrame', filters: Optional[List[List[Any]]]) -> 'pd.DataFrame':
+    """Apply [column, op, value] filters to a DataFrame."""
+    if not filters:
+        return df
+    mask = None
+    for column, op, value in filters:
+        series = df[column]
+        if op == '==':
+            cond = series == value
+        elif op == '!=':
+            cond = series != value
+        elif op == '>':
+            cond = series > value
+        elif op == '>=':
+            cond = series >= value
+        elif op == '<':
+            cond = series < value
+        elif op == '<=':
+            cond = series <= value
+        elif op == 'in':
+            cond = series.isin(value)
+        elif op == 'not in':
+            cond = ~series.isin(value)
+        else:
+            raise ValueError(f"Unsupported filter operator '{op}', expected one of {FILTER_OPS}")
+        mask = cond if mask is None else mask & cond
+    return df[mask]
+
+
+def _filters_to_sql(filters: Optional[List[List[Any]]]) -> tuple:
+    """Translate [column, op, value] filters into a parameterized SQL WHERE clause."""
+    clauses, params = [], []
+    for column, op, value in filters or []:
+        if op not in FILTER_OPS:
+            raise ValueError(f"Unsupported filter operator '{op}', expected one of {FILTER_OPS}")
+        col = _quote_identifier(column)
+        if op in ('in', 'not in'):
+            placeholders = ', '.join('?' for _ in value)
+            clauses.append(f"{col} {op.upper()} ({placeholders})")
+            params.extend(value)
+        else:
+            clauses.append(f"{col} {'=' if op == '==' else op} ?")
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _to_python(value: Any) -> Any:
+    """Convert numpy scalars to plain Python values."""
+    return value.item() if hasattr(value, 'item') else value
+
+
+_DUCKDB_INT_TYPES = {
+    'TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT',
+    'UTINYINT', 'USMALLINT', 'UINTEGER', 'UBIGINT', 'UHUGEINT'
+}
+_DUCKDB_FLOAT_TYPES = {'FLOAT', 'REAL', 'DOUBLE', 'DECIMAL', 'NUMERIC'}
+
+
+def _duckdb_column_stats(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Column stats from a DuckDB SUMMARIZE row, shaped like _summarize_frames' stats.
+
+    SUMMARIZE reports min/max/avg as strings; numeric columns get them cast
+    back to numbers, other columns only get counts (as in the pandas path).
+    """
+    nulls = round(row["count"] * float(row["null_percentage"] or 0) / 100)
+    stats = {"count": row["count"] - nulls, "nulls": nulls}
+    base_type = row["column_type"].split('(')[0].upper()
+    if base_type in _DUCKDB_INT_TYPES or base_type in _DUCKDB_FLOAT_TYPES:
+        cast = int if base_type in _DUCKDB_INT_TYPES else float
+        if row["min"] is not None:
+            stats["min"] = cast(row["min"])
+            stats["max"] = cast(row["max"])
+            stats["mean"] = float(row["avg"])
+    stats["approx_unique"] = row["approx_unique"]
+    return stats
+
+
+def _summarize_frames(frames: Iterable['pd.DataFrame'], head: int = 5) -> Dict[str, Any]:
+    """Build a schema/stats/head summary from DataFrame chunks in one pass."""
+    import pandas as pd
+
+    schema = None
+    head_rows: List[Dict[str, Any]] = []
+    row_count = 0
+    stats: Dict[str, Dict[str, Any]] = {}
+
+    for df in frames:
+        if schema is None:
+            schema = [{"name": str(col), "type": str(dtype)} for col, dtype in df.dtypes.items()]
+        if len(head_rows) < head:
+            head_rows.extend(df.head(head - len(head_rows)).to_dict('records'))
+        row_count += len(df)
+        for col in df.columns:
+            series = df[col]
+            col_stats = stats.setdefault(str(col), {"count": 0, "nulls": 0})
+            non_null = int(series.count())
+            col_stats["count"] += non_null
+            col_stats["nulls"] += len(series) - non_null
+            if non_null and pd.api.types.is_numeric_dtype(series):
+                col_min, col_max = _to_python(series.min()), _to_python(series.max())
+                col_stats["min"] = col_min if "min" not in col_stats else min(col_stats["min"], col_min)
+                col_stats["max"] = col_max if "max" not in col_stats else max(col_stats["max"], col_max)
+                col_stats["sum"] = col_stats.get("sum", 0) + _to_python(series.sum())
+
+    for col_stats in stats.values():
+        if "sum" in col_stats:
+            col_stats["mean"] = col_stats.pop("sum") / col_stats["count"]
+
+    return {
+        "row_count": row_count,
+        "schema": schema or [],
+        "stats": stats,
+        "head": head_rows
+    }
+
 class CSVTools:
     """Tools for working with CSV files."""
     
@@ -45,9 +173,13 @@ class CSVTools:
         dtype: Optional[Dict[str, str]] = None,
         parse_dates: Optional[List[str]] = None,
         na_values: Optional[List[str]] = None,
-        nrows: Optional[int] = None
+        nrows: Optional[int] = None,
+        filters: Optional[List[List[Any]]] = None
     ) -> List[Dict[str, Any]]:
         """Read a CSV file with advanced options.
+
+        For large files prefer summarize_csv / read_csv_page, which never
+        hold the whole file in memory.
         
         Args:
             filepath: Path to CSV file
@@ -59,6 +191,7 @@ class CSVTools:
             parse_dates: List of columns to parse as dates
             na_values: Additional strings to recognize as NA/NaN
             nrows: Number of rows to read
+            filters: [column, op, value] row filters, applied chunk by chunk
             
         Returns:
             List of row dicts
@@ -68,6 +201,25 @@ class CSVTools:
             if pd is None:
                 return {"error": "pandas package not available"}
 
+            if filters:
+                # Filter while streaming so only matching rows are kept
+                rows = []
+                for chunk in self.iter_csv(
+                    filepath,
+                    encoding=encoding,
+                    delimiter=delimiter,
+                    usecols=usecols,
+                    filters=filters,
+                    header=header,
+                    dtype=dtype,
+                    parse_dates=parse_dates,
+                    na_values=na_values
+                ):
+                    rows.extend(chunk)
+                    if nrows is not None and len(rows) >= nrows:
+                        return rows[:nrows]
+                return rows
+
             df = pd.read_csv(
                 filepath,
                 encoding=encoding,
@@ -86,6 +238,199 @@ class CSVTools:
             logging.error(error_msg)
             return {"error": error_msg}
 
+    def _iter_csv_frames(
+        self,
+        filepath: str,
+        chunksize: int = 100000,
+        encoding: str = 'utf-8',
+        delimiter: str = ',',
+        usecols: Optional[List[str]] = None,
+        filters: Optional[List[List[Any]]] = None,
+        **kwargs
+    ) -> Iterator['pd.DataFrame']:
+        """Yield filtered DataFrame chunks of a CSV file."""
+        pd = self._get_pandas()
+        if pd is None:
+            raise ImportError("pandas package not available")
+        columns = None
+        if usecols and filters:
+            # Filter columns must be read even if they are not returned
+            columns = list(usecols)
+            usecols = list(dict.fromkeys(list(usecols) + [f[0] for f in filters]))
+        for chunk in pd.read_csv(
+            filepath,
+            encoding=encoding,
+            delimiter=delimiter,
+            usecols=usecols,
+            chunksize=chunksize,
+            **kwargs
+        ):
+            chunk = _apply_filters(chunk, filters)
+            yield chunk[columns] if columns else chunk
+
+    def iter_csv(
+        self,
+        filepath: str,
+        chunksize: int = 10000,
+        encoding: str = 'utf-8',
+        delimiter: str = ',',
+        usecols: Optional[List[str]] = None,
+        filters: Optional[List[List[Any]]] = None,
+        **kwargs
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Iterate over a CSV file in chunks of row dicts.
+        
+        Args:
+            filepath: Path to CSV file
+            chunksize: Rows per chunk
+            encoding: File encoding
+            delimiter: Column delimiter
+            usecols: Columns to return
+            filters: [column, op, value] row filters
+            **kwargs: Additional arguments passed to pandas.read_csv
+            
+        Yields:
+            List of row dicts per chunk (chunks may be empty after filtering)
+        """
+        for chunk in self._iter_csv_frames(
+            filepath, chunksize, encoding, delimiter, usecols, filters, **kwargs
+        ):
+            yield chunk.to_dict('records')
+
+    def _duckdb_scan(
+        self,
+        filepath: str,
+        delimiter: str,
+        usecols: Optional[List[str]],
+        filters: Optional[List[List[Any]]]
+    ) -> Optional[tuple]:
+        """Build a DuckDB query scanning the CSV with projection and filters, if DuckDB is installed."""
+        if util.find_spec('duckdb') is None:
+            return None
+        import duckdb
+        cols = ', '.join(_quote_identifier(c) for c in usecols) if usecols else '*'
+        where, params = _filters_to_sql(filters)
+        path = "'" + str(filepath).replace("'", "''") + "'"
+        delim = "'" + delimiter.replace("'", "''") + "'"
+        sql = f"SELECT {cols} FROM read_csv_auto({path}, delim={delim}, header=true){where}"
+        return duckdb.connect(), sql, params
+
+    def summarize_csv(
+        self,
+        filepath: str,
+        usecols: Optional[List[str]] = None,
+        filters: Optional[List[List[Any]]] = None,
+        head: int = 5,
+        delimiter: str = ',',
+        encoding: str = 'utf-8'
+    ) -> Dict[str, Any]:
+        """Summarize a CSV file without loading it: schema, row count, column stats and head.
+
+        Uses DuckDB to scan the file when it is installed, otherwise streams
+        it through pandas in chunks. Both report count and nulls per column,
+        and numeric min, max and mean for numeric columns; DuckDB also adds
+        approx_unique.
+        
+        Args:
+            filepath: Path to CSV file
+            usecols: Columns to include
+            filters: [column, op, value] row filters
+            head: Number of leading rows to include
+            delimiter: Column delimiter
+            encoding: File encoding (pandas fallback only)
+            
+        Returns:
+            Dict with row_count, schema, stats and head, or error dict
+        """
+        try:
+            scan = self._duckdb_scan(filepath, delimiter, usecols, filters)
+            if scan is not None:
+                conn, sql, params = scan
+                try:
+                    summary = conn.execute(f"SUMMARIZE {sql}", params).fetchall()
+                    columns = [d[0] for d in conn.description]
+                    summary = [dict(zip(columns, row)) for row in summary]
+                    head_result = conn.execute(f"{sql} LIMIT {int(head)}", params)
+                    head_columns = [d[0] for d in head_result.description]
+                    return {
+                        "row_count": summary[0]["count"] if summary else 0,
+                        "schema": [{"name": r["column_name"], "type": r["column_type"]} for r in summary],
+                        "stats": {r["column_name"]: _duckdb_column_stats(r) for r in summary},
+                        "head": [dict(zip(head_columns, row)) for row in head_result.fetchall()]
+                    }
+                finally:
+                    conn.close()
+
+            return _summarize_frames(
+                self._iter_csv_frames(
+                    filepath, encoding=encoding, delimiter=delimiter, usecols=usecols, filters=filters
+                ),
+                head=head
+            )
+
+        except Exception as e:
+            error_msg = f"Error summarizing CSV file {filepath}: {str(e)}"
+            logging.error(error_msg)
+            return {"error": error_msg}
+
+    def read_csv_page(
+        self,
+        filepath: str,
+        offset: int = 0,
+        limit: int = 100,
+        usecols: Optional[List[str]] = None,
+        filters: Optional[List[List[Any]]] = None,
+        delimiter: str = ',',
+        encoding: str = 'utf-8'
+    ) -> Dict[str, Any]:
+        """Read one page of (optionally filtered and projected) rows from a CSV file.
+        
+        Args:
+            filepath: Path to CSV file
+            offset: Index of the first matching row to return
+            limit: Maximum number of rows to return
+            usecols: Columns to return
+            filters: [column, op, value] row filters
+            delimiter: Column delimiter
+            encoding: File encoding (pandas fallback only)
+            
+        Returns:
+            Dict with rows and the offset of the next page (None at the end), or error dict
+        """
+        try:
+            scan = self._duckdb_scan(filepath, delimiter, usecols, filters)
+            if scan is not None:
+                conn, sql, params = scan
+                try:
+                    result = conn.execute(f"{sql} LIMIT {int(limit) + 1} OFFSET {int(offset)}", params)
+                    columns = [d[0] for d in result.description]
+                    rows = [dict(zip(columns, row)) for row in result.fetchall()]
+                finally:
+                    conn.close()
+            else:
+                # Skip whole chunks until the page starts, then collect limit + 1 rows
+                rows, seen = [], 0
+                for chunk in self._iter_csv_frames(
+                    filepath, encoding=encoding, delimiter=delimiter, usecols=usecols, filters=filters
+                ):
+                    if seen + len(chunk) > offset:
+                        rows.extend(chunk.iloc[max(offset - seen, 0):].to_dict('records'))
+                    seen += len(chunk)
+                    if len(rows) > limit:
+                        break
+
+            has_more = len(rows) > limit
+            return {
+                "offset": offset,
+                "rows": rows[:limit],
+                "next_offset": offset + limit if has_more else None
+            }
+
+        except Exception as e:
+            error_msg = f"Error reading CSV file {filepath}: {str(e)}"
+            logging.error(error_msg)
+            return {"error": error_msg}
+
     def write_csv(
         self,
         filepath: str,
@@ -146,23 +491,23 @@ class CSVTools:
                     rows.append(row_dict)
                     data = rows
 
-                df = pd.DataFrame(data)
-                
-                # Handle append mode properly
-                write_header = header if mode == 'w' else (header and not Path(filepath).exists())
-                
-                df.to_csv(
-                    filepath,
-                    encoding=encoding,
-                    sep=delimiter,
-                    index=index,
-                    header=write_header,
-                    float_format=float_format,
-                    date_format=date_format,
-                    mode=mode
-                )
-                return True
+            df = pd.DataFrame(data)
+            
+            # Handle append mode properly
+            write_header = header if mode == 'w' else (header and not Path(filepath).exists())
             
+            df.to_csv(
+                filepath,
+                encoding=encoding,
+                sep=delimiter,
+                index=index,
+                header=write_header,
+                float_format=float_format,
+                date_format=date_format,
+                mode=mode
+            )
+            return True
+        
         except Exception as e:
             error_msg = f"Error writing CSV file {filepath}: {str(e)}"
             logging.error(error_msg)
@@ -174,9 +519,13 @@ class CSVTools:
         output_file: str,
         how: str = 'inner',
         on: Optional[Union[str, List[str]]] = None,
-        suffixes: Optional[tuple] = None
+        suffixes: Optional[tuple] = None,
+        chunksize: int = 100000
     ) -> bool:
         """Merge multiple CSV files.
+
+        For 'inner' and 'left' merges the first file is streamed in chunks
+        and written incrementally, so only the other files are held in memory.
         
         Args:
             files: List of CSV files to merge
@@ -184,6 +533,7 @@ class CSVTools:
             how: Merge method ('inner', 'outer', 'left', 'right')
             on: Column(s) to merge on
             suffixes: Suffixes for overlapping columns
+            chunksize: Rows of the first file to merge at a time
             
         Returns:
             bool: Success status
@@ -198,22 +548,30 @@ class CSVTools:
             if pd is None:
                 return False
 
-            # Read first file
-            result = pd.read_csv(files[0])
-            
-            # Merge with remaining files
-            for file in files[1:]:
-                df = pd.read_csv(file)
-                result = pd.merge(
-                    result,
-                    df,
-                    how=how,
-                    on=on,
-                    suffixes=suffixes or ('_1', '_2')
-                )
-            
-            # Write merged result
-            result.to_csv(output_file, index=False)
+            suffixes = suffixes or ('_1', '_2')
+            if how not in ('inner', 'left'):
+                # Outer/right joins need the whole left side at once
+                result = pd.read_csv(files[0])
+                for file in files[1:]:
+                    result = pd.merge(result, pd.read_csv(file), how=how, on=on, suffixes=suffixes)
+                result.to_csv(output_file, index=False)
+                return True
+
+            # Stream the first file and merge each chunk against the others,
+            # appending to the output as we go
+            others = [pd.read_csv(file) for file in files[1:]]
+            first = True
+            for chunk in pd.read_csv(files[0], chunksize=chunksize):
+                for other in others:
+                    chunk = pd.merge(chunk, other, how=how, on=on, suffixes=suffixes)
+                chunk.to_csv(output_file, index=False, mode='w' if first else 'a', header=first)
+                first = False
+            if first:
+                # Empty input: still write the header
+                empty = pd.read_csv(files[0], nrows=0)
+                for other in others:
+                    empty = pd.merge(empty, other, how=how, on=on, suffixes=suffixes)
+                empty.to_csv(output_file, index=False)
             return True
             
         except Exception as e:
@@ -226,6 +584,9 @@ _csv_tools = CSVTools()
 read_csv = _csv_tools.read_csv
 write_csv = _csv_tools.write_csv
 merge_csv = _csv_tools.merge_csv
+iter_csv = _csv_tools.iter_csv
+summarize_csv = _csv_tools.summarize_csv
+read_csv_page = _csv_tools.read_csv_page
 
 if __name__ == "__main__":
     print("\n==================================================")
@@ -287,6 +648,15 @@ if __name__ == "__main__":
                         print(row)
                 print()
         
+        print("4. Summarizing and Paging Without Loading")
+        print("------------------------------")
+        summary = summarize_csv(temp_file, filters=[["age", ">", 25]])
+        print(f"Rows: {summary['row_count']}, schema: {summary['schema']}")
+        print(f"Stats: {summary['stats']}")
+        page = read_csv_page(temp_file, offset=1, limit=1, usecols=["name"])
+        print(f"Page: {page}")
+        print()
+
         # Clean up temporary files
         os.unlink(temp_file)
         os.unlink(temp_file2)
@@ -7,17 +7,29 @@ df = duckdb_tools.query("SELECT * FROM my_table")
 or
 from praisonaiagents.tools import query_db, create_table, load_data
 df = query_db("SELECT * FROM my_table")
+
+execute_query returns at most 1000 rows by default (max_rows) and flags
+larger results with "truncated". Large results can be kept inside DuckDB
+and paged through instead:
+handle = duckdb_tools.open_query("SELECT * FROM big_table")
+rows = duckdb_tools.fetch_rows(handle["cursor"], offset=0, limit=100)
+duckdb_tools.export_result(handle["cursor"], "big.parquet")
 """
 
 import logging
 from typing import List, Dict, Any, Optional, Union, TYPE_CHECKING
 from importlib import util
 import json
+import os
+import uuid
 
 if TYPE_CHECKING:
     import duckdb
     import pandas as pd
 
+# Rows execute_query converts to Python objects before truncating
+DEFAULT_MAX_ROWS = 1000
+
 class DuckDBTools:
     """Tools for working with DuckDB databases."""
     
@@ -29,6 +41,7 @@ class DuckDBTools:
         """
         self.database = database
         self._conn = None
+        self._results = {}  # cursor id -> result handle metadata
 
     def _get_duckdb(self) -> Optional['duckdb']:
         """Get duckdb module, installing if needed"""
@@ -66,17 +79,23 @@ class DuckDBTools:
         self,
         query: str,
         params: Optional[Union[tuple, dict]] = None,
-        return_df: bool = True
-    ) -> Union[List[Dict[str, Any]], Dict[str, str]]:
+        return_df: bool = True,
+        max_rows: Optional[int] = DEFAULT_MAX_ROWS
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """Execute a SQL query.
         
+        At most ``max_rows`` rows are converted to Python objects. Larger
+        results return a dict with the first ``max_rows`` rows and
+        ``truncated: True``; use open_query/fetch_rows to page through them.
+        
         Args:
             query: SQL query to execute
             params: Query parameters
             return_df: If True, return results as DataFrame records
+            max_rows: Maximum number of rows to return (None for no limit)
             
         Returns:
-            Query results as list of dicts, or error dict
+            Query results as list of dicts, a truncated result dict, or error dict
         """
         try:
             conn = self._get_connection()
@@ -88,14 +107,33 @@ class DuckDBTools:
             else:
                 result = conn.execute(query)
 
-            if return_df:
-                pd = self._get_pandas()
-                if pd is None:
-                    return {"error": "pandas package not available"}
-                df = result.df()
-                return df.to_dict('records')
+            # Fetch one row past the limit to detect truncation
+            limit = None if max_rows is None else max_rows + 1
+            if return_df and util.find_spec('pyarrow') is not None:
+                # Arrow -> Python rows directly, without an intermediate DataFrame
+                rows = self._fetch_arrow(result, limit).to_pylist()
             else:
-                return [dict(row) for row in result.fetchall()]
+                columns = [col[0] for col in result.description]
+                records = result.fetchall() if limit is None else result.fetchmany(limit)
+                if return_df:
+                    pd = self._get_pandas()
+                    if pd is None:
+                        return {"error": "pandas package not available"}
+                    rows = pd.DataFrame.from_records(records, columns=columns).to_dict('records')
+                else:
+                    rows = [dict(zip(columns, row)) for row in records]
+
+            if max_rows is not None and len(rows) > max_rows:
+                return {
+                    "rows": rows[:max_rows],
+                    "truncated": True,
+                    "max_rows": max_rows,
+                    "note": (
+                        f"The result has more than {max_rows} rows. Use open_query and "
+                        "fetch_rows to page through it, or export_result to write it to a file."
+                    )
+                }
+            return rows
 
         except Exception as e:
             error_msg = f"Error executing query: {str(e)}"
@@ -182,37 +220,259 @@ class DuckDBTools:
         Returns:
             bool: Success status
         """
+        return self._export_query(query, filepath, 'csv', params)
+
+    def export_parquet(
+        self,
+        query: str,
+        filepath: str,
+        params: Optional[Union[tuple, dict]] = None
+    ) -> bool:
+        """Export query results to Parquet.
+        
+        Args:
+            query: SQL query to execute
+            filepath: Output file path
+            params: Optional query parameters
+            
+        Returns:
+            bool: Success status
+        """
+        return self._export_query(query, filepath, 'parquet', params)
+
+    def _export_query(
+        self,
+        query: str,
+        filepath: str,
+        file_format: str,
+        params: Optional[Union[tuple, dict]] = None
+    ) -> bool:
+        """Write query results straight to a file with DuckDB's COPY."""
         try:
-            # Execute query and get results as DataFrame
-            results = self.execute_query(query, params)
-            if isinstance(results, dict) and 'error' in results:
+            conn = self._get_connection()
+            if conn is None:
                 return False
 
-            pd = self._get_pandas()
-            if pd is None:
-                return False
+            if params:
+                # COPY cannot bind parameters, so stage the result in DuckDB first
+                handle = self.open_query(query, params, sample_size=0)
+                if 'error' in handle:
+                    return False
+                try:
+                    return self.export_result(handle['cursor'], filepath, file_format)
+                finally:
+                    self.close_result(handle['cursor'])
+
+            conn.execute(
+                f"COPY ({query}) TO {self._quote_literal(filepath)} {self._copy_options(file_format)}"
+            )
+            return True
+
+        except Exception as e:
+            error_msg = f"Error exporting to {file_format} file {filepath}: {str(e)}"
+            logging.error(error_msg)
+            return False
+
+    # -------------------------------------------------------------------------
+    #                         Result handles
+    # -------------------------------------------------------------------------
+    def _to_arrow(self, result):
+        """Fetch a DuckDB result as an Arrow table (API name differs across versions)."""
+        if hasattr(result, 'to_arrow_table'):
+            return result.to_arrow_table()
+        return result.fetch_arrow_table()
+
+    def _fetch_arrow(self, result, limit: Optional[int]):
+        """Fetch at most ``limit`` rows of a DuckDB result as an Arrow table."""
+        if limit is None:
+            return self._to_arrow(result)
+        import pyarrow as pa
+        batch_size = min(limit, 10000)
+        if hasattr(result, 'to_arrow_reader'):
+            reader = result.to_arrow_reader(batch_size)
+        else:
+            reader = result.fetch_record_batch(batch_size)
+        batches, count = [], 0
+        for batch in reader:
+            batches.append(batch)
+            count += batch.num_rows
+            if count >= limit:
+                break
+        return pa.Table.from_batches(batches, schema=reader.schema).slice(0, limit)
+
+    def _quote_literal(self, value: str) -> str:
+        return "'" + value.replace("'", "''") + "'"
+
+    def _copy_options(self, file_format: str) -> str:
+        file_format = file_format.lower()
+        if file_format == 'parquet':
+            return "(FORMAT PARQUET)"
+        if file_format == 'csv':
+            return "(FORMAT CSV, HEADER)"
+        raise ValueError("file_format must be 'csv' or 'parquet'")
+
+    def _rows(self, table: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        conn = self._get_connection()
+        result = conn.execute(f'SELECT * FROM "{table}" LIMIT ? OFFSET ?', [limit, offset])
+        if util.find_spec('pyarrow') is not None:
+            return self._to_arrow(result).to_pylist()
+        columns = [col[0] for col in result.description]
+        return [dict(zip(columns, row)) for row in result.fetchall()]
+
+    def open_query(
+        self,
+        query: str,
+        params: Optional[Union[tuple, dict]] = None,
+        sample_size: int = 10
+    ) -> Dict[str, Any]:
+        """Run a query and keep its result inside DuckDB behind a cursor.
+
+        Nothing but a small sample is converted to Python objects, so this
+        is safe for results with millions of rows.
+        
+        Args:
+            query: SQL query to execute
+            params: Query parameters
+            sample_size: Number of sample rows to include
+            
+        Returns:
+            Dict with cursor, schema, row_count and sample rows, or error dict
+        """
+        try:
+            conn = self._get_connection()
+            if conn is None:
+                return {"error": "Could not connect to database"}
+
+            cursor = uuid.uuid4().hex[:12]
+            table = f"_praison_result_{cursor}"
+            if params:
+                conn.execute(f'CREATE TEMP TABLE "{table}" AS {query}', params)
+            else:
+                conn.execute(f'CREATE TEMP TABLE "{table}" AS {query}')
+
+            row_count = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+            schema = [
+                {"name": row[0], "type": row[1]}
+                for row in conn.execute(f'DESCRIBE "{table}"').fetchall()
+            ]
+            self._results[cursor] = {"table": table, "row_count": row_count, "schema": schema}
+
+            return {
+                "cursor": cursor,
+                "row_count": row_count,
+                "schema": schema,
+                "sample": self._rows(table, 0, sample_size) if sample_size else []
+            }
+
+        except Exception as e:
+            error_msg = f"Error executing query: {str(e)}"
+            logging.error(error_msg)
+            return {"error": error_msg}
+
+    def fetch_rows(
+        self,
+        cursor: str,
+        offset: int = 0,
+        limit: int = 100
+    ) -> Union[Dict[str, Any], Dict[str, str]]:
+        """Fetch one page of rows from a result opened with open_query.
+        
+        Args:
+            cursor: Cursor returned by open_query
+            offset: Index of the first row to return
+            limit: Maximum number of rows to return
+            
+        Returns:
+            Dict with rows and the offset of the next page (None at the end), or error dict
+        """
+        try:
+            handle = self._results.get(cursor)
+            if handle is None:
+                return {"error": f"Unknown cursor: {cursor}"}
+
+            rows = self._rows(handle["table"], offset, limit)
+            next_offset = offset + len(rows)
+            return {
+                "cursor": cursor,
+                "offset": offset,
+                "rows": rows,
+                "next_offset": next_offset if next_offset < handle["row_count"] else None
+            }
+
+        except Exception as e:
+            error_msg = f"Error fetching rows for cursor {cursor}: {str(e)}"
+            logging.error(error_msg)
+            return {"error": error_msg}
+
+    def export_result(
+        self,
+        cursor: str,
+        filepath: str,
+        file_format: Optional[str] = None
+    ) -> bool:
+        """Write a result opened with open_query to a CSV or Parquet file.
+        
+        Args:
+            cursor: Cursor returned by open_query
+            filepath: Output file path
+            file_format: 'csv' or 'parquet'; inferred from the extension if omitted
+            
+        Returns:
+            bool: Success status
+        """
+        try:
+            handle = self._results.get(cursor)
+            if handle is None:
+                raise ValueError(f"Unknown cursor: {cursor}")
+
+            if file_format is None:
+                ext = os.path.splitext(filepath)[1].lower()
+                file_format = 'parquet' if ext in ('.parquet', '.pq') else 'csv'
 
-            # Convert to DataFrame and save
-            df = pd.DataFrame(results)
-            df.to_csv(filepath, index=False)
+            conn = self._get_connection()
+            conn.execute(
+                f'COPY "{handle["table"]}" TO {self._quote_literal(filepath)} {self._copy_options(file_format)}'
+            )
             return True
 
         except Exception as e:
-            error_msg = f"Error exporting to CSV file {filepath}: {str(e)}"
+            error_msg = f"Error exporting cursor {cursor} to {filepath}: {str(e)}"
             logging.error(error_msg)
             return False
 
+    def close_result(self, cursor: str) -> bool:
+        """Release a result opened with open_query.
+        
+        Args:
+            cursor: Cursor returned by open_query
+            
+        Returns:
+            bool: True if the cursor existed
+        """
+        handle = self._results.pop(cursor, None)
+        if handle is None:
+            return False
+        if self._conn is not None:
+            self._conn.execute(f'DROP TABLE IF EXISTS "{handle["table"]}"')
+        return True
+
     def close(self):
         """Close database connection."""
         if self._conn:
             self._conn.close()
             self._conn = None
+        self._results.clear()
 
 # Create instance for direct function access
 _duckdb_tools = DuckDBTools()
 execute_query = _duckdb_tools.execute_query
 load_csv = _duckdb_tools.load_csv
 export_csv = _duckdb_tools.export_csv
+export_parquet = _duckdb_tools.export_parquet
+open_query = _duckdb_tools.open_query
+fetch_rows = _duckdb_tools.fetch_rows
+export_result = _duckdb_tools.export_result
+close_result = _duckdb_tools.close_result
 
 if __name__ == "__main__":
     print("\n==================================================")
@@ -259,6 +519,18 @@ if __name__ == "__main__":
                 with open(temp_file2) as f:
                     print(f.read())
         
+        print("4. Paging Through a Query Result")
+        print("------------------------------")
+        handle = open_query("SELECT * FROM users ORDER BY age", sample_size=1)
+        print(f"Rows: {handle['row_count']}, schema: {handle['schema']}")
+        page = fetch_rows(handle['cursor'], offset=1, limit=2)
+        print(f"Page rows: {page['rows']}, next offset: {page['next_offset']}")
+        temp_file3 = temp_file2.replace('.csv', '.parquet')
+        print(f"Exported to Parquet: {export_result(handle['cursor'], temp_file3)}")
+        close_result(handle['cursor'])
+        os.unlink(temp_file3)
+        print()
+
         # Clean up temporary files
         os.unlink(temp_file)
         os.unlink(temp_file2)
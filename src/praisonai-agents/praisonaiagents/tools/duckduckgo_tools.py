@@ -7,13 +7,33 @@ results = internet_search("AI news")
 or 
 from praisonaiagents.tools import duckduckgo
 results = duckduckgo("AI news")
+
+Several queries in one call (run concurrently, deduplicated by URL):
+results = internet_search_many(["AI news", "LLM benchmarks"])
 """
 
 from typing import List, Dict
 import logging
+import threading
 from importlib import util
+from .cache import cached_tool, map_concurrent
+
+_session = threading.local()
+
 
-def internet_search(query: str) -> List[Dict]:
+def _get_ddgs():
+    """Return this thread's DDGS client, reusing its HTTP session across searches.
+
+    Batch searches run on the shared tool pool, whose threads keep their
+    client between calls.
+    """
+    if getattr(_session, "ddgs", None) is None:
+        from duckduckgo_search import DDGS
+        _session.ddgs = DDGS()
+    return _session.ddgs
+
+@cached_tool(ttl=3600)
+def internet_search(query: str, max_results: int = 5) -> List[Dict]:
     """Perform an internet search using DuckDuckGo."""
     # Check if duckduckgo_search is installed
     if util.find_spec("duckduckgo_search") is None:
@@ -22,11 +42,9 @@ def internet_search(query: str) -> List[Dict]:
         return [{"error": error_msg}]
 
     try:
-        # Import only when needed
-        from duckduckgo_search import DDGS
         results = []
-        ddgs = DDGS()
-        for result in ddgs.text(keywords=query, max_results=5):
+        ddgs = _get_ddgs()
+        for result in ddgs.text(keywords=query, max_results=max_results):
             results.append({
                 "title": result.get("title", ""),
                 "url": result.get("href", ""),
@@ -39,6 +57,28 @@ def internet_search(query: str) -> List[Dict]:
         logging.error(error_msg)
         return [{"error": error_msg}]
 
+def internet_search_many(queries: List[str], max_results: int = 5, max_workers: int = 4) -> List[Dict]:
+    """Run several DuckDuckGo searches concurrently and merge the results.
+    
+    Results are deduplicated by URL; each keeps the list of queries that found it.
+    """
+    queries = list(dict.fromkeys(q for q in queries if q))
+    batches = map_concurrent(lambda q: internet_search(q, max_results=max_results), queries, max_workers)
+
+    merged: Dict[str, Dict] = {}
+    errors = []
+    for query, results in zip(queries, batches):
+        for result in results:
+            if "error" in result:
+                errors.append({"query": query, "error": result["error"]})
+                continue
+            key = result.get("url") or result.get("title")
+            if key in merged:
+                merged[key]["queries"].append(query)
+            else:
+                merged[key] = {**result, "queries": [query]}
+    return list(merged.values()) + errors
+
 def duckduckgo(query: str) -> List[Dict]:
     """Alias for internet_search function."""
     return internet_search(query)
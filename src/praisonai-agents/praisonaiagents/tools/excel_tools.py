@@ -7,16 +7,21 @@ df = excel_tools.read_excel("data.xlsx")
 or
 from praisonaiagents.tools import read_excel, write_excel, merge_excel
 df = read_excel("data.xlsx")
+
+Large workbooks can be inspected without loading them:
+summary = excel_tools.summarize_excel("big.xlsx", filters=[["age", ">", 30]])
 """
 
 import logging
-from typing import List, Dict, Union, Optional, Any, TYPE_CHECKING, Tuple
+from typing import List, Dict, Union, Optional, Any, TYPE_CHECKING, Tuple, Iterator
 from importlib import util
 import json
 from pathlib import Path
 import tempfile
 import os
 
+from .csv_tools import _apply_filters, _summarize_frames
+
 if TYPE_CHECKING:
     import pandas as pd
     from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
@@ -98,6 +103,100 @@ class ExcelTools:
             logging.error(error_msg)
             return {"error": error_msg}
 
+    def _iter_excel_frames(
+        self,
+        filepath: str,
+        sheet_name: Union[str, int] = 0,
+        chunksize: int = 10000,
+        usecols: Optional[List[str]] = None,
+        filters: Optional[List[List[Any]]] = None
+    ) -> Iterator['pd.DataFrame']:
+        """Yield filtered DataFrame chunks of a sheet using openpyxl's read-only mode."""
+        pd = self._get_pandas()
+        if pd is None:
+            raise ImportError("Required packages not available")
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(filepath, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None) or ()
+            columns = [str(c) if c is not None else f"col{i}" for i, c in enumerate(header)]
+            width = len(columns)
+
+            def to_frame(batch):
+                df = pd.DataFrame.from_records(batch, columns=columns)
+                df = _apply_filters(df, filters)
+                return df[usecols] if usecols else df
+
+            batch = []
+            yielded = False
+            for row in rows:
+                batch.append(tuple(row[:width]) + (None,) * (width - len(row)))
+                if len(batch) >= chunksize:
+                    yield to_frame(batch)
+                    yielded = True
+                    batch = []
+            # A header-only (or empty) sheet still yields one frame with its columns
+            if batch or not yielded:
+                yield to_frame(batch)
+        finally:
+            workbook.close()
+
+    def iter_excel(
+        self,
+        filepath: str,
+        sheet_name: Union[str, int] = 0,
+        chunksize: int = 10000,
+        usecols: Optional[List[str]] = None,
+        filters: Optional[List[List[Any]]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Iterate over a sheet in chunks of row dicts without loading the workbook.
+        
+        Args:
+            filepath: Path to Excel file
+            sheet_name: Sheet name or index
+            chunksize: Rows per chunk
+            usecols: Columns to return
+            filters: [column, op, value] row filters
+            
+        Yields:
+            List of row dicts per chunk (chunks may be empty after filtering)
+        """
+        for chunk in self._iter_excel_frames(filepath, sheet_name, chunksize, usecols, filters):
+            yield chunk.to_dict('records')
+
+    def summarize_excel(
+        self,
+        filepath: str,
+        sheet_name: Union[str, int] = 0,
+        usecols: Optional[List[str]] = None,
+        filters: Optional[List[List[Any]]] = None,
+        head: int = 5
+    ) -> Dict[str, Any]:
+        """Summarize a sheet in one streaming pass: schema, row count, column stats and head.
+        
+        Args:
+            filepath: Path to Excel file
+            sheet_name: Sheet name or index
+            usecols: Columns to include
+            filters: [column, op, value] row filters
+            head: Number of leading rows to include
+            
+        Returns:
+            Dict with row_count, schema, stats and head, or error dict
+        """
+        try:
+            return _summarize_frames(
+                self._iter_excel_frames(filepath, sheet_name, usecols=usecols, filters=filters),
+                head=head
+            )
+        except Exception as e:
+            error_msg = f"Error summarizing Excel file {filepath}: {str(e)}"
+            logging.error(error_msg)
+            return {"error": error_msg}
+
     def write_excel(
         self,
         filepath: str,
@@ -188,9 +287,13 @@ class ExcelTools:
         output_file: str,
         how: str = 'inner',
         on: Optional[Union[str, List[str]]] = None,
-        suffixes: Optional[Tuple[str, str]] = None
+        suffixes: Optional[Tuple[str, str]] = None,
+        chunksize: int = 10000
     ) -> bool:
         """Merge multiple Excel files.
+
+        For 'inner' and 'left' merges the first file is streamed in chunks
+        and written incrementally, so only the other files are held in memory.
         
         Args:
             files: List of Excel files to merge
@@ -198,6 +301,7 @@ class ExcelTools:
             how: Merge method ('inner', 'outer', 'left', 'right')
             on: Column(s) to merge on
             suffixes: Suffixes for overlapping columns
+            chunksize: Rows of the first file to merge at a time
             
         Returns:
             bool: Success status
@@ -208,29 +312,35 @@ class ExcelTools:
                 logging.error(error_msg)
                 return False
             
-            # Read first file
-            result = self.read_excel(files[0])
-            
-            # Merge with remaining files
-            for file in files[1:]:
-                df = self.read_excel(file)
-                if isinstance(df, dict):
-                    df = next(iter(df.values()))
-                
-                pd = self._get_pandas()
-                if pd is None:
-                    return False
-                
-                result = pd.merge(
-                    pd.DataFrame(result),
-                    pd.DataFrame(df),
-                    how=how,
-                    on=on,
-                    suffixes=suffixes or ('_1', '_2')
-                ).to_dict('records')
-            
-            # Write merged result
-            return self.write_excel(output_file, result)
+            pd = self._get_pandas()
+            if pd is None:
+                return False
+
+            suffixes = suffixes or ('_1', '_2')
+            others = [pd.read_excel(file, engine='openpyxl') for file in files[1:]]
+            if how not in ('inner', 'left'):
+                # Outer/right joins need the whole left side at once
+                result = pd.read_excel(files[0], engine='openpyxl')
+                for other in others:
+                    result = pd.merge(result, other, how=how, on=on, suffixes=suffixes)
+                result.to_excel(output_file, index=False, engine='openpyxl')
+                return True
+
+            # Stream the first file and append merged chunks to a write-only workbook
+            from openpyxl import Workbook
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet('Sheet1')
+            header_written = False
+            for chunk in self._iter_excel_frames(files[0], chunksize=chunksize):
+                for other in others:
+                    chunk = pd.merge(chunk, other, how=how, on=on, suffixes=suffixes)
+                if not header_written:
+                    sheet.append([str(c) for c in chunk.columns])
+                    header_written = True
+                for row in chunk.itertuples(index=False, name=None):
+                    sheet.append([None if pd.isna(v) else v for v in row])
+            workbook.save(output_file)
+            return True
             
         except Exception as e:
             error_msg = f"Error merging Excel files: {str(e)}"
@@ -242,6 +352,8 @@ _excel_tools = ExcelTools()
 read_excel = _excel_tools.read_excel
 write_excel = _excel_tools.write_excel
 merge_excel = _excel_tools.merge_excel
+iter_excel = _excel_tools.iter_excel
+summarize_excel = _excel_tools.summarize_excel
 
 if __name__ == "__main__":
     print("\n==================================================")
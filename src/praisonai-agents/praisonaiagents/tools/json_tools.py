@@ -7,14 +7,142 @@ data = json_tools.read_json("data.json")
 or
 from praisonaiagents.tools import read_json, write_json, merge_json
 data = read_json("data.json")
+
+Large files can be streamed instead of loaded:
+for record in iter_json("export.json", path="results.item"):
+    ...
+extract_json("export.json", path="results.item", output_file="out.jsonl")
+schema = infer_json_schema("export.json", path="results.item")
 """
 
 import logging
-from typing import List, Dict, Union, Optional, Any, Tuple
+from typing import List, Dict, Union, Optional, Any, Tuple, Iterator, Iterable
 from importlib import util
+import itertools
 import json
 from datetime import datetime
 
+_READ_CHUNK_SIZE = 1 << 20
+
+
+def _new_schema() -> Dict[str, Any]:
+    return {'count': 0, 'types': {}, 'fields': {}, 'items': None, 'examples': []}
+
+
+def _update_schema(schema: Dict[str, Any], value: Any, max_depth: int = 10, depth: int = 0):
+    """Fold one value into an inferred schema (shared by the JSON/YAML/XML tools)."""
+    type_name = 'null' if value is None else type(value).__name__
+    schema['count'] += 1
+    schema['types'][type_name] = schema['types'].get(type_name, 0) + 1
+    if depth >= max_depth:
+        return
+    if isinstance(value, dict):
+        for key, child in value.items():
+            field = schema['fields'].setdefault(str(key), _new_schema())
+            _update_schema(field, child, max_depth, depth + 1)
+    elif isinstance(value, list):
+        if schema['items'] is None:
+            schema['items'] = _new_schema()
+        for child in value:
+            _update_schema(schema['items'], child, max_depth, depth + 1)
+    elif len(schema['examples']) < 3:
+        example = value[:100] if isinstance(value, str) else value
+        if example not in schema['examples']:
+            schema['examples'].append(example)
+
+
+def _finalize_schema(schema: Dict[str, Any], parent_count: Optional[int] = None) -> Dict[str, Any]:
+    """Convert an inferred schema into a plain, JSON-serializable summary."""
+    result = {'types': schema['types'], 'count': schema['count']}
+    if parent_count:
+        result['presence'] = round(schema['count'] / parent_count, 4)
+    if schema['fields']:
+        objects = schema['types'].get('dict', 0)
+        result['fields'] = {
+            key: _finalize_schema(field, objects)
+            for key, field in schema['fields'].items()
+        }
+    if schema['items'] is not None:
+        result['items'] = _finalize_schema(schema['items'])
+    if schema['examples']:
+        result['examples'] = schema['examples']
+    return result
+
+
+def _infer_schema(records: Iterable[Any], sample_size: int, max_depth: int = 10) -> Dict[str, Any]:
+    """Infer a schema from the first sample_size records of a stream."""
+    schema = _new_schema()
+    for record in itertools.islice(records, sample_size):
+        _update_schema(schema, record, max_depth)
+    return {
+        'sampled_records': schema['count'],
+        'schema': _finalize_schema(schema)
+    }
+
+
+def _write_jsonl(records: Iterable[Any], output_file: str, encoding: str = 'utf-8') -> int:
+    """Write records to a JSON Lines file, returning the number written."""
+    count = 0
+    with open(output_file, 'w', encoding=encoding) as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, default=str))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def _walk_path(value: Any, parts: List[str]) -> Iterator[Any]:
+    """Yield the values of a loaded document matching an ijson-style path."""
+    if not parts:
+        yield value
+        return
+    head, rest = parts[0], parts[1:]
+    if head == 'item':
+        if isinstance(value, list):
+            for child in value:
+                yield from _walk_path(child, rest)
+    elif isinstance(value, dict) and head in value:
+        yield from _walk_path(value[head], rest)
+
+
+def _iter_top_level_array(f) -> Iterator[Any]:
+    """Decode the elements of a top-level JSON array one at a time."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    started = False
+    eof = False
+    while True:
+        # Skip whitespace and separators
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+            pos += 1
+        if not started and pos < len(buffer):
+            if buffer[pos] != '[':
+                raise ValueError("Top-level JSON value is not an array")
+            started = True
+            pos += 1
+            continue
+        if started and pos < len(buffer) and buffer[pos] == ']':
+            return
+        if pos < len(buffer):
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # A value ending exactly at the buffer edge may be cut short (e.g. a number)
+                if end < len(buffer) or eof:
+                    yield value
+                    pos = end
+                    continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+        if eof:
+            if not started or pos >= len(buffer):
+                raise ValueError("Unexpected end of JSON array")
+        chunk = f.read(_READ_CHUNK_SIZE)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
 class JSONTools:
     """Tools for working with JSON files."""
     
@@ -64,6 +192,118 @@ class JSONTools:
             logging.error(error_msg)
             return {"error": error_msg}
 
+    def iter_json(
+        self,
+        filepath: str,
+        path: str = 'item',
+        encoding: str = 'utf-8'
+    ) -> Iterator[Any]:
+        """Stream values from a large JSON or JSON Lines file.
+        
+        Args:
+            filepath: Path to .json or .jsonl file
+            path: ijson-style path of the values to yield, e.g. 'item' for the
+                elements of a top-level array or 'results.item' for the
+                elements of the 'results' array. Ignored for JSON Lines.
+            encoding: File encoding
+            
+        Yields:
+            Matching values, one at a time
+        """
+        if filepath.endswith(('.jsonl', '.ndjson')):
+            with open(filepath, 'r', encoding=encoding) as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+            return
+        
+        if util.find_spec('ijson') is not None:
+            import ijson
+            with open(filepath, 'rb') as f:
+                yield from ijson.items(f, path, use_float=True)
+            return
+        
+        if path == 'item':
+            with open(filepath, 'r', encoding=encoding) as f:
+                yield from _iter_top_level_array(f)
+            return
+        
+        logging.warning(
+            f"ijson package is not available, loading {filepath} fully for path '{path}'. "
+            "Install it for streaming: pip install ijson"
+        )
+        with open(filepath, 'r', encoding=encoding) as f:
+            data = json.load(f)
+        yield from _walk_path(data, path.split('.') if path else [])
+
+    def extract_json(
+        self,
+        filepath: str,
+        path: str = 'item',
+        output_file: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        encoding: str = 'utf-8'
+    ) -> Union[List[Any], Dict[str, Any]]:
+        """Extract values at a path from a large JSON file without loading it.
+        
+        Args:
+            filepath: Path to .json or .jsonl file
+            path: ijson-style path of the values to extract
+            output_file: Write matches to this JSON Lines file instead of returning them
+            fields: Keep only these keys of object values
+            limit: Stop after this many matches
+            encoding: File encoding
+            
+        Returns:
+            List of matches, or dict with output_file and count when output_file is given
+        """
+        try:
+            records = self.iter_json(filepath, path, encoding)
+            if fields:
+                records = (
+                    {k: r.get(k) for k in fields} if isinstance(r, dict) else r
+                    for r in records
+                )
+            if limit is not None:
+                records = itertools.islice(records, limit)
+            if output_file:
+                count = _write_jsonl(records, output_file, encoding)
+                return {'output_file': output_file, 'count': count}
+            return list(records)
+        except Exception as e:
+            error_msg = f"Error extracting JSON from {filepath}: {str(e)}"
+            logging.error(error_msg)
+            return {"error": error_msg}
+
+    def infer_json_schema(
+        self,
+        filepath: str,
+        path: str = 'item',
+        sample_size: int = 1000,
+        max_depth: int = 10,
+        encoding: str = 'utf-8'
+    ) -> Dict[str, Any]:
+        """Infer the schema of a large JSON file from a streamed sample.
+        
+        Args:
+            filepath: Path to .json or .jsonl file
+            path: ijson-style path of the records to sample
+            sample_size: Number of records to read
+            max_depth: Maximum nesting depth to describe
+            encoding: File encoding
+            
+        Returns:
+            Dict with the number of sampled records and, per field, observed
+            types, presence ratio and example values
+        """
+        try:
+            return _infer_schema(self.iter_json(filepath, path, encoding), sample_size, max_depth)
+        except Exception as e:
+            error_msg = f"Error inferring JSON schema for {filepath}: {str(e)}"
+            logging.error(error_msg)
+            return {"error": error_msg}
+
     def write_json(
         self,
         data: Union[Dict[str, Any], List[Any]],
@@ -226,18 +466,30 @@ class JSONTools:
     def analyze_json(
         self,
         data: Union[Dict[str, Any], str],
-        max_depth: int = 10
+        max_depth: int = 10,
+        sample_size: Optional[int] = None,
+        path: str = 'item'
     ) -> Dict[str, Any]:
         """Analyze JSON data structure.
         
         Args:
             data: JSON data or filepath
             max_depth: Maximum depth to analyze
+            sample_size: For filepaths, stream and sample this many records
+                at `path` instead of loading the whole file
+            path: ijson-style path of the records to sample
             
         Returns:
             Dict with analysis results
         """
         try:
+            # Stream a sample rather than loading a large file
+            if isinstance(data, str) and sample_size:
+                return {
+                    'analysis_time': datetime.now().isoformat(),
+                    **_infer_schema(self.iter_json(data, path), sample_size, max_depth)
+                }
+            
             # Load data if filepath provided
             if isinstance(data, str):
                 data = self.read_json(data)
@@ -393,6 +645,9 @@ class JSONTools:
 # Create instance for direct function access
 _json_tools = JSONTools()
 read_json = _json_tools.read_json
+iter_json = _json_tools.iter_json
+extract_json = _json_tools.extract_json
+infer_json_schema = _json_tools.infer_json_schema
 write_json = _json_tools.write_json
 merge_json = _json_tools.merge_json
 validate_json = _json_tools.validate_json
@@ -509,6 +764,18 @@ if __name__ == "__main__":
     transformed = transform_json(data1, transformations)
     print("Transformed data:")
     print(json.dumps(transformed, indent=2))
+    print()
+    
+    # 7. Stream a large JSON file
+    print("7. Streaming JSON")
+    print("------------------------------")
+    write_json({'results': [dict(data1, id=i) for i in range(1000)]}, 'large.json')
+    extracted = extract_json('large.json', path='results.item', fields=['id', 'name'], limit=3)
+    print(f"First records: {extracted}")
+    summary = extract_json('large.json', path='results.item', output_file='large.jsonl')
+    print(f"JSONL export: {summary}")
+    schema = infer_json_schema('large.jsonl', sample_size=100)
+    print(f"Inferred schema fields: {list(schema['schema']['fields'])}")
     
     print("\n==================================================")
     print("Demonstration Complete")
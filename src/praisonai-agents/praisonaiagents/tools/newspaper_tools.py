@@ -16,6 +16,7 @@ from typing import List, Dict, Union, Optional, Any
 from importlib import util
 import json
 from urllib.parse import urlparse
+from .cache import cached_tool
 
 # Predefined list of popular news sources
 POPULAR_NEWS_SOURCES = {
@@ -77,6 +78,7 @@ class NewspaperTools:
         global newspaper
         import newspaper
 
+    @cached_tool(ttl=86400)
     def get_article(
         self, 
         url: str,
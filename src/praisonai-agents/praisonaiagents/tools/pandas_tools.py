@@ -53,18 +53,40 @@ class PandasTools:
         import pandas as pd
         import numpy as np
 
-    def read_csv(self, filepath: str, **kwargs) -> Union[pd.DataFrame, Dict[str, str]]:
+    def read_csv(
+        self,
+        filepath: str,
+        filters: Optional[List[List[Any]]] = None,
+        **kwargs
+    ) -> Union[pd.DataFrame, Dict[str, str]]:
         """
         Read a CSV file into a pandas DataFrame.
+
+        Pass ``usecols`` to read only some columns and ``filters`` to keep only
+        matching rows; filtering happens chunk by chunk, so rows that do not
+        match are never held in memory together. Passing ``chunksize``
+        without filters returns pandas' chunk iterator.
         
         Args:
             filepath: Path to the CSV file
+            filters: [column, op, value] row filters, e.g. [["age", ">", 30]]
             **kwargs: Additional arguments to pass to pd.read_csv()
             
         Returns:
             pd.DataFrame or Dict: DataFrame if successful, error dict if failed
         """
         try:
+            if filters:
+                from .csv_tools import _apply_filters
+                kwargs.setdefault('chunksize', 100000)
+                columns = None
+                if isinstance(kwargs.get('usecols'), (list, tuple)):
+                    # Filter columns must be read even if they are not returned
+                    columns = list(kwargs['usecols'])
+                    kwargs['usecols'] = list(dict.fromkeys(columns + [f[0] for f in filters]))
+                chunks = [_apply_filters(chunk, filters) for chunk in pd.read_csv(filepath, **kwargs)]
+                df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns)
+                return df[columns] if columns else df
             return pd.read_csv(filepath, **kwargs)
         except Exception as e:
             error_msg = f"Error reading CSV file {filepath}: {str(e)}"
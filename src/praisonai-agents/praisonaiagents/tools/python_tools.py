@@ -7,21 +7,384 @@ result = python_tools.execute_code("print('Hello, World!')")
 or
 from praisonaiagents.tools import execute_code, analyze_code, format_code
 result = execute_code("print('Hello, World!')")
+
+Code runs in a pool of pre-started worker processes. Pass session_id to
+keep variables between calls, like a notebook kernel:
+execute_code("x = 41", session_id="agent-1")
+execute_code("x + 1", session_id="agent-1")  # {'result': 42, ...}
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from importlib import util
 import io
 from contextlib import redirect_stdout, redirect_stderr
 import traceback
+import ast
+import atexit
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def _compile_code(code: str):
+    """Parse code once; return (exec_code, eval_code) where eval_code is the trailing expression, if any."""
+    tree = ast.parse(code)
+    last_expr = None
+    if tree.body and isinstance(tree.body[-1], ast.Expr):
+        last_expr = ast.Expression(tree.body.pop().value)
+    exec_code = compile(tree, '<string>', 'exec')
+    eval_code = compile(last_expr, '<string>', 'eval') if last_expr else None
+    return exec_code, eval_code
+
+
+class _PipeWriter(io.TextIOBase):
+    """stdout/stderr replacement in a worker that streams writes to the parent."""
+
+    def __init__(self, conn, stream: str, max_output_size: int):
+        self.conn = conn
+        self.stream = stream
+        self.max_output_size = max_output_size
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if text and self.size < self.max_output_size:
+            text = text[:self.max_output_size - self.size]
+            self.size += len(text)
+            self.conn.send((self.stream, text))
+        return len(text)
+
+
+def _sandbox_worker(conn, preload: Tuple[str, ...], memory_limit_mb: Optional[int]):
+    """Worker process loop: run code requests, keeping one namespace per session."""
+    if memory_limit_mb:
+        try:
+            import resource
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError):
+            pass
+    for module in preload:
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+    namespace = {'__builtins__': __builtins__, '__name__': '__main__'}
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        if request.get('reset'):
+            namespace = {'__builtins__': __builtins__, '__name__': '__main__'}
+        scope = namespace if request.get('persistent') else {'__builtins__': __builtins__, '__name__': '__main__'}
+        stdout = _PipeWriter(conn, 'stdout', request['max_output_size'])
+        stderr = _PipeWriter(conn, 'stderr', request['max_output_size'])
+        result, success = None, True
+        try:
+            exec_code, eval_code = _compile_code(request['code'])
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                exec(exec_code, scope)
+                if eval_code is not None:
+                    result = eval(eval_code, scope)
+        except MemoryError:
+            success = False
+            stderr.write("Error executing code: memory limit exceeded")
+        except BaseException as e:
+            success = False
+            stderr.write(f"Error executing code: {e}\n{traceback.format_exc()}")
+        try:
+            conn.send(('done', {'result': result, 'success': success}))
+        except Exception:
+            conn.send(('done', {'result': repr(result), 'success': success}))
+
+
+class _SandboxWorker:
+    """Parent-side handle for one worker process."""
+
+    def __init__(self, ctx, preload, memory_limit_mb):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_sandbox_worker,
+            args=(child_conn, preload, memory_limit_mb),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.lock = threading.Lock()
+
+    def run(
+        self,
+        code: str,
+        timeout: float,
+        max_output_size: int,
+        persistent: bool,
+        on_output: Optional[Callable[[str, str], None]]
+    ) -> Dict[str, Any]:
+        self.conn.send({'code': code, 'persistent': persistent, 'max_output_size': max_output_size})
+        output = {'stdout': [], 'stderr': []}
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.conn.poll(remaining):
+                self.kill()
+                return {
+                    'result': None,
+                    'stdout': ''.join(output['stdout']),
+                    'stderr': f"Error executing code: timed out after {timeout} seconds",
+                    'success': False
+                }
+            try:
+                kind, payload = self.conn.recv()
+            except (EOFError, OSError):
+                self.kill()
+                return {
+                    'result': None,
+                    'stdout': ''.join(output['stdout']),
+                    'stderr': "Error executing code: worker process exited (memory limit or crash)",
+                    'success': False
+                }
+            if kind == 'done':
+                stdout, stderr = ''.join(output['stdout']), ''.join(output['stderr'])
+                if len(stdout) >= max_output_size:
+                    stdout += "...[truncated]"
+                if len(stderr) >= max_output_size:
+                    stderr += "...[truncated]"
+                return {'result': payload['result'], 'stdout': stdout, 'stderr': stderr, 'success': payload['success']}
+            output[kind].append(payload)
+            if on_output:
+                on_output(kind, payload)
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+
+
+class SandboxPool:
+    """Pool of pre-started Python worker processes for isolated code execution.
+
+    Idle workers have common libraries imported already, so a request does
+    not pay interpreter start-up. Stateless requests borrow an idle worker;
+    requests with a session_id get a dedicated worker whose namespace
+    persists between calls. A worker that times out or crashes is killed
+    and replaced.
+
+    At most ``max_sessions`` session workers are kept: the least recently
+    used session is closed to make room for a new one. Sessions idle for
+    longer than ``session_idle_timeout`` seconds are closed on the next
+    request to the pool.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        preload: Tuple[str, ...] = ('numpy', 'pandas'),
+        memory_limit_mb: Optional[int] = 1024,
+        max_sessions: int = 8,
+        session_idle_timeout: Optional[float] = 600
+    ):
+        methods = multiprocessing.get_all_start_methods()
+        self._ctx = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        if 'forkserver' in methods:
+            self._ctx.set_forkserver_preload([m for m in preload if util.find_spec(m) is not None])
+        self.size = size
+        self.preload = tuple(preload)
+        self.memory_limit_mb = memory_limit_mb
+        self.max_sessions = max(1, max_sessions)
+        self.session_idle_timeout = session_idle_timeout
+        self._idle: List[_SandboxWorker] = []
+        # Session workers in least recently used order
+        self._sessions: 'OrderedDict[str, _SandboxWorker]' = OrderedDict()
+        self._session_used: Dict[str, float] = {}
+        self._session_calls: Dict[str, int] = {}  # calls in progress per session
+        self._lock = threading.Lock()
+        for _ in range(size):
+            self._idle.append(self._spawn())
+
+    def _spawn(self) -> _SandboxWorker:
+        return _SandboxWorker(self._ctx, self.preload, self.memory_limit_mb)
+
+    def _acquire(self, session_id: Optional[str]) -> _SandboxWorker:
+        worker, replace = None, 0
+        with self._lock:
+            session_worker = self._sessions.get(session_id) if session_id is not None else None
+            if session_worker is not None and session_worker.alive():
+                worker = session_worker
+            else:
+                while self._idle:
+                    candidate = self._idle.pop()
+                    if candidate.alive():
+                        worker = candidate
+                        break
+                    replace += 1
+                # A session keeps its worker, so that worker leaves the pool for good
+                if worker is not None and session_id is not None:
+                    replace += 1
+        if worker is None:
+            worker = self._spawn()
+        with self._lock:
+            if session_id is not None:
+                self._sessions[session_id] = worker
+                self._sessions.move_to_end(session_id)
+                self._session_used[session_id] = time.monotonic()
+                self._session_calls[session_id] = self._session_calls.get(session_id, 0) + 1
+            evicted = self._evict_sessions()
+        for stale in evicted:
+            stale.close()
+        self._replace(replace)
+        return worker
+
+    def _evict_sessions(self) -> List[_SandboxWorker]:
+        """Remove idle-expired sessions and those over max_sessions; caller holds _lock.
+
+        Sessions with a call in progress are kept. Returns the workers to close.
+        """
+        now = time.monotonic()
+        evicted = []
+        for session_id in list(self._sessions):
+            if self._session_calls.get(session_id):
+                continue
+            expired = self.session_idle_timeout is not None and \
+                now - self._session_used.get(session_id, now) > self.session_idle_timeout
+            if expired or len(self._sessions) > self.max_sessions:
+                evicted.append(self._pop_session(session_id))
+        return evicted
+
+    def _pop_session(self, session_id: str) -> Optional[_SandboxWorker]:
+        """Forget a session; caller holds _lock."""
+        self._session_used.pop(session_id, None)
+        self._session_calls.pop(session_id, None)
+        return self._sessions.pop(session_id, None)
+
+    def _replace(self, count: int):
+        """Start count workers in the background to take the place of ones that left the pool."""
+        if count > 0:
+            threading.Thread(target=self._refill, args=(count,), daemon=True).start()
+
+    def _refill(self, count: int):
+        for _ in range(count):
+            with self._lock:
+                if len(self._idle) >= self.size:
+                    return
+            worker = self._spawn()
+            with self._lock:
+                if len(self._idle) < self.size:
+                    self._idle.append(worker)
+                    continue
+            worker.close()
+
+    def _release(self, worker: _SandboxWorker, session_id: Optional[str]):
+        if session_id is not None:
+            with self._lock:
+                if self._sessions.get(session_id) is worker:
+                    self._session_calls[session_id] -= 1
+                    self._session_used[session_id] = time.monotonic()
+                    if not worker.alive():
+                        self._pop_session(session_id)
+            return
+        if not worker.alive():
+            # Killed after a timeout or crashed
+            self._replace(1)
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(worker)
+                return
+        worker.close()
+
+    def execute(
+        self,
+        code: str,
+        timeout: float = 30,
+        max_output_size: int = 10000,
+        session_id: Optional[str] = None,
+        on_output: Optional[Callable[[str, str], None]] = None
+    ) -> Dict[str, Any]:
+        worker = self._acquire(session_id)
+        with worker.lock:
+            try:
+                return worker.run(code, timeout, max_output_size, session_id is not None, on_output)
+            finally:
+                self._release(worker, session_id)
+
+    def reset_session(self, session_id: str) -> None:
+        with self._lock:
+            worker = self._pop_session(session_id)
+        if worker:
+            worker.close()
+
+    def close(self) -> None:
+        with self._lock:
+            workers = self._idle + list(self._sessions.values())
+            self._idle = []
+            self._sessions.clear()
+            self._session_used.clear()
+            self._session_calls.clear()
+        for worker in workers:
+            worker.close()
 
 class PythonTools:
     """Tools for Python code execution and analysis."""
     
-    def __init__(self):
-        """Initialize PythonTools."""
+    def __init__(
+        self,
+        pool_size: int = 2,
+        preload: Tuple[str, ...] = ('numpy', 'pandas'),
+        memory_limit_mb: Optional[int] = 1024,
+        max_sessions: int = 8,
+        session_idle_timeout: Optional[float] = 600
+    ):
+        """Initialize PythonTools.
+
+        Args:
+            pool_size: Number of warm worker processes kept ready for execute_code
+            preload: Modules imported in workers before they receive code
+            memory_limit_mb: Address-space limit per worker (POSIX only), None to disable
+            max_sessions: Session workers kept; the least recently used is closed beyond this
+            session_idle_timeout: Seconds after which an idle session is closed (None to keep)
+        """
         self._check_dependencies()
+        self.pool_size = pool_size
+        self.preload = preload
+        self.memory_limit_mb = memory_limit_mb
+        self.max_sessions = max_sessions
+        self.session_idle_timeout = session_idle_timeout
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> SandboxPool:
+        """Start the worker pool on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = SandboxPool(
+                    self.pool_size, self.preload, self.memory_limit_mb,
+                    self.max_sessions, self.session_idle_timeout
+                )
+                atexit.register(self._pool.close)
+            return self._pool
         
     def _check_dependencies(self):
         """Check if required packages are installed."""
@@ -42,67 +405,40 @@ class PythonTools:
         globals_dict: Optional[Dict[str, Any]] = None,
         locals_dict: Optional[Dict[str, Any]] = None,
         timeout: int = 30,
-        max_output_size: int = 10000
+        max_output_size: int = 10000,
+        session_id: Optional[str] = None,
+        on_output: Optional[Callable[[str, str], None]] = None
     ) -> Dict[str, Any]:
-        """Execute Python code safely."""
+        """Execute Python code in an isolated worker process.
+
+        The code runs in a pre-started worker with a wall-clock ``timeout``
+        and the pool's memory limit; a runaway worker is killed and replaced.
+        Passing ``globals_dict``/``locals_dict`` runs the code in-process
+        instead (needed to share live objects), where the timeout cannot be
+        enforced.
+
+        Args:
+            code: Python code to execute
+            globals_dict: Globals for in-process execution
+            locals_dict: Locals for in-process execution
+            timeout: Wall-clock limit in seconds
+            max_output_size: Maximum characters of stdout/stderr to keep
+            session_id: Reuse a persistent namespace across calls
+            on_output: Callback receiving (stream, text) as output is produced
+
+        Returns:
+            Dict with result, stdout, stderr and success
+        """
+        if globals_dict is not None or locals_dict is not None:
+            return self._execute_in_process(code, globals_dict, locals_dict, max_output_size)
         try:
-            # Set up execution environment
-            if globals_dict is None:
-                globals_dict = {'__builtins__': __builtins__}
-            if locals_dict is None:
-                locals_dict = {}
-            
-            # Capture output
-            stdout_buffer = io.StringIO()
-            stderr_buffer = io.StringIO()
-            
-            try:
-                # Compile code
-                compiled_code = compile(code, '<string>', 'exec')
-                
-                # Execute with output capture
-                with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
-                    exec(compiled_code, globals_dict, locals_dict)
-                    
-                    # Get last expression value if any
-                    import ast
-                    tree = ast.parse(code)
-                    if tree.body and isinstance(tree.body[-1], ast.Expr):
-                        result = eval(
-                            compile(ast.Expression(tree.body[-1].value), '<string>', 'eval'),
-                            globals_dict,
-                            locals_dict
-                        )
-                    else:
-                        result = None
-                
-                # Get output
-                stdout = stdout_buffer.getvalue()
-                stderr = stderr_buffer.getvalue()
-                
-                # Truncate output if too large
-                if len(stdout) > max_output_size:
-                    stdout = stdout[:max_output_size] + "...[truncated]"
-                if len(stderr) > max_output_size:
-                    stderr = stderr[:max_output_size] + "...[truncated]"
-                
-                return {
-                    'result': result,
-                    'stdout': stdout,
-                    'stderr': stderr,
-                    'success': True
-                }
-            
-            except Exception as e:
-                error_msg = f"Error executing code: {str(e)}"
-                logging.error(error_msg)
-                return {
-                    'result': None,
-                    'stdout': stdout_buffer.getvalue(),
-                    'stderr': error_msg,
-                    'success': False
-                }
-            
+            return self._get_pool().execute(
+                code,
+                timeout=timeout,
+                max_output_size=max_output_size,
+                session_id=session_id,
+                on_output=on_output
+            )
         except Exception as e:
             error_msg = f"Error executing code: {str(e)}"
             logging.error(error_msg)
@@ -113,6 +449,63 @@ class PythonTools:
                 'success': False
             }
 
+    def reset_session(self, session_id: str) -> None:
+        """Discard the persistent namespace (and worker) of a session."""
+        if self._pool is not None:
+            self._pool.reset_session(session_id)
+
+    def _execute_in_process(
+        self,
+        code: str,
+        globals_dict: Optional[Dict[str, Any]],
+        locals_dict: Optional[Dict[str, Any]],
+        max_output_size: int
+    ) -> Dict[str, Any]:
+        """Execute code in the current process with caller-provided namespaces."""
+        if globals_dict is None:
+            globals_dict = {'__builtins__': __builtins__}
+        if locals_dict is None:
+            locals_dict = {}
+
+        # Capture output
+        stdout_buffer = io.StringIO()
+        stderr_buffer = io.StringIO()
+
+        try:
+            exec_code, eval_code = _compile_code(code)
+
+            # Execute with output capture
+            with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
+                exec(exec_code, globals_dict, locals_dict)
+                result = eval(eval_code, globals_dict, locals_dict) if eval_code else None
+
+            # Get output
+            stdout = stdout_buffer.getvalue()
+            stderr = stderr_buffer.getvalue()
+
+            # Truncate output if too large
+            if len(stdout) > max_output_size:
+                stdout = stdout[:max_output_size] + "...[truncated]"
+            if len(stderr) > max_output_size:
+                stderr = stderr[:max_output_size] + "...[truncated]"
+
+            return {
+                'result': result,
+                'stdout': stdout,
+                'stderr': stderr,
+                'success': True
+            }
+
+        except Exception as e:
+            error_msg = f"Error executing code: {str(e)}"
+            logging.error(error_msg)
+            return {
+                'result': None,
+                'stdout': stdout_buffer.getvalue(),
+                'stderr': error_msg,
+                'success': False
+            }
+
     def analyze_code(
         self,
         code: str
@@ -351,6 +744,7 @@ analyze_code = _python_tools.analyze_code
 format_code = _python_tools.format_code
 lint_code = _python_tools.lint_code
 disassemble_code = _python_tools.disassemble_code
+reset_session = _python_tools.reset_session
 
 if __name__ == "__main__":
     print("\n==================================================")
@@ -418,6 +812,15 @@ print(f"The sum of {x} and {y} is {result}")
     print(result["stdout"])
     print()
 
+    print("5. Persistent Sessions and Timeouts")
+    print("------------------------------")
+    execute_code("counter = 41", session_id="demo")
+    result = execute_code("counter + 1", session_id="demo")
+    print(f"Session result: {result['result']}")
+    result = execute_code("while True: pass", timeout=2)
+    print(f"Runaway loop: {result['stderr']}")
+    print()
+
     print("==================================================")
     print("Demonstration Complete")
     print("==================================================")
@@ -5,14 +5,122 @@ This module provides a safe interface for executing shell commands with:
 - Output capture
 - Error handling
 - Resource limits
+
+Commands run on an asyncio subprocess engine: output is streamed line by
+line to an optional callback, only the head and tail of large output are
+kept in memory, and a timed-out command is killed with its whole process
+group. Use aexecute_command / aexecute_commands from async code to run
+several commands concurrently without blocking the event loop. An agent
+runs the tool calls of one response concurrently only through achat /
+astart; chat() runs them one at a time.
 """
 
-import subprocess
+import asyncio
+import codecs
+import collections
 import shlex
 import logging
 import os
+import signal
 import time
-from typing import Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Union
+
+
+class _OutputBuffer:
+    """Bounded capture of a stream: keeps the first and last max_size/2 characters."""
+
+    def __init__(self, max_size: int):
+        self.head_size = max_size // 2
+        self.tail_size = max_size - self.head_size
+        self.head = ''
+        self.tail = collections.deque()
+        self.tail_len = 0
+        self.dropped = 0
+
+    def write(self, text: str):
+        if len(self.head) < self.head_size:
+            room = self.head_size - len(self.head)
+            self.head += text[:room]
+            text = text[room:]
+        if not text:
+            return
+        self.tail.append(text)
+        self.tail_len += len(text)
+        while self.tail_len > self.tail_size:
+            excess = self.tail_len - self.tail_size
+            first = self.tail[0]
+            if len(first) <= excess:
+                self.tail.popleft()
+                self.tail_len -= len(first)
+                self.dropped += len(first)
+            else:
+                self.tail[0] = first[excess:]
+                self.tail_len -= excess
+                self.dropped += excess
+
+    def getvalue(self) -> str:
+        tail = ''.join(self.tail)
+        if self.dropped:
+            return f"{self.head}\n...[truncated {self.dropped} characters]...\n{tail}"
+        return self.head + tail
+
+
+# Longest partial line held for on_output; longer runs without a newline
+# (progress bars, binary output) are passed on in pieces of this size
+_MAX_PENDING_LINE = 65536
+
+
+async def _pump(
+    reader: asyncio.StreamReader,
+    buffer: _OutputBuffer,
+    stream: str,
+    on_output: Optional[Callable[[str, str], None]]
+):
+    """Copy a subprocess pipe into buffer, calling on_output once per line.
+
+    A line longer than _MAX_PENDING_LINE is passed to on_output in pieces.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending = ''
+    while True:
+        chunk = await reader.read(65536)
+        text = decoder.decode(chunk, final=not chunk)
+        if text:
+            buffer.write(text)
+            if on_output:
+                pending += text
+                *lines, pending = pending.split('\n')
+                for line in lines:
+                    on_output(stream, line)
+                while len(pending) >= _MAX_PENDING_LINE:
+                    on_output(stream, pending[:_MAX_PENDING_LINE])
+                    pending = pending[_MAX_PENDING_LINE:]
+        if not chunk:
+            break
+    if on_output and pending:
+        on_output(stream, pending)
+
+
+def _kill_process_tree(pid: int):
+    """Kill a process started with start_new_session together with its process group / children."""
+    if hasattr(os, 'killpg'):
+        # The process leads its own session, so its group ID is its PID; this
+        # still reaches the group after the leader itself has exited and been reaped
+        try:
+            os.killpg(pid, signal.SIGKILL)
+            return
+        except (ProcessLookupError, PermissionError):
+            pass
+    import psutil
+    try:
+        parent = psutil.Process(pid)
+        for child in parent.children(recursive=True):
+            child.kill()
+        parent.kill()
+    except psutil.NoSuchProcess:
+        pass
+
 
 class ShellTools:
     """Tools for executing shell commands safely."""
@@ -31,16 +139,17 @@ class ShellTools:
                 "Run: pip install psutil"
             )
     
-    def execute_command(
+    async def aexecute_command(
         self,
         command: str,
         cwd: Optional[str] = None,
         timeout: int = 30,
         shell: bool = False,
         env: Optional[Dict[str, str]] = None,
-        max_output_size: int = 10000
+        max_output_size: int = 10000,
+        on_output: Optional[Callable[[str, str], None]] = None
     ) -> Dict[str, Union[str, int, bool]]:
-        """Execute a shell command safely.
+        """Execute a shell command without blocking the event loop.
         
         Args:
             command: Command to execute
@@ -48,66 +157,70 @@ class ShellTools:
             timeout: Maximum execution time in seconds
             shell: Whether to run command in shell
             env: Environment variables
-            max_output_size: Maximum output size in bytes
+            max_output_size: Maximum characters kept per stream (head and tail)
+            on_output: Callback receiving (stream, line) as output arrives
             
         Returns:
             Dictionary with execution results
         """
+        start_time = time.time()
         try:
-            # Split command if not using shell
-            if not shell:
-                command = shlex.split(command)
-            
             # Set up process environment
             process_env = os.environ.copy()
             if env:
                 process_env.update(env)
             
-            # Start process
-            start_time = time.time()
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+            # Start process in its own session so the whole group can be killed
+            kwargs = dict(
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
                 cwd=cwd,
-                shell=shell,
                 env=process_env,
-                text=True
+                start_new_session=True
             )
+            if shell:
+                process = await asyncio.create_subprocess_shell(command, **kwargs)
+            else:
+                process = await asyncio.create_subprocess_exec(*shlex.split(command), **kwargs)
             
-            try:
-                # Wait for process with timeout
-                stdout, stderr = process.communicate(timeout=timeout)
-                
-                # Truncate output if too large
-                if len(stdout) > max_output_size:
-                    stdout = stdout[:max_output_size] + "...[truncated]"
-                if len(stderr) > max_output_size:
-                    stderr = stderr[:max_output_size] + "...[truncated]"
-                
-                return {
-                    'stdout': stdout,
-                    'stderr': stderr,
-                    'exit_code': process.returncode,
-                    'success': process.returncode == 0,
-                    'execution_time': time.time() - start_time
-                }
+            stdout = _OutputBuffer(max_output_size)
+            stderr = _OutputBuffer(max_output_size)
+            pumps = asyncio.gather(
+                _pump(process.stdout, stdout, 'stdout', on_output),
+                _pump(process.stderr, stderr, 'stderr', on_output)
+            )
+            
+            async def finish():
+                await pumps
+                return await process.wait()
             
-            except subprocess.TimeoutExpired:
-                # Kill process on timeout
-                parent = psutil.Process(process.pid)
-                children = parent.children(recursive=True)
-                for child in children:
-                    child.kill()
-                parent.kill()
+            # Output and exit share one deadline: a command may close its pipes
+            # early, or leave a background child holding them open
+            run = asyncio.ensure_future(finish())
+            try:
+                exit_code = await asyncio.wait_for(asyncio.shield(run), timeout=timeout)
+            except asyncio.TimeoutError:
+                # Kill process group on timeout
+                _kill_process_tree(process.pid)
+                # A child that left the group could still hold the pipes open
+                await asyncio.wait({run}, timeout=5)
+                run.cancel()
                 
                 return {
-                    'stdout': '',
-                    'stderr': f'Command timed out after {timeout} seconds',
+                    'stdout': stdout.getvalue(),
+                    'stderr': (stderr.getvalue() + f'\nCommand timed out after {timeout} seconds').lstrip('\n'),
                     'exit_code': -1,
                     'success': False,
-                    'execution_time': timeout
+                    'execution_time': time.time() - start_time
                 }
+            
+            return {
+                'stdout': stdout.getvalue(),
+                'stderr': stderr.getvalue(),
+                'exit_code': exit_code,
+                'success': exit_code == 0,
+                'execution_time': time.time() - start_time
+            }
                 
         except Exception as e:
             error_msg = f"Error executing command: {str(e)}"
@@ -117,15 +230,73 @@ class ShellTools:
                 'stderr': error_msg,
                 'exit_code': -1,
                 'success': False,
-                'execution_time': 0
+                'execution_time': time.time() - start_time
             }
     
+    async def aexecute_commands(
+        self,
+        commands: List[str],
+        concurrency: int = 4,
+        **kwargs
+    ) -> List[Dict[str, Union[str, int, bool]]]:
+        """Execute several commands concurrently.
+        
+        Args:
+            commands: Commands to execute
+            concurrency: Maximum number of commands running at once
+            **kwargs: Options passed to aexecute_command
+            
+        Returns:
+            List of execution results, in the order of commands
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def run(command):
+            async with semaphore:
+                return await self.aexecute_command(command, **kwargs)
+        
+        return await asyncio.gather(*(run(command) for command in commands))
+    
+    def execute_command(
+        self,
+        command: str,
+        cwd: Optional[str] = None,
+        timeout: int = 30,
+        shell: bool = False,
+        env: Optional[Dict[str, str]] = None,
+        max_output_size: int = 10000,
+        on_output: Optional[Callable[[str, str], None]] = None
+    ) -> Dict[str, Union[str, int, bool]]:
+        """Execute a shell command safely.
+        
+        Args:
+            command: Command to execute
+            cwd: Working directory
+            timeout: Maximum execution time in seconds
+            shell: Whether to run command in shell
+            env: Environment variables
+            max_output_size: Maximum characters kept per stream (head and tail)
+            on_output: Callback receiving (stream, line) as output arrives
+            
+        Returns:
+            Dictionary with execution results
+        """
+        coro = self.aexecute_command(command, cwd, timeout, shell, env, max_output_size, on_output)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # Called from inside an event loop: run on a separate thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+    
     def list_processes(self) -> List[Dict[str, Union[int, str, float]]]:
         """List running processes with their details.
         
         Returns:
             List of process information dictionaries
         """
+        import psutil
         try:
             processes = []
             for proc in psutil.process_iter(['pid', 'name', 'username', 'memory_percent', 'cpu_percent']):
@@ -160,6 +331,7 @@ class ShellTools:
         Returns:
             Dictionary with operation results
         """
+        import psutil
         try:
             process = psutil.Process(pid)
             if force:
@@ -195,6 +367,7 @@ class ShellTools:
         Returns:
             Dictionary with system information
         """
+        import psutil
         try:
             cpu_percent = psutil.cpu_percent(interval=1)
             memory = psutil.virtual_memory()
@@ -230,6 +403,8 @@ class ShellTools:
 # Create instance for direct function access
 _shell_tools = ShellTools()
 execute_command = _shell_tools.execute_command
+aexecute_command = _shell_tools.aexecute_command
+aexecute_commands = _shell_tools.aexecute_commands
 list_processes = _shell_tools.list_processes
 kill_process = _shell_tools.kill_process
 get_system_info = _shell_tools.get_system_info
@@ -273,6 +448,22 @@ if __name__ == "__main__":
         print(f"PID: {proc['pid']}, Name: {proc['name']}, CPU: {proc['cpu_percent']}%")
     print()
     
+    # 4. Streaming and concurrent execution
+    print("4. Streaming and Concurrent Execution")
+    print("------------------------------")
+    result = execute_command(
+        "for i in 1 2 3; do echo line $i; done",
+        shell=True,
+        on_output=lambda stream, line: print(f"[{stream}] {line}")
+    )
+    result = execute_command("seq 1 100000", max_output_size=40)
+    print(f"Bounded output:\n{result['stdout']}")
+    result = execute_command("sleep 10", timeout=1)
+    print(f"Timeout: {result['stderr']}")
+    results = asyncio.run(aexecute_commands(["sleep 1", "sleep 1", "sleep 1"]))
+    print(f"Ran {len(results)} commands in {max(r['execution_time'] for r in results):.2f}s")
+    print()
+    
     print("\n==================================================")
     print("Demonstration Complete")
     print("==================================================")
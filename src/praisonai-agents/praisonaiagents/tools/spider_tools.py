@@ -14,11 +14,13 @@ import logging
 from typing import List, Dict, Union, Optional, Any
 from importlib import util
 import json
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlunparse
 import re
 import os
 import hashlib
-import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from .cache import cached_tool
 
 class SpiderTools:
     """Tools for web scraping and crawling."""
@@ -46,6 +48,82 @@ class SpiderTools:
             })
         return self._session
 
+    def _parse_page(
+        self,
+        url: str,
+        html: str,
+        status_code: int = 200,
+        encoding: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        selector: Optional[str] = None,
+        extract_images: bool = False,
+        extract_links: bool = False
+    ) -> Dict[str, Any]:
+        """Parse fetched HTML into the result dict returned by scrape_page."""
+        from bs4 import BeautifulSoup
+
+        # Parse HTML
+        soup = BeautifulSoup(html, 'lxml')
+        
+        # Remove unwanted elements
+        for element in soup(['script', 'style']):
+            element.decompose()
+        
+        # Initialize result
+        result = {
+            'url': url,
+            'status_code': status_code,
+            'encoding': encoding,
+            'headers': headers or {},
+        }
+        
+        # Extract content based on selector
+        if selector:
+            elements = soup.select(selector)
+            result['content'] = [elem.get_text(strip=True) for elem in elements]
+            result['html'] = [str(elem) for elem in elements]
+        else:
+            result['title'] = soup.title.string if soup.title else None
+            result['content'] = soup.get_text(separator=' ', strip=True)
+            result['html'] = str(soup)
+        
+        # Extract metadata
+        meta_tags = {}
+        for meta in soup.find_all('meta'):
+            name = meta.get('name') or meta.get('property')
+            if name:
+                meta_tags[name] = meta.get('content')
+        result['meta_tags'] = meta_tags
+        
+        # Extract images if requested
+        if extract_images:
+            images = []
+            for img in soup.find_all('img'):
+                src = img.get('src')
+                if src:
+                    images.append({
+                        'src': urljoin(url, src),
+                        'alt': img.get('alt', ''),
+                        'title': img.get('title', '')
+                    })
+            result['images'] = images
+        
+        # Extract links if requested
+        if extract_links:
+            links = []
+            for link in soup.find_all('a'):
+                href = link.get('href')
+                if href:
+                    links.append({
+                        'url': urljoin(url, href),
+                        'text': link.get_text(strip=True),
+                        'title': link.get('title', '')
+                    })
+            result['links'] = links
+        
+        return result
+
+    @cached_tool(ttl=3600)
     def scrape_page(
         self,
         url: str,
@@ -79,7 +157,6 @@ class SpiderTools:
                 error_msg = "bs4 package is not available. Please install it using: pip install beautifulsoup4"
                 logging.error(error_msg)
                 return {"error": error_msg}
-            from bs4 import BeautifulSoup
 
             # Make request
             response = session.get(
@@ -89,66 +166,16 @@ class SpiderTools:
             )
             response.raise_for_status()
             
-            # Parse HTML
-            soup = BeautifulSoup(response.text, 'lxml')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style']):
-                element.decompose()
-            
-            # Initialize result
-            result = {
-                'url': url,
-                'status_code': response.status_code,
-                'encoding': response.encoding,
-                'headers': dict(response.headers),
-            }
-            
-            # Extract content based on selector
-            if selector:
-                elements = soup.select(selector)
-                result['content'] = [elem.get_text(strip=True) for elem in elements]
-                result['html'] = [str(elem) for elem in elements]
-            else:
-                result['title'] = soup.title.string if soup.title else None
-                result['content'] = soup.get_text(separator=' ', strip=True)
-                result['html'] = str(soup)
-            
-            # Extract metadata
-            meta_tags = {}
-            for meta in soup.find_all('meta'):
-                name = meta.get('name') or meta.get('property')
-                if name:
-                    meta_tags[name] = meta.get('content')
-            result['meta_tags'] = meta_tags
-            
-            # Extract images if requested
-            if extract_images:
-                images = []
-                for img in soup.find_all('img'):
-                    src = img.get('src')
-                    if src:
-                        images.append({
-                            'src': urljoin(url, src),
-                            'alt': img.get('alt', ''),
-                            'title': img.get('title', '')
-                        })
-                result['images'] = images
-            
-            # Extract links if requested
-            if extract_links:
-                links = []
-                for link in soup.find_all('a'):
-                    href = link.get('href')
-                    if href:
-                        links.append({
-                            'url': urljoin(url, href),
-                            'text': link.get_text(strip=True),
-                            'title': link.get('title', '')
-                        })
-                result['links'] = links
-            
-            return result
+            return self._parse_page(
+                url,
+                response.text,
+                status_code=response.status_code,
+                encoding=response.encoding,
+                headers=dict(response.headers),
+                selector=selector,
+                extract_images=extract_images,
+                extract_links=extract_links
+            )
         except Exception as e:
             error_msg = f"Error scraping {url}: {str(e)}"
             logging.error(error_msg)
@@ -226,7 +253,56 @@ class SpiderTools:
             logging.error(error_msg)
             return {"error": error_msg}
 
-    def crawl(
+    def _normalize_url(self, url: str) -> Optional[str]:
+        """Normalize a URL for deduplication, or return None if it is not crawlable."""
+        parsed = urlparse(url)
+        scheme = parsed.scheme.lower()
+        if scheme not in ('http', 'https'):
+            return None
+        host = (parsed.hostname or '').lower()
+        if not host:
+            return None
+        netloc = host
+        if parsed.port and (scheme, parsed.port) not in (('http', 80), ('https', 443)):
+            netloc = f"{host}:{parsed.port}"
+        path = parsed.path or '/'
+        return urlunparse((scheme, netloc, path, parsed.params, parsed.query, ''))
+
+    def _cache_path(self, cache_dir: str, url: str) -> str:
+        """Location of the on-disk HTTP cache entry for a URL."""
+        return os.path.join(cache_dir, hashlib.md5(url.encode()).hexdigest() + '.json')
+
+    def _load_cache(self, cache_dir: Optional[str], url: str) -> Optional[Dict[str, Any]]:
+        if not cache_dir:
+            return None
+        path = self._cache_path(cache_dir, url)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_cache(self, cache_dir: Optional[str], url: str, response) -> None:
+        if not cache_dir:
+            return
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        entry = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'status_code': response.status_code,
+            'encoding': response.encoding,
+            'headers': dict(response.headers),
+            'text': response.text,
+        }
+        with open(self._cache_path(cache_dir, url), 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+
+    async def acrawl(
         self,
         start_url: str,
         max_pages: int = 10,
@@ -235,96 +311,223 @@ class SpiderTools:
         delay: float = 1.0,
         timeout: int = 30,
         verify_ssl: bool = True,
-        output_dir: Optional[str] = None
+        output_dir: Optional[str] = None,
+        concurrency: int = 8,
+        per_host_concurrency: int = 4,
+        cache_dir: Optional[str] = None
     ) -> Union[List[Dict[str, Any]], Dict[str, str]]:
         """
-        Crawl multiple pages starting from a URL.
-        
+        Crawl multiple pages concurrently, breadth-first, starting from a URL.
+
+        Pages are fetched by up to ``concurrency`` workers, with at most
+        ``per_host_concurrency`` requests in flight per host. Requests to
+        the same host start at least ``delay`` seconds apart; the wait
+        happens before a host slot is taken, so slow responses do not add
+        to it.
+        When ``cache_dir`` is set, responses carrying ETag/Last-Modified are
+        cached on disk and revalidated with conditional requests.
+
         Args:
             start_url: Starting URL
             max_pages: Maximum number of pages to crawl
             same_domain: Only crawl pages from the same domain
             exclude_patterns: List of regex patterns to exclude
-            delay: Delay between requests in seconds
+            delay: Minimum seconds between requests to the same host
             timeout: Request timeout in seconds
             verify_ssl: Whether to verify SSL certificates
-            output_dir: Directory to save crawled pages
-            
+            output_dir: Directory to stream crawled pages to (as crawl.jsonl)
+            concurrency: Maximum number of concurrent requests overall
+            per_host_concurrency: Maximum number of concurrent requests per host
+            cache_dir: Directory for the conditional-request HTTP cache
+
         Returns:
-            List[Dict] or Dict: Crawled pages or error dict
+            List[Dict] or Dict: Crawled pages in BFS order or error dict
         """
         try:
-            # Create output directory if needed
+            if util.find_spec('httpx') is None:
+                error_msg = "httpx package is not available. Please install it using: pip install httpx"
+                logging.error(error_msg)
+                return {"error": error_msg}
+            if util.find_spec('bs4') is None:
+                error_msg = "bs4 package is not available. Please install it using: pip install beautifulsoup4"
+                logging.error(error_msg)
+                return {"error": error_msg}
+            import httpx
+
+            start = self._normalize_url(start_url)
+            if start is None:
+                return {"error": f"Invalid start URL: {start_url}"}
+            start_host = urlparse(start).netloc
+            patterns = [re.compile(p) for p in exclude_patterns or []]
+
             if output_dir:
                 os.makedirs(output_dir, exist_ok=True)
-            
-            # Initialize crawl state
-            to_visit = {start_url}
-            visited = set()
-            results = []
-            
-            while to_visit and len(visited) < max_pages:
-                # Get next URL
-                url = to_visit.pop()
-                
-                # Skip if already visited
-                if url in visited:
-                    continue
-                
-                # Add to visited
-                visited.add(url)
-                
-                # Delay if not first request
-                if len(visited) > 1:
-                    time.sleep(delay)
-                
-                # Scrape page
-                result = self.scrape_page(
-                    url,
-                    extract_links=True,
-                    timeout=timeout,
-                    verify_ssl=verify_ssl
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+
+            # BFS frontier: URLs are numbered in discovery order, which is also
+            # the order results are returned in.
+            frontier: asyncio.Queue = asyncio.Queue()
+            seen = {start: 0}
+            frontier.put_nowait((0, start))
+            results: Dict[int, Dict[str, Any]] = {}
+            host_slots: Dict[str, asyncio.Semaphore] = {}
+            # Earliest start time (event loop clock) of the next request to each host
+            host_next_start: Dict[str, float] = {}
+            jsonl = open(os.path.join(output_dir, 'crawl.jsonl'), 'w', encoding='utf-8') if output_dir else None
+
+            def enqueue(link_url: str):
+                url = self._normalize_url(link_url)
+                if url is None or url in seen or len(seen) >= max_pages:
+                    return
+                if same_domain and urlparse(url).netloc != start_host:
+                    return
+                if any(p.search(url) for p in patterns):
+                    return
+                seen[url] = len(seen)
+                frontier.put_nowait((seen[url], url))
+
+            async def throttle(host: str):
+                # Reserve the host's next start time before waiting, so
+                # concurrent workers queue up delay seconds apart
+                if not delay:
+                    return
+                now = asyncio.get_running_loop().time()
+                start_at = max(now, host_next_start.get(host, now))
+                host_next_start[host] = start_at + delay
+                if start_at > now:
+                    await asyncio.sleep(start_at - now)
+
+            async def fetch(client, url: str) -> Dict[str, Any]:
+                host = urlparse(url).netloc
+                slot = host_slots.setdefault(host, asyncio.Semaphore(per_host_concurrency))
+                cached = self._load_cache(cache_dir, url)
+                headers = {}
+                if cached:
+                    if cached.get('etag'):
+                        headers['If-None-Match'] = cached['etag']
+                    if cached.get('last_modified'):
+                        headers['If-Modified-Since'] = cached['last_modified']
+                await throttle(host)
+                async with slot:
+                    response = await client.get(url, headers=headers)
+                if response.status_code == 304 and cached:
+                    text, status, encoding, resp_headers = (
+                        cached['text'], cached['status_code'], cached['encoding'], cached['headers']
+                    )
+                else:
+                    response.raise_for_status()
+                    self._save_cache(cache_dir, url, response)
+                    text, status, encoding, resp_headers = (
+                        response.text, response.status_code, response.encoding, dict(response.headers)
+                    )
+                return await asyncio.to_thread(
+                    self._parse_page, url, text,
+                    status_code=status, encoding=encoding, headers=resp_headers,
+                    extract_links=True
                 )
-                
-                if "error" in result:
-                    logging.warning(f"Error crawling {url}: {result['error']}")
-                    continue
-                
-                # Save result
-                results.append(result)
-                
-                # Save to file if requested
-                if output_dir:
-                    filename = hashlib.md5(url.encode()).hexdigest() + '.json'
-                    filepath = os.path.join(output_dir, filename)
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        json.dump(result, f, indent=2, ensure_ascii=False)
-                
-                # Add new links to visit
-                for link in result.get('links', []):
-                    link_url = link['url']
-                    parsed = urlparse(link_url)
-                    
-                    # Skip if not same domain and same_domain is True
-                    if same_domain and parsed.netloc != urlparse(start_url).netloc:
-                        continue
-                    
-                    # Skip if matches exclude patterns
-                    if exclude_patterns and any(
-                        re.compile(p).search(link_url) for p in exclude_patterns
-                    ):
-                        continue
-                    
-                    # Add to visit if not visited
-                    if link_url not in visited:
-                        to_visit.add(link_url)
-            
-            return results
+
+            async def worker(client):
+                while True:
+                    index, url = await frontier.get()
+                    try:
+                        result = await fetch(client, url)
+                        results[index] = result
+                        if jsonl:
+                            jsonl.write(json.dumps(result, ensure_ascii=False) + '\n')
+                            jsonl.flush()
+                        for link in result.get('links', []):
+                            enqueue(link['url'])
+                    except Exception as e:
+                        logging.warning(f"Error crawling {url}: {str(e)}")
+                    finally:
+                        frontier.task_done()
+
+            client_headers = {
+                'User-Agent': 'Mozilla/5.0 (compatible; PraisonAI/1.0; +http://praisonai.com/bot)',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.5',
+            }
+            limits = httpx.Limits(max_connections=concurrency)
+            try:
+                async with httpx.AsyncClient(
+                    headers=client_headers,
+                    timeout=timeout,
+                    verify=verify_ssl,
+                    follow_redirects=True,
+                    limits=limits
+                ) as client:
+                    workers = [asyncio.create_task(worker(client)) for _ in range(max(1, concurrency))]
+                    await frontier.join()
+                    for w in workers:
+                        w.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+            finally:
+                if jsonl:
+                    jsonl.close()
+
+            return [results[i] for i in sorted(results)]
         except Exception as e:
             error_msg = f"Error crawling from {start_url}: {str(e)}"
             logging.error(error_msg)
             return {"error": error_msg}
 
+    def crawl(
+        self,
+        start_url: str,
+        max_pages: int = 10,
+        same_domain: bool = True,
+        exclude_patterns: Optional[List[str]] = None,
+        delay: float = 1.0,
+        timeout: int = 30,
+        verify_ssl: bool = True,
+        output_dir: Optional[str] = None,
+        concurrency: int = 8,
+        per_host_concurrency: int = 4,
+        cache_dir: Optional[str] = None
+    ) -> Union[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Crawl multiple pages starting from a URL.
+
+        Synchronous wrapper around ``acrawl``; see it for details.
+        
+        Args:
+            start_url: Starting URL
+            max_pages: Maximum number of pages to crawl
+            same_domain: Only crawl pages from the same domain
+            exclude_patterns: List of regex patterns to exclude
+            delay: Minimum seconds between requests to the same host
+            timeout: Request timeout in seconds
+            verify_ssl: Whether to verify SSL certificates
+            output_dir: Directory to stream crawled pages to (as crawl.jsonl)
+            concurrency: Maximum number of concurrent requests overall
+            per_host_concurrency: Maximum number of concurrent requests per host
+            cache_dir: Directory for the conditional-request HTTP cache
+            
+        Returns:
+            List[Dict] or Dict: Crawled pages or error dict
+        """
+        coro = self.acrawl(
+            start_url,
+            max_pages=max_pages,
+            same_domain=same_domain,
+            exclude_patterns=exclude_patterns,
+            delay=delay,
+            timeout=timeout,
+            verify_ssl=verify_ssl,
+            output_dir=output_dir,
+            concurrency=concurrency,
+            per_host_concurrency=per_host_concurrency,
+            cache_dir=cache_dir
+        )
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # Called from inside an event loop (e.g. an async agent): run on a helper thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+
     def extract_text(
         self,
         url: str,
@@ -426,6 +629,39 @@ if __name__ == "__main__":
     else:
         print(results)  # Show error
     
+    print()
+
+    # 5. Crawl a local site (no network required)
+    print("5. Crawling a Local Site")
+    print("------------------------------")
+    import tempfile
+    import threading
+    from functools import partial
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+    with tempfile.TemporaryDirectory() as site_dir:
+        for i in range(20):
+            links = ''.join(f'<a href="page{j}.html#top">page {j}</a>' for j in (2 * i + 1, 2 * i + 2) if j < 20)
+            with open(os.path.join(site_dir, f"page{i}.html"), 'w') as f:
+                f.write(f"<html><head><title>Page {i}</title></head><body>{links}</body></html>")
+        class QuietHandler(SimpleHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=site_dir))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        local_url = f"http://127.0.0.1:{server.server_address[1]}/page0.html"
+        output_dir = os.path.join(site_dir, "out")
+        cache_dir = os.path.join(site_dir, "cache")
+        results = crawl(local_url, max_pages=15, delay=0, output_dir=output_dir, cache_dir=cache_dir)
+        print(f"Crawled {len(results)} pages in BFS order: {[r['title'] for r in results]}")
+        with open(os.path.join(output_dir, "crawl.jsonl")) as f:
+            print(f"Streamed {sum(1 for _ in f)} pages to crawl.jsonl")
+        # Second run revalidates against the cache (Last-Modified -> 304)
+        results = crawl(local_url, max_pages=15, delay=0, cache_dir=cache_dir)
+        print(f"Re-crawled {len(results)} pages using the HTTP cache")
+        server.shutdown()
+
     print("\n==================================================")
     print("Demonstration Complete")
     print("==================================================")
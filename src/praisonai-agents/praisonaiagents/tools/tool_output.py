@@ -0,0 +1,214 @@
+"""Token-budgeted compaction of tool results before they enter the conversation.
+
+Usage:
+from praisonaiagents.tools.tool_output import ToolOutputCompactor
+
+compactor = ToolOutputCompactor({"max_tokens": 2000})
+content = compactor.format("read_file", result)
+
+Compaction is off unless a config is given. Results within the budget are
+passed through as JSON. Larger results are compacted with one of these
+strategies:
+
+- "truncate":  keep the head and tail of the text
+- "summarize": for structured data, an inferred schema plus sample records
+- "spill":     store the full result as an artifact and return a handle,
+               which the agent pages through with read_tool_output
+- "auto":      summarize structured data or truncate text (default)
+
+Config (Agent(tool_output_config=...)):
+{
+  "max_tokens": 4000,                  # budget per tool result
+  "strategy": "auto",
+  "spill": False,                      # also store the full result with any strategy
+  "artifact_dir": ".praison/artifacts",
+  "tools": {                           # per-tool overrides
+    "read_file": {"max_tokens": 8000, "strategy": "spill"}
+  }
+}
+Results are only written to artifact_dir when spilling is enabled, either
+with "spill": True or the "spill" strategy. Set "enabled": False to pass
+results through unchanged.
+"""
+
+import json
+import logging
+import os
+import uuid
+from importlib import util
+from typing import Any, Dict, Optional
+
+from .json_tools import _infer_schema
+
+DEFAULT_MAX_TOKENS = 4000
+DEFAULT_ARTIFACT_DIR = ".praison/artifacts"
+STRATEGIES = ("auto", "truncate", "summarize", "spill")
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken when available, else estimate 4 characters per token."""
+    global _encoding
+    if _encoding is None and util.find_spec("tiktoken") is not None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logging.debug(f"tiktoken unavailable, estimating tokens: {e}")
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def _dumps(result: Any) -> str:
+    if isinstance(result, str):
+        return result
+    return json.dumps(result, default=str)
+
+
+class ArtifactStore:
+    """Directory of spilled tool results addressable by handle."""
+
+    def __init__(self, directory: str = DEFAULT_ARTIFACT_DIR):
+        self.directory = directory
+
+    def _path(self, handle: str) -> str:
+        if not handle.replace("-", "").isalnum():
+            raise ValueError(f"Invalid artifact handle: {handle}")
+        return os.path.join(self.directory, f"{handle}.txt")
+
+    def put(self, content: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        handle = uuid.uuid4().hex[:16]
+        with open(self._path(handle), "w", encoding="utf-8") as f:
+            f.write(content)
+        return handle
+
+    def read(self, handle: str, offset: int = 0, limit: int = 8000) -> Dict[str, Any]:
+        path = self._path(handle)
+        if not os.path.exists(path):
+            return {"error": f"No tool output found for handle {handle}"}
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        offset = max(0, offset)
+        end = min(len(text), offset + max(0, limit))
+        return {
+            "handle": handle,
+            "offset": offset,
+            "content": text[offset:end],
+            "next_offset": end if end < len(text) else None,
+            "total_chars": len(text)
+        }
+
+
+_stores: Dict[str, ArtifactStore] = {}
+
+
+def get_artifact_store(directory: str = DEFAULT_ARTIFACT_DIR) -> ArtifactStore:
+    if directory not in _stores:
+        _stores[directory] = ArtifactStore(directory)
+    return _stores[directory]
+
+
+def read_tool_output(handle: str, offset: int = 0, limit: int = 8000) -> Dict[str, Any]:
+    """Read part of a large tool result that was stored instead of returned in full.
+
+    Args:
+        handle: Handle returned in place of the full tool result
+        offset: Character offset to start reading from
+        limit: Maximum number of characters to return
+
+    Returns:
+        Dict with the content slice and next_offset (None when the end is reached)
+    """
+    for store in list(_stores.values()) or [get_artifact_store()]:
+        result = store.read(handle, offset, limit)
+        if "error" not in result:
+            return result
+    return {"error": f"No tool output found for handle {handle}"}
+
+
+class ToolOutputCompactor:
+    """Applies a per-tool token budget to tool results."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.enabled = bool(config) and config.get("enabled", True)
+        config = config or {}
+        self.max_tokens = config.get("max_tokens", DEFAULT_MAX_TOKENS)
+        self.strategy = config.get("strategy", "auto")
+        self.spill = config.get("spill", False)
+        self.tool_config = config.get("tools", {})
+        self.store = get_artifact_store(config.get("artifact_dir", DEFAULT_ARTIFACT_DIR))
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"Unknown tool output strategy '{self.strategy}', expected one of {STRATEGIES}")
+
+    def uses_artifacts(self) -> bool:
+        """Whether any result may be spilled (and read_tool_output is needed)."""
+        strategies = {self.strategy} | {c.get("strategy", self.strategy) for c in self.tool_config.values()}
+        spills = {c.get("spill", self.spill) for c in self.tool_config.values()} | {self.spill}
+        return self.enabled and (True in spills or "spill" in strategies)
+
+    def format(self, tool_name: str, result: Any) -> str:
+        """Serialize a tool result for the conversation, compacting it if over budget."""
+        content = json.dumps(result, default=str)
+        if not self.enabled:
+            return content
+        override = self.tool_config.get(tool_name, {})
+        max_tokens = override.get("max_tokens", self.max_tokens)
+        strategy = override.get("strategy", self.strategy)
+        spill = override.get("spill", self.spill)
+        tokens = count_tokens(content)
+        if max_tokens is None or tokens <= max_tokens:
+            return content
+
+        logging.debug(f"Compacting {tool_name} output ({tokens} tokens > {max_tokens}) with '{strategy}'")
+        structured = isinstance(result, (list, dict))
+        compacted: Dict[str, Any] = {
+            "tool_output_compacted": True,
+            "original_tokens": tokens
+        }
+        if spill or strategy == "spill":
+            compacted["handle"] = self.store.put(_dumps(result))
+            compacted["note"] = (
+                "The full output was stored. Call read_tool_output(handle, offset, limit) "
+                "to read more of it."
+            )
+        if structured and (strategy == "summarize" or strategy == "auto"):
+            summary = json.dumps(self.summarize(result, max_tokens), default=str)
+            summary_tokens = count_tokens(summary)
+            # Very wide records can make even the summary too large
+            compacted["summary"] = json.loads(summary) if summary_tokens <= max_tokens else \
+                self.truncate(summary, summary_tokens, max_tokens)
+        elif strategy in ("truncate", "summarize", "auto"):
+            compacted["content"] = self.truncate(_dumps(result), tokens, max_tokens)
+        else:  # spill
+            compacted["preview"] = self.truncate(_dumps(result), tokens, min(max_tokens, 200), tail=False)
+        return json.dumps(compacted, default=str)
+
+    @staticmethod
+    def truncate(text: str, tokens: int, max_tokens: int, tail: bool = True) -> str:
+        """Keep roughly max_tokens worth of text from the head (and tail)."""
+        keep = max(1, int(len(text) * max_tokens / max(tokens, 1) * 0.9))
+        if len(text) <= keep:
+            return text
+        if not tail:
+            return text[:keep] + "...[truncated]"
+        head = keep // 2
+        return f"{text[:head]}\n...[truncated {len(text) - keep} characters]...\n{text[len(text) - (keep - head):]}"
+
+    def summarize(self, result: Any, max_tokens: int) -> Dict[str, Any]:
+        """Describe structured data by its shape, schema and a few sample records."""
+        if isinstance(result, list):
+            summary = {"type": "list", "length": len(result), **_infer_schema(result, 1000)}
+            samples = result[:3]
+        else:
+            summary = {"type": "dict", "keys": list(result.keys())[:50], **_infer_schema([result], 1)}
+            samples = None
+        if samples is not None:
+            sample_text = json.dumps(samples, default=str)
+            sample_tokens = count_tokens(sample_text)
+            budget = max_tokens // 2
+            summary["sample"] = samples if sample_tokens <= budget else self.truncate(sample_text, sample_tokens, budget)
+        return summary
@@ -9,12 +9,14 @@ results = wikipedia_tools.wiki_search("Python programming")
 or
 from praisonaiagents.tools import wiki_search, wiki_summary, wiki_page
 summary = wiki_summary("Python programming language")
+summaries = wiki_summaries(["Python (programming language)", "Rust (programming language)"])
 """
 
 import logging
 from typing import List, Dict, Union, Any
 from importlib import util
 import json
+from .cache import cached_tool, map_concurrent
 
 class WikipediaTools:
     """Tools for accessing and searching Wikipedia content."""
@@ -63,6 +65,7 @@ class WikipediaTools:
             logging.error(error_msg)
             return {"error": error_msg}
 
+    @cached_tool(ttl=86400)
     def wiki_summary(
         self, 
         title: str, 
@@ -92,6 +95,33 @@ class WikipediaTools:
             logging.error(error_msg)
             return {"error": error_msg}
 
+    def wiki_summaries(
+        self,
+        titles: List[str],
+        sentences: int = 5,
+        auto_suggest: bool = True,
+        max_workers: int = 4
+    ) -> Dict[str, Union[str, Dict[str, str]]]:
+        """
+        Get summaries of several Wikipedia pages in one call.
+        
+        Args:
+            titles: Titles of the Wikipedia pages
+            sentences: Number of sentences to return per page
+            auto_suggest: Whether to auto-suggest similar titles
+            max_workers: Maximum number of pages fetched concurrently
+            
+        Returns:
+            Dict: Summary (or error dict) keyed by title
+        """
+        titles = list(dict.fromkeys(t.strip() for t in titles if t and t.strip()))
+        summaries = map_concurrent(
+            lambda title: self.wiki_summary(title, sentences=sentences, auto_suggest=auto_suggest),
+            titles,
+            max_workers
+        )
+        return dict(zip(titles, summaries))
+
     def wiki_page(
         self, 
         title: str, 
@@ -207,6 +237,7 @@ class WikipediaTools:
 _wikipedia_tools = WikipediaTools()
 wiki_search = _wikipedia_tools.wiki_search
 wiki_summary = _wikipedia_tools.wiki_summary
+wiki_summaries = _wikipedia_tools.wiki_summaries
 wiki_page = _wikipedia_tools.wiki_page
 wiki_random = _wikipedia_tools.wiki_random
 wiki_language = _wikipedia_tools.wiki_language
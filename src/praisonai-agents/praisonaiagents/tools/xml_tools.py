@@ -7,16 +7,37 @@ tree = xml_tools.read_xml("data.xml")
 or
 from praisonaiagents.tools import read_xml, write_xml, transform_xml
 tree = read_xml("data.xml")
+
+Large files can be streamed element by element instead of parsed whole:
+for book in iter_xml("catalog.xml", path="bookstore/book"):
+    ...
 """
 
 import logging
-from typing import List, Dict, Union, Optional, Any, Tuple
+from typing import List, Dict, Union, Optional, Any, Tuple, Iterator
 from importlib import util
+import itertools
 import xml.etree.ElementTree as ET
 import xml.dom.minidom as minidom
 from io import StringIO
 import json
 
+from .json_tools import _infer_schema, _write_jsonl
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _path_matches(stack: List[str], parts: List[str]) -> bool:
+    """Whether the innermost tags of stack end with parts (namespaces optional)."""
+    if len(stack) < len(parts):
+        return False
+    return all(
+        part in (tag, _local_name(tag))
+        for tag, part in zip(stack[len(stack) - len(parts):], parts)
+    )
+
 class XMLTools:
     """Tools for working with XML files."""
     
@@ -74,6 +95,110 @@ class XMLTools:
             logging.error(error_msg)
             return None
 
+    def iter_xml(
+        self,
+        filepath: str,
+        path: str,
+        as_dict: bool = True,
+        preserve_attrs: bool = True
+    ) -> Iterator[Union[Dict[str, Any], ET.Element]]:
+        """Stream matching elements from a large XML file.
+        
+        Elements are parsed incrementally with iterparse and detached from
+        the tree once processed, so memory stays bounded by the size of a
+        single match.
+        
+        Args:
+            filepath: Path to XML file
+            path: Tag or slash-separated tag path the element must end with,
+                e.g. 'book' or 'bookstore/book'
+            as_dict: Yield dicts (as xml_to_dict) instead of elements
+            preserve_attrs: Keep XML attributes in dicts
+            
+        Yields:
+            Matching elements, one at a time
+        """
+        parts = [p for p in path.strip('/').split('/') if p]
+        tags: List[str] = []
+        elements: List[ET.Element] = []
+        open_matches = 0
+        for event, elem in ET.iterparse(filepath, events=('start', 'end')):
+            if event == 'start':
+                tags.append(elem.tag)
+                elements.append(elem)
+                if _path_matches(tags, parts):
+                    open_matches += 1
+                continue
+            
+            matched = _path_matches(tags, parts)
+            tags.pop()
+            elements.pop()
+            if matched:
+                open_matches -= 1
+                # Nested matches are returned as part of their outermost match
+                if open_matches == 0:
+                    yield self.xml_to_dict(elem, preserve_attrs) if as_dict else elem
+            if open_matches == 0 and elements:
+                # Done with this subtree: detach it to keep memory flat
+                elements[-1].remove(elem)
+
+    def extract_xml(
+        self,
+        filepath: str,
+        path: str,
+        output_file: Optional[str] = None,
+        limit: Optional[int] = None,
+        preserve_attrs: bool = True
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """Extract matching elements from a large XML file as dicts.
+        
+        Args:
+            filepath: Path to XML file
+            path: Tag or slash-separated tag path of the elements to extract
+            output_file: Write matches to this JSON Lines file instead of returning them
+            limit: Stop after this many matches
+            preserve_attrs: Keep XML attributes
+            
+        Returns:
+            List of matches, or dict with output_file and count when output_file is given
+        """
+        try:
+            records = self.iter_xml(filepath, path, preserve_attrs=preserve_attrs)
+            if limit is not None:
+                records = itertools.islice(records, limit)
+            if output_file:
+                count = _write_jsonl(records, output_file)
+                return {'output_file': output_file, 'count': count}
+            return list(records)
+        except Exception as e:
+            error_msg = f"Error extracting XML from {filepath}: {str(e)}"
+            logging.error(error_msg)
+            return {"error": error_msg}
+
+    def infer_xml_schema(
+        self,
+        filepath: str,
+        path: str,
+        sample_size: int = 1000
+    ) -> Dict[str, Any]:
+        """Infer the structure of repeated elements from a streamed sample.
+        
+        Args:
+            filepath: Path to XML file
+            path: Tag or slash-separated tag path of the records to sample
+            sample_size: Number of records to read
+            
+        Returns:
+            Dict with the number of sampled records and, per child element,
+            observed types, presence ratio and example values
+        """
+        try:
+            return _infer_schema(self.iter_xml(filepath, path), sample_size)
+        except Exception as e:
+            error_msg = f"Error inferring XML schema for {filepath}: {str(e)}"
+            logging.error(error_msg)
+            return {"error": error_msg}
+
     def write_xml(
         self,
         root: ET.Element,
@@ -360,6 +485,9 @@ class XMLTools:
 # Create instance for direct function access
 _xml_tools = XMLTools()
 read_xml = _xml_tools.read_xml
+iter_xml = _xml_tools.iter_xml
+extract_xml = _xml_tools.extract_xml
+infer_xml_schema = _xml_tools.infer_xml_schema
 write_xml = _xml_tools.write_xml
 transform_xml = _xml_tools.transform_xml
 validate_xml = _xml_tools.validate_xml
@@ -486,6 +614,14 @@ if __name__ == "__main__":
             print("\nTransformed HTML content:")
             with open(output_file, 'r') as f:
                 print(f.read())
+        print()
+
+        print("6. Streaming XML")
+        print("------------------------------")
+        for book in iter_xml(temp_file, 'bookstore/book'):
+            print(f"{book['title']} ({book['@attributes']['category']})")
+        schema = infer_xml_schema(temp_file, 'book')
+        print(f"Book fields: {list(schema['schema']['fields'])}")
 
     finally:
         # Clean up temporary files
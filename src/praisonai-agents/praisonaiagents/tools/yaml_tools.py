@@ -7,14 +7,70 @@ data = yaml_tools.read_yaml("config.yaml")
 or
 from praisonaiagents.tools import read_yaml, write_yaml, merge_yaml
 data = read_yaml("config.yaml")
+
+Large files can be streamed from parser events instead of loaded:
+for record in iter_yaml("export.yaml", path="records.item"):
+    ...
 """
 
 import logging
-from typing import List, Dict, Union, Optional, Any
+from typing import List, Dict, Union, Optional, Any, Iterator
 from importlib import util
+import itertools
 import os
 from copy import deepcopy
 
+from .json_tools import _infer_schema, _write_jsonl
+
+
+def _skip_yaml_node(loader):
+    """Consume the events of one node without building it.
+
+    Anchored sub-nodes are still composed so later aliases can resolve.
+    """
+    import yaml
+    depth = 0
+    while True:
+        event = loader.peek_event()
+        if isinstance(event, (yaml.ScalarEvent, yaml.CollectionStartEvent)) and event.anchor:
+            loader.compose_node(None, None)
+            if depth == 0:
+                return
+            continue
+        event = loader.get_event()
+        if isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.SequenceEndEvent, yaml.MappingEndEvent)):
+            depth -= 1
+        if depth == 0:
+            return
+
+
+def _select_yaml(loader, parts: List[str]) -> Iterator[Any]:
+    """Yield the values under an ijson-style path, building only matching nodes."""
+    import yaml
+    if not parts:
+        yield loader.construct_document(loader.compose_node(None, None))
+        return
+    head, rest = parts[0], parts[1:]
+    if head == 'item' and loader.check_event(yaml.SequenceStartEvent):
+        loader.get_event()
+        while not loader.check_event(yaml.SequenceEndEvent):
+            yield from _select_yaml(loader, rest)
+        loader.get_event()
+    elif head != 'item' and loader.check_event(yaml.MappingStartEvent):
+        loader.get_event()
+        while not loader.check_event(yaml.MappingEndEvent):
+            key_node = loader.compose_node(None, None)
+            key = key_node.value if isinstance(key_node, yaml.ScalarNode) else None
+            if key == head:
+                yield from _select_yaml(loader, rest)
+            else:
+                _skip_yaml_node(loader)
+        loader.get_event()
+    else:
+        _skip_yaml_node(loader)
+
 class YAMLTools:
     """Tools for working with YAML files."""
     
@@ -60,6 +116,70 @@ class YAMLTools:
             logging.error(error_msg)
             return None
 
+    def iter_yaml(
+        self,
+        filepath: str,
+        path: str = '',
+        encoding: str = 'utf-8'
+    ) -> Iterator[Any]:
+        """Stream values from a large YAML file using parser events.
+        
+        Args:
+            filepath: Path to YAML file (multi-document streams are supported)
+            path: ijson-style path inside each document, e.g. 'item' for the
+                elements of a top-level list or 'records.item'; '' yields
+                whole documents
+            encoding: File encoding
+            
+        Yields:
+            Matching values, one at a time
+        """
+        import yaml
+        with open(filepath, 'r', encoding=encoding) as f:
+            loader = yaml.SafeLoader(f)
+            try:
+                loader.get_event()  # StreamStart
+                while not loader.check_event(yaml.StreamEndEvent):
+                    loader.get_event()  # DocumentStart
+                    yield from _select_yaml(loader, path.split('.') if path else [])
+                    loader.get_event()  # DocumentEnd
+                    loader.anchors = {}
+            finally:
+                loader.dispose()
+
+    def extract_yaml(
+        self,
+        filepath: str,
+        path: str = '',
+        output_file: Optional[str] = None,
+        limit: Optional[int] = None,
+        encoding: str = 'utf-8'
+    ) -> Optional[Union[List[Any], Dict[str, Any]]]:
+        """Extract values at a path from a large YAML file without loading it.
+        
+        Args:
+            filepath: Path to YAML file
+            path: ijson-style path of the values to extract
+            output_file: Write matches to this JSON Lines file instead of returning them
+            limit: Stop after this many matches
+            encoding: File encoding
+            
+        Returns:
+            List of matches, or dict with output_file and count when output_file is given
+        """
+        try:
+            records = self.iter_yaml(filepath, path, encoding)
+            if limit is not None:
+                records = itertools.islice(records, limit)
+            if output_file:
+                count = _write_jsonl(records, output_file, encoding)
+                return {'output_file': output_file, 'count': count}
+            return list(records)
+        except Exception as e:
+            error_msg = f"Error extracting YAML from {filepath}: {str(e)}"
+            logging.error(error_msg)
+            return None
+
     def write_yaml(
         self,
         data: Union[Dict[str, Any], List[Any]],
@@ -184,10 +304,19 @@ class YAMLTools:
 
     def analyze_yaml(
         self,
-        data: Union[Dict[str, Any], List[Any], str]
+        data: Union[Dict[str, Any], List[Any], str],
+        sample_size: Optional[int] = None,
+        path: str = 'item'
     ) -> Optional[Dict[str, Any]]:
-        """Analyze YAML data structure."""
+        """Analyze YAML data structure.
+        
+        With a filepath and sample_size, the records at `path` are streamed
+        and a schema is inferred from the first sample_size of them.
+        """
         try:
+            if isinstance(data, str) and sample_size:
+                return _infer_schema(self.iter_yaml(data, path), sample_size)
+            
             # Load data if file path
             if isinstance(data, str):
                 data = self.read_yaml(data)
@@ -315,6 +444,8 @@ class YAMLTools:
 # Create instance for direct function access
 _yaml_tools = YAMLTools()
 read_yaml = _yaml_tools.read_yaml
+iter_yaml = _yaml_tools.iter_yaml
+extract_yaml = _yaml_tools.extract_yaml
 write_yaml = _yaml_tools.write_yaml
 merge_yaml = _yaml_tools.merge_yaml
 validate_yaml = _yaml_tools.validate_yaml
@@ -406,12 +537,21 @@ if __name__ == "__main__":
     transformed = transform_yaml(merged, operations)
     print("Transformed content:")
     print(transformed)
+    print()
+    
+    # 7. Stream a large YAML file
+    print("7. Streaming YAML")
+    print("------------------------------")
+    write_yaml({'meta': {'source': 'demo'}, 'records': [{'id': i, 'tags': ['a', 'b']} for i in range(500)]}, 'records.yaml')
+    print(f"First records: {extract_yaml('records.yaml', path='records.item', limit=2)}")
+    analysis = analyze_yaml('records.yaml', sample_size=100, path='records.item')
+    print(f"Sampled {analysis['sampled_records']} records, fields: {list(analysis['schema']['fields'])}")
     
     print("\n==================================================")
     print("Demonstration Complete")
     print("==================================================")
     
     # Cleanup
-    for file in ['config1.yaml', 'config2.yaml']:
+    for file in ['config1.yaml', 'config2.yaml', 'records.yaml']:
         if os.path.exists(file):
             os.remove(file)
@@ -4,6 +4,7 @@ Usage:
 from praisonaiagents.tools import get_stock_price, get_stock_info
 price = get_stock_price("AAPL")
 info = get_stock_info("AAPL")
+prices = get_stock_prices(["AAPL", "MSFT", "GOOG"])
 
 or 
 from praisonaiagents.tools import yfinance
@@ -15,6 +16,7 @@ from typing import List, Dict, Optional, Any
 import logging
 from importlib import util
 from datetime import datetime
+from .cache import cached_tool, map_concurrent
 
 class YFinanceTools:
     """A comprehensive tool for financial data analysis using yfinance"""
@@ -73,6 +75,21 @@ class YFinanceTools:
             logging.error(error_msg)
             return {"error": error_msg}
 
+    def get_stock_prices(self, symbols: List[str], max_workers: int = 8) -> Dict[str, Dict[str, float]]:
+        """
+        Get current prices for several stocks in one call
+        
+        Args:
+            symbols (List[str]): Stock ticker symbols
+            max_workers (int): Maximum number of tickers fetched concurrently
+            
+        Returns:
+            Dict[str, Dict[str, float]]: Price information keyed by symbol
+        """
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        return dict(zip(symbols, map_concurrent(self.get_stock_price, symbols, max_workers)))
+
+    @cached_tool(ttl=900)
     def get_stock_info(self, symbol: str) -> Dict:
         """
         Get detailed information about a stock
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Import praisonaiagents from this source tree
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Tests run offline: use litellm's bundled model cost map instead of fetching it
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
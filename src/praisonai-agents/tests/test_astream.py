@@ -0,0 +1,176 @@
+import asyncio
+import os
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+from praisonaiagents import Agent, PraisonAIAgents, Task  # noqa: E402
+
+
+def chunk(content=None, tool_calls=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def tool_call(index, id=None, name=None, arguments=None):
+    return SimpleNamespace(index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+class FakeAsyncOpenAI:
+    """Streams one scripted turn per chat.completions.create call and records the requests."""
+
+    def __init__(self, turns):
+        self.turns = list(turns)
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **params):
+        self.requests.append(params)
+        chunks = self.turns.pop(0)
+
+        async def stream():
+            for item in chunks:
+                await asyncio.sleep(0)
+                yield item
+        return stream()
+
+
+def get_weather(city: str) -> str:
+    """Get the weather of a city."""
+    return f"Sunny in {city}"
+
+
+async def get_time(city: str) -> str:
+    """Get the local time of a city."""
+    return f"Noon in {city}"
+
+
+TOOL_TURN = [
+    chunk("Let me check. "),
+    # Names and arguments arrive in fragments, keyed by index
+    chunk(tool_calls=[tool_call(0, id="call_1", name="get_weather", arguments='{"ci')]),
+    chunk(tool_calls=[tool_call(0, arguments='ty": "Paris"}'), tool_call(1, id="call_2", name="get_time")]),
+    chunk(tool_calls=[tool_call(1, arguments='{"city": "Paris"}')]),
+]
+ANSWER_TURN = [chunk("Sunny "), chunk("at noon.")]
+
+
+class AstreamTestCase(unittest.TestCase):
+    def use_client(self, *turns):
+        self.client = FakeAsyncOpenAI(turns)
+        patcher = patch("praisonaiagents.agent.agent.AsyncOpenAI", lambda *args, **kwargs: self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def collect(self, stream):
+        async def run():
+            return [event async for event in stream]
+        return asyncio.run(run())
+
+
+class TestAgentAstream(AstreamTestCase):
+    def setUp(self):
+        self.agent = Agent(name="Forecaster", instructions="Answer weather questions", llm="gpt-4o-mini",
+                           tools=[get_weather, get_time])
+
+    def test_events_in_order(self):
+        self.use_client(TOOL_TURN, ANSWER_TURN)
+        events = self.collect(self.agent.astream("Weather in Paris?"))
+        self.assertEqual(
+            [(e.type, e.content or e.tool_name) for e in events],
+            [
+                ("token", "Let me check. "),
+                ("tool_call_start", "get_weather"),
+                ("tool_result", "get_weather"),
+                ("tool_call_start", "get_time"),
+                ("tool_result", "get_time"),
+                ("token", "Sunny "),
+                ("token", "at noon."),
+                ("done", "Let me check. Sunny at noon.")
+            ]
+        )
+        self.assertEqual(events[1].arguments, {"city": "Paris"})
+        self.assertEqual((events[2].tool_call_id, events[2].result), ("call_1", "Sunny in Paris"))
+        self.assertEqual((events[4].tool_call_id, events[4].result), ("call_2", "Noon in Paris"))
+        self.assertEqual(self.agent.chat_history[-1], {"role": "assistant", "content": "Let me check. Sunny at noon."})
+
+    def test_tool_results_are_sent_back(self):
+        self.use_client(TOOL_TURN, ANSWER_TURN)
+        self.collect(self.agent.astream("Weather in Paris?"))
+        first, second = self.client.requests
+        self.assertEqual({t["function"]["name"] for t in first["tools"]}, {"get_weather", "get_time"})
+        assistant, *results = second["messages"][-3:]
+        self.assertEqual(
+            [(c["id"], c["function"]["arguments"]) for c in assistant["tool_calls"]],
+            [("call_1", '{"city": "Paris"}'), ("call_2", '{"city": "Paris"}')]
+        )
+        self.assertEqual([(r["tool_call_id"], r["content"]) for r in results],
+                         [("call_1", '"Sunny in Paris"'), ("call_2", '"Noon in Paris"')])
+
+    def test_tools_passed_to_the_call_take_precedence(self):
+        def get_weather(city):
+            return "Raining"
+
+        self.use_client([chunk(tool_calls=[tool_call(0, "call_1", "get_weather", '{"city": "Oslo"}')])], ANSWER_TURN)
+        events = self.collect(self.agent.astream("Weather in Oslo?", tools=[get_weather]))
+        self.assertEqual([e.result for e in events if e.type == "tool_result"], ["Raining"])
+
+    def test_invalid_arguments_and_failing_tools_become_results(self):
+        def broken(city):
+            raise RuntimeError("offline")
+
+        self.use_client(
+            [chunk(tool_calls=[tool_call(0, "call_1", "get_weather", "{not json"), tool_call(1, "call_2", "broken", '{"city": "Oslo"}')])],
+            ANSWER_TURN
+        )
+        events = self.collect(self.agent.astream("Weather?", tools=[get_weather, broken]))
+        results = [e.result for e in events if e.type == "tool_result"]
+        self.assertIn("Invalid arguments for get_weather", results[0]["error"])
+        self.assertIn("offline", results[1]["error"])
+
+    def test_stops_after_max_iter(self):
+        self.agent.max_iter = 2
+        loop_turn = [chunk(tool_calls=[tool_call(0, "call_1", "get_weather", '{"city": "Paris"}')])]
+        self.use_client(loop_turn, loop_turn, ANSWER_TURN)
+        events = self.collect(self.agent.astream("Weather?"))
+        self.assertEqual(len(self.client.requests), 2)
+        self.assertEqual(events[-1].type, "done")
+
+
+class TestAgentsAstream(AstreamTestCase):
+    def test_task_events_wrap_agent_events(self):
+        self.use_client(TOOL_TURN, ANSWER_TURN, [chunk("Pack "), chunk("sunglasses.")])
+        agent = Agent(name="Forecaster", instructions="Answer weather questions", llm="gpt-4o-mini",
+                      tools=[get_weather, get_time])
+        forecast = Task(name="forecast", description="Weather in Paris", expected_output="Forecast", agent=agent)
+        advice = Task(name="advice", description="What to pack", expected_output="Advice", agent=agent,
+                      context=[forecast])
+        agents = PraisonAIAgents(agents=[agent], tasks=[forecast, advice], verbose=0)
+
+        events = self.collect(agents.astream())
+        self.assertEqual(
+            [(e.type, e.task_name) for e in events if e.type != "token"],
+            [
+                ("task_started", "forecast"),
+                ("tool_call_start", "forecast"),
+                ("tool_result", "forecast"),
+                ("tool_call_start", "forecast"),
+                ("tool_result", "forecast"),
+                ("task_completed", "forecast"),
+                ("task_started", "advice"),
+                ("task_completed", "advice"),
+                ("done", None)
+            ]
+        )
+        tokens = [e.content for e in events if e.type == "token" and e.task_name == "advice"]
+        self.assertEqual(tokens, ["Pack ", "sunglasses."])
+        completed = [e for e in events if e.type == "task_completed"]
+        self.assertEqual(completed[0].result.raw, "Let me check. Sunny at noon.")
+        self.assertEqual(events[-1].content, "Pack sunglasses.")
+        # The second task sees the first task's output as context
+        self.assertIn("Sunny at noon.", self.client.requests[-1]["messages"][-1]["content"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import importlib
+import importlib.machinery
+import sys
+import threading
+import time
+import types
+import unittest
+from unittest.mock import patch
+from praisonaiagents.tools import cache
+from praisonaiagents.tools.cache import SQLiteToolCache, map_concurrent, use_tool_cache
+
+
+def fake_module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__spec__ = importlib.machinery.ModuleSpec(name, None)
+    module.__dict__.update(attrs)
+    return module
+
+
+class FakeDDGS:
+    instances = 0
+    lock = threading.Lock()
+
+    def __init__(self):
+        with FakeDDGS.lock:
+            FakeDDGS.instances += 1
+
+    def text(self, keywords, max_results):
+        if keywords == "broken":
+            raise RuntimeError("rate limited")
+        time.sleep(0.01)
+        return [
+            {"title": f"{keywords} {i}", "href": f"https://example.com/{i}", "body": ""}
+            for i in range(2)
+        ]
+
+
+class TestMapConcurrent(unittest.TestCase):
+    def test_keeps_order_and_limits_concurrency(self):
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def work(item):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return item * 2
+
+        self.assertEqual(map_concurrent(work, range(8), max_workers=3), [0, 2, 4, 6, 8, 10, 12, 14])
+        self.assertLessEqual(peak[0], 3)
+
+    def test_reuses_pool_threads(self):
+        names = set()
+        for _ in range(3):
+            names.update(map_concurrent(lambda _: threading.current_thread().name, range(4)))
+        self.assertLessEqual(len(names), cache.MAX_POOL_WORKERS)
+        self.assertTrue(all(name.startswith("praison-tools") for name in names))
+
+    def test_nested_call_runs_inline(self):
+        result = map_concurrent(lambda i: map_concurrent(lambda j: i * j, range(3)), range(cache.MAX_POOL_WORKERS * 2))
+        self.assertEqual(result[2], [0, 2, 4])
+
+    def test_keeps_callers_tool_cache(self):
+        tool_cache = SQLiteToolCache(":memory:")
+        with use_tool_cache(tool_cache):
+            seen = map_concurrent(lambda _: cache._current_cache(), range(3))
+        self.assertEqual(seen, [tool_cache] * 3)
+
+
+class TestInternetSearchMany(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.dict(sys.modules, {"duckduckgo_search": fake_module("duckduckgo_search", DDGS=FakeDDGS)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        from praisonaiagents.tools import duckduckgo_tools
+        self.ddg = duckduckgo_tools
+
+    def test_merges_and_deduplicates(self):
+        results = self.ddg.internet_search_many(["ai", "ml", "ai", "broken"])
+        by_url = {r["url"]: r for r in results if "url" in r}
+        self.assertEqual(by_url["https://example.com/0"]["queries"], ["ai", "ml"])
+        self.assertEqual(len(by_url), 2)
+        self.assertEqual([r["query"] for r in results if "error" in r], ["broken"])
+
+    def test_clients_are_reused_across_batches(self):
+        for batch in range(10):
+            self.ddg.internet_search_many([f"b{batch}-{i}" for i in range(4)])
+        # One client per pool thread, not one per thread per batch
+        self.assertLessEqual(FakeDDGS.instances, cache.MAX_POOL_WORKERS)
+
+
+class TestBatchLookups(unittest.TestCase):
+    def load(self, module, package, **attrs):
+        patcher = patch.dict(sys.modules, {package: fake_module(package, **attrs)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.modules.pop(f"praisonaiagents.tools.{module}", None)
+        return importlib.import_module(f"praisonaiagents.tools.{module}")
+
+    def test_arxiv_search_many(self):
+        arxiv_tools = self.load("arxiv_tools", "arxiv")
+
+        def search(self, query, *args):
+            if query == "bad":
+                return {"error": "boom"}
+            return [{"arxiv_id": "1", "title": "shared"}, {"arxiv_id": query, "title": query}]
+
+        with patch.object(arxiv_tools.ArxivTools, "search", search):
+            papers = arxiv_tools.ArxivTools().search_many(["a", "b", "bad"])
+            self.assertEqual({p["arxiv_id"]: p["queries"] for p in papers}, {"1": ["a", "b"], "a": ["a"], "b": ["b"]})
+            self.assertEqual(arxiv_tools.ArxivTools().search_many(["bad"]), {"error": "bad: boom"})
+
+    def test_wiki_summaries(self):
+        wikipedia_tools = self.load("wikipedia_tools", "wikipedia", set_lang=lambda lang: None)
+        with patch.object(wikipedia_tools.WikipediaTools, "wiki_summary", lambda self, title, **kw: f"About {title}"):
+            summaries = wikipedia_tools.WikipediaTools().wiki_summaries([" Rust ", "Go", "Rust", ""])
+        self.assertEqual(summaries, {"Rust": "About Rust", "Go": "About Go"})
+
+    def test_get_stock_prices(self):
+        yfinance_tools = self.load("yfinance_tools", "yfinance")
+        with patch.object(yfinance_tools.YFinanceTools, "get_stock_price", lambda self, symbol: {"symbol": symbol}):
+            prices = yfinance_tools.YFinanceTools().get_stock_prices(["aapl", "MSFT ", "AAPL"])
+        self.assertEqual(prices, {"AAPL": {"symbol": "AAPL"}, "MSFT": {"symbol": "MSFT"}})
+
+
+if __name__ == "__main__":
+    unittest.main()
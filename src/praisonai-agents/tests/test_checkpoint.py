@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+from praisonaiagents import Agent, PraisonAIAgents, Task  # noqa: E402
+from praisonaiagents.main import TaskOutput  # noqa: E402
+
+
+class Crash(Exception):
+    pass
+
+
+class TestRunCheckpoint(unittest.TestCase):
+    """A run crashes partway through and is resumed with the same agents and tasks."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.calls = []
+        self.crash_at = None
+        test = self
+
+        def execute_task(self, task_id):
+            # Stands in for the LLM call: records the task, updates state and history
+            task = self.tasks[task_id]
+            test.calls.append(task.name)
+            if task.name == test.crash_at:
+                raise Crash(task.name)
+            task.agent.chat_history.append({"role": "assistant", "content": task.name})
+            self.set_state(task.name, len(test.calls))
+            # Loop rows are decision tasks that move on when the answer is "done"
+            raw = "done" if task.task_type == "decision" else f"out-{task.name}"
+            task.result = TaskOutput(description=task.description, raw=raw, agent=task.agent.name)
+            return task.result
+
+        patcher = patch.object(PraisonAIAgents, "execute_task", execute_task)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def build(self, tasks):
+        agent = Agent(name="A", role="r", goal="g", backstory="b", llm="gpt-4o-mini")
+        process = "workflow" if any(task.get("task_type") == "loop" for task in tasks) else "sequential"
+        return PraisonAIAgents(
+            agents=[agent],
+            tasks=[Task(agent=agent, **task) for task in tasks],
+            process=process,
+            checkpoint=True,
+            checkpoint_dir=os.path.join(self.tmp.name, "runs"),
+            max_iter=30
+        )
+
+    def crash_then_resume(self, tasks, crash_at):
+        self.crash_at = crash_at
+        first = self.build(tasks)
+        try:
+            first.start()
+        except Crash:
+            pass  # the workflow process logs task errors instead of raising them
+        crashed_calls = list(self.calls)
+        self.assertEqual(crashed_calls[-1], crash_at)
+        self.crash_at = None
+        self.calls.clear()
+        resumed = self.build(tasks)
+        result = resumed.start(resume_run_id=first.run_id, return_dict=True)
+        return crashed_calls, resumed, result
+
+    def test_sequential_run_resumes_after_crash(self):
+        tasks = [{"name": f"t{i}", "description": f"step {i}"} for i in range(4)]
+        crashed_calls, resumed, result = self.crash_then_resume(tasks, "t2")
+        self.assertEqual(crashed_calls, ["t0", "t1", "t2"])
+        # Completed tasks are not run again; their outputs, state and history come from the checkpoint
+        self.assertEqual(self.calls, ["t2", "t3"])
+        self.assertEqual({k: v.raw for k, v in result["task_results"].items()},
+                         {0: "out-t0", 1: "out-t1", 2: "out-t2", 3: "out-t3"})
+        self.assertEqual(resumed.get_state("t0"), 1)
+        self.assertEqual([m["content"] for m in resumed.agents[0].chat_history], ["t0", "t1", "t2", "t3"])
+
+    def test_csv_loop_resumes_at_crashed_row(self):
+        rows = os.path.join(self.tmp.name, "rows.csv")
+        with open(rows, "w") as f:
+            f.write("q1\nq2\nq3\n")
+        tasks = [{"name": "rows", "description": "each row", "task_type": "loop", "input_file": rows, "is_start": True}]
+        crashed_calls, resumed, _ = self.crash_then_resume(tasks, "rows_2")
+        self.assertEqual(crashed_calls, ["rows_1", "rows_2"])
+        # Row tasks are created again on resume and matched to the checkpoint by name
+        self.assertEqual(self.calls, ["rows_2", "rows_3"])
+        row_tasks = {task.name: task for task in resumed.tasks.values() if task.name.startswith("rows_")}
+        self.assertEqual({name: task.status for name, task in row_tasks.items()},
+                         {"rows_1": "completed", "rows_2": "completed", "rows_3": "completed"})
+        self.assertEqual(row_tasks["rows_1"].result.raw, "done")
+        self.assertEqual(resumed.get_state("rows_1"), 1)
+
+    def test_unknown_run_id(self):
+        with self.assertRaises(ValueError):
+            self.build([{"name": "t0", "description": "step"}]).start(resume_run_id="missing")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,275 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from openpyxl import Workbook
+
+from praisonaiagents.tools import json_tools
+from praisonaiagents.tools.csv_tools import CSVTools
+from praisonaiagents.tools.excel_tools import ExcelTools
+from praisonaiagents.tools.json_tools import JSONTools, _infer_schema, _write_jsonl
+from praisonaiagents.tools.pandas_tools import PandasTools
+from praisonaiagents.tools.xml_tools import XMLTools
+from praisonaiagents.tools.yaml_tools import YAMLTools
+
+
+class TestExcelFrames(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "book.xlsx")
+
+    def write(self, rows):
+        workbook = Workbook()
+        for row in rows:
+            workbook.active.append(row)
+        workbook.save(self.path)
+
+    def test_header_only_sheet_keeps_columns(self):
+        self.write([["name", "age"]])
+        frames = list(ExcelTools()._iter_excel_frames(self.path))
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(list(frames[0].columns), ["name", "age"])
+        self.assertTrue(frames[0].empty)
+
+    def test_exact_chunks_do_not_add_an_empty_frame(self):
+        self.write([["name", "age"], ["a", 1], ["b", 2]])
+        frames = list(ExcelTools()._iter_excel_frames(self.path, chunksize=2))
+        self.assertEqual([len(f) for f in frames], [2])
+
+
+class TestPandasReadCsv(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "people.csv")
+        with open(self.path, "w") as f:
+            f.write("name,age,city\na,20,x\nb,40,y\nc,50,z\n")
+
+    def test_filter_on_column_not_in_usecols(self):
+        df = PandasTools().read_csv(self.path, usecols=["name"], filters=[["age", ">", 30]])
+        self.assertEqual(list(df.columns), ["name"])
+        self.assertEqual(df["name"].tolist(), ["b", "c"])
+
+    def test_filter_with_all_columns(self):
+        df = PandasTools().read_csv(self.path, filters=[["city", "in", ["x", "z"]]])
+        self.assertEqual(df["name"].tolist(), ["a", "c"])
+
+
+class TestSummarizeCsv(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "sales.csv")
+        with open(self.path, "w") as f:
+            f.write("name,qty,price,day\na,3,1.5,2024-01-02\nb,,2.5,2024-01-03\nc,10,4.0,2024-01-01\n")
+
+    def test_duckdb_and_pandas_stats_match(self):
+        tools = CSVTools()
+        with_duckdb = tools.summarize_csv(self.path)
+        with patch.object(CSVTools, "_duckdb_scan", return_value=None):
+            with_pandas = tools.summarize_csv(self.path)
+
+        stats = with_duckdb["stats"]
+        self.assertEqual(stats["qty"]["min"], 3)
+        self.assertIsInstance(stats["qty"]["min"], int)
+        self.assertEqual(stats["price"]["max"], 4.0)
+        self.assertNotIn("min", stats["day"])
+        for column, column_stats in stats.items():
+            column_stats.pop("approx_unique")
+            self.assertEqual(column_stats, with_pandas["stats"][column], column)
+        self.assertEqual(with_duckdb["row_count"], with_pandas["row_count"])
+
+
+class StreamingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def read_lines(self, path):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+
+class TestJsonStreaming(StreamingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.array = self.write("array.json", '[{"id": 1, "n": 1.5}, {"id": 2, "tags": ["a"]}, 3, "x"]')
+        self.nested = self.write("nested.json", '{"meta": {}, "results": [{"id": 1}, {"id": 2, "extra": true}]}')
+        self.lines = self.write("rows.jsonl", '{"id": 1}\n\n{"id": 2}\n')
+
+    def without_ijson(self):
+        find_spec = json_tools.util.find_spec
+        patcher = patch.object(json_tools.util, "find_spec", lambda name: None if name == "ijson" else find_spec(name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def check_iter_json(self):
+        tools = JSONTools()
+        self.assertEqual(list(tools.iter_json(self.array)), [{"id": 1, "n": 1.5}, {"id": 2, "tags": ["a"]}, 3, "x"])
+        self.assertEqual(list(tools.iter_json(self.nested, "results.item")), [{"id": 1}, {"id": 2, "extra": True}])
+        self.assertEqual(list(tools.iter_json(self.nested, "meta")), [{}])
+        self.assertEqual(list(tools.iter_json(self.lines)), [{"id": 1}, {"id": 2}])
+
+    def test_iter_json(self):
+        self.check_iter_json()
+
+    def test_iter_json_without_ijson(self):
+        self.without_ijson()
+        self.check_iter_json()
+
+    def test_top_level_array_across_read_chunks(self):
+        self.without_ijson()
+        records = [{"id": i, "value": 12345.678} for i in range(200)]
+        path = self.write("big.json", json.dumps(records))
+        with patch.object(json_tools, "_READ_CHUNK_SIZE", 7):
+            self.assertEqual(list(JSONTools().iter_json(path)), records)
+        with self.assertRaises(ValueError):
+            list(JSONTools().iter_json(self.nested))
+        with self.assertRaises(ValueError):
+            list(JSONTools().iter_json(self.write("cut.json", '[{"id": 1}, ')))
+
+    def test_extract_json(self):
+        tools = JSONTools()
+        self.assertEqual(tools.extract_json(self.array, fields=["id"], limit=3), [{"id": 1}, {"id": 2}, 3])
+        output = os.path.join(self.tmp.name, "out.jsonl")
+        self.assertEqual(
+            tools.extract_json(self.nested, "results.item", output_file=output),
+            {"output_file": output, "count": 2}
+        )
+        self.assertEqual(self.read_lines(output), [{"id": 1}, {"id": 2, "extra": True}])
+        self.assertIn("error", tools.extract_json(os.path.join(self.tmp.name, "missing.json")))
+
+    def test_infer_json_schema(self):
+        result = JSONTools().infer_json_schema(self.nested, "results.item")
+        self.assertEqual(result["sampled_records"], 2)
+        fields = result["schema"]["fields"]
+        self.assertEqual(fields["id"], {"types": {"int": 2}, "count": 2, "presence": 1.0, "examples": [1, 2]})
+        self.assertEqual(fields["extra"]["presence"], 0.5)
+        self.assertEqual(JSONTools().infer_json_schema(self.array, sample_size=1)["sampled_records"], 1)
+
+
+class TestSchemaHelpers(StreamingTestCase):
+    def test_infer_schema(self):
+        records = iter([{"a": [1, 2], "b": None}, {"a": [], "c": {"d": "deep"}}, "x" * 200])
+        schema = _infer_schema(records, sample_size=10, max_depth=2)
+        self.assertEqual(schema["sampled_records"], 3)
+        top = schema["schema"]
+        self.assertEqual(top["types"], {"dict": 2, "str": 1})
+        self.assertEqual(top["fields"]["a"]["items"]["types"], {"int": 2})
+        self.assertEqual(top["fields"]["b"]["types"], {"null": 1})
+        self.assertEqual(top["fields"]["c"]["presence"], 0.5)
+        # Values at max_depth are counted but not described
+        self.assertEqual(top["fields"]["c"]["fields"]["d"], {"types": {"str": 1}, "count": 1, "presence": 1.0})
+        self.assertEqual(top["examples"], ["x" * 100])
+
+    def test_infer_schema_stops_at_sample_size(self):
+        consumed = []
+
+        def records():
+            for i in range(10):
+                consumed.append(i)
+                yield i
+
+        self.assertEqual(_infer_schema(records(), sample_size=3)["sampled_records"], 3)
+        self.assertEqual(consumed, [0, 1, 2])
+
+    def test_write_jsonl(self):
+        path = os.path.join(self.tmp.name, "out.jsonl")
+        count = _write_jsonl(iter([{"name": "caf\u00e9"}, [1, 2], {"day": date(2024, 1, 2)}]), path)
+        self.assertEqual(count, 3)
+        with open(path, encoding="utf-8") as f:
+            self.assertIn("café", f.readline())
+        self.assertEqual(self.read_lines(path), [{"name": "café"}, [1, 2], {"day": "2024-01-02"}])
+
+
+class TestYamlStreaming(StreamingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = self.write("docs.yaml", """\
+defaults: &defaults
+  retries: 3
+records:
+  - {id: 1, <<: *defaults}
+  - id: 2
+    nested: {skip: [1, 2]}
+---
+records:
+  - id: 3
+other: [1, 2]
+---
+- plain
+""")
+
+    def test_iter_yaml_documents(self):
+        docs = list(YAMLTools().iter_yaml(self.path))
+        self.assertEqual(len(docs), 3)
+        self.assertEqual(docs[2], ["plain"])
+
+    def test_iter_yaml_path(self):
+        records = list(YAMLTools().iter_yaml(self.path, "records.item"))
+        self.assertEqual(records, [
+            {"id": 1, "retries": 3},
+            {"id": 2, "nested": {"skip": [1, 2]}},
+            {"id": 3}
+        ])
+        self.assertEqual(list(YAMLTools().iter_yaml(self.path, "item")), ["plain"])
+
+    def test_extract_yaml(self):
+        tools = YAMLTools()
+        self.assertEqual(tools.extract_yaml(self.path, "records.item", limit=1), [{"id": 1, "retries": 3}])
+        output = os.path.join(self.tmp.name, "out.jsonl")
+        self.assertEqual(tools.extract_yaml(self.path, "other", output_file=output), {"output_file": output, "count": 1})
+        self.assertEqual(self.read_lines(output), [[1, 2]])
+        self.assertIsNone(tools.extract_yaml(self.write("bad.yaml", "a: [1, 2")))
+
+
+class TestXmlStreaming(StreamingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = self.write("store.xml", """\
+<store xmlns:x="urn:x">
+  <book id="1"><title>A</title><price>3</price></book>
+  <x:book id="2"><title>B</title></x:book>
+  <shelf>
+    <book id="3"><title>C</title><book id="4"><title>D</title></book></book>
+  </shelf>
+</store>""")
+
+    def test_iter_xml(self):
+        books = list(XMLTools().iter_xml(self.path, "book"))
+        self.assertEqual([b["@attributes"]["id"] for b in books], ["1", "2", "3"])
+        # Nested matches stay inside their outermost match
+        self.assertEqual(books[2]["book"]["title"], "D")
+        self.assertEqual(books[0], {"@attributes": {"id": "1"}, "title": "A", "price": "3"})
+
+    def test_iter_xml_path_and_elements(self):
+        tools = XMLTools()
+        self.assertEqual([b["title"] for b in tools.iter_xml(self.path, "/store/book")], ["A", "B"])
+        self.assertEqual([b["title"] for b in tools.iter_xml(self.path, "shelf/book")], ["C"])
+        elements = list(tools.iter_xml(self.path, "title", as_dict=False))
+        self.assertEqual([e.text for e in elements], ["A", "B", "C", "D"])
+
+    def test_extract_and_infer_xml(self):
+        tools = XMLTools()
+        output = os.path.join(self.tmp.name, "out.jsonl")
+        self.assertEqual(tools.extract_xml(self.path, "book", output_file=output), {"output_file": output, "count": 3})
+        self.assertEqual(len(self.read_lines(output)), 3)
+        self.assertEqual(len(tools.extract_xml(self.path, "book", limit=2)), 2)
+        self.assertIn("error", tools.extract_xml(self.write("bad.xml", "<a><b></a>"), "b"))
+        schema = tools.infer_xml_schema(self.path, "book")
+        self.assertEqual(schema["sampled_records"], 3)
+        self.assertEqual(schema["schema"]["fields"]["price"]["presence"], 0.3333)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import csv
+import os
+import tempfile
+import unittest
+from praisonaiagents.tools.duckdb_tools import DuckDBTools
+
+
+class TestDuckDBTools(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db = DuckDBTools()
+        self.addCleanup(self.db.close)
+        self.db.execute_query("CREATE TABLE nums AS SELECT range AS i, 'n' || range AS name FROM range(2500)")
+
+    def test_execute_query_within_limit(self):
+        rows = self.db.execute_query("SELECT * FROM nums WHERE i < ? ORDER BY i", (3,))
+        self.assertEqual(rows, [{"i": 0, "name": "n0"}, {"i": 1, "name": "n1"}, {"i": 2, "name": "n2"}])
+
+    def test_execute_query_is_truncated(self):
+        for return_df in (True, False):
+            result = self.db.execute_query("SELECT * FROM nums ORDER BY i", return_df=return_df, max_rows=100)
+            self.assertTrue(result["truncated"])
+            self.assertEqual(len(result["rows"]), 100)
+            self.assertEqual(result["rows"][-1]["i"], 99)
+        self.assertTrue(self.db.execute_query("SELECT * FROM nums")["truncated"])
+        self.assertEqual(len(self.db.execute_query("SELECT * FROM nums", max_rows=None)), 2500)
+
+    def test_open_fetch_close(self):
+        handle = self.db.open_query("SELECT * FROM nums WHERE i >= ? ORDER BY i", (2000,), sample_size=2)
+        self.assertEqual(handle["row_count"], 500)
+        self.assertEqual([c["name"] for c in handle["schema"]], ["i", "name"])
+        self.assertEqual([r["i"] for r in handle["sample"]], [2000, 2001])
+
+        page = self.db.fetch_rows(handle["cursor"], offset=490, limit=5)
+        self.assertEqual([r["i"] for r in page["rows"]], [2490, 2491, 2492, 2493, 2494])
+        self.assertEqual(page["next_offset"], 495)
+        self.assertIsNone(self.db.fetch_rows(handle["cursor"], offset=495, limit=5)["next_offset"])
+
+        self.assertTrue(self.db.close_result(handle["cursor"]))
+        self.assertFalse(self.db.close_result(handle["cursor"]))
+        self.assertIn("error", self.db.fetch_rows(handle["cursor"]))
+
+    def test_export_result(self):
+        handle = self.db.open_query("SELECT * FROM nums WHERE i < 10")
+        csv_path = os.path.join(self.tmp.name, "out.csv")
+        parquet_path = os.path.join(self.tmp.name, "out.parquet")
+        self.assertTrue(self.db.export_result(handle["cursor"], csv_path))
+        self.assertTrue(self.db.export_result(handle["cursor"], parquet_path))
+        with open(csv_path, newline="") as f:
+            self.assertEqual(len(list(csv.DictReader(f))), 10)
+        count = self.db.execute_query(f"SELECT COUNT(*) AS n FROM '{parquet_path}'")
+        self.assertEqual(count, [{"n": 10}])
+        self.assertFalse(self.db.export_result("missing", csv_path))
+
+    def test_export_query_with_params(self):
+        path = os.path.join(self.tmp.name, "params.parquet")
+        self.assertTrue(self.db.export_parquet("SELECT * FROM nums WHERE i < ?", path, (5,)))
+        self.assertEqual(self.db.execute_query(f"SELECT COUNT(*) AS n FROM '{path}'"), [{"n": 5}])
+        self.assertEqual(self.db._results, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
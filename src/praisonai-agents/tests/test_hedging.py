@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from openai import OpenAI
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+from praisonaiagents import Agent  # noqa: E402
+from praisonaiagents.llm.hedging import _histograms, full_response_key, get_latency_histogram  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Chat completions endpoint whose responses are delayed by server.delays, in order."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            delay = self.server.delays.pop(0) if self.server.delays else 0
+            self.server.requests += 1
+        time.sleep(delay)
+        base = {"id": "c", "created": 0, "model": body["model"]}
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for text in ("Hello", " world"):
+                chunk = {**base, "object": "chat.completion.chunk",
+                         "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+            return
+        data = json.dumps({**base, "object": "chat.completion", "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": f"reply after {delay}"}, "finish_reason": "stop"}
+        ]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class TestHedgedCompletions(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.server.delays, self.server.requests, self.server.lock = [], 0, threading.Lock()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        stub = OpenAI(base_url=f"http://127.0.0.1:{self.server.server_port}/v1", api_key="test")
+        # Warm up the client so the first attempt reaches the server first
+        stub.chat.completions.create(model="warmup", messages=[{"role": "user", "content": "hi"}])
+        self.server.requests = 0
+        patcher = patch("praisonaiagents.agent.agent.client", stub)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Requests still running from another test record under their own model
+        self.model = f"stub-{self._testMethodName}"
+        self.agent = Agent(instructions="test", llm=self.model,
+                           hedging={"initial_delay": 0.2, "min_delay": 0.05})
+
+    def test_late_stream_is_hedged(self):
+        self.server.delays = [2.0, 0]
+        started = time.monotonic()
+        chunks = list(self.agent._create_completion(messages=[{"role": "user", "content": "hi"}], stream=True))
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertEqual("".join(c.choices[0].delta.content or "" for c in chunks), "Hello world")
+        self.assertEqual(self.agent.hedger.hedged, 1)
+        self.assertEqual(self.agent.hedger.hedge_wins, 1)
+        self.assertEqual(self.server.requests, 2)
+
+    def test_non_streaming_calls_use_their_own_histogram(self):
+        self.server.delays = [0.4]
+        response = self.agent._create_completion(messages=[{"role": "user", "content": "hi"}])
+        # Slower than the stream hedge delay, but not duplicated
+        self.assertEqual(response.choices[0].message.content, "reply after 0.4")
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(self.agent.hedger.hedged, 0)
+        self.assertNotIn(self.model, _histograms)
+        self.assertEqual(_histograms[full_response_key(self.model)].count, 1)
+
+    def test_non_streaming_calls_hedged_on_full_response_latency(self):
+        histogram = get_latency_histogram(full_response_key(self.model))
+        for _ in range(20):
+            histogram.record(0.3)
+        self.server.delays = [0.2, 3.0, 0]
+        response = self.agent._create_completion(messages=[{"role": "user", "content": "hi"}])
+        self.assertEqual(response.choices[0].message.content, "reply after 0.2")
+        self.assertEqual(self.agent.hedger.hedged, 0)
+
+        started = time.monotonic()
+        response = self.agent._create_completion(messages=[{"role": "user", "content": "hi"}])
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual(response.choices[0].message.content, "reply after 0")
+        self.assertEqual(self.agent.hedger.hedged, 1)
+        self.assertNotIn(self.model, _histograms)
+
+    def test_hedge_clients_are_reused(self):
+        self.assertIs(self.agent._hedge_target(is_async=True)[2], self.agent._hedge_target(is_async=True)[2])
+        self.assertIs(self.agent._hedge_target()[2], self.agent._hedge_target()[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
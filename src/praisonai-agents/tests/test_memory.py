@@ -0,0 +1,129 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from praisonaiagents.memory.memory import Memory
+from praisonaiagents.memory.quality import QualityEvaluator
+
+
+class TestQualityChecks(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        self.memory = Memory(config={
+            "provider": "none",
+            "short_db": os.path.join(self.tmp.name, "short.db"),
+            "long_db": os.path.join(self.tmp.name, "long.db"),
+            "quality_flush_interval": 0
+        })
+        self.release = threading.Event()
+
+    def score(self, batch):
+        self.release.wait(5)
+        return [
+            {k: (0.9 if "good" in item["content"] else 0.1) for k in ("completeness", "relevance", "clarity", "accuracy")}
+            for item in batch
+        ]
+
+    def test_short_term_is_stored_before_scoring(self):
+        with patch.object(QualityEvaluator, "score_batch", side_effect=self.score):
+            self.memory.queue_quality_check("good output", "expected", "Writer", task_id="t1")
+            hits = self.memory.search_short_term("good output")
+            self.assertEqual([h["metadata"]["task_id"] for h in hits], ["t1"])
+            self.assertEqual(self.memory.search_long_term("good output"), [])
+            self.release.set()
+            self.memory.close()
+        self.assertEqual(len(self.memory.search_short_term("good output")), 1)
+
+    def test_only_passing_outputs_reach_long_term(self):
+        self.release.set()
+        with patch.object(QualityEvaluator, "score_batch", side_effect=self.score):
+            self.memory.queue_quality_check("good output", "expected", "Writer", task_id="t1")
+            self.memory.queue_quality_check("bad output", "expected", "Writer", task_id="t2")
+            self.memory.close()
+        long_term = self.memory.search_long_term("output")
+        self.assertEqual([r["metadata"]["task_id"] for r in long_term], ["t1"])
+        self.assertEqual(long_term[0]["metadata"]["quality"], 0.9)
+
+
+class FakeMem0:
+    def __init__(self, results):
+        self.results = results
+        self.limits = []
+
+    def search(self, query, limit):
+        self.limits.append(limit)
+        return self.results[:limit]
+
+
+class TestMetadataFilters(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        self.memory = Memory(config={
+            "provider": "none",
+            "short_db": os.path.join(self.tmp.name, "short.db"),
+            "long_db": os.path.join(self.tmp.name, "long.db")
+        })
+
+    def test_sql_filter_fills_limit_past_non_matching_rows(self):
+        for i in range(30):
+            self.memory.store_long_term(f"note {i} about paris")
+        for i in range(3):
+            self.memory.store_entity(f"Paris{i}", "city", "capital", "France")
+        self.memory.store_user_memory("alice", "alice likes paris")
+        self.memory.store_user_memory("bob", "bob likes paris")
+
+        entities = self.memory.search_entity("Paris", limit=2)
+        self.assertEqual(len(entities), 2)
+        self.assertTrue(all(e["metadata"]["category"] == "entity" for e in entities))
+        users = self.memory.search_user_memory("alice", "paris")
+        self.assertEqual([u["metadata"]["user_id"] for u in users], ["alice"])
+        both = self.memory.search_long_term("paris", filters={"user_id": "bob", "category": "entity"})
+        self.assertEqual(both, [])
+
+    def test_filter_keys_are_validated(self):
+        with self.assertRaises(ValueError):
+            self.memory.search_long_term("x", filters={"a') OR 1=1 --": 1})
+
+    def test_indexes_are_used(self):
+        conn = sqlite3.connect(self.memory.long_db)
+        self.addCleanup(conn.close)
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertTrue({"idx_long_mem_category", "idx_long_mem_user_id"} <= names)
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM long_mem WHERE json_extract(meta, '$.category') = ?",
+            ("entity",)
+        ).fetchall()
+        self.assertIn("idx_long_mem_category", " ".join(str(row[-1]) for row in plan))
+
+    def test_chroma_where(self):
+        self.assertIsNone(self.memory._chroma_where(None))
+        self.assertEqual(self.memory._chroma_where({"category": "entity"}), {"category": "entity"})
+        self.assertEqual(
+            self.memory._chroma_where({"category": "entity", "user_id": "u"}),
+            {"$and": [{"category": "entity"}, {"user_id": "u"}]}
+        )
+
+    def test_mem0_filters_over_fetch(self):
+        hits = [{"id": i, "metadata": {"category": "note"}} for i in range(15)]
+        hits += [{"id": 100 + i, "metadata": {"category": "entity"}} for i in range(10)]
+        self.memory.use_mem0 = True
+        self.memory.mem0_client = FakeMem0(hits)
+
+        entities = self.memory.search_long_term("x", limit=3, filters={"category": "entity"})
+        self.assertEqual([e["id"] for e in entities], [100, 101, 102])
+        self.assertEqual(len(self.memory.search_long_term("x", limit=3)), 3)
+        self.assertEqual(self.memory.mem0_client.limits, [20, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import time
+import unittest
+from praisonaiagents.tools.python_tools import SandboxPool
+
+
+class TestSandboxPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = SandboxPool(size=2, preload=(), memory_limit_mb=None)
+        self.addCleanup(self.pool.close)
+        self.warm = {worker.process.pid for worker in self.pool._idle}
+
+    def pids(self):
+        return {worker.process.pid for worker in self.pool._idle}
+
+    def test_sequential_calls_reuse_warm_workers(self):
+        for _ in range(6):
+            result = self.pool.execute("import os\nos.getpid()")
+            self.assertTrue(result['success'])
+            self.assertIn(result['result'], self.warm)
+        time.sleep(0.5)
+        self.assertEqual(self.pids(), self.warm)
+
+    def test_timed_out_worker_is_replaced(self):
+        result = self.pool.execute("import time\ntime.sleep(10)", timeout=0.5)
+        self.assertFalse(result['success'])
+        deadline = time.time() + 30
+        while len(self.pool._idle) < 2 and time.time() < deadline:
+            time.sleep(0.1)
+        pids = self.pids()
+        self.assertEqual(len(pids), 2)
+        self.assertEqual(len(pids & self.warm), 1)
+
+    def test_session_keeps_namespace(self):
+        self.pool.execute("x = 41", session_id="s")
+        self.assertEqual(self.pool.execute("x + 1", session_id="s")['result'], 42)
+
+    def test_least_recently_used_session_is_closed_past_the_cap(self):
+        self.pool.max_sessions = 2
+        for session_id in ("a", "b"):
+            self.pool.execute("x = 1", session_id=session_id)
+        self.pool.execute("x", session_id="a")
+        oldest = self.pool._sessions["b"]
+        self.pool.execute("x = 1", session_id="c")
+        self.assertEqual(list(self.pool._sessions), ["a", "c"])
+        self.assertFalse(oldest.alive())
+        self.assertFalse(self.pool.execute("x", session_id="b")['success'])
+
+    def test_idle_sessions_are_reaped(self):
+        self.pool.session_idle_timeout = 0.2
+        self.pool.execute("x = 1", session_id="s")
+        worker = self.pool._sessions["s"]
+        time.sleep(0.3)
+        self.assertTrue(self.pool.execute("1 + 1")['success'])
+        self.assertNotIn("s", self.pool._sessions)
+        self.assertFalse(worker.alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import unittest
+from praisonaiagents.llm.reflection import ReflectionEngine
+
+UNSATISFIED = json.dumps({"reflection": "wrong", "satisfactory": "no", "confidence": 0.9, "edits": ["fix it"]})
+SATISFIED = json.dumps({"reflection": "good", "satisfactory": "yes", "confidence": 0.9, "edits": []})
+
+
+class FakeModel:
+    """Critic answers from a list; the reviser numbers its revisions."""
+
+    def __init__(self, critiques):
+        self.critiques = list(critiques)
+        self.calls = []
+
+    def complete(self, messages, model, response_format):
+        self.calls.append((model, response_format))
+        if model == "critic":
+            return self.critiques.pop(0), {}
+        return f"revision {sum(1 for m, _ in self.calls if m == 'reviser')}", {}
+
+
+class TestReflectionEngine(unittest.TestCase):
+    def engine(self, max_reflect):
+        return ReflectionEngine("critic", "reviser", max_reflect=max_reflect, min_reflect=1)
+
+    def test_last_round_edits_are_applied(self):
+        model = FakeModel([UNSATISFIED])
+        result = self.engine(1).run("task", "draft", model.complete)
+        self.assertEqual(result.response, "revision 1")
+        self.assertTrue(result.steps[0].revised)
+
+    def test_one_revision_per_round(self):
+        model = FakeModel([UNSATISFIED, UNSATISFIED, UNSATISFIED])
+        result = self.engine(3).run("task", "draft", model.complete)
+        self.assertEqual(result.response, "revision 3")
+        self.assertEqual(len(result.steps), 3)
+
+    def test_satisfied_critic_stops_early(self):
+        model = FakeModel([UNSATISFIED, SATISFIED])
+        result = self.engine(3).run("task", "draft", model.complete)
+        self.assertEqual(result.response, "revision 1")
+        self.assertEqual([s.revised for s in result.steps], [True, False])
+
+    def test_revision_uses_response_format(self):
+        response_format = {"type": "json_object"}
+        model = FakeModel([UNSATISFIED])
+        self.engine(1).run("task", "draft", model.complete, response_format=response_format)
+        self.assertEqual(model.calls[-1], ("reviser", response_format))
+
+    def test_async_run(self):
+        model = FakeModel([UNSATISFIED, UNSATISFIED])
+
+        async def complete(messages, name, response_format):
+            return model.complete(messages, name, response_format)
+
+        result = asyncio.run(self.engine(2).arun("task", "draft", complete))
+        self.assertEqual(result.response, "revision 2")
+
+
+if __name__ == '__main__':
+    unittest.main()
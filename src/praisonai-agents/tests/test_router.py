@@ -0,0 +1,129 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from praisonaiagents import Agent
+from praisonaiagents.llm.llm import LLM
+from praisonaiagents.llm.router import DEFAULT_STATS_PATH, Router, routing_task
+
+MODELS = ["openai/small", "openai/medium", "openai/large"]
+
+
+class TestRouter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.stats_path = os.path.join(self.tmp.name, "stats.json")
+        self.router = Router(MODELS, stats_path=self.stats_path, min_samples=3, min_success_rate=0.5)
+
+    def test_cascade_order(self):
+        self.assertEqual(self.router.candidates("summarize"), MODELS)
+
+    def test_split_confidence(self):
+        self.assertEqual(Router.split_confidence("Paris\nCONFIDENCE: 0.9"), ("Paris", 0.9))
+        self.assertEqual(Router.split_confidence("Paris\n**Confidence:** 0.35\n"), ("Paris", 0.35))
+        self.assertEqual(Router.split_confidence("Paris\nCONFIDENCE: 1"), ("Paris", 1.0))
+        self.assertEqual(Router.split_confidence("Paris"), ("Paris", None))
+        self.assertEqual(Router.split_confidence("CONFIDENCE: 0.9 in Paris"), ("CONFIDENCE: 0.9 in Paris", None))
+
+    def test_evaluate(self):
+        self.assertEqual(self.router.evaluate("Paris\nCONFIDENCE: 0.9", asked_confidence=True), (True, "Paris", None))
+        accepted, text, reason = self.router.evaluate("Paris\nCONFIDENCE: 0.2", asked_confidence=True)
+        self.assertFalse(accepted)
+        self.assertEqual(text, "Paris")
+        self.assertIn("low confidence", reason)
+        self.assertEqual(self.router.evaluate("", asked_confidence=True), (False, "", "no response"))
+        # Without a confidence line the answer is accepted
+        self.assertTrue(self.router.evaluate("Paris", asked_confidence=True)[0])
+
+    def test_reject_escalates_the_next_attempt_only(self):
+        self.router.record("summarize", MODELS[1], True)
+        self.router.reject("summarize")
+        self.assertEqual(self.router.candidates("summarize"), MODELS[2:])
+        self.assertEqual(self.router.candidates("summarize"), MODELS)
+        self.assertEqual(self.router.stats()["summarize"][MODELS[1]]["failures"], 1)
+
+    def test_models_with_poor_record_are_skipped(self):
+        for _ in range(3):
+            self.router.record("summarize", MODELS[0], False)
+        self.router.record("summarize", MODELS[1], False)
+        self.assertEqual(self.router.candidates("summarize"), MODELS[1:])
+        self.assertEqual(self.router.candidates("translate"), MODELS)
+        # The last model is always kept
+        for _ in range(3):
+            self.router.record("summarize", MODELS[1], False)
+            self.router.record("summarize", MODELS[2], False)
+        self.assertEqual(self.router.candidates("summarize"), MODELS[2:])
+
+    def test_stats_persist(self):
+        for _ in range(3):
+            self.router.record("summarize", MODELS[0], False, latency=2.0)
+        with open(self.stats_path) as f:
+            self.assertEqual(json.load(f)["summarize"][MODELS[0]]["attempts"], 3)
+        reloaded = Router(MODELS, stats_path=self.stats_path, min_samples=3)
+        self.assertEqual(reloaded.candidates("summarize"), MODELS[1:])
+        self.assertEqual(reloaded.stats()["summarize"][MODELS[0]]["avg_latency"], 2.0)
+
+    def test_default_stats_path_is_per_user(self):
+        self.assertTrue(DEFAULT_STATS_PATH.startswith(os.path.expanduser("~")))
+
+
+class TestRoutedAgent(unittest.TestCase):
+    def setUp(self):
+        self.replies = {
+            "openai/small": "Maybe Lyon\nCONFIDENCE: 0.2",
+            "openai/medium": "Paris\nCONFIDENCE: 0.95",
+            "openai/large": "Paris"
+        }
+        self.calls = []
+        test = self
+
+        def get_response(llm, prompt, **kwargs):
+            test.calls.append(llm.model)
+            return test.replies[llm.model]
+
+        async def get_response_async(llm, prompt, **kwargs):
+            await asyncio.sleep(0.01)
+            return get_response(llm, prompt, **kwargs)
+
+        for name, fake in (("get_response", get_response), ("get_response_async", get_response_async)):
+            patcher = patch.object(LLM, name, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.router = Router(MODELS, stats_path=None)
+        self.agent = Agent(name="geo", role="Geographer", llm=self.router, self_reflect=False)
+
+    def test_escalates_and_restores_model(self):
+        before = self.agent.llm_instance
+        self.assertEqual(self.agent.chat("Capital of France?"), "Paris")
+        self.assertEqual(self.calls, ["openai/small", "openai/medium"])
+        self.assertIs(self.agent.llm_instance, before)
+        self.assertEqual(self.agent.chat_history[-1], {"role": "assistant", "content": "Paris"})
+        stats = self.router.stats()["Geographer"]
+        self.assertEqual(stats["openai/small"]["failures"], 1)
+        self.assertEqual(stats["openai/medium"]["failures"], 0)
+
+    def test_task_type_and_reject(self):
+        with routing_task("capitals"):
+            self.agent.chat("Capital of France?")
+        self.router.reject("capitals")
+        self.calls.clear()
+        with routing_task("capitals"):
+            self.assertEqual(self.agent.chat("Capital of France?"), "Paris")
+        self.assertEqual(self.calls, ["openai/large"])
+
+    def test_concurrent_achat_calls_are_all_routed(self):
+        async def run():
+            return await asyncio.gather(*(self.agent.achat(f"Question {i}") for i in range(3)))
+
+        before = self.agent.llm_instance
+        self.assertEqual(asyncio.run(run()), ["Paris"] * 3)
+        self.assertEqual(self.router.stats()["Geographer"]["openai/small"]["attempts"], 3)
+        self.assertIs(self.agent.llm_instance, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import time
+import unittest
+from praisonaiagents.tools import shell_tools
+from praisonaiagents.tools.shell_tools import ShellTools
+
+
+class TestShellToolsTimeout(unittest.TestCase):
+    def setUp(self):
+        self.tools = ShellTools()
+
+    def test_closed_pipes_do_not_escape_timeout(self):
+        start = time.time()
+        result = self.tools.execute_command("sh -c 'exec >&- 2>&-; sleep 5'", timeout=1)
+        self.assertLess(time.time() - start, 3)
+        self.assertFalse(result['success'])
+        self.assertIn('timed out', result['stderr'])
+
+    def test_background_child_is_killed_on_timeout(self):
+        start = time.time()
+        result = self.tools.execute_command("sh -c 'sleep 30 & echo hi'", timeout=2)
+        self.assertLess(time.time() - start, 5)
+        self.assertFalse(result['success'])
+        self.assertEqual(result['stdout'].strip(), 'hi')
+        self.assertIn('timed out', result['stderr'])
+
+    def test_command_within_timeout(self):
+        result = self.tools.execute_command("echo hello", timeout=5)
+        self.assertTrue(result['success'])
+        self.assertEqual(result['stdout'].strip(), 'hello')
+
+
+class TestShellToolsOutput(unittest.TestCase):
+    def test_output_without_newlines_is_passed_on_in_pieces(self):
+        pieces = []
+        result = ShellTools().execute_command(
+            "head -c 200000 /dev/zero | tr '\\0' x; echo; echo done",
+            shell=True,
+            on_output=lambda stream, line: pieces.append((stream, len(line)))
+        )
+        self.assertTrue(result['success'])
+        limit = shell_tools._MAX_PENDING_LINE
+        self.assertEqual(pieces[:3], [('stdout', limit)] * 3)
+        self.assertEqual(pieces[3:], [('stdout', 200000 - 3 * limit), ('stdout', 4)])
+        self.assertLessEqual(len(result['stdout']), 10100)
+
+
+if __name__ == '__main__':
+    unittest.main()
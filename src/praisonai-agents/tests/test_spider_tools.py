@@ -0,0 +1,58 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from praisonaiagents.tools.spider_tools import SpiderTools
+
+PAGES = 6
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    """page0 links to every other page; each response takes server.latency seconds."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.starts.append(time.monotonic())
+        time.sleep(self.server.latency)
+        links = ''.join(f'<a href="/page{i}">page {i}</a>' for i in range(1, PAGES)) if self.path == '/page0' else ''
+        body = f"<html><head><title>{self.path[1:]}</title></head><body>{links}</body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestCrawl(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+        self.server.starts, self.server.lock, self.server.latency = [], threading.Lock(), 0.3
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/page0"
+
+    def test_requests_to_a_host_are_spaced_by_delay(self):
+        started = time.monotonic()
+        results = SpiderTools().crawl(self.url, max_pages=PAGES, delay=0.2, per_host_concurrency=4)
+        elapsed = time.monotonic() - started
+        self.assertEqual([r['title'] for r in results], [f"page{i}" for i in range(PAGES)])
+        gaps = [b - a for a, b in zip(self.server.starts, self.server.starts[1:])]
+        self.assertGreaterEqual(min(gaps), 0.18)
+        # The delay overlaps with slow responses instead of adding to them
+        self.assertLess(elapsed, PAGES * (self.server.latency + 0.2))
+
+    def test_no_delay_runs_requests_concurrently(self):
+        started = time.monotonic()
+        results = SpiderTools().crawl(self.url, max_pages=PAGES, delay=0, per_host_concurrency=4)
+        self.assertEqual(len(results), PAGES)
+        # page0, then the other five pages in two rounds of at most four
+        self.assertLess(time.monotonic() - started, 4 * self.server.latency)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,201 @@
+import asyncio
+import sys
+import unittest
+from typing import List, Optional
+from unittest.mock import patch
+
+from pydantic import BaseModel, ConfigDict
+from praisonaiagents.llm.structured import (
+    JSONStreamValidator,
+    StructuredOutput,
+    aensure_valid,
+    ensure_valid,
+    extract_json,
+    get_structured_output,
+    supports_native_schema,
+)
+
+
+class City(BaseModel):
+    name: str
+    population: int
+    tags: List[str]
+
+
+class Note(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    title: str
+    body: Optional[str] = None
+
+
+VALID = '{"name": "Paris", "population": 2100000, "tags": ["capital"]}'
+
+
+class TestStructuredOutput(unittest.TestCase):
+    def test_compiled_once_per_model(self):
+        self.assertIs(get_structured_output(City), get_structured_output(City))
+        self.assertIsNot(get_structured_output(City), get_structured_output(Note))
+
+    def test_strict_response_format(self):
+        city = StructuredOutput(City)
+        json_schema = city.response_format["json_schema"]
+        self.assertEqual(city.response_format["type"], "json_schema")
+        self.assertEqual(json_schema["name"], "City")
+        self.assertTrue(json_schema["strict"])
+        self.assertFalse(json_schema["schema"]["additionalProperties"])
+        # The model's own schema is left untouched
+        self.assertNotIn("additionalProperties", city.schema)
+        self.assertIn(city.schema_json, city.instruction)
+
+    def test_optional_fields_are_not_strict(self):
+        note = StructuredOutput(Note)
+        self.assertFalse(note.response_format["json_schema"]["strict"])
+        self.assertIs(note.response_format["json_schema"]["schema"], note.schema)
+        self.assertTrue(note.forbid_extra)
+        self.assertEqual(note.properties, {"title", "body"})
+
+    def test_validate(self):
+        city = StructuredOutput(City)
+        instance, error = city.validate(f"Here you go:\n```json\n{VALID}\n```")
+        self.assertIsNone(error)
+        self.assertEqual(instance.population, 2100000)
+        self.assertIsNone(city.validate('{"name": "Paris"}')[0])
+        self.assertIn("population", city.validate('{"name": "Paris"}')[1])
+        self.assertIsNotNone(city.validate("no json here")[1])
+
+    def test_extract_json(self):
+        self.assertEqual(extract_json(f"```json\n{VALID}\n```"), VALID)
+        self.assertEqual(extract_json(f"```\n{VALID}\n```"), VALID)
+        self.assertEqual(extract_json(f"Sure! {VALID} Anything else?"), VALID)
+        self.assertEqual(extract_json("plain text"), "plain text")
+
+
+class TestSupportsNativeSchema(unittest.TestCase):
+    def setUp(self):
+        supports_native_schema.cache_clear()
+        self.addCleanup(supports_native_schema.cache_clear)
+
+    def test_without_litellm_uses_known_prefixes(self):
+        with patch.dict(sys.modules, {"litellm": None}):
+            self.assertTrue(supports_native_schema("gpt-4o-mini"))
+            self.assertTrue(supports_native_schema("o3-mini"))
+            self.assertFalse(supports_native_schema("gpt-3.5-turbo"))
+
+    def test_asks_litellm(self):
+        fake = type(sys)("litellm")
+        fake.supports_response_schema = lambda model: model == "custom/model"
+        with patch.dict(sys.modules, {"litellm": fake}):
+            self.assertTrue(supports_native_schema("custom/model"))
+            self.assertFalse(supports_native_schema("gpt-4o"))
+
+    def test_litellm_errors_mean_unsupported(self):
+        fake = type(sys)("litellm")
+
+        def supports_response_schema(model):
+            raise ValueError("unknown model")
+
+        fake.supports_response_schema = supports_response_schema
+        with patch.dict(sys.modules, {"litellm": fake}):
+            self.assertFalse(supports_native_schema("mystery"))
+
+    def test_older_litellm_checks_supported_params(self):
+        fake = type(sys)("litellm")
+        fake.get_supported_openai_params = lambda model: ["temperature", "response_format"] if model == "a" else None
+        with patch.dict(sys.modules, {"litellm": fake}):
+            self.assertTrue(supports_native_schema("a"))
+            self.assertFalse(supports_native_schema("b"))
+
+
+class TestJSONStreamValidator(unittest.TestCase):
+    def feed(self, model, chunks):
+        validator = JSONStreamValidator(get_structured_output(model))
+        results = [validator.feed(chunk) for chunk in chunks]
+        return validator, results
+
+    def test_accepts_valid_object_in_pieces(self):
+        text = "```json\n" + VALID + "\n```"
+        validator, results = self.feed(City, [text[i:i + 3] for i in range(0, len(text), 3)])
+        self.assertTrue(all(results))
+        self.assertTrue(validator.complete)
+        self.assertIsNone(validator.error)
+
+    def test_rejects_prose_early(self):
+        validator, results = self.feed(City, ["Sure, ", "here is the JSON: {"])
+        self.assertEqual(results, [False, False])
+        self.assertIn("does not start with a JSON object", validator.error)
+
+    def test_rejects_long_whitespace_preamble(self):
+        validator, results = self.feed(City, [" " * 20])
+        self.assertEqual(results, [False])
+
+    def test_rejects_mismatched_brackets(self):
+        validator, results = self.feed(City, ['{"tags": ["a"}'])
+        self.assertEqual(results, [False])
+        self.assertIn("Unbalanced", validator.error)
+
+    def test_unknown_keys_only_rejected_when_extra_is_forbidden(self):
+        validator, results = self.feed(Note, ['{"title": "t", "', 'author": "x"}'])
+        self.assertEqual(results, [True, False])
+        self.assertIn("author", validator.error)
+        # Nested keys and strings that look like keys are not checked
+        validator, results = self.feed(Note, ['{"title": "a, \\"author\\": b", "body": {"author": 1}}'])
+        self.assertEqual(results, [True])
+        self.assertTrue(validator.complete)
+        validator, results = self.feed(City, ['{"extra": 1, "name": "Paris"}'])
+        self.assertEqual(results, [True])
+
+    def test_text_after_the_object_is_ignored(self):
+        validator, results = self.feed(City, ['{"name": "x"}', " trailing prose"])
+        self.assertEqual(results, [True, True])
+        self.assertTrue(validator.complete)
+
+
+class TestEnsureValid(unittest.TestCase):
+    def setUp(self):
+        self.city = get_structured_output(City)
+        self.messages = [{"role": "user", "content": "Describe Paris"}]
+        self.requests = []
+
+    def complete_with(self, reply):
+        def complete(messages):
+            self.requests.append(messages)
+            if isinstance(reply, Exception):
+                raise reply
+            return reply
+        return complete
+
+    def test_valid_reply_is_cleaned_without_a_request(self):
+        result = ensure_valid(self.city, self.messages, f"```json\n{VALID}\n```", self.complete_with(None))
+        self.assertEqual(result, VALID)
+        self.assertEqual(self.requests, [])
+
+    def test_invalid_reply_is_repaired_once(self):
+        result = ensure_valid(self.city, self.messages, '{"name": "Paris"}', self.complete_with(f"```{VALID}```"))
+        self.assertEqual(result, VALID)
+        self.assertEqual(len(self.requests), 1)
+        repair = self.requests[0]
+        self.assertEqual(repair[:1], self.messages)
+        self.assertEqual(repair[1], {"role": "assistant", "content": '{"name": "Paris"}'})
+        self.assertIn("City JSON schema", repair[2]["content"])
+        self.assertIn("population", repair[2]["content"])
+
+    def test_failed_repair_keeps_the_original(self):
+        for reply in ('{"still": "wrong"}', None, RuntimeError("rate limited")):
+            self.requests.clear()
+            result = ensure_valid(self.city, self.messages, "not json", self.complete_with(reply))
+            self.assertEqual(result, "not json")
+            self.assertEqual(len(self.requests), 1)
+
+    def test_async(self):
+        async def complete(messages):
+            self.requests.append(messages)
+            return VALID
+
+        result = asyncio.run(aensure_valid(self.city, self.messages, '{"name": "Paris"}', complete))
+        self.assertEqual(result, VALID)
+        self.assertEqual(asyncio.run(aensure_valid(self.city, self.messages, VALID, complete)), VALID)
+        self.assertEqual(len(self.requests), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
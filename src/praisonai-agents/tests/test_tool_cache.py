@@ -0,0 +1,84 @@
+import os
+import pickle
+import tempfile
+import time
+import unittest
+from praisonaiagents.tools.cache import DEFAULT_CACHE_PATH, SQLiteToolCache, cached_tool, use_tool_cache
+
+
+class Exploit:
+    def __reduce__(self):
+        return (os.system, ("touch should-not-exist",))
+
+
+class TestSQLiteToolCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = SQLiteToolCache(os.path.join(self.tmp.name, "cache.db"))
+
+    def test_round_trip(self):
+        self.cache.set("k", {"a": [1, 2], "b": None}, ttl=60, tool="t")
+        self.assertEqual(self.cache.get("k"), (True, {"a": [1, 2], "b": None}))
+
+    def test_non_json_result_is_not_cached(self):
+        self.cache.set("k", object(), ttl=60, tool="t")
+        self.assertEqual(self.cache.get("k"), (False, None))
+
+    def test_pickled_entry_is_not_loaded(self):
+        with self.cache._lock:
+            self.cache._conn.execute(
+                "INSERT INTO tool_cache (key, tool, value, created_at, expires_at) VALUES (?, ?, ?, 0, NULL)",
+                ("k", "t", pickle.dumps(Exploit()))
+            )
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            self.assertEqual(self.cache.get("k"), (False, None))
+        finally:
+            os.chdir(cwd)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "should-not-exist")))
+
+    def test_default_path_is_per_user(self):
+        self.assertTrue(DEFAULT_CACHE_PATH.startswith(os.path.expanduser("~")))
+
+    def test_expired_entries_are_purged_on_open(self):
+        self.cache.set("old", 1, ttl=-1, tool="t")
+        self.cache.set("new", 2, ttl=60, tool="t")
+        reopened = SQLiteToolCache(self.cache.path)
+        keys = [row[0] for row in reopened._conn.execute("SELECT key FROM tool_cache")]
+        self.assertEqual(keys, ["new"])
+
+
+class TestCachedTool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = SQLiteToolCache(os.path.join(self.tmp.name, "cache.db"))
+        self.calls = 0
+
+        @cached_tool(ttl=60)
+        def lookup(query: str) -> dict:
+            self.calls += 1
+            return {"query": query, "at": time.time()}
+        self.lookup = lookup
+
+    def test_off_by_default(self):
+        self.lookup("x")
+        self.lookup("x")
+        self.assertEqual(self.calls, 2)
+
+    def test_enabled_with_use_tool_cache(self):
+        with use_tool_cache(self.cache):
+            first = self.lookup("x")
+            self.assertEqual(self.lookup("x"), first)
+            self.lookup("y")
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        with use_tool_cache(False):
+            self.lookup("x")
+        self.assertEqual(self.calls, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import unittest
+from praisonaiagents.tools.tool_output import ToolOutputCompactor, read_tool_output
+
+ROWS = [{"id": i, "name": f"row {i}", "text": "x" * 50} for i in range(500)]
+
+
+class TestToolOutputCompactor(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.artifacts = os.path.join(self.tmp.name, "artifacts")
+
+    def test_off_without_config(self):
+        compactor = ToolOutputCompactor()
+        self.assertFalse(compactor.enabled)
+        self.assertEqual(json.loads(compactor.format("t", ROWS)), ROWS)
+
+    def test_auto_summarizes_in_memory(self):
+        compactor = ToolOutputCompactor({"max_tokens": 500, "artifact_dir": self.artifacts})
+        out = json.loads(compactor.format("t", ROWS))
+        self.assertEqual(out["summary"]["length"], 500)
+        self.assertNotIn("handle", out)
+        self.assertFalse(compactor.uses_artifacts())
+        self.assertFalse(os.path.exists(self.artifacts))
+
+    def test_spill_is_readable(self):
+        compactor = ToolOutputCompactor({"max_tokens": 500, "spill": True, "artifact_dir": self.artifacts})
+        self.assertTrue(compactor.uses_artifacts())
+        out = json.loads(compactor.format("t", ROWS))
+        page = read_tool_output(out["handle"], 0, 100)
+        self.assertEqual(page["content"], json.dumps(ROWS)[:100])
+        self.assertEqual(page["next_offset"], 100)
+
+    def test_per_tool_spill_strategy(self):
+        compactor = ToolOutputCompactor({
+            "max_tokens": 500,
+            "artifact_dir": self.artifacts,
+            "tools": {"read_file": {"strategy": "spill"}}
+        })
+        self.assertTrue(compactor.uses_artifacts())
+        self.assertIn("handle", json.loads(compactor.format("read_file", ROWS)))
+        self.assertNotIn("handle", json.loads(compactor.format("other", ROWS)))
+
+
+class TestAgentToolOutput(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("OPENAI_API_KEY", "test")
+
+    def lookup(self, query: str) -> str:
+        """Look something up."""
+        return query
+
+    def test_read_tool_output_only_added_when_spilling(self):
+        from praisonaiagents import Agent
+        self.assertEqual(Agent(name="a", tools=[self.lookup]).tools, [self.lookup])
+        agent = Agent(name="a", tools=[self.lookup], tool_output_config={"max_tokens": 100})
+        self.assertEqual(agent.tools, [self.lookup])
+        agent = Agent(name="a", tools=[self.lookup], tool_output_config={"spill": True})
+        self.assertEqual(agent.tools, [self.lookup, read_tool_output])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Load test for the Twilio <-> OpenAI Realtime call relay (praisonai.api.call).
+
+Runs everything locally: a stub OpenAI Realtime WebSocket server, the call
+server, and simulated Twilio media streams that send 20ms mu-law frames.
+
+Usage:
+    python tests/call_load_test.py --calls 50 --seconds 10
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import statistics
+import time
+
+import websockets
+
+OPENAI_PORT = 8765
+CALL_PORT = 8766
+
+# Must be set before praisonai.api.call is imported
+os.environ.setdefault("OPENAI_API_KEY", "stub")
+os.environ["OPENAI_REALTIME_URL"] = f"ws://127.0.0.1:{OPENAI_PORT}"
+
+# Compact JSON, as sent by Twilio and OpenAI
+dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+FRAME = base64.b64encode(bytes(range(160))).decode()  # 20ms of 8kHz mu-law
+DELTA = base64.b64encode(bytes(range(256)) * 12).decode()  # ~380ms of response audio
+
+
+async def stub_openai(ws, *args):
+    """Answer one second of caller audio with a short spoken response."""
+    appended = 0
+    async for message in ws:
+        event = json.loads(message)
+        if event["type"] == "session.update":
+            await ws.send(dumps({"type": "session.updated", "session": event["session"]}))
+        elif event["type"] == "input_audio_buffer.append":
+            appended += len(base64.b64decode(event["audio"]))
+            if appended >= 8000:
+                appended = 0
+                await ws.send(dumps({"type": "input_audio_buffer.speech_stopped", "audio_end_ms": 1000}))
+                for _ in range(3):
+                    await ws.send(dumps({
+                        "type": "response.audio.delta", "response_id": "resp", "item_id": "item",
+                        "output_index": 0, "content_index": 0, "delta": DELTA
+                    }))
+
+
+async def twilio_call(index, seconds, results):
+    """One phone call: stream caller audio and count the audio played back."""
+    stream_sid = f"MZ{index:032d}"
+    received = 0
+    async with websockets.connect(f"ws://127.0.0.1:{CALL_PORT}/media-stream") as ws:
+        await ws.send(dumps({"event": "start", "start": {"streamSid": stream_sid}}))
+
+        async def listen():
+            nonlocal received
+            async for message in ws:
+                data = json.loads(message)
+                assert data["event"] == "media" and data["streamSid"] == stream_sid
+                assert data["media"]["payload"] == DELTA
+                received += 1
+
+        listener = asyncio.create_task(listen())
+        started = time.monotonic()
+        for sequence in range(seconds * 50):
+            await ws.send(dumps({
+                "event": "media", "sequenceNumber": str(sequence), "streamSid": stream_sid,
+                "media": {"track": "inbound", "chunk": str(sequence), "timestamp": str(sequence * 20), "payload": FRAME}
+            }))
+            # Real time pacing: one frame every 20ms
+            await asyncio.sleep(max(0.0, started + (sequence + 1) * 0.02 - time.monotonic()))
+        lag = time.monotonic() - started - seconds
+        # Let the last responses arrive
+        await asyncio.sleep(0.5)
+        await ws.send(dumps({"event": "stop", "streamSid": stream_sid}))
+        listener.cancel()
+    results.append({"sent": seconds * 50, "received": received, "lag": lag})
+
+
+async def run(calls, seconds):
+    import uvicorn
+    from praisonai.api import call as call_module
+
+    server = uvicorn.Server(uvicorn.Config(call_module.app, host="127.0.0.1", port=CALL_PORT, log_level="warning"))
+    async with websockets.serve(stub_openai, "127.0.0.1", OPENAI_PORT):
+        server_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+
+        results = []
+        tasks = [asyncio.create_task(twilio_call(i, seconds, results)) for i in range(calls)]
+        await asyncio.sleep(seconds / 2)
+        snapshot = [c.snapshot() for c in call_module.active_calls.values()]
+        await asyncio.gather(*tasks)
+        server.should_exit = True
+        await server_task
+
+    received = sum(r["received"] for r in results)
+    print(f"calls: {calls}, duration: {seconds}s, jitter window: {call_module.JITTER_WINDOW_MS}ms")
+    print(f"caller frames sent: {sum(r['sent'] for r in results)}, response frames received: {received}")
+    print(f"pacing lag per call: max {max(r['lag'] for r in results) * 1000:.0f}ms")
+    if snapshot:
+        print(f"mid-run, {len(snapshot)} active calls:")
+        for key in ("frames_in_per_s", "messages_to_openai", "max_queue_depth", "relay_latency_ms", "response_latency_ms"):
+            values = [s[key] for s in snapshot if s[key] is not None]
+            if values:
+                print(f"  {key}: mean {statistics.mean(values):.2f}, max {max(values):.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the call relay against local stub endpoints")
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--seconds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.seconds))
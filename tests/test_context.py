@@ -0,0 +1,114 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from praisonai.ui import context
+from praisonai.ui.context import ContextGatherer, _FileCache, count_tokens, truncate_to_tokens
+
+
+class TestContextGatherer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = self.tmp.name
+        context._file_cache.clear()
+        self.addCleanup(context._file_cache.clear)
+
+    def write(self, rel_path, text, mtime=None):
+        path = os.path.join(self.dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_gathers_files_and_tree(self):
+        self.write("app.py", "print('app')\n")
+        self.write("pkg/util.py", "def util(): pass\n")
+        self.write("notes.md", "ignored by the default patterns\n")
+        gatherer = ContextGatherer(directory=self.dir)
+        text, tokens, tree = gatherer.run()
+        self.assertIn("print('app')", text)
+        self.assertIn("def util", text)
+        self.assertNotIn("ignored", text)
+        self.assertEqual(tokens, count_tokens(text + "\n"))
+        self.assertEqual(tree.splitlines(), ["├── app.py", "└── pkg", "    └── pkg/util.py"])
+
+    def test_select_files_by_priority(self):
+        now = time.time()
+        paths = {
+            "explicit": self.write("deep/dir/explicit.py", "", now - 100),
+            "shallow_old": self.write("old.py", "", now - 50),
+            "shallow_new": self.write("new.py", "", now),
+            "deep": self.write("deep/deeper.py", "", now)
+        }
+        gatherer = ContextGatherer(directory=self.dir, max_tokens=30)
+        files = {path: ("", 10) for path in paths.values()}
+        candidates = {path: name == "explicit" for name, path in paths.items()}
+        self.assertEqual(
+            gatherer.select_files(files, candidates),
+            {paths["explicit"], paths["shallow_new"], paths["shallow_old"]}
+        )
+        gatherer.max_tokens = 100
+        self.assertEqual(gatherer.select_files(files, candidates), set(paths.values()))
+
+    def test_truncate_to_tokens(self):
+        text = "word " * 100
+        self.assertEqual(truncate_to_tokens(text, 1000), text)
+        cut = truncate_to_tokens(text, 10)
+        self.assertTrue(text.startswith(cut))
+        self.assertLessEqual(count_tokens(cut), 11)
+
+    def test_unchanged_files_come_from_cache(self):
+        path = self.write("app.py", "print('app')\n")
+        ContextGatherer(directory=self.dir).gather_context()
+        with patch("builtins.open", side_effect=AssertionError("re-read")):
+            self.assertIn("print('app')", ContextGatherer(directory=self.dir).read_file(path)[0])
+        self.write("app.py", "print('changed')\n")
+        self.assertIn("changed", ContextGatherer(directory=self.dir).read_file(path)[0])
+
+    def test_deleted_files_are_pruned(self):
+        self.write("app.py", "a")
+        gone = self.write("gone.py", "b")
+        ContextGatherer(directory=self.dir).gather_context()
+        self.assertEqual(len(context._file_cache), 2)
+        os.remove(gone)
+        ContextGatherer(directory=self.dir).gather_context()
+        self.assertEqual(len(context._file_cache), 1)
+
+
+class TestFileCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = _FileCache(max_chars=10)
+        cache.put("a", 1, ("aaaa", 1))
+        cache.put("b", 1, ("bbbb", 1))
+        self.assertIsNotNone(cache.get("a", 1))
+        cache.put("c", 1, ("cccc", 1))
+        self.assertIsNone(cache.get("b", 1))
+        self.assertIsNotNone(cache.get("a", 1))
+        self.assertEqual(cache.size, 8)
+
+    def test_stale_and_oversized_entries(self):
+        cache = _FileCache(max_chars=10)
+        cache.put("a", 1, ("aaaa", 1))
+        self.assertIsNone(cache.get("a", 2))
+        cache.put("a", 2, ("x" * 11, 1))
+        self.assertIsNone(cache.get("a", 2))
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+    def test_prune(self):
+        cache = _FileCache(max_chars=100)
+        for key in (os.path.join("/r", "a.py"), os.path.join("/r", "b.py"), os.path.join("/rx", "c.py")):
+            cache.put(key, 1, ("x", 1))
+        cache.prune("/r", {os.path.join("/r", "a.py")})
+        self.assertIsNotNone(cache.get(os.path.join("/r", "a.py"), 1))
+        self.assertIsNone(cache.get(os.path.join("/r", "b.py"), 1))
+        self.assertIsNotNone(cache.get(os.path.join("/rx", "c.py"), 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
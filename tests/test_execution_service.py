@@ -0,0 +1,117 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from backend.execution_service import ExecutionService, run_job
+from backend.job_queue import SQLiteJobQueue
+
+WORKFLOW = {
+    "nodes": [
+        {"id": "node1", "function": "lambda x: x + 1"},
+        {"id": "node2", "function": "lambda x: x * 2"}
+    ],
+    "edges": [
+        {"source": "node1", "target": "node2"}
+    ],
+    "entry_point": "node1",
+    "input": 5
+}
+
+
+class TestExecutionService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "jobs.db")
+        self.service = ExecutionService(self.path, workers=0)
+
+    def test_submit_and_run_job(self):
+        job_id = self.service.submit("wf", WORKFLOW)
+        self.assertEqual(self.service.get_workflow_status("wf")["status"], "queued")
+
+        # A second connection, as a worker process would use
+        queue = SQLiteJobQueue(self.path)
+        job = queue.claim("worker", lease_seconds=60)
+        self.assertEqual(job["id"], job_id)
+        self.assertIsNone(queue.claim("other", lease_seconds=60))
+        run_job(queue, job)
+
+        status = self.service.get_job_status(job_id)
+        self.assertEqual(status["status"], "completed")
+        self.assertEqual(status["result"]["value"], 12)
+        types = [(e["type"], e.get("node")) for e in self.service.queue.events(job_id)]
+        self.assertEqual(types, [
+            ("job_queued", None), ("job_started", None),
+            ("node_started", "node1"), ("node_completed", "node1"),
+            ("node_started", "node2"), ("node_completed", "node2"),
+            ("job_completed", None)
+        ])
+        self.assertEqual(len(self.service.get_execution_history("wf")), 1)
+
+    def test_failed_job(self):
+        job_id = self.service.submit("wf", {**WORKFLOW, "input": "text"})
+        queue = SQLiteJobQueue(self.path)
+        run_job(queue, queue.claim("worker", lease_seconds=60))
+        status = self.service.get_job_status(job_id)
+        self.assertEqual(status["status"], "failed")
+        self.assertIn("node_failed", [e["type"] for e in queue.events(job_id)])
+
+    def test_expired_lease_is_reclaimed(self):
+        job_id = self.service.submit("wf", WORKFLOW)
+        queue = SQLiteJobQueue(self.path)
+        queue.claim("crashed", lease_seconds=0.01)
+        time.sleep(0.05)
+        job = queue.claim("worker", lease_seconds=60)
+        self.assertEqual(job["id"], job_id)
+        self.assertEqual(job["attempts"], 2)
+
+    def test_job_fails_after_max_attempts(self):
+        job_id = self.service.submit("wf", WORKFLOW)
+        queue = SQLiteJobQueue(self.path)
+        for attempt in (1, 2):
+            self.assertEqual(queue.claim("crashed", lease_seconds=0.01, max_attempts=2)["attempts"], attempt)
+            time.sleep(0.05)
+        self.assertIsNone(queue.claim("worker", lease_seconds=60, max_attempts=2))
+        job = queue.get(job_id)
+        self.assertEqual((job["status"], job["error"]), ("failed", "Lease expired after 2 attempts"))
+        self.assertEqual(queue.events(job_id)[-1]["type"], "job_failed")
+        self.assertFalse(queue.complete(job_id, {"value": 12}, "crashed"))
+
+    def test_heartbeat_renews_lease(self):
+        slow = {**WORKFLOW, "nodes": [
+            {"id": "node1", "function": "lambda x: __import__('time').sleep(1) or x + 1"},
+            WORKFLOW["nodes"][1]
+        ]}
+        job_id = self.service.submit("wf", slow)
+        queue = SQLiteJobQueue(self.path)
+        job = queue.claim("worker", lease_seconds=0.3)
+        runner = threading.Thread(target=run_job, args=(queue, job), kwargs={"lease_seconds": 0.3})
+        runner.start()
+        time.sleep(0.7)
+        # The lease has been renewed past its original 0.3 seconds
+        self.assertIsNone(SQLiteJobQueue(self.path).claim("other", lease_seconds=60))
+        runner.join()
+        self.assertEqual(self.service.get_job_status(job_id)["status"], "completed")
+
+    def test_only_lease_holder_finishes_job(self):
+        job_id = self.service.submit("wf", WORKFLOW)
+        queue = SQLiteJobQueue(self.path)
+        stale = queue.claim("crashed", lease_seconds=0.01)
+        time.sleep(0.05)
+        job = queue.claim("worker", lease_seconds=60)
+        self.assertFalse(queue.renew(job_id, "crashed", 60))
+        self.assertFalse(queue.complete(job_id, {"value": 0}, "crashed"))
+        self.assertFalse(queue.fail(job_id, "late", "crashed"))
+        self.assertEqual(queue.get(job_id)["status"], "running")
+        run_job(queue, stale)
+        self.assertEqual(queue.get(job_id)["status"], "running")
+        self.assertTrue(queue.complete(job_id, {"value": 12}, job["worker"]))
+        self.assertEqual(queue.get(job_id)["result"], {"value": 12})
+
+    def test_invalid_workflow_rejected(self):
+        with self.assertRaises(ValueError):
+            self.service.submit("wf", {"nodes": []})
+
+if __name__ == '__main__':
+    unittest.main()
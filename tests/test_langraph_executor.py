@@ -0,0 +1,155 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from langraph.executor import LangGraphExecutor
+
+
+def node(node_id, node_type='default', **data):
+    return {"id": node_id, "type": node_type, "data": {"label": node_id, **data}}
+
+
+def edge(source, target, condition=None):
+    result = {"source": source, "target": target}
+    if condition:
+        result["data"] = {"condition": condition}
+    return result
+
+
+class TestLangGraphExecutor(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(LangGraphExecutor, '_save_result')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_workflow(self, workflow, run_task, **kwargs):
+        executor = LangGraphExecutor(workflow, **kwargs)
+        with patch.object(LangGraphExecutor, '_get_agent', return_value=None), \
+                patch.object(LangGraphExecutor, '_run_agent', lambda self, agent, input_data: run_task(input_data['task'])):
+            result = executor.execute_workflow()
+        return executor, result
+
+    def test_fan_out_runs_in_parallel(self):
+        workflow = {
+            "nodes": [node("start")] + [node(f"branch{i}") for i in range(4)] + [node("join")],
+            "edges": [edge("start", f"branch{i}") for i in range(4)] + [edge(f"branch{i}", "join") for i in range(4)]
+        }
+        order = []
+        barrier = threading.Barrier(4, timeout=5)
+
+        def run_task(task):
+            if task['label'].startswith('branch'):
+                barrier.wait()  # only passes if all four branches run at once
+            order.append(task['label'])
+            return {task['label']: 'done'}
+
+        executor, result = self.run_workflow(workflow, run_task, max_workers=4)
+        self.assertEqual(result['status'], 'completed')
+        self.assertEqual(order[0], 'start')
+        self.assertEqual(order[-1], 'join')
+        self.assertTrue(all(r['status'] == 'success' for r in executor.task_results.values()))
+        self.assertEqual(executor.context['join'], 'done')
+
+    def test_failure_cancels_downstream_only(self):
+        workflow = {
+            "nodes": [node("a"), node("b"), node("c"), node("d")],
+            "edges": [edge("a", "b"), edge("b", "c")]
+        }
+
+        def run_task(task):
+            if task['label'] == 'a':
+                raise RuntimeError("boom")
+            return {}
+
+        executor, _ = self.run_workflow(workflow, run_task)
+        self.assertEqual(executor.task_results['a']['status'], 'error')
+        self.assertEqual(executor.task_results['b']['status'], 'cancelled')
+        self.assertEqual(executor.task_results['c']['status'], 'cancelled')
+        self.assertEqual(executor.task_results['d']['status'], 'success')
+
+    def test_critical_failure_stops_workflow(self):
+        workflow = {"nodes": [node("a", critical=True), node("b")], "edges": [edge("a", "b")]}
+
+        def run_task(task):
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            self.run_workflow(workflow, run_task)
+
+    def test_node_timeout(self):
+        workflow = {"nodes": [node("slow", timeout=0.1), node("after")], "edges": [edge("slow", "after")]}
+        started = time.monotonic()
+        executor, _ = self.run_workflow(workflow, lambda task: time.sleep(1))
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertEqual(executor.task_results['slow']['status'], 'error')
+        self.assertEqual(executor.task_results['after']['status'], 'cancelled')
+
+    def test_decision_runs_chosen_path_once(self):
+        workflow = {
+            "nodes": [node("check", 'decision', condition="score > 5"), node("yes"), node("no"), node("parallel", 'parallel'), node("p1"), node("p2")],
+            "edges": [edge("check", "yes", "true"), edge("check", "no", "false"), edge("yes", "parallel"),
+                      edge("parallel", "p1"), edge("parallel", "p2")]
+        }
+        calls = []
+
+        def run_task(task):
+            calls.append(task['label'])
+            return {}
+
+        executor = LangGraphExecutor(workflow)
+        executor.context['score'] = 10
+        with patch.object(LangGraphExecutor, '_get_agent', return_value=None), \
+                patch.object(LangGraphExecutor, '_run_agent', lambda self, agent, input_data: run_task(input_data['task'])):
+            executor.execute_workflow()
+        self.assertEqual(sorted(calls), ['p1', 'p2', 'yes'])
+        self.assertEqual(executor.task_results['no']['status'], 'skipped')
+
+    def test_if_else_branches_merge(self):
+        workflow = {
+            "nodes": [node("check", 'decision', condition="score > 5"), node("yes"), node("no"), node("no2"),
+                      node("join"), node("after")],
+            "edges": [edge("check", "yes", "true"), edge("check", "no", "false"), edge("no", "no2"),
+                      edge("yes", "join"), edge("no2", "join"), edge("join", "after")]
+        }
+        calls = []
+        contexts = []
+
+        def run_task(input_data):
+            calls.append(input_data['task']['label'])
+            contexts.append(input_data['context'])
+            return {input_data['task']['label']: 'done'}
+
+        executor = LangGraphExecutor(workflow)
+        executor.context['score'] = 10
+        with patch.object(LangGraphExecutor, '_get_agent', return_value=None), \
+                patch.object(LangGraphExecutor, '_run_agent', lambda self, agent, input_data: run_task(input_data)):
+            executor.execute_workflow()
+        self.assertEqual(calls, ['yes', 'join', 'after'])
+        self.assertEqual(executor.task_results['no']['status'], 'skipped')
+        self.assertEqual(executor.task_results['no2']['status'], 'skipped')
+        self.assertEqual(executor.task_results['join']['status'], 'success')
+        # Tasks get a snapshot of the context, not the shared dict
+        self.assertIsNot(contexts[0], executor.context)
+        self.assertNotIn('yes', contexts[0])
+        self.assertEqual(contexts[1]['yes'], 'done')
+
+    def test_node_after_skipped_paths_only_is_skipped(self):
+        workflow = {
+            "nodes": [node("check", 'decision', condition="score > 5"), node("yes"), node("no"), node("after_no")],
+            "edges": [edge("check", "yes", "true"), edge("check", "no", "false"), edge("no", "after_no")]
+        }
+        executor = LangGraphExecutor(workflow)
+        executor.context['score'] = 10
+        with patch.object(LangGraphExecutor, '_get_agent', return_value=None), \
+                patch.object(LangGraphExecutor, '_run_agent', lambda self, agent, input_data: {}):
+            executor.execute_workflow()
+        self.assertEqual(executor.task_results['yes']['status'], 'success')
+        self.assertEqual(executor.task_results['after_no']['status'], 'skipped')
+
+    def test_cycle_detection(self):
+        workflow = {"nodes": [node("a"), node("b")], "edges": [edge("a", "b"), edge("b", "a")]}
+        with self.assertRaises(ValueError):
+            LangGraphExecutor(workflow).execute_workflow()
+
+if __name__ == '__main__':
+    unittest.main()
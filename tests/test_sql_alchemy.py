@@ -0,0 +1,324 @@
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# The UI modules import each other as top-level modules, as they do when chainlit runs them
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "praisonai", "ui"))
+# chainlit and db create their files under CHAINLIT_APP_ROOT on import
+_app_root = tempfile.TemporaryDirectory()
+with patch.dict(os.environ, {"CHAINLIT_APP_ROOT": _app_root.name}):
+    from chainlit.context import context_var, init_http_context
+    from chainlit.types import Feedback, Pagination, ThreadFilter
+    from chainlit.user import User
+    import db
+    from settings_store import subscribe_session
+
+
+class DataLayerTestCase(unittest.IsolatedAsyncioTestCase):
+    """A DatabaseManager on a fresh SQLite database with one user."""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        env = patch.dict(os.environ, {"CHAINLIT_APP_ROOT": self.tmp.name})
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop("DATABASE_URL", None)
+        os.environ.pop("SUPABASE_DATABASE_URL", None)
+        self.db = db.DatabaseManager()
+        self.db.initialize()
+        self.addAsyncCleanup(self.db.engine.dispose)
+        init_http_context()
+        self.user = await self.db.create_user(User(identifier="alice"))
+
+    async def add_thread(self, thread_id, created_at, user_id=None):
+        await self.db.update_thread(thread_id, name=thread_id, user_id=user_id or self.user.id)
+        # update_thread stamps the current time; pin it to control the order
+        await self.db.execute_sql(
+            'UPDATE threads SET "createdAt" = :created_at WHERE "id" = :id',
+            {"created_at": created_at, "id": thread_id}
+        )
+
+    async def add_step(self, step_id, thread_id, output):
+        await self.db.create_step({
+            "id": step_id, "name": "assistant", "type": "assistant_message",
+            "threadId": thread_id, "output": output, "createdAt": "2024-01-01T00:00:00Z"
+        })
+
+    async def list_ids(self, first=20, cursor=None, **filters):
+        page = await self.db.list_threads(
+            Pagination(first=first, cursor=cursor), ThreadFilter(userId=self.user.id, **filters)
+        )
+        return [thread["id"] for thread in page.data], page.pageInfo
+
+
+class TestListThreads(DataLayerTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        for thread_id, created_at in (("a", "2024-01-01"), ("b", "2024-01-03"), ("c", "2024-01-03"),
+                                      ("d", "2024-01-02"), ("e", None)):
+            await self.add_thread(thread_id, created_at)
+        bob = await self.db.create_user(User(identifier="bob"))
+        await self.add_thread("x", "2024-02-01", user_id=bob.id)
+
+    async def test_keyset_pagination(self):
+        pages, cursor = [], None
+        while True:
+            ids, info = await self.list_ids(first=2, cursor=cursor)
+            pages.append(ids)
+            if not info.hasNextPage:
+                break
+            self.assertEqual(info.startCursor, ids[0])
+            cursor = info.endCursor
+        # Newest first, ties broken by id, threads without a date last
+        self.assertEqual(pages, [["c", "b"], ["d", "a"], ["e"]])
+
+    async def test_user_id_is_required(self):
+        with self.assertRaises(ValueError):
+            await self.db.list_threads(Pagination(first=5), ThreadFilter())
+
+    async def test_threads_are_listed_without_steps(self):
+        await self.add_step("s1", "a", "hello")
+        page = await self.db.list_threads(Pagination(first=5), ThreadFilter(userId=self.user.id))
+        self.assertTrue(all(thread["steps"] == [] for thread in page.data))
+        self.assertEqual(len((await self.db.get_thread("a"))["steps"]), 1)
+
+    async def test_search_with_fts5(self):
+        await self.add_step("s1", "a", "Trip to Paris in spring")
+        await self.add_step("s2", "b", "Paris budget")
+        await self.add_step("s3", "c", "Berlin")
+        await self.add_step("s4", "x", "Paris, but not alice's thread")
+        self.assertEqual(await self.db._get_search_mode(), "fts5")
+        # Unsaved steps are flushed first; terms match word prefixes, all terms required
+        self.assertEqual((await self.list_ids(search="PARI"))[0], ["b", "a"])
+        self.assertEqual((await self.list_ids(search="paris spring"))[0], ["a"])
+        self.assertEqual((await self.list_ids(search="aris"))[0], [])
+        self.assertEqual((await self.list_ids(search="?!"))[0], [])
+
+    async def test_search_without_fts5(self):
+        await self.add_step("s1", "a", "Trip to Paris in spring")
+        await self.add_step("s2", "b", "Berlin")
+        self.db._search_mode = "like"
+        self.assertEqual((await self.list_ids(search="paris"))[0], ["a"])
+        self.assertEqual((await self.list_ids(search="aris"))[0], ["a"])
+
+    async def test_search_index_follows_updates_and_deletes(self):
+        await self.add_step("s1", "a", "Paris")
+        self.assertEqual((await self.list_ids(search="paris"))[0], ["a"])
+        await self.add_step("s1", "a", "Rome")
+        self.assertEqual((await self.list_ids(search="paris"))[0], [])
+        self.assertEqual((await self.list_ids(search="rome"))[0], ["a"])
+        await self.db.delete_step("s1")
+        self.assertEqual((await self.list_ids(search="rome"))[0], [])
+
+    async def test_search_index_covers_steps_saved_before_it(self):
+        conn = sqlite3.connect(self.db.db_path)
+        self.addCleanup(conn.close)
+        for trigger in ("steps_fts_insert", "steps_fts_delete", "steps_fts_update"):
+            conn.execute(f"DROP TRIGGER {trigger}")
+        conn.execute("DROP TABLE steps_fts")
+        conn.execute(
+            "INSERT INTO steps (id, name, type, threadId, output) VALUES ('old', 'n', 't', 'd', 'Lisbon notes')"
+        )
+        self.db.create_search_index_sqlite(conn.cursor())
+        # Creating it again keeps the existing index
+        self.db.create_search_index_sqlite(conn.cursor())
+        conn.commit()
+        self.assertEqual((await self.list_ids(search="lisbon"))[0], ["d"])
+
+    async def test_feedback_filter(self):
+        await self.add_step("s1", "a", "Paris")
+        await self.add_step("s2", "b", "Paris")
+        await self.add_step("s3", "b", "Rome")
+        await self.db.upsert_feedback(Feedback(forId="s1", value=1, threadId="a"))
+        await self.db.upsert_feedback(Feedback(forId="s2", value=0, threadId="b"))
+        await self.db.upsert_feedback(Feedback(forId="s3", value=0, threadId="b"))
+        self.assertEqual((await self.list_ids(feedback=1))[0], ["a"])
+        # A thread with several matching steps is listed once
+        self.assertEqual((await self.list_ids(feedback=0))[0], ["b"])
+        self.assertEqual((await self.list_ids(feedback=0, search="paris"))[0], ["b"])
+        self.assertEqual((await self.list_ids(feedback=1, search="rome"))[0], [])
+
+    async def test_listing_uses_the_thread_index(self):
+        conn = sqlite3.connect(self.db.db_path)
+        self.addCleanup(conn.close)
+        plan = conn.execute("""
+            EXPLAIN QUERY PLAN SELECT t."id" FROM threads t WHERE t."userId" = ?
+            ORDER BY COALESCE(t."createdAt", '') DESC, t."id" DESC LIMIT 5
+        """, (self.user.id,)).fetchall()
+        details = " ".join(str(row[-1]) for row in plan)
+        self.assertIn("idx_threads_userId_createdAt", details)
+        self.assertNotIn("TEMP B-TREE", details)
+
+
+class TestWriteBehind(DataLayerTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        # Flushes happen when the tests ask for them
+        self.db.flush_interval = 60
+        await self.add_thread("a", "2024-01-01")
+        await self.add_thread("b", "2024-01-02")
+
+    async def saved_steps(self):
+        rows = await self.db.execute_sql('SELECT "id", "output" FROM steps ORDER BY "id"', {})
+        return [(row["id"], row["output"]) for row in rows]
+
+    async def test_updates_are_coalesced_into_one_transaction(self):
+        await self.add_step("s1", "a", "draft")
+        await self.db.update_step({"id": "s1", "threadId": "a", "output": "final"})
+        await self.add_step("s2", "b", "other")
+        self.assertEqual(await self.saved_steps(), [])
+        with patch.object(self.db, "execute_many", wraps=self.db.execute_many) as execute_many:
+            await self.db.flush()
+        execute_many.assert_called_once()
+        self.assertEqual(len(execute_many.call_args.args[0]), 2)
+        self.assertEqual(await self.saved_steps(), [("s1", "final"), ("s2", "other")])
+        # Fields missing from the update keep their earlier values
+        thread = await self.db.get_thread("a")
+        self.assertEqual(thread["steps"][0]["name"], "assistant")
+
+    async def test_flushed_after_the_interval(self):
+        self.db.flush_interval = 0.05
+        await self.add_step("s1", "a", "hello")
+        await asyncio.sleep(0.3)
+        self.assertEqual(await self.saved_steps(), [("s1", "hello")])
+
+    async def test_reads_and_close_flush_first(self):
+        await self.add_step("s1", "a", "hello")
+        self.assertEqual([step["output"] for step in (await self.db.get_thread("a"))["steps"]], ["hello"])
+        await self.add_step("s2", "a", "bye")
+        await self.db.close()
+        conn = sqlite3.connect(self.db.db_path)
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM steps").fetchone()[0], 2)
+
+    async def test_write_through(self):
+        self.db.write_behind = False
+        await self.add_step("s1", "a", "hello")
+        self.assertEqual(await self.saved_steps(), [("s1", "hello")])
+        self.assertEqual(self.db._pending_steps, {})
+
+    async def test_failed_batch_saves_what_it_can(self):
+        await self.add_step("s1", "a", "hello")
+        # No name or type: violates NOT NULL and fails the batch
+        await self.db.create_step({"id": "bad", "threadId": "a", "output": "broken"})
+        await self.db.flush()
+        self.assertEqual(await self.saved_steps(), [("s1", "hello")])
+
+    async def test_deletes_drop_pending_steps(self):
+        await self.add_step("s1", "a", "one")
+        await self.add_step("s2", "a", "two")
+        await self.add_step("s3", "b", "three")
+        await self.db.delete_step("s1")
+        await self.db.delete_thread("b")
+        await self.db.flush()
+        self.assertEqual(await self.saved_steps(), [("s2", "two")])
+
+    async def run_delete_during_flush(self, delete):
+        """Start a flush that blocks mid-write, then delete while it is in flight."""
+        started, release = asyncio.Event(), asyncio.Event()
+        execute_many = self.db.execute_many
+
+        async def blocked_execute_many(statements):
+            started.set()
+            await release.wait()
+            return await execute_many(statements)
+
+        with patch.object(self.db, "execute_many", blocked_execute_many):
+            flush = asyncio.create_task(self.db.flush())
+            await started.wait()
+            deleting = asyncio.create_task(delete)
+            await asyncio.sleep(0.05)
+            # The delete waits for the flush instead of running underneath it
+            self.assertFalse(deleting.done())
+            release.set()
+            await asyncio.gather(flush, deleting)
+
+    async def test_delete_step_during_flush_is_not_undone(self):
+        await self.add_step("s1", "a", "one")
+        await self.add_step("s2", "a", "two")
+        await self.run_delete_during_flush(self.db.delete_step("s1"))
+        self.assertEqual(await self.saved_steps(), [("s2", "two")])
+
+    async def test_delete_thread_during_flush_is_not_undone(self):
+        await self.add_step("s1", "a", "one")
+        await self.add_step("s2", "b", "two")
+        await self.run_delete_during_flush(self.db.delete_thread("a"))
+        self.assertEqual(await self.saved_steps(), [("s2", "two")])
+        self.assertIsNone(await self.db.get_thread("a"))
+
+
+class TestSettingsStore(DataLayerTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.store = self.db.settings
+
+    async def test_reads_are_cached(self):
+        await self.store.set("model_name", "gpt-4o")
+        self.assertEqual(await self.store.get("model_name"), "gpt-4o")
+        await self.db.execute_sql('UPDATE settings SET "value" = \'other\' WHERE "key" = \'model_name\'', {})
+        self.assertEqual(await self.store.get("model_name"), "gpt-4o")
+        self.assertEqual(await self.store.get("missing", "default"), "default")
+        # Past max_age the settings are read again
+        self.store.max_age = 0
+        self.assertEqual(await self.store.get("model_name"), "other")
+
+    async def test_set_writes_even_when_the_cache_matches(self):
+        await self.store.set("model_name", "gpt-4o")
+        # Another process changes the database behind the cache
+        await self.db.execute_sql('UPDATE settings SET "value" = \'other\' WHERE "key" = \'model_name\'', {})
+        await self.store.set("model_name", "gpt-4o")
+        rows = await self.db.execute_sql('SELECT "value" FROM settings WHERE "key" = \'model_name\'', {})
+        self.assertEqual(rows[0]["value"], "gpt-4o")
+
+    async def test_subscribers_are_told_about_every_change(self):
+        changes = []
+
+        async def on_change(key, value):
+            changes.append((key, value))
+
+        def broken(key, value):
+            raise RuntimeError("gone")
+
+        self.store.subscribe(broken)
+        unsubscribe = self.store.subscribe(on_change)
+        await self.store.set("model_name", "gpt-4o")
+        await self.store.set("model_name", "gpt-4o")
+        unsubscribe()
+        unsubscribe()
+        await self.store.set("model_name", "o3-mini")
+        # A failing subscriber neither raises nor stops the others
+        self.assertEqual(changes, [("model_name", "gpt-4o")] * 2)
+
+    async def test_subscribe_session_runs_in_the_subscribing_session(self):
+        changes = []
+
+        async def on_change(key, value):
+            changes.append((context_var.get().session.id, value))
+
+        async def subscriber():
+            context = init_http_context()
+            unsubscribe = subscribe_session(self.store, on_change)
+            # Changes made by the subscribing session are not reported back to it
+            await self.store.set("model_name", "own")
+            return context.session.id, unsubscribe
+
+        async def other_session(model_name):
+            init_http_context()
+            await self.store.set("model_name", model_name)
+
+        # Each task runs in its own copy of the context, like separate sessions
+        session_id, unsubscribe = await asyncio.create_task(subscriber())
+        await asyncio.create_task(other_session("gpt-4o"))
+        self.assertEqual(changes, [(session_id, "gpt-4o")])
+        unsubscribe()
+        await asyncio.create_task(other_session("o3-mini"))
+        self.assertEqual(changes, [(session_id, "gpt-4o")])
+
+
+if __name__ == "__main__":
+    unittest.main()
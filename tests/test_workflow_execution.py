@@ -1,7 +1,15 @@
+import os
+import tempfile
+from unittest.mock import patch
 from fastapi.testclient import TestClient
-from backend.api import app
 import pytest
 
+# backend.api creates its job queue on import; keep it out of the working directory
+# without leaking WORKFLOW_QUEUE_URL into other tests
+_queue_dir = tempfile.TemporaryDirectory()
+with patch.dict(os.environ, {"WORKFLOW_QUEUE_URL": os.path.join(_queue_dir.name, "workflow_jobs.db")}):
+    from backend.api import app
+
 client = TestClient(app)
 
 def test_execute_workflow():
@@ -34,7 +42,7 @@ def test_execute_workflow():
     # Check status
     status_response = client.get(f"/api/workflows/{workflow_id}/status")
     assert status_response.status_code == 200
-    assert status_response.json()["status"] in ["running", "completed"]
+    assert status_response.json()["status"] in ["queued", "running", "completed"]
 
 def test_get_workflow_status_not_found():
     response = client.get("/api/workflows/nonexistent/status")